@@ -6,6 +6,7 @@ WICHTIG: Config MUSS vor init_extensions() komplett geladen sein!
 """
 
 import os
+import click
 
 # Lade .env Datei (für DATABASE_URL etc.)
 from dotenv import load_dotenv
@@ -63,6 +64,7 @@ def create_app(config_name=None):
     
     # Load Configuration from config.py
     app.config.from_object(config[config_name])
+    app.config['CONFIG_NAME'] = config_name
     
     # Init app in config class
     if hasattr(config[config_name], 'init_app'):
@@ -128,6 +130,13 @@ def create_app(config_name=None):
 
     print()
 
+    # =========================================================================
+    # RESPONSE COMPRESSION (gzip/brotli) - vor allen anderen after_request
+    # Hooks registrieren, damit sie als letzte läuft
+    # =========================================================================
+    from app.utils.compression import compressor
+    compressor.init_app(app)
+
     # =========================================================================
     # SECURITY HEADERS
     # =========================================================================
@@ -135,6 +144,18 @@ def create_app(config_name=None):
     configure_cors_security(app)
     app.logger.info("Security headers configured")
 
+    # =========================================================================
+    # QUERY PROFILER (Server-Timing, N+1 Erkennung, /metrics)
+    # =========================================================================
+    from app.utils.query_profiler import query_profiler
+    query_profiler.init_app(app)
+
+    # =========================================================================
+    # METRICS (Prometheus Text Format unter /metrics)
+    # =========================================================================
+    from app.utils.metrics import metrics
+    metrics.init_app(app)
+
     # =========================================================================
     # ERROR HANDLERS
     # =========================================================================
@@ -311,6 +332,66 @@ def create_app(config_name=None):
         else:
             print("[CANCEL] Cancelled")
     
+    @app.cli.command()
+    def ensure_tables():
+        """Create tables missing from the baseline schema (idempotent)"""
+        from app.models import GesperrterToken, ModulSuchindex
+        with app.app_context():
+            # checkfirst: vorhandene Tabellen bleiben unberührt,
+            # neue werden samt Indizes angelegt
+            for model in (GesperrterToken, ModulSuchindex):
+                model.__table__.create(db.engine, checkfirst=True)
+                print(f"[OK] Table {model.__tablename__} present")
+
+    @app.cli.command()
+    def rebuild_search_index():
+        """Rebuild module full-text search index"""
+        from app.services import modul_suche_service
+        with app.app_context():
+            anzahl = modul_suche_service.rebuild()
+            print(f"[OK] Search index rebuilt ({anzahl} modules)")
+    
+    @app.cli.command()
+    def normalize_modul_rollen():
+        """Normalize role names of module/lecturer assignments"""
+        from app.models import ModulDozent
+        from app.utils.cache_utils import invalidate_module_caches
+        with app.app_context():
+            anzahl = ModulDozent.normalisiere_bestand()
+            # Bulk-UPDATE löst keine ORM-Events aus
+            invalidate_module_caches()
+            print(f"[OK] {anzahl} assignments normalized")
+    
+    @app.cli.command()
+    @click.option('--tage', type=int, default=None, help='Gelesene Benachrichtigungen älter als X Tage')
+    @click.option('--chunk-size', type=int, default=None, help='Zeilen pro DELETE/Commit')
+    def cleanup_notifications(tage, chunk_size):
+        """Delete old read notifications (retention job, e.g. via cron)"""
+        from app.services import notification_service
+        with app.app_context():
+            anzahl = notification_service.delete_alte_benachrichtigungen(
+                tage=tage if tage is not None else app.config['NOTIFICATION_RETENTION_DAYS'],
+                chunk_size=chunk_size or app.config['NOTIFICATION_DELETE_CHUNK']
+            )
+            print(f"[OK] {anzahl} notifications deleted")
+    
+    @app.cli.command()
+    @click.option('--verzeichnis', default=None, help='PDF-Verzeichnis (Default: MODULHANDBUCH_DIR)')
+    @click.option('--workers', type=int, default=None, help='Parse-Prozesse')
+    @click.option('--force', is_flag=True, help='Auch unveränderte Handbücher neu importieren')
+    def import_modulhandbuecher(verzeichnis, workers, force):
+        """Import module handbook PDFs (only changed files are parsed)"""
+        from app.services import modulhandbuch_import_service
+        with app.app_context():
+            stats = modulhandbuch_import_service.importiere(verzeichnis, workers=workers, force=force)
+            print(
+                f"[OK] {stats['importiert']} handbooks imported, {stats['uebersprungen']} unchanged "
+                f"({stats['module_neu']} new / {stats['module_aktualisiert']} updated modules, "
+                f"{stats['seiten']} page ranges, {stats['dauer']}s)"
+            )
+            for fehler in stats['fehler']:
+                print(f"[ERROR] {fehler}")
+    
     @app.cli.command()
     def routes():
         """Show all registered routes"""
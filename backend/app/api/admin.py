@@ -7,9 +7,8 @@ Administrative Funktionen für Dekan:
 """
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from app.extensions import db
-from app.models.user import Benutzer
 from app.models.planung import Semesterplanung, GeplantesModul, WunschFreierTag
 from app.models.planungsphase import Planungsphase, ArchiviertePlanung
 from app.models.semester import Semester
@@ -22,6 +21,7 @@ from app.models.deputat import (
     DeputatsBetreuung
 )
 from app.models.auftrag import SemesterAuftrag
+from app.utils.cache_utils import invalidate_semesterplanung_caches, invalidate_semester_caches
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,8 +31,7 @@ admin_api = Blueprint('admin_api', __name__, url_prefix='/api/admin')
 
 def check_dekan_role():
     """Prüft ob der aktuelle Benutzer Dekan ist"""
-    user_id = get_jwt_identity()
-    user = Benutzer.query.get(user_id)
+    user = current_user
     if not user:
         return False, jsonify({'success': False, 'error': 'Benutzer nicht gefunden'}), 404
     if not user.rolle or user.rolle.name != 'dekan':
@@ -131,6 +130,10 @@ def reset_database():
 
         db.session.commit()
 
+        # Bulk-DELETEs lösen keine ORM-Events aus
+        invalidate_semesterplanung_caches()
+        invalidate_semester_caches()
+
         logger.warning(f"[ADMIN] DATABASE RESET completed successfully")
 
         return jsonify({
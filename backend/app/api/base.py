@@ -6,16 +6,22 @@ Foundation für alle API Endpoints.
 Provides:
 - Response Formatting
 - Error Handling
-- Decorators (authentication, authorization)
+- Decorators (authentication, authorization, conditional GET)
 - Pagination Helper
 - Request Validation
 """
 
+import hashlib
+from datetime import date, datetime, timezone
 from functools import wraps
-from flask import jsonify, request, current_app
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask import jsonify, request, current_app, make_response
+from flask_jwt_extended import verify_jwt_in_request, get_current_user as get_jwt_user
 from typing import Optional, Dict, Any, Callable, List, Tuple
+from werkzeug.http import is_resource_modified
 from app.models import Benutzer
+from app.utils.principal_cache import BenutzerPrincipal
+from app.utils.cache_utils import get_tag_versionen
+from app.utils.db_routing import replica_router
 
 
 # =========================================================================
@@ -144,6 +150,24 @@ class ApiResponse:
 
         return jsonify(response), 500
 
+    @staticmethod
+    def not_modified(etag: str, last_modified: datetime = None):
+        """
+        304 Not Modified (ohne Body)
+
+        Args:
+            etag: ETag (ohne Anführungszeichen, wird als weak gesetzt)
+            last_modified: Optional - Last-Modified Zeitpunkt
+
+        Returns:
+            Flask Response mit Status 304
+        """
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        if last_modified:
+            response.last_modified = last_modified
+        return response
+
     @staticmethod
     def paginated(
         items: List[Any],
@@ -238,8 +262,8 @@ def role_required(*allowed_roles: str):
         def wrapper(*args, **kwargs):
             try:
                 verify_jwt_in_request()
-                user_id = get_jwt_identity()
-                user = Benutzer.query.get(user_id)
+                # Principal aus user_lookup_callback (Principal-Cache, keine Query)
+                user = get_jwt_user()
                 
                 if not user:
                     return ApiResponse.error(
@@ -271,12 +295,76 @@ def role_required(*allowed_roles: str):
     return decorator
 
 
-def get_current_user() -> Optional[Benutzer]:
+def conditional_get(*tags: str, tagesabhaengig: bool = False):
+    """
+    Decorator: Conditional GET über ETag / Last-Modified
+
+    Die Validatoren werden aus den Versions-Zählern der Cache-Tags
+    gebildet (get_tag_versionen), die bei jeder Invalidierung steigen.
+    Passt If-None-Match bzw. If-Modified-Since, antwortet der Decorator
+    mit 304, bevor Response-Cache oder Datenbank gefragt werden. Sonst
+    liest der Request vom Primary (ETag und Body auf demselben Stand).
+
+    Nur für Endpoints, deren Antwort nicht vom User abhängt. Muss unter
+    @jwt_required/@login_required stehen (304 nur nach Authentifizierung).
+
+    Args:
+        *tags: Tags aus CACHE_TAG_RULES, von denen die Antwort abhängt
+        tagesabhaengig: Antwort enthält vom heutigen Datum abhängige Felder
+                        (z.B. Semester.ist_laufend): Datum geht in den ETag
+                        ein, Last-Modified ist mindestens Mitternacht
+
+    Usage:
+        @modul_api.route('/', methods=['GET'])
+        @jwt_required()
+        @conditional_get('modul', 'dozent', 'lehrform')
+        @cache.cached(timeout=300, query_string=True)
+        def get_alle_module():
+            ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                versionen = get_tag_versionen(tags)
+            except Exception as e:
+                current_app.logger.warning(f"[ETag] Versions-Zähler nicht verfügbar: {e}")
+                return fn(*args, **kwargs)
+
+            schluessel = request.full_path + '|' + '|'.join(
+                f'{tag}:{versionen[tag]}' for tag in sorted(versionen)
+            )
+            last_modified = datetime.fromtimestamp(max(versionen.values()) / 1000, tz=timezone.utc)
+            if tagesabhaengig:
+                heute = date.today()
+                schluessel += f'|{heute.isoformat()}'
+                mitternacht = datetime.combine(heute, datetime.min.time()).astimezone(timezone.utc)
+                last_modified = max(last_modified, mitternacht)
+            etag = hashlib.sha1(schluessel.encode()).hexdigest()[:24]
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                return ApiResponse.not_modified(etag, last_modified)
+
+            # Body vom Primary: von einer nachlaufenden Replica gelesen, bekäme
+            # ein alter Stand den neuen ETag und bliebe bis zur nächsten
+            # Änderung per 304 beim Client
+            replica_router.request_auf_primary('etag')
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+
+def get_current_user() -> Optional[BenutzerPrincipal]:
     """
     Holt aktuellen eingeloggten User
 
     Returns:
-        Benutzer oder None
+        BenutzerPrincipal (verhält sich wie Benutzer, lädt ihn bei
+        Bedarf nach) oder None
 
     Usage:
         user = get_current_user()
@@ -285,8 +373,7 @@ def get_current_user() -> Optional[Benutzer]:
     """
     try:
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        return Benutzer.query.get(user_id)
+        return get_jwt_user()
     except Exception:
         return None
 
@@ -10,22 +10,26 @@ Endpoints:
     GET /api/dashboard/statistik                - Gesamt-Statistiken
     GET /api/dashboard/statistik/phasen         - Phasen-Statistiken
     GET /api/dashboard/notifications            - Benachrichtigungen
+    GET /api/dashboard/notifications/ungelesen  - Ungelesen-Zähler (Polling mit ETag)
     GET /api/dashboard/nicht-zugeordnete-module - Nicht zugeordnete Module
     GET /api/dashboard/dozenten-planungsfortschritt - Planungsfortschritt
     GET /api/dashboard/modulhandbuecher         - Modulhandbücher-Übersicht
 """
 
-from flask import Blueprint, request, current_app
+from flask import Blueprint, request, current_app, make_response
+from collections import Counter
+from werkzeug.http import is_resource_modified
 from datetime import datetime
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, noload, selectinload
 from sqlalchemy import func
-from app.extensions import db, cache
+from app.extensions import db, cache, limiter
 from app.api.base import (
     ApiResponse,
     login_required,
     role_required,
     get_current_user,
-    get_pagination_params
+    get_pagination_params,
+    conditional_get
 )
 from app.services import (
     semester_service,
@@ -33,10 +37,10 @@ from app.services import (
     user_service,
     modul_service,
     dozent_service,
-    notification_service
+    notification_service,
+    modulhandbuch_service
 )
-from app.models.modul import Modul, ModulDozent, ModulStudiengang
-from app.models.studiengang import Studiengang
+from app.models.modul import Modul, ModulDozent
 
 # Blueprint
 dashboard_api = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
@@ -501,6 +505,48 @@ def get_notifications():
         )
 
 
+@dashboard_api.route('/notifications/ungelesen', methods=['GET'])
+@limiter.limit("10 per minute")  # Polling (mehrere Tabs), statt 200/h Default
+@login_required
+def get_ungelesen_stand():
+    """
+    GET /api/dashboard/notifications/ungelesen
+
+    Ungelesen-Zähler für kurzes Polling. Der ETag ist die seq des Zählers:
+    mit If-None-Match antwortet der Endpoint ohne DB-Zugriff mit 304,
+    solange sich nichts geändert hat. Ersetzt das Polling des kompletten
+    Dashboards und hält keinen Worker fest.
+
+    Returns:
+        200: {'ungelesen': int, 'seq': int, 'poll_sekunden': int}
+        304: Zähler unverändert
+    """
+    try:
+        user = get_current_user()
+        seq, ungelesen = notification_service.get_ungelesen_stand(user.id)
+
+        etag = f'ungelesen-{user.id}-{seq}'
+        if not is_resource_modified(request.environ, etag=etag):
+            response = ApiResponse.not_modified(etag)
+        else:
+            response = make_response(ApiResponse.success(data={
+                'ungelesen': ungelesen,
+                'seq': seq,
+                'poll_sekunden': current_app.config.get('NOTIFICATION_POLL_SECONDS', 30)
+            }))
+            response.set_etag(etag, weak=True)
+        # Benutzerspezifisch: keine geteilten Caches, immer revalidieren
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return ApiResponse.error(
+            message='Fehler beim Laden der Benachrichtigungen',
+            errors=[str(e)],
+            status_code=500
+        )
+
+
 @dashboard_api.route('/notifications/<int:notification_id>/gelesen', methods=['POST'])
 @login_required
 def markiere_gelesen(notification_id: int):
@@ -568,6 +614,7 @@ def markiere_alle_gelesen():
 
 @dashboard_api.route('/nicht-zugeordnete-module', methods=['GET'])
 @login_required
+@conditional_get('modul', 'dozent', 'lehrform', 'semester', 'semesterplanung', 'geplante_module', tagesabhaengig=True)
 def get_nicht_zugeordnete_module():
     """
     GET /api/dashboard/nicht-zugeordnete-module
@@ -593,10 +640,6 @@ def get_nicht_zugeordnete_module():
     try:
         from app.models.semester import Semester
         from app.models.planungsphase import Planungsphase
-        from app.models.modul import Modul
-        from app.models.planung import GeplantesModul
-        from sqlalchemy import and_, or_
-
         # Semester bestimmen
         semester_id = request.args.get('semester_id', type=int)
         po_id = request.args.get('po_id', type=int)
@@ -668,10 +711,8 @@ def get_nicht_zugeordnete_module():
                 }
             )
 
-        # Query: Alle Module des relevanten Turnus mit Eager Loading
-        modul_query = Modul.query.options(
-            joinedload(Modul.dozent_zuordnungen).joinedload(ModulDozent.dozent)
-        )
+        # Basis-Query: Alle Module des relevanten Turnus
+        modul_query = Modul.query
 
         if po_id:
             modul_query = modul_query.filter_by(po_id=po_id)
@@ -679,120 +720,65 @@ def get_nicht_zugeordnete_module():
         if relevante_turnus:
             modul_query = modul_query.filter(Modul.turnus.in_(relevante_turnus))
 
-        alle_module = modul_query.all()
+        anzahl_alle_module = modul_query.order_by(None).count()
 
-        # Hole alle bereits geplanten Modul-IDs
-        geplante_modul_ids = []
-
-        if aktive_phase:
-            # Aktive Planungsphase vorhanden - hole geplante Module dieser Phase
-            from app.models.planung import Semesterplanung
-            geplante_modul_ids = db.session.query(GeplantesModul.modul_id).join(
-                Semesterplanung,
-                GeplantesModul.semesterplanung_id == Semesterplanung.id
-            ).filter(
-                Semesterplanung.planungsphase_id == aktive_phase.id
-            ).distinct().all()
+        # Geplante Module: Phase der aktiven Planungsphase, ohne Phase und
+        # ohne Semester-Filter ("Alle") über alle Phasen, sonst keine
+        if aktive_phase or not semester_id:
+            phase_id = aktive_phase.id if aktive_phase else None
+            geplante_modul_ids = planung_service.get_geplante_modul_ids(phase_id)
+            modul_query = modul_query.filter(planung_service.nicht_geplant_filter(phase_id))
+        else:
+            geplante_modul_ids = frozenset()
 
-            geplante_modul_ids = [m[0] for m in geplante_modul_ids]
-        elif not aktive_phase and not semester_id:
-            # Keine aktive Phase UND kein spezifisches Semester: "Alle" Filter
-            geplante_modul_ids = db.session.query(GeplantesModul.modul_id).distinct().all()
-            geplante_modul_ids = [m[0] for m in geplante_modul_ids]
+        # Nicht zugeordnete Module per NOT EXISTS, Dozenten/Lehrformen gebatcht
+        nicht_geplante_module = modul_query.options(
+            selectinload(Modul.dozent_zuordnungen).joinedload(ModulDozent.dozent),
+            selectinload(Modul.lehrformen),
+            noload(Modul.studiengang_zuordnungen)
+        ).all()
 
-        # Filter: Nicht zugeordnete Module
         nicht_zugeordnete = []
         statistik_nach_turnus = {}
 
-        # PERFORMANCE FIX: Prefetch alle Planungen mit Benutzer-Daten VOR dem Loop
-        modul_planungen_map = {}  # modul_id -> [planungen_data]
-        if aktive_phase:
-            from app.models.planung import Semesterplanung
-            from app.models.user import Benutzer
-
-            # Hole alle Planungen für alle Module in einem Query (mit Benutzer-Join)
-            # Benutzer hat kein 'titel' Feld - nur vorname und nachname
-            alle_planungen = db.session.query(
-                GeplantesModul.modul_id,
-                Semesterplanung.id.label('planung_id'),
-                Semesterplanung.status,
-                Semesterplanung.eingereicht_am,
-                Semesterplanung.benutzer_id,
-                Benutzer.vorname,
-                Benutzer.nachname
-            ).join(
-                Semesterplanung,
-                GeplantesModul.semesterplanung_id == Semesterplanung.id
-            ).join(
-                Benutzer,
-                Semesterplanung.benutzer_id == Benutzer.id
-            ).filter(
-                Semesterplanung.planungsphase_id == aktive_phase.id
-            ).all()
-
-            # Gruppiere nach modul_id
-            for p in alle_planungen:
-                if p.modul_id not in modul_planungen_map:
-                    modul_planungen_map[p.modul_id] = []
-
-                # Name zusammenbauen
-                name_teile = []
-                if p.vorname:
-                    name_teile.append(p.vorname)
-                if p.nachname:
-                    name_teile.append(p.nachname)
-                dozent_name = ' '.join(name_teile) if name_teile else 'Unbekannt'
-
-                modul_planungen_map[p.modul_id].append({
-                    'hat_planung': True,
-                    'planung_id': p.planung_id,
-                    'dozent_id': p.benutzer_id,
-                    'dozent_name': dozent_name,
-                    'status': p.status,
-                    'eingereicht_am': p.eingereicht_am.isoformat() if p.eingereicht_am else None
-                })
-
-        for modul in alle_module:
-            if modul.id not in geplante_modul_ids:
-                # Hole Verantwortlichen Dozenten (nutzt eager-loaded dozent_zuordnungen)
-                verantwortliche = modul.get_verantwortliche()
-                verantwortlicher_data = None
-                if verantwortliche:
-                    v = verantwortliche[0]  # Erster Verantwortlicher
-                    verantwortlicher_data = {
-                        'dozent_id': v.id,
-                        'name': v.name_komplett,
-                        'email': v.email
-                    }
+        for modul in nicht_geplante_module:
+            # Hole Verantwortlichen Dozenten (nutzt eager-loaded dozent_zuordnungen)
+            verantwortliche = modul.get_verantwortliche()
+            verantwortlicher_data = None
+            if verantwortliche:
+                v = verantwortliche[0]  # Erster Verantwortlicher
+                verantwortlicher_data = {
+                    'dozent_id': v.id,
+                    'name': v.name_komplett,
+                    'email': v.email
+                }
+
+            # Hole alle Lehrpersonen (nutzt eager-loaded dozent_zuordnungen)
+            lehrpersonen = modul.get_lehrpersonen()
+            lehrpersonen_data = [{
+                'dozent_id': lp.id,
+                'name': lp.name_komplett,
+                'email': lp.email
+            } for lp in lehrpersonen]
+
+            nicht_zugeordnete.append({
+                'id': modul.id,
+                'kuerzel': modul.kuerzel,
+                'bezeichnung_de': modul.bezeichnung_de,
+                'bezeichnung_en': modul.bezeichnung_en,
+                'leistungspunkte': modul.leistungspunkte,
+                'turnus': modul.turnus,
+                'sws_gesamt': modul.get_sws_gesamt(),
+                'po_id': modul.po_id,
+                'verantwortlicher': verantwortlicher_data,
+                'lehrpersonen': lehrpersonen_data,
+                # Nicht geplante Module haben in der Phase keine Planungen
+                'planungen': []
+            })
 
-                # Hole alle Lehrpersonen (nutzt eager-loaded dozent_zuordnungen)
-                lehrpersonen = modul.get_lehrpersonen()
-                lehrpersonen_data = [{
-                    'dozent_id': lp.id,
-                    'name': lp.name_komplett,
-                    'email': lp.email
-                } for lp in lehrpersonen]
-
-                # PERFORMANCE FIX: Nutze prefetched Planungen statt Query im Loop
-                planungen_data = modul_planungen_map.get(modul.id, [])
-
-                nicht_zugeordnete.append({
-                    'id': modul.id,
-                    'kuerzel': modul.kuerzel,
-                    'bezeichnung_de': modul.bezeichnung_de,
-                    'bezeichnung_en': modul.bezeichnung_en,
-                    'leistungspunkte': modul.leistungspunkte,
-                    'turnus': modul.turnus,
-                    'sws_gesamt': modul.get_sws_gesamt(),
-                    'po_id': modul.po_id,
-                    'verantwortlicher': verantwortlicher_data,
-                    'lehrpersonen': lehrpersonen_data,
-                    'planungen': planungen_data
-                })
-
-                # Statistik nach Turnus
-                turnus = modul.turnus or 'Unbekannt'
-                statistik_nach_turnus[turnus] = statistik_nach_turnus.get(turnus, 0) + 1
+            # Statistik nach Turnus
+            turnus = modul.turnus or 'Unbekannt'
+            statistik_nach_turnus[turnus] = statistik_nach_turnus.get(turnus, 0) + 1
 
         # Sortiere nach Kürzel
         nicht_zugeordnete.sort(key=lambda x: x['kuerzel'])
@@ -810,9 +796,9 @@ def get_nicht_zugeordnete_module():
             'statistik': {
                 'gesamt': len(nicht_zugeordnete),
                 'nach_turnus': statistik_nach_turnus,
-                'alle_module': len(alle_module),
+                'alle_module': anzahl_alle_module,
                 'geplante_module': len(geplante_modul_ids),
-                'zuordnungsquote': round((len(geplante_modul_ids) / len(alle_module) * 100), 2) if len(alle_module) > 0 else 0
+                'zuordnungsquote': round((len(geplante_modul_ids) / anzahl_alle_module * 100), 2) if anzahl_alle_module > 0 else 0
             }
         })
 
@@ -848,8 +834,6 @@ def get_dozenten_planungsfortschritt():
     try:
         from app.models.semester import Semester
         from app.models.planungsphase import Planungsphase
-        from app.models.planung import Semesterplanung, GeplantesModul
-        from app.models.dozent import Dozent
 
         semester_id = request.args.get('semester_id', type=int)
 
@@ -884,135 +868,20 @@ def get_dozenten_planungsfortschritt():
             ist_aktiv=True
         ).first()
 
-        # Hole alle Dozenten die Module verantworten
-        # Prüfe zuerst, welche Rollen existieren und passe Filter an
-        verantwortlicher_rolle = 'verantwortlicher'
-
-        # Fallback: Falls keine 'verantwortlicher' Einträge existieren,
-        # suche nach alternativen Bezeichnungen
-        if not db.session.query(ModulDozent.id).filter_by(rolle='verantwortlicher').first():
-            # Suche nach Alternativen (Modulverantwortlicher, etc.)
-            for alt_rolle in ['Modulverantwortlicher', 'modulverantwortlicher', 'Verantwortlicher', 'verantwortlich']:
-                if db.session.query(ModulDozent.id).filter_by(rolle=alt_rolle).first():
-                    verantwortlicher_rolle = alt_rolle
-                    current_app.logger.debug(f"Using alternative rolle: {verantwortlicher_rolle}")
-                    break
-
-        current_app.logger.debug(f"Searching for rolle: {verantwortlicher_rolle}")
-
-        dozenten_query = db.session.query(
-            Dozent.id,
-            Dozent.titel,
-            Dozent.vorname,
-            Dozent.nachname,
-            Dozent.email
-        ).join(
-            ModulDozent, ModulDozent.dozent_id == Dozent.id
-        ).filter(
-            ModulDozent.rolle == verantwortlicher_rolle,
-            Dozent.aktiv == True
-        ).distinct()
-
-        dozenten = dozenten_query.all()
-        current_app.logger.debug(f"Found {len(dozenten)} dozenten with rolle '{verantwortlicher_rolle}'")
-
-        # PERFORMANCE FIX: Prefetch alle Modul-Dozent-Zuordnungen VOR dem Loop
-        dozent_ids = [d.id for d in dozenten]
-
-        # Query: Alle Module aller Dozenten mit relevantem Turnus (1 Query statt N)
-        module_query = db.session.query(
-            ModulDozent.dozent_id,
-            Modul.id.label('modul_id'),
-            Modul.kuerzel,
-            Modul.bezeichnung_de
-        ).join(
-            Modul, ModulDozent.modul_id == Modul.id
-        ).filter(
-            ModulDozent.dozent_id.in_(dozent_ids),
-            ModulDozent.rolle == verantwortlicher_rolle
+        # Zählung + Status pro Dozent in SQL (Rollen sind beim Schreiben normalisiert)
+        result = dozent_service.get_planungsfortschritt(
+            aktive_phase.id if aktive_phase else None,
+            turnus=relevante_turnus
         )
 
-        if relevante_turnus:
-            module_query = module_query.filter(Modul.turnus.in_(relevante_turnus))
-
-        alle_module_zuordnungen = module_query.all()
-
-        # Gruppiere nach dozent_id: {dozent_id: [(modul_id, kuerzel, bezeichnung), ...]}
-        dozent_module_map = {}
-        for z in alle_module_zuordnungen:
-            if z.dozent_id not in dozent_module_map:
-                dozent_module_map[z.dozent_id] = []
-            dozent_module_map[z.dozent_id].append({
-                'id': z.modul_id,
-                'kuerzel': z.kuerzel,
-                'bezeichnung': z.bezeichnung_de
-            })
-
-        # PERFORMANCE FIX: Prefetch alle geplanten Module (1 Query statt N)
-        alle_geplanten_modul_ids = set()
-        if aktive_phase:
-            geplante_query = db.session.query(GeplantesModul.modul_id).join(
-                Semesterplanung,
-                GeplantesModul.semesterplanung_id == Semesterplanung.id
-            ).filter(
-                Semesterplanung.planungsphase_id == aktive_phase.id
-            ).distinct().all()
-
-            alle_geplanten_modul_ids = set(m[0] for m in geplante_query)
-
-        result = []
-
-        for dozent in dozenten:
-            # PERFORMANCE FIX: Nutze prefetched Daten statt Query
-            verantwortliche_module = dozent_module_map.get(dozent.id, [])
-            anzahl_zu_planen = len(verantwortliche_module)
-
-            if anzahl_zu_planen == 0:
-                continue  # Skip Dozenten ohne Module in diesem Semester
-
-            # PERFORMANCE FIX: Filter aus prefetched Set
-            geplante_modul_ids = set(
-                m['id'] for m in verantwortliche_module
-                if m['id'] in alle_geplanten_modul_ids
-            )
-
-            # Berechne nicht geplante Module
-            nicht_geplante_module = [
-                m for m in verantwortliche_module
-                if m['id'] not in geplante_modul_ids
-            ]
-
-            anzahl_geplant = len(geplante_modul_ids)
-            prozent = round((anzahl_geplant / anzahl_zu_planen) * 100, 1) if anzahl_zu_planen > 0 else 0
-
-            # Name zusammenbauen
-            name_teile = []
-            if dozent.titel:
-                name_teile.append(dozent.titel)
-            if dozent.vorname:
-                name_teile.append(dozent.vorname)
-            name_teile.append(dozent.nachname)
-            name_komplett = ' '.join(name_teile)
-
-            result.append({
-                'dozent_id': dozent.id,
-                'name': name_komplett,
-                'email': dozent.email,
-                'anzahl_zu_planen': anzahl_zu_planen,
-                'anzahl_geplant': anzahl_geplant,
-                'anzahl_offen': anzahl_zu_planen - anzahl_geplant,
-                'prozent_geplant': prozent,
-                'status': 'vollständig' if prozent == 100 else 'teilweise' if prozent > 0 else 'offen',
-                'nicht_geplante_module': nicht_geplante_module
-            })
-
         # Sortiere: Erst nach Prozent (aufsteigend), dann nach Name
         result.sort(key=lambda x: (x['prozent_geplant'], x['name']))
 
         # Statistik
-        vollstaendig = len([d for d in result if d['status'] == 'vollständig'])
-        teilweise = len([d for d in result if d['status'] == 'teilweise'])
-        offen = len([d for d in result if d['status'] == 'offen'])
+        status_anzahl = Counter(d['status'] for d in result)
+        vollstaendig = status_anzahl['vollständig']
+        teilweise = status_anzahl['teilweise']
+        offen = status_anzahl['offen']
 
         return ApiResponse.success(data={
             'semester': semester.to_dict(),
@@ -1042,172 +911,21 @@ def get_dozenten_planungsfortschritt():
 
 @dashboard_api.route('/modulhandbuecher', methods=['GET'])
 @login_required
-@cache.cached(timeout=300, query_string=True)  # 5 Minuten Cache
+@conditional_get('modul', 'dozent', 'lehrform', 'studiengang', 'modulhandbuch')
 def get_modulhandbuecher():
     """
     GET /api/dashboard/modulhandbuecher
 
     Holt alle Module gruppiert nach Studiengang für Modulhandbücher-Übersicht.
 
+    Die Übersicht wird als Snapshot vorgehalten und bei Änderungen an
+    Modulen/Zuordnungen inkrementell aktualisiert (siehe ModulhandbuchService).
+
     Returns:
         200: Studiengänge mit Modulen und Statistiken
     """
     try:
-        # Hole alle aktiven Studiengänge mit Eager Loading
-        studiengaenge = Studiengang.query.filter_by(aktiv=True).order_by(
-            Studiengang.kuerzel
-        ).all()
-
-        # Hole alle Module mit ihren Zuordnungen (optimiert mit Joins)
-        alle_module = Modul.query.options(
-            joinedload(Modul.studiengang_zuordnungen).joinedload(ModulStudiengang.studiengang),
-            joinedload(Modul.dozent_zuordnungen).joinedload(ModulDozent.dozent)
-        ).all()
-
-        # Sammle Module die keinem Studiengang zugeordnet sind
-        zugeordnete_modul_ids = set()
-
-        # Baue Studiengang-Daten
-        studiengaenge_data = []
-
-        for sg in studiengaenge:
-            # Hole Module für diesen Studiengang
-            modul_zuordnungen = ModulStudiengang.query.filter_by(
-                studiengang_id=sg.id
-            ).all()
-
-            module_data = []
-            kategorien = {}
-            ects_summe = 0
-            turnus_verteilung = {}
-            semester_verteilung = {}
-
-            for mz in modul_zuordnungen:
-                modul = mz.modul
-                zugeordnete_modul_ids.add(modul.id)
-
-                # Verantwortlicher
-                verantwortlicher = None
-                lehrpersonen = []
-                for dz in modul.dozent_zuordnungen:
-                    if dz.rolle == 'verantwortlicher' and dz.dozent:
-                        verantwortlicher = dz.dozent.name_komplett
-                    elif dz.rolle == 'lehrperson' and dz.dozent:
-                        lehrpersonen.append(dz.dozent.name_komplett)
-
-                # Kategorie aus pflicht/wahlpflicht ableiten
-                if mz.pflicht:
-                    kategorie = 'pflicht'
-                elif mz.wahlpflicht:
-                    kategorie = 'wahlpflicht'
-                else:
-                    kategorie = 'unbekannt'
-
-                module_data.append({
-                    'id': modul.id,
-                    'kuerzel': modul.kuerzel,
-                    'bezeichnung_de': modul.bezeichnung_de,
-                    'bezeichnung_en': modul.bezeichnung_en,
-                    'leistungspunkte': modul.leistungspunkte,
-                    'turnus': modul.turnus,
-                    'sws_gesamt': modul.get_sws_gesamt() if hasattr(modul, 'get_sws_gesamt') else 0,
-                    'semester': mz.semester,
-                    'kategorie': kategorie,
-                    'pflicht': mz.pflicht,
-                    'wahlpflicht': mz.wahlpflicht,
-                    'verantwortlicher': verantwortlicher,
-                    'lehrpersonen': lehrpersonen
-                })
-
-                # Statistiken sammeln
-                if modul.leistungspunkte:
-                    ects_summe += modul.leistungspunkte
-
-                kategorien[kategorie] = kategorien.get(kategorie, 0) + 1
-
-                # Turnus normalisieren für Frontend-Kompatibilität
-                turnus_raw = (modul.turnus or '').lower()
-                if 'wintersemester' in turnus_raw and 'sommersemester' in turnus_raw:
-                    turnus_key = 'jedes_semester'
-                elif 'jedes semester' in turnus_raw:
-                    turnus_key = 'jedes_semester'
-                elif 'wintersemester' in turnus_raw or 'winter' in turnus_raw:
-                    turnus_key = 'wintersemester'
-                elif 'sommersemester' in turnus_raw or 'sommer' in turnus_raw:
-                    turnus_key = 'sommersemester'
-                elif turnus_raw:
-                    turnus_key = 'sonstige'
-                else:
-                    turnus_key = 'unbekannt'
-                turnus_verteilung[turnus_key] = turnus_verteilung.get(turnus_key, 0) + 1
-
-                if mz.semester:
-                    sem_key = str(mz.semester)
-                    semester_verteilung[sem_key] = semester_verteilung.get(sem_key, 0) + 1
-
-            # Sortiere Module nach Semester und Kürzel
-            module_data.sort(key=lambda x: (x['semester'] or 99, x['kuerzel']))
-
-            studiengaenge_data.append({
-                'id': sg.id,
-                'kuerzel': sg.kuerzel,
-                'bezeichnung': sg.bezeichnung,
-                'abschluss': sg.abschluss,
-                'fachbereich': sg.fachbereich,
-                'regelstudienzeit': sg.regelstudienzeit,
-                'ects_gesamt': sg.ects_gesamt,
-                'module': module_data,
-                'statistik': {
-                    'anzahl_module': len(module_data),
-                    'kategorien': kategorien,
-                    'ects_summe': ects_summe,
-                    'turnus_verteilung': turnus_verteilung,
-                    'semester_verteilung': semester_verteilung
-                }
-            })
-
-        # Nicht zugeordnete Module
-        nicht_zugeordnet_data = []
-        for modul in alle_module:
-            if modul.id not in zugeordnete_modul_ids:
-                verantwortlicher = None
-                lehrpersonen = []
-                for dz in modul.dozent_zuordnungen:
-                    if dz.rolle == 'verantwortlicher' and dz.dozent:
-                        verantwortlicher = dz.dozent.name_komplett
-                    elif dz.rolle == 'lehrperson' and dz.dozent:
-                        lehrpersonen.append(dz.dozent.name_komplett)
-
-                nicht_zugeordnet_data.append({
-                    'id': modul.id,
-                    'kuerzel': modul.kuerzel,
-                    'bezeichnung_de': modul.bezeichnung_de,
-                    'bezeichnung_en': modul.bezeichnung_en,
-                    'leistungspunkte': modul.leistungspunkte,
-                    'turnus': modul.turnus,
-                    'sws_gesamt': modul.get_sws_gesamt() if hasattr(modul, 'get_sws_gesamt') else 0,
-                    'semester': None,
-                    'kategorie': 'unbekannt',  # Keine Studiengang-Zuordnung
-                    'verantwortlicher': verantwortlicher,
-                    'lehrpersonen': lehrpersonen
-                })
-
-        # Sortiere nach Kürzel
-        nicht_zugeordnet_data.sort(key=lambda x: x['kuerzel'])
-
-        return ApiResponse.success(data={
-            'studiengaenge': studiengaenge_data,
-            'nicht_zugeordnet': {
-                'module': nicht_zugeordnet_data,
-                'anzahl': len(nicht_zugeordnet_data)
-            },
-            'gesamt_statistik': {
-                'alle_module': len(alle_module),
-                'zugeordnet': len(zugeordnete_modul_ids),
-                'nicht_zugeordnet': len(nicht_zugeordnet_data),
-                'studiengaenge': len(studiengaenge)
-            }
-        })
+        return ApiResponse.success(data=modulhandbuch_service.get_uebersicht())
 
     except Exception as e:
         current_app.logger.exception("Error in get_modulhandbuecher")
@@ -30,12 +30,19 @@ Endpoints:
 - PUT /api/deputat/<id>/zuruecksetzen - Zurücksetzen
 
 - GET /api/deputat/statistik - Statistiken (Dekan)
+
+- GET /api/deputat/<id>/pdf - PDF Export (gespeichertes PDF wird wiederverwendet)
+- POST /api/deputat/<id>/pdf/jobs - PDF-Job einreichen (asynchron)
+- GET /api/deputat/pdf/jobs/<job_id> - Status eines PDF-/ZIP-Jobs
+- GET /api/deputat/pdf/jobs/<job_id>/download - PDF bzw. ZIP eines fertigen Jobs
+- POST /api/deputat/planungsphase/<id>/pdf/jobs - ZIP-Job: alle PDFs einer Phase (Dekan)
 """
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from datetime import datetime
 from app.services.deputat_service import deputat_service
+from app.services import deputat_pdf_service
 from app.extensions import db
 from app.api.base import ApiResponse
 
@@ -166,10 +173,11 @@ def get_meine_abrechnungen():
             benutzer_id=current_user.id,
             planungsphase_id=planungsphase_id
         )
+        summen = deputat_service.berechne_summen_batch(abrechnungen)
 
         return jsonify({
             'success': True,
-            'data': [a.to_dict(include_summen=True) for a in abrechnungen],
+            'data': [a.to_dict(include_summen=True, summen=summen[a.id]) for a in abrechnungen],
             'message': f'{len(abrechnungen)} Abrechnungen gefunden'
         }), 200
 
@@ -201,16 +209,14 @@ def get_alle_abrechnungen():
                 status=status
             )
         else:
-            # Alle Abrechnungen
-            from app.models import Deputatsabrechnung
-            query = Deputatsabrechnung.query
-            if status:
-                query = query.filter_by(status=status)
-            abrechnungen = query.order_by(Deputatsabrechnung.updated_at.desc()).all()
+            abrechnungen = deputat_service.get_alle_abrechnungen(status=status)
+
+        # Summen mengenbasiert statt fünf Relationships pro Abrechnung
+        summen = deputat_service.berechne_summen_batch(abrechnungen)
 
         return jsonify({
             'success': True,
-            'data': [a.to_dict(include_summen=True) for a in abrechnungen],
+            'data': [a.to_dict(include_summen=True, summen=summen[a.id]) for a in abrechnungen],
             'message': f'{len(abrechnungen)} Abrechnungen gefunden'
         }), 200
 
@@ -1442,20 +1448,14 @@ def export_pdf(abrechnung_id):
                 'message': 'Keine Berechtigung'
             }), 403
 
-        # Generate PDF
-        pdf_bytes = deputat_service.generate_pdf(abrechnung_id)
-
-        # Create filename
-        benutzer_name = abrechnung.benutzer.username if abrechnung.benutzer else 'unbekannt'
-        phase_name = abrechnung.planungsphase.name if abrechnung.planungsphase else 'unbekannt'
-        # Clean filename
-        safe_name = f"Deputatsabrechnung_{benutzer_name}_{phase_name}".replace(' ', '_').replace('/', '-')
+        # Gespeichertes PDF wiederverwenden, solange die Abrechnung unverändert ist
+        pdf_bytes = deputat_pdf_service.get_or_generate_pdf(abrechnung)
 
         return Response(
             pdf_bytes,
             mimetype='application/pdf',
             headers={
-                'Content-Disposition': f'attachment; filename="{safe_name}.pdf"',
+                'Content-Disposition': f'attachment; filename="{deputat_pdf_service.dateiname(abrechnung)}"',
                 'Content-Type': 'application/pdf'
             }
         )
@@ -1484,3 +1484,181 @@ def export_pdf(abrechnung_id):
             'success': False,
             'message': f'Fehler beim PDF-Export: {str(e)}'
         }), 500
+
+
+@deputat_api.route('/<int:abrechnung_id>/pdf/jobs', methods=['POST'])
+@jwt_required()
+def submit_pdf_job(abrechnung_id):
+    """
+    POST /api/deputat/<id>/pdf/jobs - PDF-Job einreichen
+
+    Rendert das PDF in einem Hintergrund-Prozess. Ist das PDF für den
+    aktuellen Stand der Abrechnung bereits vorhanden, ist der Job sofort fertig.
+
+    Returns:
+        200: Job fertig (PDF vorhanden)
+        202: Job eingereicht/läuft
+    """
+    try:
+        abrechnung = deputat_service.get_by_id(abrechnung_id)
+        if not abrechnung:
+            return ApiResponse.error(message='Abrechnung nicht gefunden', status_code=404)
+
+        if not kann_abrechnung_zugreifen(abrechnung):
+            return ApiResponse.error(message='Keine Berechtigung', status_code=403)
+
+        job = deputat_pdf_service.submit(abrechnung)
+        status_code = 200 if job['status'] == 'fertig' else 202
+
+        return ApiResponse.success(
+            data=job,
+            message='PDF-Job eingereicht',
+            status_code=status_code
+        )
+
+    except Exception as e:
+        return ApiResponse.internal_error(
+            message='Fehler beim Einreichen des PDF-Jobs',
+            exception=e,
+            log_context='DeputatAPI'
+        )
+
+
+def _get_job_mit_berechtigung(job_id):
+    """
+    Lädt Job + Abrechnung (ZIP-Job: Planungsphase) und prüft den Zugriff
+    (job, objekt, fehler_response)
+    """
+    from app.models import Planungsphase
+
+    job = deputat_pdf_service.get_job(job_id)
+    if not job:
+        return None, None, ApiResponse.error(message='PDF-Job nicht gefunden', status_code=404)
+
+    if job.get('art') == 'zip':
+        if not require_dekan():
+            return None, None, ApiResponse.error(message='Keine Berechtigung', status_code=403)
+        planungsphase = db.session.get(Planungsphase, job['planungsphase_id'])
+        if not planungsphase:
+            return None, None, ApiResponse.error(message='Planungsphase nicht gefunden', status_code=404)
+        return job, planungsphase, None
+
+    abrechnung = deputat_service.get_by_id(job['abrechnung_id'])
+    if not abrechnung:
+        return None, None, ApiResponse.error(message='Abrechnung nicht gefunden', status_code=404)
+
+    if not kann_abrechnung_zugreifen(abrechnung):
+        return None, None, ApiResponse.error(message='Keine Berechtigung', status_code=403)
+
+    return job, abrechnung, None
+
+
+@deputat_api.route('/pdf/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_pdf_job(job_id):
+    """GET /api/deputat/pdf/jobs/<job_id> - Status eines PDF-/ZIP-Jobs"""
+    try:
+        job, _, error = _get_job_mit_berechtigung(job_id)
+        if error:
+            return error
+
+        return ApiResponse.success(data=job)
+
+    except Exception as e:
+        return ApiResponse.internal_error(
+            message='Fehler beim Laden des PDF-Jobs',
+            exception=e,
+            log_context='DeputatAPI'
+        )
+
+
+@deputat_api.route('/pdf/jobs/<job_id>/download', methods=['GET'])
+@jwt_required()
+def download_pdf_job(job_id):
+    """GET /api/deputat/pdf/jobs/<job_id>/download - PDF bzw. ZIP eines fertigen Jobs"""
+    from flask import send_file
+
+    try:
+        job, objekt, error = _get_job_mit_berechtigung(job_id)
+        if error:
+            return error
+
+        path = deputat_pdf_service.get_job_datei(job)
+        if not path:
+            return ApiResponse.error(
+                message=f"Datei noch nicht verfügbar (Status: {job['status']})",
+                status_code=409
+            )
+
+        if job.get('art') == 'zip':
+            safe_name = f"Deputatsabrechnungen_{objekt.name}".replace(' ', '_').replace('/', '-')
+            return send_file(
+                path,
+                mimetype='application/zip',
+                as_attachment=True,
+                download_name=f'{safe_name}.zip'
+            )
+
+        return send_file(
+            path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=deputat_pdf_service.dateiname(objekt)
+        )
+
+    except Exception as e:
+        return ApiResponse.internal_error(
+            message='Fehler beim PDF-Download',
+            exception=e,
+            log_context='DeputatAPI'
+        )
+
+
+@deputat_api.route('/planungsphase/<int:planungsphase_id>/pdf/jobs', methods=['POST'])
+@jwt_required()
+def submit_phase_zip_job(planungsphase_id):
+    """
+    POST /api/deputat/planungsphase/<id>/pdf/jobs - ZIP aller PDFs einer Phase (Dekan)
+
+    Der ZIP wird als Job im Hintergrund gebaut (fehlende PDFs inklusive).
+    Status und Download über /api/deputat/pdf/jobs/<job_id>.
+
+    Query Parameters:
+        status: Optional - nur Abrechnungen mit diesem Status
+
+    Returns:
+        200: ZIP fertig
+        202: Job eingereicht/läuft
+    """
+    from app.models import Deputatsabrechnung, Planungsphase
+
+    try:
+        if not require_dekan():
+            return ApiResponse.error(message='Keine Berechtigung', status_code=403)
+
+        planungsphase = db.session.get(Planungsphase, planungsphase_id)
+        if not planungsphase:
+            return ApiResponse.error(message='Planungsphase nicht gefunden', status_code=404)
+
+        status = request.args.get('status')
+        abrechnungen = Deputatsabrechnung.query.filter_by(planungsphase_id=planungsphase_id)
+        if status:
+            abrechnungen = abrechnungen.filter_by(status=status)
+        if not db.session.query(abrechnungen.exists()).scalar():
+            return ApiResponse.error(message='Keine Abrechnungen in dieser Planungsphase', status_code=404)
+
+        job = deputat_pdf_service.submit_phase_zip(planungsphase_id, status=status)
+        status_code = 200 if job['status'] == 'fertig' else 202
+
+        return ApiResponse.success(
+            data=job,
+            message='ZIP-Job eingereicht',
+            status_code=status_code
+        )
+
+    except Exception as e:
+        return ApiResponse.internal_error(
+            message='Fehler beim ZIP-Export',
+            exception=e,
+            log_context='DeputatAPI'
+        )
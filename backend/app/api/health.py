@@ -6,17 +6,24 @@ Health & Readiness Endpoints für Load Balancer und Monitoring
 Endpoints:
 - GET /health     - Health Check (DB Connection)
 - GET /ready      - Readiness Check
-- GET /metrics    - System Metrics (Optional)
+- GET /metrics    - Prometheus Metrics (Text Format, ?format=json für Snapshot)
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, request
 from datetime import datetime
 from app.extensions import db
 from sqlalchemy import text
 from app.api.base import ApiResponse
-import psutil
+from app.utils.metrics import metrics as metrics_registry
+from app.utils.query_profiler import query_profiler
+from app.utils.db_routing import replica_router
 import os
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 health_api = Blueprint('health', __name__)
 
 
@@ -60,7 +67,9 @@ def health_check():
 
     # Check Database Connection
     try:
-        db.session.execute(text('SELECT 1'))
+        # Primary prüfen (Replicas haben eine eigene Lag-Prüfung mit Fallback)
+        with replica_router.primary():
+            db.session.execute(text('SELECT 1'))
         checks['database'] = 'connected'
     except Exception as e:
         checks['status'] = 'unhealthy'
@@ -114,12 +123,18 @@ def readiness_check():
 @health_api.route('/metrics', methods=['GET'])
 def metrics():
     """
-    System Metrics Endpoint
-    =======================
-    Liefert System-Metriken für Monitoring.
+    Metrics Endpoint
+    ================
+    Liefert Metriken im Prometheus Text Exposition Format, aggregiert
+    über alle Gunicorn-Worker (siehe app.utils.metrics):
+
+    - Requests, Latenz-Histogramme und In-Flight pro Blueprint/Endpoint
+    - DB Queries/DB-Zeit pro Request, N+1 Verdachtsfälle
+    - Cache Hits/Misses, DB Pool Wartezeit und Auslastung
+    - CPU-Sekunden und Memory der Worker
 
-    OPTIONAL: Nur aktivieren wenn gewünscht!
-    Kann für Prometheus, Grafana, etc. genutzt werden.
+    Mit ?format=json: System-Snapshot dieses Workers inkl. Query Profiler
+    Report (N+1 Signaturen). Kein blockierendes CPU-Sampling.
 
     Returns:
         200: Metrics
@@ -128,6 +143,14 @@ def metrics():
     Example:
         GET /metrics
 
+        Response (200, text/plain; version=0.0.4):
+        # HELP dekanet_http_requests_total Anzahl HTTP Requests
+        # TYPE dekanet_http_requests_total counter
+        dekanet_http_requests_total{blueprint="module",endpoint="module.get_alle_module",method="GET",status="200"} 42
+        ...
+
+        GET /metrics?format=json
+
         Response (200):
         {
             "system": {
@@ -144,14 +167,29 @@ def metrics():
                 "overflow": 0
             },
             "application": {
-                "uptime_seconds": 3600,
                 "version": "1.0.0",
                 "environment": "production"
             },
+            "endpoints": {
+                "dashboard.get_modulhandbuecher": {
+                    "requests": 12,
+                    "duration_ms": {"buckets": {...}, "sum": 840.5, "count": 12},
+                    "db_time_ms": {...},
+                    "query_count": {...},
+                    "n_plus_one_requests": 0,
+                    "n_plus_one_signatures": []
+                }
+            },
             "timestamp": "2025-12-04T10:30:00.000Z"
         }
     """
     try:
+        if request.args.get('format') != 'json':
+            return Response(
+                metrics_registry.render(),
+                content_type='text/plain; version=0.0.4; charset=utf-8'
+            )
+
         metrics_data = {
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             'application': {
@@ -160,13 +198,17 @@ def metrics():
             }
         }
 
-        # System Metrics
+        # System Metrics (optional, psutil)
         try:
+            if psutil is None:
+                raise RuntimeError('psutil not installed')
+
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
 
             metrics_data['system'] = {
-                'cpu_percent': psutil.cpu_percent(interval=0.1),
+                # interval=None: Wert seit letztem Aufruf, blockiert nicht
+                'cpu_percent': psutil.cpu_percent(interval=None),
                 'memory_percent': memory.percent,
                 'memory_used_mb': round(memory.used / 1024 / 1024, 2),
                 'memory_total_mb': round(memory.total / 1024 / 1024, 2),
@@ -182,11 +224,15 @@ def metrics():
                 'pool_size': pool.size(),
                 'connections_checkedin': pool.checkedin(),
                 'connections_checkedout': pool.checkedout(),
-                'overflow': pool.overflow()
+                'overflow': pool.overflow(),
+                'replicas': replica_router.get_status()
             }
         except Exception as e:
             metrics_data['database'] = {'error': str(e)}
 
+        # Query Profiler: Histogramme pro Endpoint (dieser Worker)
+        metrics_data['endpoints'] = query_profiler.get_report()
+
         return jsonify(metrics_data), 200
 
     except Exception as e:
@@ -14,6 +14,10 @@ from app.models import (
 )
 from app.extensions import db, cache
 from app.utils.cache_utils import invalidate_module_caches
+from app.utils.serializers import Projektion
+from app.api.base import conditional_get
+from app.utils.json_stream import stream_json, soll_streamen, nicht_gestreamt
+from app.services import sws_calculator, modul_suche_service, modul_service, modulhandbuch_pdf_service
 from sqlalchemy.orm import joinedload
 
 # Blueprint Definition
@@ -23,103 +27,7 @@ modul_api = Blueprint('module', __name__, url_prefix='/api/module')
 @modul_api.before_request
 def log_request():
     """Log every request"""
-    current_app.logger.info(f"[ModuleAPI] {request.method} {request.path}")
-
-
-# =========================================================================
-# HELPER FUNCTIONS
-# =========================================================================
-
-def calculate_sws_robust(modul):
-    """Berechnet SWS für ein Modul"""
-    try:
-        if hasattr(modul, 'get_sws_gesamt'):
-            try:
-                sws = modul.get_sws_gesamt()
-                if sws is not None and sws > 0:
-                    return float(sws)
-            except (AttributeError, TypeError) as e:
-                current_app.logger.debug(f"get_sws_gesamt failed for modul {getattr(modul, 'id', '?')}: {e}")
-
-        if hasattr(modul, 'lehrformen'):
-            try:
-                lehrformen = modul.lehrformen.all() if hasattr(modul.lehrformen, 'all') else modul.lehrformen
-                if lehrformen:
-                    sws = sum(lf.sws for lf in lehrformen if hasattr(lf, 'sws'))
-                    if sws > 0:
-                        return float(sws)
-            except (AttributeError, TypeError) as e:
-                current_app.logger.debug(f"lehrformen calculation failed for modul {getattr(modul, 'id', '?')}: {e}")
-
-        return 0.0
-    except Exception as e:
-        current_app.logger.warning(f"SWS calculation failed: {e}")
-        return 0.0
-
-
-def modul_to_dict_robust(modul):
-    """Konvertiert Modul zu Dict - MIT DOZENTEN UND LEHRFORMEN (nutzt eager-loaded relationships)"""
-    try:
-        # Nutze pre-loaded dozent_zuordnungen (keine zusätzliche Query wenn eager-loaded)
-        dozenten_list = []
-        try:
-            # Nutze die bereits geladene Relationship statt neuer Query
-            dozenten = modul.dozent_zuordnungen.all() if hasattr(modul.dozent_zuordnungen, 'all') else list(modul.dozent_zuordnungen)
-
-            for d in dozenten:
-                if d.dozent:
-                    name_komplett = d.dozent.name_komplett if hasattr(d.dozent, 'name_komplett') else f"{d.dozent.vorname} {d.dozent.nachname}"
-                    name_kurz = d.dozent.name_kurz if hasattr(d.dozent, 'name_kurz') else f"{d.dozent.vorname[0]}. {d.dozent.nachname}"
-                    dozent_data = {
-                        'id': d.id,
-                        'dozent_id': d.dozent_id,
-                        'name': name_komplett,
-                        'name_komplett': name_komplett,
-                        'name_kurz': name_kurz,
-                        'vorname': d.dozent.vorname,
-                        'nachname': d.dozent.nachname,
-                        'rolle': d.rolle
-                    }
-                    dozenten_list.append(dozent_data)
-        except Exception as e:
-            current_app.logger.error(f"[modul_to_dict] Error loading dozenten for modul {modul.id}: {e}")
-
-        # Nutze pre-loaded lehrformen (keine zusätzliche Query wenn eager-loaded)
-        lehrformen_list = []
-        try:
-            lehrformen = modul.lehrformen.all() if hasattr(modul.lehrformen, 'all') else list(modul.lehrformen)
-            for lf in lehrformen:
-                if lf.lehrform:
-                    lehrformen_list.append({
-                        'id': lf.id,
-                        'lehrform_id': lf.lehrform_id,
-                        'bezeichnung': lf.lehrform.bezeichnung,
-                        'kuerzel': lf.lehrform.kuerzel,
-                        'sws': float(lf.sws) if lf.sws else 0.0
-                    })
-        except Exception as e:
-            current_app.logger.error(f"[modul_to_dict] Error loading lehrformen for modul {modul.id}: {e}")
-
-        # Füge po_id hinzu (wichtig für Frontend!)
-        po_id = modul.po_id if hasattr(modul, 'po_id') and modul.po_id else 1
-
-        result = {
-            'id': modul.id,
-            'kuerzel': modul.kuerzel,
-            'po_id': po_id,  # PO-ID hinzugefügt
-            'bezeichnung_de': modul.bezeichnung_de,
-            'bezeichnung_en': modul.bezeichnung_en,
-            'leistungspunkte': modul.leistungspunkte if modul.leistungspunkte else 0,
-            'turnus': modul.turnus if modul.turnus else 'Nicht festgelegt',
-            'sws_gesamt': calculate_sws_robust(modul),
-            'dozenten': dozenten_list,  # Dozenten hinzugefügt
-            'lehrformen': lehrformen_list  # Lehrformen hinzugefügt (für SWS-Berechnung!)
-        }
-
-        return result
-    except Exception as e:
-        current_app.logger.error(f"[modul_to_dict] Error converting modul: {e}")
-        return None
+    current_app.logger.debug(f"[ModuleAPI] {request.method} {request.path}")
 
 
 # =========================================================================
@@ -128,14 +36,23 @@ def modul_to_dict_robust(modul):
 
 @modul_api.route('/', methods=['GET'])
 @jwt_required()
-@cache.cached(timeout=300, query_string=True)  # 5 Minuten Cache
+@conditional_get('modul', 'dozent', 'lehrform')
+@cache.cached(timeout=300, query_string=True, response_filter=nicht_gestreamt)  # 5 Minuten Cache
 def get_alle_module():
-    """GET /api/module/ - Holt alle Module"""
+    """
+    GET /api/module/ - Holt alle Module
+
+    Query Parameters:
+        page, per_page: Pagination (Default 1 / 100)
+        po_id: Optional - Filter nach PO
+        turnus: Optional - Filter nach Turnus
+        search: Optional - Volltextsuche (sortiert nach Relevanz)
+        projektion: 'list' (Default, mit Dozenten/Lehrformen) oder 'option'
+
+    Ab JSON_STREAM_MIN_ITEMS Modulen pro Seite wird die Liste gestreamt
+    (Server-Side-Cursor) statt komplett im Speicher aufgebaut.
+    """
     try:
-        user_id = get_jwt_identity()
-        current_app.logger.info(f"[ModuleAPI] ========== GET ALL MODULES START ==========")
-        current_app.logger.info(f"[ModuleAPI] Request from user: {user_id}")
-
         if not current_user:
             return jsonify({
                 'success': False,
@@ -148,68 +65,56 @@ def get_alle_module():
         po_id = request.args.get('po_id', type=int)
         turnus = request.args.get('turnus')
         search = request.args.get('search', '').strip()
+        projektion = request.args.get('projektion', 'list')
 
-        current_app.logger.info(f"[ModuleAPI] Query params: page={page}, per_page={per_page}, po_id={po_id}, turnus={turnus}, search='{search}'")
-
-        # Query bauen - mit eager loading um N+1 zu vermeiden
-        from sqlalchemy.orm import subqueryload
-        try:
-            query = Modul.query.options(
-                subqueryload(Modul.lehrformen).joinedload(ModulLehrform.lehrform),
-                subqueryload(Modul.dozent_zuordnungen).joinedload(ModulDozent.dozent)
-            )
+        if projektion not in ('list', 'option'):
+            return jsonify({
+                'success': False,
+                'message': f'Unbekannte Projektion: {projektion}'
+            }), 400
 
-            if po_id:
-                query = query.filter(Modul.po_id == po_id)
-            if turnus:
-                query = query.filter(Modul.turnus == turnus)
-            if search:
-                search_term = f"%{search}%"
-                query = query.filter(
-                    db.or_(
-                        Modul.kuerzel.ilike(search_term),
-                        Modul.bezeichnung_de.ilike(search_term),
-                        Modul.bezeichnung_en.ilike(search_term)
-                    )
+        bedingungen = []
+        order_by = []
+        if po_id:
+            bedingungen.append(Modul.po_id == po_id)
+        if turnus:
+            bedingungen.append(Modul.turnus == turnus)
+        if search:
+            # Volltext-Index, Reihenfolge nach Relevanz
+            treffer_ids = modul_suche_service.search_ids(search, po_id=po_id, limit=None)
+            bedingungen.append(Modul.id.in_(treffer_ids))
+            if treffer_ids:
+                order_by.append(
+                    db.case({modul_id: pos for pos, modul_id in enumerate(treffer_ids)}, value=Modul.id)
                 )
 
-            # Pagination anwenden
-            paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-            module = paginated.items
-            total = paginated.total
-            current_app.logger.info(f"[ModuleAPI] Query successful: {len(module)} modules (page {page}/{paginated.pages}, total {total})")
-        except Exception as e:
-            current_app.logger.error(f"[ModuleAPI] Query failed: {e}")
-            query = Modul.query
-            if po_id:
-                query = query.filter(Modul.po_id == po_id)
-            paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-            module = paginated.items
-            total = paginated.total
-            current_app.logger.info(f"[ModuleAPI] Fallback query: {len(module)} modules (total {total})")
-
-        # Konvertiere zu Dict
-        items = []
-        for m in module:
-            modul_dict = modul_to_dict_robust(m)
-            if modul_dict:
-                items.append(modul_dict)
-
-        # DEBUG logging entfernt für bessere Performance
-
-        current_app.logger.info(f"[ModuleAPI] Returning {len(items)} modules to client (total: {total})")
-        current_app.logger.info(f"[ModuleAPI] ========== GET ALL MODULES END ==========")
+        total = modul_service.count_module(bedingungen)
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'pages': (total + per_page - 1) // per_page
+        }
+
+        limit = per_page if per_page > 0 else 20
+        offset = (max(page, 1) - 1) * limit
+        anzahl = max(0, min(limit, total - offset))
+        seite = dict(bedingungen=bedingungen, order_by=order_by, limit=limit, offset=offset)
+
+        if soll_streamen(anzahl):
+            return stream_json(
+                {'success': True, 'message': f'{anzahl} Module gefunden', 'pagination': pagination},
+                'data',
+                modul_service.iter_projektion(projektion, **seite)
+            )
+
+        items = modul_service.get_projektion(projektion, **seite) if anzahl else []
 
         return jsonify({
             'success': True,
             'data': items,
             'message': f'{len(items)} Module gefunden',
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'pages': (total + per_page - 1) // per_page
-            }
+            'pagination': pagination
         }), 200
 
     except Exception as e:
@@ -223,8 +128,17 @@ def get_alle_module():
 
 @modul_api.route('/search', methods=['GET'])
 @jwt_required()
+@conditional_get('modul', 'dozent', 'lehrform')
 def search_module():
-    """GET /api/module/search - Sucht Module"""
+    """
+    GET /api/module/search - Sucht Module (Volltext, nach Relevanz sortiert)
+
+    Query Parameters:
+        q: Suchbegriff (Wörter werden als Präfix gesucht)
+        po_id: Optional - Filter nach PO
+        limit: Max. Treffer (Default 50, max. 200)
+        projektion: 'list' (Default) oder 'option' (Type-Ahead)
+    """
     try:
         query_text = request.args.get('q', '').strip()
         po_id = request.args.get('po_id', type=int)
@@ -235,29 +149,18 @@ def search_module():
                 'message': 'Suchbegriff erforderlich'
             }), 400
         
-        search_term = f"%{query_text}%"
-        from sqlalchemy.orm import subqueryload
-        module_query = Modul.query.options(
-            subqueryload(Modul.lehrformen).joinedload(ModulLehrform.lehrform),
-            subqueryload(Modul.dozent_zuordnungen).joinedload(ModulDozent.dozent)
-        ).filter(
-            db.or_(
-                Modul.kuerzel.ilike(search_term),
-                Modul.bezeichnung_de.ilike(search_term),
-                Modul.bezeichnung_en.ilike(search_term)
-            )
-        )
+        limit = min(request.args.get('limit', 50, type=int), 200)
+        projektion = request.args.get('projektion', 'list')
 
-        if po_id:
-            module_query = module_query.filter(Modul.po_id == po_id)
+        if projektion not in ('list', 'option'):
+            return jsonify({
+                'success': False,
+                'message': f'Unbekannte Projektion: {projektion}'
+            }), 400
 
-        module = module_query.all()
-        
-        items = []
-        for m in module:
-            modul_dict = modul_to_dict_robust(m)
-            if modul_dict:
-                items.append(modul_dict)
+        # Volltext-Index (Präfix-Suche für Type-Ahead), sortiert nach Relevanz
+        treffer_ids = modul_suche_service.search_ids(query_text, po_id=po_id, limit=limit)
+        items = modul_service.get_projektion_sortiert(treffer_ids, projektion)
         
         return jsonify({
             'success': True,
@@ -276,15 +179,15 @@ def search_module():
 
 @modul_api.route('/<int:modul_id>', methods=['GET'])
 @jwt_required()
+@conditional_get('modul', 'dozent', 'lehrform', 'studiengang')
 def get_modul(modul_id: int):
     """GET /api/module/<id> - VOLLSTÄNDIGE DETAILS"""
     try:
-        user_id = get_jwt_identity()
-        current_app.logger.info(f"[ModuleAPI] Get complete details for module {modul_id}")
+        current_app.logger.debug(f"[ModuleAPI] Get complete details for module {modul_id}")
         
-        modul = Modul.query.get(modul_id)
+        basis = modul_service.get_projektion('detail', bedingungen=[Modul.id == modul_id])
         
-        if not modul:
+        if not basis:
             return jsonify({
                 'success': False,
                 'message': 'Modul nicht gefunden'
@@ -293,18 +196,7 @@ def get_modul(modul_id: int):
         # VOLLSTÄNDIGE DATEN
         details = {
             # Basis-Daten
-            'id': modul.id,
-            'kuerzel': modul.kuerzel,
-            'po_id': modul.po_id,
-            'bezeichnung_de': modul.bezeichnung_de,
-            'bezeichnung_en': modul.bezeichnung_en,
-            'untertitel': modul.untertitel,
-            'leistungspunkte': modul.leistungspunkte,
-            'turnus': modul.turnus,
-            'gruppengroesse': modul.gruppengroesse if hasattr(modul, 'gruppengroesse') else None,
-            'teilnehmerzahl': modul.teilnehmerzahl if hasattr(modul, 'teilnehmerzahl') else None,
-            'anmeldemodalitaeten': modul.anmeldemodalitaeten if hasattr(modul, 'anmeldemodalitaeten') else None,
-            'sws_gesamt': calculate_sws_robust(modul),
+            **basis[0],
             
             # Listen für Detail-Daten
             'lehrformen': [],
@@ -471,7 +363,7 @@ def get_modul(modul_id: int):
         except Exception as e:
             current_app.logger.error(f"Error loading abhaengigkeiten: {e}")
         
-        current_app.logger.info(f"[ModuleAPI] Complete details loaded for module {modul_id}")
+        current_app.logger.debug(f"[ModuleAPI] Complete details loaded for module {modul_id}")
         
         return jsonify({
             'success': True,
@@ -487,6 +379,55 @@ def get_modul(modul_id: int):
         }), 500
 
 
+@modul_api.route('/<int:modul_id>/handbuch.pdf', methods=['GET'])
+@jwt_required()
+def get_modul_handbuch_auszug(modul_id: int):
+    """
+    GET /api/module/<id>/handbuch.pdf - Seiten des Moduls aus dem Modulhandbuch
+
+    Liefert nur den Seitenbereich aus ModulSeiten als eigenes PDF
+    (gecachter Auszug, Auslieferung per sendfile).
+
+    Query Parameters:
+        modulhandbuch_id: Optional - Handbuch, falls das Modul in mehreren steht
+        download: true = als Attachment (Default: inline anzeigen)
+    """
+    from flask import send_file
+
+    try:
+        auszug = modulhandbuch_pdf_service.get_auszug(
+            modul_id,
+            modulhandbuch_id=request.args.get('modulhandbuch_id', type=int)
+        )
+        if auszug is None:
+            return jsonify({
+                'success': False,
+                'message': 'Keine Modulhandbuch-Seiten für dieses Modul hinterlegt'
+            }), 404
+
+        return send_file(
+            auszug['path'],
+            mimetype='application/pdf',
+            as_attachment=request.args.get('download', 'false').lower() == 'true',
+            download_name=auszug['download_name'],
+            conditional=True
+        )
+
+    except FileNotFoundError as e:
+        current_app.logger.error(f"[ModuleAPI] Handbook excerpt for module {modul_id}: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'Modulhandbuch-PDF nicht verfügbar'
+        }), 404
+    except Exception as e:
+        current_app.logger.error(f"[ModuleAPI] Error: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'message': 'Fehler beim Laden des Modulhandbuch-Auszugs',
+            'error': str(e)
+        }), 500
+
+
 # =========================================================================
 # CREATE/UPDATE/DELETE HAUPTMODUL
 # =========================================================================
@@ -707,6 +648,7 @@ def add_lehrform(modul_id: int):
         )
         
         db.session.add(modul_lehrform)
+        sws_calculator.update_aktive_phase_nach_lehrform_aenderung(modul_id)
         db.session.commit()
         
         return jsonify({
@@ -740,6 +682,7 @@ def update_lehrform(modul_id: int, lehrform_zuordnung_id: int):
         data = request.get_json()
         if 'sws' in data:
             lehrform_zuordnung.sws = data['sws']
+            sws_calculator.update_aktive_phase_nach_lehrform_aenderung(modul_id)
         
         db.session.commit()
         
@@ -766,6 +709,7 @@ def delete_lehrform(modul_id: int, lehrform_zuordnung_id: int):
             return jsonify({'success': False, 'message': 'Zuordnung nicht gefunden'}), 404
         
         db.session.delete(lehrform_zuordnung)
+        sws_calculator.update_aktive_phase_nach_lehrform_aenderung(modul_id)
         db.session.commit()
         
         return jsonify({'success': True, 'message': 'Lehrform entfernt'}), 200
@@ -1301,16 +1245,40 @@ def set_zweitpruefer(modul_id: int, dozent_zuordnung_id: int):
 # HILFSFUNKTIONEN - LISTE ALLER LEHRFORMEN/DOZENTEN/ETC
 # =========================================================================
 
+# Options-Projektionen (nur die Spalten der Dropdowns)
+LEHRFORM_OPTION = Projektion('option', {
+    'id': Lehrform.id,
+    'bezeichnung': Lehrform.bezeichnung,
+    'kuerzel': Lehrform.kuerzel,
+})
+
+DOZENT_OPTION = Projektion('option', {
+    'id': Dozent.id,
+    'name': Dozent.name_komplett,
+    'vorname': Dozent.vorname,
+    'nachname': Dozent.nachname,
+})
+
+STUDIENGANG_OPTION = Projektion('option', {
+    'id': Studiengang.id,
+    'bezeichnung': Studiengang.bezeichnung,
+    'kuerzel': Studiengang.kuerzel,
+})
+
+
 @modul_api.route('/options/lehrformen', methods=['GET'])
 @jwt_required()
+@conditional_get('lehrform')
 @cache.cached(timeout=3600)  # 1 Stunde Cache - Lehrformen ändern sich selten
 def get_lehrformen_options():
     """GET /api/module/options/lehrformen - Liste aller Lehrformen"""
     try:
-        lehrformen = Lehrform.query.order_by(Lehrform.bezeichnung).all()
+        rows = db.session.execute(
+            LEHRFORM_OPTION.select().order_by(Lehrform.bezeichnung)
+        ).all()
         return jsonify({
             'success': True,
-            'data': [{'id': lf.id, 'bezeichnung': lf.bezeichnung, 'kuerzel': lf.kuerzel} for lf in lehrformen]
+            'data': LEHRFORM_OPTION.serialize(rows)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -1318,19 +1286,17 @@ def get_lehrformen_options():
 
 @modul_api.route('/options/dozenten', methods=['GET'])
 @jwt_required()
+@conditional_get('dozent')
 @cache.cached(timeout=1800)  # 30 Minuten Cache - Dozenten ändern sich gelegentlich
 def get_dozenten_options():
     """GET /api/module/options/dozenten - Liste aller Dozenten"""
     try:
-        dozenten = Dozent.query.order_by(Dozent.nachname, Dozent.vorname).all()
+        rows = db.session.execute(
+            DOZENT_OPTION.select().order_by(Dozent.nachname, Dozent.vorname)
+        ).all()
         return jsonify({
             'success': True,
-            'data': [{
-                'id': d.id,
-                'name': d.name_komplett if hasattr(d, 'name_komplett') else f"{d.vorname} {d.nachname}",
-                'vorname': d.vorname,
-                'nachname': d.nachname
-            } for d in dozenten]
+            'data': DOZENT_OPTION.serialize(rows)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -1338,18 +1304,17 @@ def get_dozenten_options():
 
 @modul_api.route('/options/studiengaenge', methods=['GET'])
 @jwt_required()
+@conditional_get('studiengang')
 @cache.cached(timeout=3600)  # 1 Stunde Cache - Studiengänge ändern sich selten
 def get_studiengaenge_options():
     """GET /api/module/options/studiengaenge - Liste aller Studiengänge"""
     try:
-        studiengaenge = Studiengang.query.order_by(Studiengang.bezeichnung).all()
+        rows = db.session.execute(
+            STUDIENGANG_OPTION.select().order_by(Studiengang.bezeichnung)
+        ).all()
         return jsonify({
             'success': True,
-            'data': [{
-                'id': sg.id,
-                'bezeichnung': sg.bezeichnung,
-                'kuerzel': sg.kuerzel if hasattr(sg, 'kuerzel') else None
-            } for sg in studiengaenge]
+            'data': STUDIENGANG_OPTION.serialize(rows)
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
\ No newline at end of file
@@ -1180,18 +1180,26 @@ def get_alle_planungen_dekan():
                Wenn keine Phase aktiv ist → leere Liste (Dashboard leer).
                Geschlossene Phasen gehören ins Archiv, nicht ins Dashboard!
 
+    Keyset Pagination: Die Antwort enthält meta.pagination.next_cursor;
+    dieser Wert als ?cursor= liefert die nächste Seite. Ohne ?details=true
+    werden geplante Module und Wunsch-freie Tage nicht mitgeliefert.
+
     Query Parameters:
         ?planungsphase_id=5  - Zeige spezifische Phase (für Archiv/Historie)
         ?status=eingereicht  - Filtere nach Status
-        ?page=1&per_page=20
+        ?per_page=20         - Planungen pro Seite (max. 200)
+        ?cursor=123          - next_cursor der vorherigen Seite
+        ?details=true        - Inkl. geplante Module und Wunsch-freie Tage
 
     Returns:
-        200: Liste aller Planungen der aktiven Phase
+        200: Seite von Planungen der Phase
     """
     try:
         status = request.args.get('status')
         planungsphase_id = request.args.get('planungsphase_id', type=int)
-        page, per_page = get_pagination_params()
+        cursor = request.args.get('cursor', type=int)
+        details = request.args.get('details', 'false').lower() == 'true'
+        _, per_page = get_pagination_params()
 
         # Input validation for status parameter
         if status and status not in VALID_STATUS_VALUES:
@@ -1201,28 +1209,36 @@ def get_alle_planungen_dekan():
             )
 
         # NEUE LOGIK: Standard = nur aktive Phase
-        if planungsphase_id:
-            # Spezifische Phase angefordert (z.B. für Archiv-Ansicht)
-            planungen = planung_service.get_all(status=status)
-            planungen = [p for p in planungen if p.planungsphase_id == planungsphase_id]
-        else:
-            # STANDARD: Nur aktive Phase zeigen
+        if not planungsphase_id:
             active_phase = Planungsphase.get_active_phase()
+            # Keine aktive Phase = Dashboard leer (korrekt!)
+            planungsphase_id = active_phase.id if active_phase else None
 
-            if not active_phase:
-                # Keine aktive Phase = Dashboard leer (korrekt!)
-                planungen = []
-            else:
-                # Zeige nur Planungen der aktiven Phase
-                planungen = planung_service.get_all(status=status)
-                planungen = [p for p in planungen if p.planungsphase_id == active_phase.id]
+        planungen, anzahl_module, next_cursor = [], {}, None
+        if planungsphase_id:
+            planungen, anzahl_module, next_cursor = planung_service.get_seite_fuer_phase(
+                planungsphase_id,
+                status=status,
+                after_id=cursor,
+                limit=per_page,
+                details=details
+            )
 
-        # Format - WICHTIG: include_module=True für Dekan-Ansicht mit vollständigen Daten
-        items = [p.to_dict(include_module=True) for p in planungen]
+        items = [
+            p.to_dict(include_module=details, anzahl_module=anzahl_module.get(p.id))
+            for p in planungen
+        ]
 
         return ApiResponse.success(
             data=items,
-            message=f'{len(items)} Planung(en) gefunden'
+            message=f'{len(items)} Planung(en) gefunden',
+            meta={
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None
+                }
+            }
         )
     
     except Exception as e:
@@ -5,7 +5,7 @@ REST API für Planungsphasen-Verwaltung
 """
 
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from datetime import datetime
 from sqlalchemy import desc
 
@@ -14,7 +14,8 @@ from app.models.planungsphase import Planungsphase, PhaseSubmission, Archivierte
 from app.models.user import Benutzer as User
 from app.models.planung import Semesterplanung
 from app.models.semester import Semester
-from app.api.base import role_required
+from app.api.base import role_required, conditional_get
+from app.utils.json_stream import stream_json, soll_streamen
 
 # Blueprint erstellen
 planungsphase_api = Blueprint('planungsphase_api', __name__, url_prefix='/api/planungphase')
@@ -137,6 +138,7 @@ def close_phase(phase_id):
 
     except Exception as e:
         current_app.logger.error(f"Error closing phase: {e}")
+        db.session.rollback()
         return jsonify({
             'success': False,
             'message': 'Fehler beim Schließen der Planungsphase',
@@ -146,6 +148,7 @@ def close_phase(phase_id):
 
 @planungsphase_api.route('', methods=['GET'])
 @jwt_required()
+@conditional_get('semester', 'planungsphase')
 def get_all_phases():
     """Holt alle Planungsphasen"""
     try:
@@ -178,6 +181,7 @@ def get_all_phases():
 
 @planungsphase_api.route('/active', methods=['GET'])
 @jwt_required()
+@conditional_get('semester', 'planungsphase')
 def get_active_phase():
     """Holt die aktive Planungsphase"""
     try:
@@ -198,6 +202,7 @@ def get_active_phase():
 
 @planungsphase_api.route('/active-with-semester', methods=['GET'])
 @jwt_required()
+@conditional_get('semester', 'planungsphase', 'semesterplanung', tagesabhaengig=True)
 def get_active_phase_with_semester():
     """Gibt aktive Phase MIT Semester-Daten zurück (für Professor-Wizard)"""
     try:
@@ -256,7 +261,7 @@ def check_submission_status():
     """Prüft den Einreichungsstatus"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
 
         professor_id = request.args.get('professor_id', type=int)
 
@@ -479,7 +484,7 @@ def get_phase_history():
     """Holt die Phasen-Historie"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
 
         professor_id = request.args.get('professor_id', type=int)
 
@@ -610,7 +615,7 @@ def get_archived_planungen():
     """Holt archivierte Planungen"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
 
         # Filter von Query-Parametern
         status = request.args.get('status')
@@ -639,7 +644,13 @@ def get_archived_planungen():
         # Remove None values
         filter_dict = {k: v for k, v in filter_dict.items() if v is not None}
 
-        result = ArchiviertePlanung.get_filtered(filter_dict)
+        kopf, planungen = ArchiviertePlanung.iter_filtered(filter_dict)
+
+        # Große Seiten (planung_daten je Eintrag) streamen statt puffern
+        if soll_streamen(kopf.pop('anzahl')):
+            return stream_json({'success': True, **kopf}, 'planungen', planungen)
+
+        result = {'planungen': list(planungen), **kopf}
 
         return jsonify({
             'success': True,
@@ -661,7 +672,7 @@ def get_archived_planung_detail(archiv_id):
     """Holt Details einer archivierten Planung"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_user
 
         archived = ArchiviertePlanung.query.get_or_404(archiv_id)
 
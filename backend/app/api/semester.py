@@ -25,7 +25,8 @@ from app.api.base import (
     role_required,
     validate_request,
     get_pagination_params,
-    get_filter_params
+    get_filter_params,
+    conditional_get
 )
 from app.services import semester_service
 from app.extensions import cache
@@ -40,6 +41,7 @@ semester_api = Blueprint('semester', __name__, url_prefix='/api/semester')
 
 @semester_api.route('/', methods=['GET'])
 @login_required
+@conditional_get('semester', 'semesterplanung', tagesabhaengig=True)
 @cache.cached(timeout=600, query_string=True)  # 10 Minuten Cache, beachtet Query-Parameter
 def get_alle_semester():
     """
@@ -89,6 +91,7 @@ def get_alle_semester():
 
 @semester_api.route('/<int:semester_id>', methods=['GET'])
 @login_required
+@conditional_get('semester', 'semesterplanung', tagesabhaengig=True)
 def get_semester(semester_id: int):
     """
     GET /api/semester/<id>
@@ -122,6 +125,7 @@ def get_semester(semester_id: int):
 
 @semester_api.route('/aktiv', methods=['GET'])
 @login_required
+@conditional_get('semester', 'semesterplanung', tagesabhaengig=True)
 def get_aktives_semester():
     """
     GET /api/semester/aktiv
@@ -155,6 +159,7 @@ def get_aktives_semester():
 
 @semester_api.route('/planung', methods=['GET'])
 @login_required
+@conditional_get('semester', 'semesterplanung', tagesabhaengig=True)
 def get_planungssemester():
     """
     GET /api/semester/planung
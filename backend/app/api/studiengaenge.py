@@ -14,7 +14,8 @@ Endpoints:
 from flask import Blueprint, request
 from app.api.base import (
     ApiResponse,
-    login_required
+    login_required,
+    conditional_get
 )
 from app.models import Studiengang, Pruefungsordnung, Modul
 
@@ -29,6 +30,7 @@ po_api = Blueprint('pruefungsordnungen', __name__, url_prefix='/api/pruefungsord
 
 @studiengaenge_api.route('/', methods=['GET'])
 @login_required
+@conditional_get('studiengang')
 def get_alle_studiengaenge():
     """
     GET /api/studiengaenge
@@ -68,6 +70,7 @@ def get_alle_studiengaenge():
 
 @studiengaenge_api.route('/<int:studiengang_id>', methods=['GET'])
 @login_required
+@conditional_get('studiengang')
 def get_studiengang(studiengang_id: int):
     """
     GET /api/studiengaenge/<id>
@@ -102,6 +105,7 @@ def get_studiengang(studiengang_id: int):
 
 @studiengaenge_api.route('/<int:studiengang_id>/module', methods=['GET'])
 @login_required
+@conditional_get('studiengang', 'modul', 'lehrform')
 def get_studiengang_module(studiengang_id: int):
     """
     GET /api/studiengaenge/<id>/module
@@ -151,6 +155,7 @@ def get_studiengang_module(studiengang_id: int):
 
 @po_api.route('/', methods=['GET'])
 @login_required
+@conditional_get('studiengang')
 def get_alle_pos():
     """
     GET /api/pruefungsordnungen
@@ -192,6 +197,7 @@ def get_alle_pos():
 
 @po_api.route('/<int:po_id>', methods=['GET'])
 @login_required
+@conditional_get('studiengang')
 def get_po(po_id: int):
     """
     GET /api/pruefungsordnungen/<id>
@@ -227,6 +233,7 @@ def get_po(po_id: int):
 
 @po_api.route('/<int:po_id>/module', methods=['GET'])
 @login_required
+@conditional_get('studiengang', 'modul', 'lehrform')
 def get_po_module(po_id: int):
     """
     GET /api/pruefungsordnungen/<id>/module
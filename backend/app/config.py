@@ -66,13 +66,44 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_RECORD_QUERIES = True
+
+    # Query Profiler (wertet RECORD_QUERIES pro Request aus)
+    QUERY_PROFILER_ENABLED = True
+    # Server-Timing Header (DB-Zeit, Query-Anzahl) legt Interna offen:
+    # nur in Development, sonst explizit per Environment
+    QUERY_PROFILER_SERVER_TIMING = os.environ.get('QUERY_PROFILER_SERVER_TIMING', 'false').lower() == 'true'
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', 5))
+    QUERY_PROFILER_SLOW_QUERY_MS = int(os.environ.get('QUERY_PROFILER_SLOW_QUERY_MS', 100))
+
+    # Metrics (/metrics) - Aggregation über Gunicorn-Worker via Verzeichnis
+    # (wird von gunicorn.conf.py gesetzt; ohne: nur der antwortende Prozess)
+    METRICS_ENABLED = True
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
         'pool_recycle': 3600,
-        'pool_size': 20,
+        'pool_size': 20,  # pool_size/max_overflow/pool_timeout nur bei DB_POOL_MODE=static
         'max_overflow': 40,
         'pool_timeout': 30,
     }
+
+    # Connection-Budget über alle Gunicorn-Worker (siehe app/utils/db_pool.py)
+    # budget: Pool pro Worker aus Budget + Worker-Modell, pgbouncer: Transaction-Pooler, static: wie oben
+    DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'budget')
+    DB_CONNECTION_BUDGET = int(os.environ.get('DB_CONNECTION_BUDGET', 0)) or None  # Default: max_connections des Servers; gesetzt = harte Grenze
+    DB_CONNECTION_RESERVE = int(os.environ.get('DB_CONNECTION_RESERVE', 5))  # CLI, Cron (PDF-Render-Prozesse zählt db_pool selbst)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))  # Unter Gunicorn timeout (30s) bleiben!
+
+    # Read-Replicas (siehe app/utils/db_routing.py): lesende Requests auf Replicas,
+    # nach einem Schreibzugriff bleibt der Benutzer DB_REPLICA_STICKY_SECONDS auf dem Primary
+    DB_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_REPLICA_CONNECTION_BUDGET = int(os.environ.get('DB_REPLICA_CONNECTION_BUDGET', 0)) or None  # Pro Replica (Default: DB_CONNECTION_BUDGET)
+    DB_REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', 5.0))  # Sekunden, darüber liest der Primary
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))  # Größer als DB_REPLICA_MAX_LAG!
+    DB_REPLICA_CHECK_INTERVAL = float(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 2.0))
+    DB_REPLICA_RETRY_INTERVAL = 30.0  # Nach Verbindungsfehler
+    DB_REPLICA_CONNECT_TIMEOUT = 2
     
     # =========================================================================
     # FLASK-LOGIN & SESSION SECURITY
@@ -87,6 +118,66 @@ class Config:
     REMEMBER_COOKIE_HTTPONLY = True  # XSS Protection
     REMEMBER_COOKIE_SAMESITE = 'Lax'  # CSRF Protection
     
+    # =========================================================================
+    # CACHE - Gemeinsamer Cache für alle Gunicorn-Worker
+    # =========================================================================
+    # SharedCache: SQLite-Datei (WAL) mit Tag-Invalidierung über alle Worker
+    # SimpleCache: In-Memory pro Prozess (nur für Tests/Single-Process)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'app.utils.shared_cache.SharedCache')
+    CACHE_DEFAULT_TIMEOUT = 300
+    CACHE_SHARED_PATH = os.environ.get('CACHE_SHARED_PATH') or str(BASE_DIR / 'instance' / 'shared_cache.sqlite3')
+
+    # =========================================================================
+    # TOKEN BLOCKLIST - Logout-Sperren (DB) mit Bloom-Filter pro Worker
+    # =========================================================================
+    TOKEN_BLOCKLIST_REFRESH_SECONDS = 2.0  # Max. Verzögerung bis ein Logout in allen Workern gilt
+    TOKEN_BLOCKLIST_REBUILD_SECONDS = 3600  # Neuaufbau verwirft abgelaufene Einträge
+    TOKEN_BLOCKLIST_BLOOM_BITS = 1 << 20  # 128 KiB pro Worker
+    TOKEN_BLOCKLIST_BLOOM_HASHES = 7
+
+    # JWT User Lookup: Principal-Cache pro Worker (siehe app/utils/principal_cache.py)
+    AUTH_PRINCIPAL_CACHE_SIZE = 4096  # 0 = aus
+    AUTH_PRINCIPAL_CACHE_TTL = 60.0  # Sekunden; Änderungen über UserService wirken sofort
+
+    # =========================================================================
+    # RESPONSE-KOMPRESSION & JSON-STREAMING
+    # =========================================================================
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'  # aus, wenn der Proxy komprimiert
+    COMPRESS_MIN_SIZE = 1024  # Bytes, kleinere Bodies bleiben unkomprimiert
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4  # brotli optional (requirements.txt)
+    JSON_STREAM_MIN_ITEMS = 200  # Listen ab dieser Größe streamen
+    JSON_STREAM_CHUNK_ITEMS = 100  # Items pro Chunk / yield_per
+
+    # =========================================================================
+    # PDF JOBS - Asynchrone Deputat-PDFs (siehe deputat_pdf_service)
+    # =========================================================================
+    PDF_STORAGE_DIR = os.environ.get('PDF_STORAGE_DIR') or str(BASE_DIR / 'instance' / 'pdf')
+    PDF_JOB_WORKERS = int(os.environ.get('PDF_JOB_WORKERS', 1))  # Render-Prozesse pro Worker (0 = synchron)
+    PDF_JOB_MP_CONTEXT = os.environ.get('PDF_JOB_MP_CONTEXT', 'spawn')
+    PDF_JOB_NICE = 10
+    PDF_JOB_TTL = 3600  # Job-Status und ZIP-Dateien (Sekunden)
+    PDF_JOB_TIMEOUT = 600  # Wartender Job ohne Lebenszeichen gilt danach als fehlgeschlagen (Worker recycelt)
+
+    # =========================================================================
+    # MODULHANDBUCH - PDF-Import (flask import-modulhandbuecher) & Seiten-Auszüge
+    # =========================================================================
+    MODULHANDBUCH_DIR = os.environ.get('MODULHANDBUCH_DIR') or str(BASE_DIR / 'Modulhandbuecher')
+    MODULHANDBUCH_IMPORT_WORKERS = int(os.environ.get('MODULHANDBUCH_IMPORT_WORKERS', 4))  # Parse-Prozesse (max. CPUs)
+    MODULHANDBUCH_IMPORT_MP_CONTEXT = os.environ.get('MODULHANDBUCH_IMPORT_MP_CONTEXT', 'fork')  # kein App-Import nötig
+    MODULHANDBUCH_IMPORT_SEITEN_PRO_TASK = 32  # Große PDFs in Seitenbereiche aufteilen
+    MODULHANDBUCH_IMPORT_BATCH_SIZE = 200  # Module pro INSERT/UPDATE
+    MODULHANDBUCH_AUSZUG_DIR = os.environ.get('MODULHANDBUCH_AUSZUG_DIR') or str(BASE_DIR / 'instance' / 'modulhandbuch_auszuege')
+    MODULHANDBUCH_AUSZUG_CACHE_MB = int(os.environ.get('MODULHANDBUCH_AUSZUG_CACHE_MB', 200))  # LRU-Limit Seiten-Auszüge
+
+    # =========================================================================
+    # BENACHRICHTIGUNGEN - Retention (flask cleanup-notifications), Ungelesen-Zähler
+    # =========================================================================
+    NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 30))
+    NOTIFICATION_DELETE_CHUNK = int(os.environ.get('NOTIFICATION_DELETE_CHUNK', 1000))  # Zeilen pro DELETE
+    NOTIFICATION_COUNTER_TTL = 3600  # Ungelesen-Zähler im Shared Cache
+    NOTIFICATION_POLL_SECONDS = 30  # Empfohlenes Client-Intervall (Polling mit ETag)
+
     # =========================================================================
     # PAGINATION
     # =========================================================================
@@ -138,10 +229,11 @@ class Config:
         'Content-Type',
         'Authorization',
         'X-Requested-With',
-        'Accept'
+        'Accept',
+        'If-None-Match'  # Polling mit ETag (Ungelesen-Zähler)
     ]
     
-    CORS_EXPOSE_HEADERS = ['Content-Type', 'Authorization']
+    CORS_EXPOSE_HEADERS = ['Content-Type', 'Authorization', 'ETag']
     CORS_SUPPORTS_CREDENTIALS = True
     CORS_MAX_AGE = 3600
     
@@ -168,6 +260,8 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_ECHO = True
     LOG_LEVEL = 'DEBUG'
 
+    QUERY_PROFILER_SERVER_TIMING = True
+
     SESSION_COOKIE_SECURE = False
     REMEMBER_COOKIE_SECURE = False
 
@@ -187,6 +281,7 @@ class TestingConfig(Config):
     
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    CACHE_TYPE = 'SimpleCache'
     BCRYPT_LOG_ROUNDS = 4
     
     SESSION_COOKIE_SECURE = False
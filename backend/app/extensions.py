@@ -13,14 +13,16 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_caching import Cache
 from flask_wtf.csrf import CSRFProtect
 
+from app.utils.db_routing import RoutingCache, RoutingSession
+
 
 # =========================================================================
 # DATABASE (SQLAlchemy)
 # =========================================================================
-db = SQLAlchemy()
+# RoutingSession: lesende Requests auf Read-Replicas (app/utils/db_routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # =========================================================================
 # DATABASE MIGRATIONS (Flask-Migrate)
@@ -58,7 +60,8 @@ limiter = Limiter(
 # =========================================================================
 # CACHE (Flask-Caching) - API Response Caching
 # =========================================================================
-cache = Cache()
+# RoutingCache: Cache-Misses in @cache.cached/@cache.memoize lesen vom Primary
+cache = RoutingCache()
 
 # =========================================================================
 # CSRF PROTECTION (Flask-WTF) - Protection against CSRF attacks
@@ -107,9 +110,16 @@ def init_extensions(app):
     # =====================================================================
     # Database
     # =====================================================================
+    # Pool-Größe aus Connection-Budget und Worker-Modell (DB_POOL_MODE)
+    from app.utils.db_pool import init_db_pool
+    init_db_pool(app)
+
     db.init_app(app)
     app.logger.info('[OK] Database initialized')
 
+    from app.utils.db_routing import replica_router
+    replica_router.init_app(app)
+
     # =====================================================================
     # Migrations
     # =====================================================================
@@ -173,20 +183,46 @@ def init_extensions(app):
             app.logger.error(f"[JWT] Invalid user identity: {type(user)} - {user}: {e}")
             return None
     
+    # Principal-Cache pro Worker (invalidiert über Versions-Zähler im Cache)
+    from app.utils.principal_cache import principal_cache
+    principal_cache.init_app(app)
+
+    def lade_benutzer(user_id):
+        """Lädt einen aktiven Benutzer samt Rolle (eine Query)"""
+        from sqlalchemy.orm import joinedload
+        from app.models.user import Benutzer
+        from app.utils.db_routing import replica_router
+
+        # Primary: der Principal wird unter der aktuellen Benutzer-Version gecacht
+        with replica_router.primary():
+            user = Benutzer.query.options(joinedload(Benutzer.rolle)).filter_by(id=user_id).first()
+
+        if not user:
+            app.logger.warning(f"[JWT] User not found for ID: {user_id}")
+            return None
+
+        if not user.aktiv:
+            app.logger.warning(f"[JWT] User {user_id} is inactive")
+            return None
+
+        if app.config.get('DEBUG'):
+            app.logger.debug(f"[JWT] User loaded: {user.username} (ID: {user_id})")
+        return user
+
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
         """
         JWT User Lookup Loader
-        Lädt User-Objekt aus JWT Token
+        Liefert den Benutzer aus dem JWT Token als BenutzerPrincipal
+        (Principal-Cache, DB nur bei Cache-Miss)
 
         Args:
             _jwt_header: JWT Header (unused)
             jwt_data: JWT Payload mit 'sub' (Identity als String)
 
         Returns:
-            Benutzer-Objekt oder None
+            BenutzerPrincipal oder None
         """
-        from app.models.user import Benutzer
         identity = jwt_data["sub"]  # Kommt als STRING vom JWT
 
         if app.config.get('DEBUG'):
@@ -195,19 +231,7 @@ def init_extensions(app):
         try:
             # Konvertiere String zu Integer für DB Query
             user_id = int(identity)
-            user = Benutzer.query.filter_by(id=user_id).first()
-
-            if not user:
-                app.logger.warning(f"[JWT] User not found for ID: {user_id}")
-                return None
-
-            if not user.aktiv:
-                app.logger.warning(f"[JWT] User {user_id} is inactive")
-                return None
-
-            if app.config.get('DEBUG'):
-                app.logger.debug(f"[JWT] User loaded: {user.username} (ID: {user_id})")
-            return user
+            return principal_cache.get_or_load(user_id, lade_benutzer)
 
         except (ValueError, TypeError) as e:
             app.logger.error(f"[JWT] Invalid identity in token: {identity} - {e}")
@@ -260,9 +284,10 @@ def init_extensions(app):
     # =====================================================================
     # TOKEN BLOCKLIST - Token-Invalidierung bei Logout
     # =====================================================================
-    # In-Memory Blocklist (für Production: Redis verwenden)
+    # Persistente Blocklist (DB) mit Bloom-Filter pro Worker
 
     from app.utils.token_blocklist import token_blocklist
+    token_blocklist.init_app(app)
 
     @jwt.token_in_blocklist_loader
     def check_if_token_in_blocklist(jwt_header, jwt_payload):
@@ -315,11 +340,13 @@ def init_extensions(app):
                     "Content-Type",
                     "Authorization",
                     "X-Requested-With",
-                    "Accept"
+                    "Accept",
+                    "If-None-Match"
                 ]),
                 "expose_headers": app.config.get('CORS_EXPOSE_HEADERS', [
                     "Content-Type",
-                    "Authorization"
+                    "Authorization",
+                    "ETag"
                 ]),
                 "supports_credentials": app.config.get('CORS_SUPPORTS_CREDENTIALS', True),
                 "max_age": app.config.get('CORS_MAX_AGE', 3600)
@@ -339,13 +366,26 @@ def init_extensions(app):
     # =====================================================================
     # Cache - API Response Caching
     # =====================================================================
+    from app.utils.cache_utils import CACHE_TAG_RULES, register_cache_invalidation
+
+    cache_type = app.config.get('CACHE_TYPE', 'SimpleCache')
+    cache_timeout = app.config.get('CACHE_DEFAULT_TIMEOUT', 300)
     cache.init_app(app, config={
-        'CACHE_TYPE': 'SimpleCache',  # In-Memory Cache
-        'CACHE_DEFAULT_TIMEOUT': 300,  # 5 Minuten Default
+        'CACHE_TYPE': cache_type,
+        'CACHE_DEFAULT_TIMEOUT': cache_timeout,
+        'CACHE_SHARED_PATH': app.config.get('CACHE_SHARED_PATH'),
+        'CACHE_TAG_RULES': CACHE_TAG_RULES,
     })
+    register_cache_invalidation(app)
+
+    from app.services.modulhandbuch_service import register_modulhandbuch_listeners
+    register_modulhandbuch_listeners(app)
+
+    from app.services.modul_suche_service import register_modul_suche_listeners
+    register_modul_suche_listeners(app)
     app.logger.info('[OK] Cache initialized')
-    app.logger.info(f"   Type: SimpleCache (in-memory)")
-    app.logger.info(f"   Default Timeout: 300 seconds")
+    app.logger.info(f"   Type: {cache_type}")
+    app.logger.info(f"   Default Timeout: {cache_timeout} seconds")
 
     # =====================================================================
     # CSRF Protection - Protection against CSRF attacks
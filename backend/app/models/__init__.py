@@ -60,11 +60,15 @@ from .studiengang import Studiengang, Pruefungsordnung
 from .lehrform import Lehrform
 from .sprache import Sprache
 from .modulhandbuch import Modulhandbuch
+from .modul_suche import ModulSuchindex
 
 # Optional
 from .audit import AuditLog
 from .notification import Benachrichtigung
 
+# JWT Blocklist (Logout)
+from .token_blocklist import GesperrterToken
+
 # Semesteraufträge
 from .auftrag import Auftrag, SemesterAuftrag
 
@@ -119,6 +123,7 @@ __all__ = [
     'Lehrform',
     'Sprache',
     'Modulhandbuch',
+    'ModulSuchindex',
     
     # Modul-Details
     'ModulLiteratur',
@@ -134,6 +139,9 @@ __all__ = [
     'AuditLog',
     'Benachrichtigung',
 
+    # JWT Blocklist
+    'GesperrterToken',
+
     # Deputatsabrechnung
     'DeputatsEinstellungen',
     'Deputatsabrechnung',
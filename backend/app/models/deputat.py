@@ -257,8 +257,7 @@ class Deputatsabrechnung(db.Model):
         if einstellungen is None:
             einstellungen = DeputatsEinstellungen.get_current()
 
-        # Lehrtätigkeiten (mit Obergrenzen)
-        sws_lehrtaetigkeiten = 0.0
+        # Lehrtätigkeiten nach Kategorie
         sws_praxisseminar = 0.0
         sws_projektveranstaltung = 0.0
         sws_seminar_master = 0.0
@@ -274,6 +273,171 @@ class Deputatsabrechnung(db.Model):
             else:
                 sws_sonstige += lt.sws
 
+        return self._summen_aus_werten(
+            {
+                'sws_praxisseminar': sws_praxisseminar,
+                'sws_projektveranstaltung': sws_projektveranstaltung,
+                'sws_seminar_master': sws_seminar_master,
+                'sws_sonstige': sws_sonstige,
+                'sws_lehrexport': sum(le.sws for le in self.lehrexporte),
+                'sws_vertretungen': sum(v.sws for v in self.vertretungen),
+                'sws_ermaessigungen': sum(e.sws for e in self.ermaessigungen),
+                'sws_betreuungen_roh': sum(b.sws for b in self.betreuungen),
+                'anzahl_lehrtaetigkeiten': len(self.lehrtaetigkeiten),
+                'anzahl_lehrexporte': len(self.lehrexporte),
+                'anzahl_vertretungen': len(self.vertretungen),
+                'anzahl_ermaessigungen': len(self.ermaessigungen),
+                'anzahl_betreuungen': len(self.betreuungen),
+            },
+            self.netto_lehrverpflichtung,
+            einstellungen
+        )
+
+    # Max. Anzahl Abrechnungen pro Aggregations-Query (IN-Liste)
+    BATCH_SIZE = 500
+
+    @classmethod
+    def berechne_summen_batch(
+        cls,
+        abrechnungen: List['Deputatsabrechnung'],
+        einstellungen: 'DeputatsEinstellungen' = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Berechnet die Summen vieler Abrechnungen mengenbasiert.
+
+        Statt fünf Relationships pro Abrechnung zu laden, werden SWS-Summen
+        und Anzahlen aller Positionen mit einer UNION ALL / GROUP BY Query
+        pro Block von Abrechnungen ermittelt. Obergrenzen, Differenz und
+        Bewertung werden identisch zu berechne_summen() angewendet.
+
+        Args:
+            abrechnungen: Liste von Deputatsabrechnungen
+            einstellungen: DeputatsEinstellungen für Obergrenzen
+
+        Returns:
+            Dict {abrechnung_id: summen}
+        """
+        from .deputat_einstellungen import DeputatsEinstellungen
+
+        if not abrechnungen:
+            return {}
+
+        if einstellungen is None:
+            einstellungen = DeputatsEinstellungen.get_current()
+
+        # Startwerte wie in berechne_summen() (Kategorien float, sum() int)
+        werte = {
+            a.id: {
+                'sws_praxisseminar': 0.0,
+                'sws_projektveranstaltung': 0.0,
+                'sws_seminar_master': 0.0,
+                'sws_sonstige': 0.0,
+                'sws_lehrexport': 0,
+                'sws_vertretungen': 0,
+                'sws_ermaessigungen': 0,
+                'sws_betreuungen_roh': 0,
+                'anzahl_lehrtaetigkeiten': 0,
+                'anzahl_lehrexporte': 0,
+                'anzahl_vertretungen': 0,
+                'anzahl_ermaessigungen': 0,
+                'anzahl_betreuungen': 0,
+            }
+            for a in abrechnungen
+        }
+
+        kategorie_keys = {
+            'praxisseminar': 'sws_praxisseminar',
+            'projektveranstaltung': 'sws_projektveranstaltung',
+            'seminar_master': 'sws_seminar_master',
+        }
+        typ_keys = {
+            'lehrexport': ('sws_lehrexport', 'anzahl_lehrexporte'),
+            'vertretung': ('sws_vertretungen', 'anzahl_vertretungen'),
+            'ermaessigung': ('sws_ermaessigungen', 'anzahl_ermaessigungen'),
+            'betreuung': ('sws_betreuungen_roh', 'anzahl_betreuungen'),
+        }
+
+        ids = list(werte)
+        for i in range(0, len(ids), cls.BATCH_SIZE):
+            for abrechnung_id, typ, kategorie, sws, anzahl in db.session.execute(
+                cls._summen_query(ids[i:i + cls.BATCH_SIZE])
+            ):
+                w = werte[abrechnung_id]
+                if typ == 'lehrtaetigkeit':
+                    w[kategorie_keys.get(kategorie, 'sws_sonstige')] += sws
+                    w['anzahl_lehrtaetigkeiten'] += anzahl
+                else:
+                    sws_key, anzahl_key = typ_keys[typ]
+                    w[sws_key] += sws
+                    w[anzahl_key] += anzahl
+
+        return {
+            a.id: cls._summen_aus_werten(werte[a.id], a.netto_lehrverpflichtung, einstellungen)
+            for a in abrechnungen
+        }
+
+    @staticmethod
+    def _summen_query(abrechnung_ids: List[int]):
+        """UNION ALL über alle Positionstabellen, gruppiert nach Abrechnung"""
+        teile = [
+            db.select(
+                DeputatsLehrtaetigkeit.deputatsabrechnung_id,
+                db.literal('lehrtaetigkeit'),
+                DeputatsLehrtaetigkeit.kategorie,
+                db.func.sum(DeputatsLehrtaetigkeit.sws),
+                db.func.count()
+            ).where(
+                DeputatsLehrtaetigkeit.deputatsabrechnung_id.in_(abrechnung_ids)
+            ).group_by(
+                DeputatsLehrtaetigkeit.deputatsabrechnung_id,
+                DeputatsLehrtaetigkeit.kategorie
+            )
+        ]
+        for typ, model in (
+            ('lehrexport', DeputatsLehrexport),
+            ('vertretung', DeputatsVertretung),
+            ('ermaessigung', DeputatsErmaessigung),
+            ('betreuung', DeputatsBetreuung),
+        ):
+            teile.append(
+                db.select(
+                    model.deputatsabrechnung_id,
+                    db.literal(typ),
+                    db.null(),
+                    db.func.sum(model.sws),
+                    db.func.count()
+                ).where(
+                    model.deputatsabrechnung_id.in_(abrechnung_ids)
+                ).group_by(model.deputatsabrechnung_id)
+            )
+        return db.union_all(*teile)
+
+    @staticmethod
+    def _summen_aus_werten(
+        werte: Dict[str, Any],
+        netto_lehrverpflichtung: float,
+        einstellungen: 'DeputatsEinstellungen'
+    ) -> Dict[str, Any]:
+        """
+        Wendet Obergrenzen an und berechnet Differenz, Bewertung und Warnungen
+
+        Args:
+            werte: Roh-Summen und Anzahlen pro Kategorie
+            netto_lehrverpflichtung: Soll-Deputat
+            einstellungen: DeputatsEinstellungen für Obergrenzen
+
+        Returns:
+            Dict mit allen berechneten Summen
+        """
+        sws_praxisseminar = werte['sws_praxisseminar']
+        sws_projektveranstaltung = werte['sws_projektveranstaltung']
+        sws_seminar_master = werte['sws_seminar_master']
+        sws_sonstige = werte['sws_sonstige']
+        sws_lehrexport = werte['sws_lehrexport']
+        sws_vertretungen = werte['sws_vertretungen']
+        sws_ermaessigungen = werte['sws_ermaessigungen']
+        sws_betreuungen_roh = werte['sws_betreuungen_roh']
+
         # Obergrenzen anwenden
         sws_praxisseminar_angerechnet = min(sws_praxisseminar, einstellungen.max_sws_praxisseminar)
         sws_projektveranstaltung_angerechnet = min(sws_projektveranstaltung, einstellungen.max_sws_projektveranstaltung)
@@ -286,17 +450,7 @@ class Deputatsabrechnung(db.Model):
             sws_seminar_master_angerechnet
         )
 
-        # Lehrexport
-        sws_lehrexport = sum(le.sws for le in self.lehrexporte)
-
-        # Vertretungen
-        sws_vertretungen = sum(v.sws for v in self.vertretungen)
-
-        # Ermäßigungen
-        sws_ermaessigungen = sum(e.sws for e in self.ermaessigungen)
-
         # Betreuungen (mit Obergrenze)
-        sws_betreuungen_roh = sum(b.sws for b in self.betreuungen)
         sws_betreuungen_angerechnet = min(sws_betreuungen_roh, einstellungen.max_sws_betreuung)
 
         # Gesamtdeputat (erbrachte Lehre + Funktionen/Semesteraufträge)
@@ -314,7 +468,7 @@ class Deputatsabrechnung(db.Model):
         nettobelastung = gesamtdeputat
 
         # Differenz = Gesamtdeputat - Netto-Lehrverpflichtung
-        differenz = gesamtdeputat - self.netto_lehrverpflichtung
+        differenz = gesamtdeputat - netto_lehrverpflichtung
 
         # Status-Bewertung
         if abs(differenz) <= 1.0:
@@ -363,7 +517,7 @@ class Deputatsabrechnung(db.Model):
             # Summen
             'gesamtdeputat': round(gesamtdeputat, 2),
             'nettobelastung': round(nettobelastung, 2),
-            'netto_lehrverpflichtung': round(self.netto_lehrverpflichtung, 2),
+            'netto_lehrverpflichtung': round(netto_lehrverpflichtung, 2),
             'differenz': round(differenz, 2),
 
             # Bewertung
@@ -371,19 +525,29 @@ class Deputatsabrechnung(db.Model):
             'warnungen': warnungen,
 
             # Anzahlen
-            'anzahl_lehrtaetigkeiten': len(self.lehrtaetigkeiten),
-            'anzahl_lehrexporte': len(self.lehrexporte),
-            'anzahl_vertretungen': len(self.vertretungen),
-            'anzahl_ermaessigungen': len(self.ermaessigungen),
-            'anzahl_betreuungen': len(self.betreuungen),
+            'anzahl_lehrtaetigkeiten': werte['anzahl_lehrtaetigkeiten'],
+            'anzahl_lehrexporte': werte['anzahl_lehrexporte'],
+            'anzahl_vertretungen': werte['anzahl_vertretungen'],
+            'anzahl_ermaessigungen': werte['anzahl_ermaessigungen'],
+            'anzahl_betreuungen': werte['anzahl_betreuungen'],
         }
 
     # =========================================================================
     # SERIALISIERUNG
     # =========================================================================
 
-    def to_dict(self, include_details: bool = False, include_summen: bool = False) -> Dict[str, Any]:
-        """Konvertiert zu Dictionary (für API)"""
+    def to_dict(
+        self,
+        include_details: bool = False,
+        include_summen: bool = False,
+        summen: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Konvertiert zu Dictionary (für API)
+
+        Args:
+            summen: Bereits berechnete Summen (z.B. aus berechne_summen_batch)
+        """
         data = {
             'id': self.id,
             'planungsphase_id': self.planungsphase_id,
@@ -432,7 +596,9 @@ class Deputatsabrechnung(db.Model):
             data['ermaessigungen'] = [e.to_dict() for e in self.ermaessigungen]
             data['betreuungen'] = [b.to_dict() for b in self.betreuungen]
 
-        if include_summen:
+        if include_summen and summen is not None:
+            data['summen'] = summen
+        elif include_summen:
             try:
                 data['summen'] = self.berechne_summen()
             except Exception as e:
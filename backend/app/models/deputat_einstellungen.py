@@ -8,11 +8,29 @@ Enthält:
 - SWS-Werte für Betreuungen
 - Obergrenzen für verschiedene Lehrkategorien
 - Warnschwellen
+
+Caching:
+    get_current() hält die aktive Version prozesslokal vor. Ein Versions-
+    Counter im geteilten Cache (für alle Gunicorn-Worker sichtbar) wird bei
+    jeder neuen Version erhöht; nur dann wird neu aus der DB geladen.
+    Innerhalb eines Requests wird auch der Counter nur einmal gelesen.
 """
 
+import threading
 from datetime import datetime
-from typing import Dict, Any
-from app.extensions import db
+from typing import Dict, Any, Optional, Tuple
+from flask import g
+from sqlalchemy.orm import make_transient_to_detached
+from app.extensions import db, cache
+from app.utils.db_routing import replica_router
+
+
+# Versions-Counter im geteilten Cache
+VERSION_KEY = 'version/deputats_einstellungen'
+
+# Prozesslokaler Cache: (version, Spaltenwerte der aktiven Einstellungen)
+_cache_lock = threading.Lock()
+_cached: Optional[Tuple[Any, Dict[str, Any]]] = None
 
 
 class DeputatsEinstellungen(db.Model):
@@ -103,10 +121,39 @@ class DeputatsEinstellungen(db.Model):
         Holt die aktuellen aktiven Einstellungen.
         Falls keine existieren, werden Default-Einstellungen erstellt.
 
+        Die Werte kommen aus dem prozesslokalen Cache, solange der
+        Versions-Counter unverändert ist. Das Objekt wird ohne Query in die
+        aktuelle Session übernommen (merge mit load=False).
+
         Returns:
             DeputatsEinstellungen: Aktive Einstellungen
         """
-        einstellungen = cls.query.filter_by(ist_aktiv=True).first()
+        global _cached
+
+        einstellungen = g.get('deputats_einstellungen')
+        if einstellungen is not None:
+            return einstellungen
+
+        version = cache.get(VERSION_KEY)
+        with _cache_lock:
+            cached = _cached
+
+        if cached is not None and cached[0] == version:
+            einstellungen = cls._aus_werten(cached[1])
+        else:
+            einstellungen = cls._lade_aktive()
+            with _cache_lock:
+                _cached = (version, cls._spalten_werte(einstellungen))
+
+        g.deputats_einstellungen = einstellungen
+        return einstellungen
+
+    @classmethod
+    def _lade_aktive(cls) -> 'DeputatsEinstellungen':
+        """Lädt die aktiven Einstellungen aus der DB (erstellt ggf. Defaults)"""
+        # Primary: die Werte werden unter der aktuellen Version gecacht
+        with replica_router.primary():
+            einstellungen = cls.query.filter_by(ist_aktiv=True).first()
 
         if einstellungen is None:
             # Erstelle Default-Einstellungen
@@ -116,9 +163,34 @@ class DeputatsEinstellungen(db.Model):
             )
             db.session.add(einstellungen)
             db.session.commit()
+            cls.invalidate_cache()
 
         return einstellungen
 
+    @classmethod
+    def _spalten_werte(cls, einstellungen: 'DeputatsEinstellungen') -> Dict[str, Any]:
+        return {column.key: getattr(einstellungen, column.key) for column in cls.__table__.columns}
+
+    @classmethod
+    def _aus_werten(cls, werte: Dict[str, Any]) -> 'DeputatsEinstellungen':
+        """Baut aus gecachten Werten ein Session-Objekt (ohne Query)"""
+        einstellungen = cls(**werte)
+        make_transient_to_detached(einstellungen)
+        return db.session.merge(einstellungen, load=False)
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """
+        Erhöht den Versions-Counter: alle Worker laden beim nächsten
+        Zugriff neu. Muss nach dem Commit aufgerufen werden.
+        """
+        global _cached
+
+        g.pop('deputats_einstellungen', None)
+        with _cache_lock:
+            _cached = None
+        cache.cache.inc(VERSION_KEY)
+
     @classmethod
     def erstelle_neue_version(
         cls,
@@ -166,6 +238,7 @@ class DeputatsEinstellungen(db.Model):
 
         db.session.add(neue_einstellungen)
         db.session.commit()
+        cls.invalidate_cache()
 
         return neue_einstellungen
 
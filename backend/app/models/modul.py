@@ -18,6 +18,7 @@ Alle Modul-bezogenen Tabellen:
 """
 
 from datetime import datetime
+from sqlalchemy.orm import validates
 from .base import db
 
 
@@ -348,8 +349,75 @@ class ModulDozent(db.Model):
     # Indexes
     __table_args__ = (
         db.Index('idx_modul_dozent', 'modul_id', 'dozent_id'),
+        db.Index('ix_modul_dozent_rolle_dozent', 'rolle', 'dozent_id'),
     )
 
+    # Kanonische Rollen - abweichende Schreibweisen (Import, Altdaten,
+    # Frontend) werden beim Schreiben vereinheitlicht
+    ROLLE_VERANTWORTLICHER = 'verantwortlicher'
+    ROLLE_LEHRPERSON = 'lehrperson'
+    ROLLEN_ALIASE = {
+        'modulverantwortlicher': ROLLE_VERANTWORTLICHER,
+        'verantwortlich': ROLLE_VERANTWORTLICHER,
+        'dozent': ROLLE_LEHRPERSON,
+    }
+
+    @classmethod
+    def normalisiere_rolle(cls, rolle):
+        """Bildet eine Rollen-Schreibweise auf den kanonischen Namen ab"""
+        if rolle is None:
+            return None
+        rolle = rolle.strip().lower()
+        return cls.ROLLEN_ALIASE.get(rolle, rolle)
+
+    @classmethod
+    def schreibweisen(cls, rolle):
+        """
+        Alle gespeicherten Schreibweisen einer kanonischen Rolle.
+
+        Bestand aus der Zeit vor der Normalisierung enthält z.B. noch
+        'Modulverantwortlicher' oder 'Dozent', bis 'flask
+        normalize-modul-rollen' gelaufen ist.
+        """
+        namen = [rolle] + [alias for alias, ziel in cls.ROLLEN_ALIASE.items() if ziel == rolle]
+        varianten = []
+        for name in namen:
+            for variante in (name, name.capitalize(), name.upper()):
+                if variante not in varianten:
+                    varianten.append(variante)
+        return varianten
+
+    @classmethod
+    def rolle_ist(cls, rolle):
+        """
+        SQL-Filter auf eine Rolle inkl. Alt-Schreibweisen (nutzt den Index
+        auf rolle, anders als lower(rolle))
+        """
+        return cls.rolle.in_(cls.schreibweisen(cls.normalisiere_rolle(rolle)))
+
+    @validates('rolle')
+    def _validate_rolle(self, key, rolle):
+        return self.normalisiere_rolle(rolle)
+
+    @classmethod
+    def normalisiere_bestand(cls) -> int:
+        """
+        Vereinheitlicht die Rollen bestehender Zuordnungen (einmalig nach
+        Import/Update, siehe 'flask normalize-modul-rollen')
+
+        Returns:
+            int: Anzahl geänderter Zuordnungen
+        """
+        count = 0
+        for (rolle,) in db.session.query(cls.rolle).distinct().all():
+            kanonisch = cls.normalisiere_rolle(rolle)
+            if kanonisch != rolle:
+                count += db.session.query(cls).filter(cls.rolle == rolle).update(
+                    {cls.rolle: kanonisch}, synchronize_session=False
+                )
+        db.session.commit()
+        return count
+
     def __repr__(self):
         return f'<ModulDozent {self.modul.kuerzel if self.modul else "?"} - {self.dozent.name_komplett if self.dozent else "?"}>'
 
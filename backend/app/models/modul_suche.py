@@ -0,0 +1,39 @@
+"""
+Modul Suchindex
+===============
+Volltext-Index über Module (Kürzel, Titel, Lernergebnisse, Literatur).
+
+PostgreSQL: tsvector mit GIN-Index, gepflegt von ModulSucheService.
+SQLite: Tabelle bleibt leer, gesucht wird im prozesslokalen Index.
+"""
+
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from .base import db
+
+
+class ModulSuchindex(db.Model):
+    """
+    Suchdokument pro Modul (gewichteter tsvector)
+
+    Gewichte:
+        A: Kürzel, deutsche Bezeichnung
+        B: Englische Bezeichnung, Untertitel
+        C: Lernziele, Kompetenzen, Inhalt
+        D: Literatur (Titel, Autoren)
+    """
+    __tablename__ = 'modul_suchindex'
+
+    modul_id = db.Column(db.Integer, db.ForeignKey('modul.id', ondelete='CASCADE'), primary_key=True)
+    po_id = db.Column(db.Integer, db.ForeignKey('pruefungsordnung.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    dokument = db.Column(TSVECTOR().with_variant(db.Text, 'sqlite'), nullable=False)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_modul_suchindex_dokument', 'dokument', postgresql_using='gin'),
+    )
+
+    def __repr__(self):
+        return f'<ModulSuchindex modul={self.modul_id}>'
@@ -23,6 +23,11 @@ class Benachrichtigung(db.Model):
     
     # Relationships
     empfaenger = db.relationship('Benutzer', back_populates='benachrichtigungen')
+
+    # Retention-DELETE filtert auf gelesen + gelesen_am
+    __table_args__ = (
+        db.Index('ix_benachrichtigung_gelesen_am', 'gelesen', 'gelesen_am'),
+    )
     
     def __repr__(self):
         return f'<Benachrichtigung {self.titel}>'
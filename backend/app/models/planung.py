@@ -133,6 +133,7 @@ class Semesterplanung(db.Model):
         db.UniqueConstraint('semester_id', 'benutzer_id', 'planungsphase_id', name='uq_semester_benutzer_phase'),
         db.Index('ix_semesterplanung_status_semester', 'status', 'semester_id'),
         db.Index('ix_semesterplanung_benutzer_status', 'benutzer_id', 'status'),
+        db.Index('ix_semesterplanung_phase_id', 'planungsphase_id', 'id'),
     )
     
     def __repr__(self):
@@ -362,12 +363,14 @@ class Semesterplanung(db.Model):
     # HELPER METHODS
     # =========================================================================
     
-    def to_dict(self, include_module=False):
+    def to_dict(self, include_module=False, anzahl_module=None):
         """
         Konvertiert zu Dictionary (fÃ¼r API)
 
         Args:
             include_module: Sollen alle Module inkludiert werden?
+            anzahl_module: Optional - vorberechnete Modulanzahl (wenn die
+                geplanten Module nicht geladen wurden)
         """
         data = {
             'id': self.id,
@@ -394,7 +397,7 @@ class Semesterplanung(db.Model):
             'room_requirements': self.room_requirements,
             'special_requests': self.special_requests,
             'gesamt_sws': self.gesamt_sws,
-            'anzahl_module': self.anzahl_module,
+            'anzahl_module': self.anzahl_module if anzahl_module is None else anzahl_module,
             'eingereicht_am': self.eingereicht_am.isoformat() if self.eingereicht_am else None,
             'freigegeben_am': self.freigegeben_am.isoformat() if self.freigegeben_am else None,
             'abgelehnt_am': self.abgelehnt_am.isoformat() if self.abgelehnt_am else None,
@@ -525,6 +528,7 @@ class GeplantesModul(db.Model):
     __table_args__ = (
         db.UniqueConstraint('semesterplanung_id', 'modul_id', name='uq_planung_modul'),
         db.Index('ix_geplantes_modul_planung', 'semesterplanung_id'),
+        db.Index('ix_geplantes_modul_modul_planung', 'modul_id', 'semesterplanung_id'),
     )
     
     def __repr__(self):
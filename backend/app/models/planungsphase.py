@@ -84,59 +84,76 @@ class Planungsphase(BaseModel):
         return new_phase
 
     def close_phase(self, user_id, archiviere_entwuerfe=False, grund=None):
-        """Schließt diese Planungsphase mit Archivierung"""
-        from app.models.planung import Semesterplanung
-
-        # Archiviere alle eingereichten/genehmigten/abgelehnten Planungen
-        planungen_to_archive = Semesterplanung.query.filter(
-            Semesterplanung.semester_id == self.semester_id,
-            Semesterplanung.status.in_(['eingereicht', 'freigegeben', 'abgelehnt'])
-        ).all()
-
-        archiviert_count = 0
-        for planung in planungen_to_archive:
-            ArchiviertePlanung.archive_planung(
-                planung=planung,
+        """
+        Schließt diese Planungsphase mit Archivierung
+
+        Alles läuft in einer Transaktion: Archiv-Snapshots werden gesammelt
+        erzeugt und per Bulk-INSERT geschrieben, Entwürfe mengenbasiert
+        gelöscht. Bei einem Fehler bleibt die Phase unverändert offen.
+        """
+        from app.models.planung import Semesterplanung, GeplantesModul, WunschFreierTag
+
+        planungen_filter = Semesterplanung.semester_id == self.semester_id
+
+        try:
+            # Eingereichte/genehmigte/abgelehnte Planungen
+            archiv_ids = db.session.execute(
+                db.select(Semesterplanung.id).where(
+                    planungen_filter,
+                    Semesterplanung.status.in_(['eingereicht', 'freigegeben', 'abgelehnt'])
+                ).order_by(Semesterplanung.id)
+            ).scalars().all()
+
+            # Entwürfe
+            entwurf_filter = and_(planungen_filter, Semesterplanung.status == 'entwurf')
+            entwurf_ids = db.session.execute(
+                db.select(Semesterplanung.id).where(entwurf_filter).order_by(Semesterplanung.id)
+            ).scalars().all()
+
+            ArchiviertePlanung.archive_planungen(
+                planung_ids=archiv_ids + (entwurf_ids if archiviere_entwuerfe else []),
                 phase=self,
                 archiviert_von=user_id,
                 grund='phase_geschlossen'
             )
-            archiviert_count += 1
-
-        # Handle Entwürfe
-        entwuerfe = Semesterplanung.query.filter(
-            Semesterplanung.semester_id == self.semester_id,
-            Semesterplanung.status == 'entwurf'
-        ).all()
 
-        geloescht_count = 0
-        if archiviere_entwuerfe:
-            # Archiviere Entwürfe
-            for entwurf in entwuerfe:
-                ArchiviertePlanung.archive_planung(
-                    planung=entwurf,
-                    phase=self,
-                    archiviert_von=user_id,
-                    grund='phase_geschlossen'
+            if entwurf_ids and not archiviere_entwuerfe:
+                # Lösche Entwürfe inkl. abhängiger Zeilen (entspricht ORM-Cascade)
+                entwurf_subquery = db.select(Semesterplanung.id).where(entwurf_filter)
+                for model, fk_column in (
+                    (GeplantesModul, GeplantesModul.semesterplanung_id),
+                    (WunschFreierTag, WunschFreierTag.semesterplanung_id),
+                    (PhaseSubmission, PhaseSubmission.planung_id),
+                ):
+                    db.session.execute(
+                        db.delete(model).where(fk_column.in_(entwurf_subquery)),
+                        execution_options={'synchronize_session': False}
+                    )
+                db.session.execute(
+                    db.delete(Semesterplanung).where(entwurf_filter),
+                    execution_options={'synchronize_session': False}
                 )
-                geloescht_count += 1
-        else:
-            # Lösche Entwürfe
-            for entwurf in entwuerfe:
-                db.session.delete(entwurf)
-                geloescht_count += 1
 
-        # Schließe die Phase
-        self.ist_aktiv = False
-        self.geschlossen_am = datetime.utcnow()
-        self.geschlossen_von = user_id
-        self.geschlossen_grund = grund or 'Manuell geschlossen'
+            # Schließe die Phase
+            self.ist_aktiv = False
+            self.geschlossen_am = datetime.utcnow()
+            self.geschlossen_von = user_id
+            self.geschlossen_grund = grund or 'Manuell geschlossen'
 
-        db.session.commit()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Gelöschte Entwürfe nicht aus der Identity Map weiterverwenden
+        db.session.expire_all()
+        if entwurf_ids:
+            from app.utils.cache_utils import invalidate_semesterplanung_caches
+            invalidate_semesterplanung_caches()
 
         return {
-            'archivierte_planungen': archiviert_count,
-            'geloeschte_entwuerfe': geloescht_count
+            'archivierte_planungen': len(archiv_ids),
+            'geloeschte_entwuerfe': len(entwurf_ids)
         }
 
     def get_statistics(self):
@@ -353,17 +370,19 @@ class ArchiviertePlanung(BaseModel):
     archivierer = db.relationship('Benutzer', foreign_keys=[archiviert_von])
     semester = db.relationship('Semester')
 
-    @classmethod
-    def archive_planung(cls, planung, phase, archiviert_von, grund='manuell'):
-        """Archiviert eine Planung"""
-        from app.models.user import Benutzer
-        from app.models.semester import Semester
+    # Max. Planungen pro Bulk-Archivierungsschritt (IN-Listen, INSERT)
+    BULK_CHUNK_SIZE = 500
 
-        professor = Benutzer.query.get(planung.benutzer_id)
-        semester = Semester.query.get(planung.semester_id)
+    @staticmethod
+    def _planung_snapshot(planung, geplante_module):
+        """
+        Baut die planung_daten einer Planung
 
-        # Sammle alle Planungsdaten
-        planung_data = {
+        Args:
+            planung: Semesterplanung (oder Row mit denselben Attributen)
+            geplante_module: Iterable von (GeplantesModul-Werte, modul_name)
+        """
+        return {
             'id': planung.id,
             'dozent_id': planung.benutzer_id,
             'semester_id': planung.semester_id,
@@ -372,20 +391,34 @@ class ArchiviertePlanung(BaseModel):
             'anmerkungen': planung.anmerkungen,
             'created_at': planung.created_at.isoformat(),
             'updated_at': planung.updated_at.isoformat(),
-            'geplante_module': []
+            'geplante_module': [
+                {
+                    'modul_id': modul.modul_id,
+                    'modul_name': modul_name,
+                    'multiplikator_vorlesung': modul.anzahl_vorlesungen,
+                    'multiplikator_seminar': modul.anzahl_seminare,
+                    'multiplikator_uebung': modul.anzahl_uebungen,
+                    'multiplikator_praktikum': modul.anzahl_praktika,
+                    'berechnete_sws': modul.sws_gesamt
+                }
+                for modul, modul_name in geplante_module
+            ]
         }
 
-        # Füge geplante Module hinzu
-        for modul in planung.geplante_module:
-            planung_data['geplante_module'].append({
-                'modul_id': modul.modul_id,
-                'modul_name': modul.modul.bezeichnung_de if modul.modul else None,
-                'multiplikator_vorlesung': modul.anzahl_vorlesungen,
-                'multiplikator_seminar': modul.anzahl_seminare,
-                'multiplikator_uebung': modul.anzahl_uebungen,
-                'multiplikator_praktikum': modul.anzahl_praktika,
-                'berechnete_sws': modul.sws_gesamt
-            })
+    @classmethod
+    def archive_planung(cls, planung, phase, archiviert_von, grund='manuell'):
+        """Archiviert eine Planung"""
+        from app.models.user import Benutzer
+        from app.models.semester import Semester
+
+        professor = db.session.get(Benutzer, planung.benutzer_id)
+        semester = db.session.get(Semester, planung.semester_id)
+
+        # Sammle alle Planungsdaten
+        planung_data = cls._planung_snapshot(
+            planung,
+            [(modul, modul.modul.bezeichnung_de if modul.modul else None) for modul in planung.geplante_module]
+        )
 
         # Erstelle Archiveintrag
         archived = cls(
@@ -407,6 +440,97 @@ class ArchiviertePlanung(BaseModel):
 
         return archived
 
+    @classmethod
+    def archive_planungen(cls, planung_ids, phase, archiviert_von, grund='manuell'):
+        """
+        Archiviert viele Planungen mengenbasiert (ohne Commit)
+
+        Lädt Planungen, Professoren, Semester und geplante Module mit je
+        einer Query pro Block, baut die Snapshots im Speicher und schreibt
+        sie per Bulk-INSERT. Der Commit liegt beim Aufrufer, damit die
+        Archivierung Teil seiner Transaktion ist.
+
+        Args:
+            planung_ids: IDs der zu archivierenden Semesterplanungen
+            phase: Planungsphase
+            archiviert_von: Benutzer-ID
+            grund: Archivierungsgrund
+
+        Returns:
+            Anzahl archivierter Planungen
+        """
+        from app.models.planung import Semesterplanung, GeplantesModul
+        from app.models.user import Benutzer
+        from app.models.semester import Semester
+        from app.models.modul import Modul
+
+        archiviert_am = datetime.utcnow()
+        anzahl = 0
+
+        for i in range(0, len(planung_ids), cls.BULK_CHUNK_SIZE):
+            chunk = planung_ids[i:i + cls.BULK_CHUNK_SIZE]
+
+            planungen = db.session.execute(
+                db.select(
+                    Semesterplanung.id, Semesterplanung.benutzer_id, Semesterplanung.semester_id,
+                    Semesterplanung.status, Semesterplanung.gesamt_sws, Semesterplanung.anmerkungen,
+                    Semesterplanung.created_at, Semesterplanung.updated_at
+                ).where(Semesterplanung.id.in_(chunk)).order_by(Semesterplanung.id)
+            ).all()
+            if not planungen:
+                continue
+
+            professoren = {
+                row.id: f"{row.vorname} {row.nachname}"
+                for row in db.session.execute(
+                    db.select(Benutzer.id, Benutzer.vorname, Benutzer.nachname)
+                    .where(Benutzer.id.in_({p.benutzer_id for p in planungen}))
+                )
+            }
+            semester = dict(db.session.execute(
+                db.select(Semester.id, Semester.bezeichnung)
+                .where(Semester.id.in_({p.semester_id for p in planungen}))
+            ).all())
+
+            module_pro_planung = {}
+            for row in db.session.execute(
+                db.select(
+                    GeplantesModul.semesterplanung_id, GeplantesModul.modul_id,
+                    GeplantesModul.anzahl_vorlesungen, GeplantesModul.anzahl_seminare,
+                    GeplantesModul.anzahl_uebungen, GeplantesModul.anzahl_praktika,
+                    GeplantesModul.sws_gesamt, Modul.bezeichnung_de
+                ).outerjoin(Modul, Modul.id == GeplantesModul.modul_id)
+                .where(GeplantesModul.semesterplanung_id.in_(chunk))
+                .order_by(GeplantesModul.id)
+            ):
+                module_pro_planung.setdefault(row.semesterplanung_id, []).append((row, row.bezeichnung_de))
+
+            db.session.execute(
+                db.insert(cls),
+                [
+                    {
+                        'original_planung_id': planung.id,
+                        'planungphase_id': phase.id,
+                        'professor_id': planung.benutzer_id,
+                        'professor_name': professoren.get(planung.benutzer_id, 'Unbekannt'),
+                        'semester_id': planung.semester_id,
+                        'semester_name': semester.get(planung.semester_id, 'Unbekannt'),
+                        'phase_name': phase.name,
+                        'status_bei_archivierung': planung.status,
+                        'archiviert_am': archiviert_am,
+                        'archiviert_grund': grund,
+                        'archiviert_von': archiviert_von,
+                        'planung_daten': cls._planung_snapshot(planung, module_pro_planung.get(planung.id, [])),
+                        'created_at': archiviert_am,
+                        'updated_at': archiviert_am,
+                    }
+                    for planung in planungen
+                ]
+            )
+            anzahl += len(planungen)
+
+        return anzahl
+
     def restore(self, restored_by):
         """Stellt eine archivierte Planung wieder her"""
         from app.models.planung import Semesterplanung, GeplantesModul
@@ -446,6 +570,48 @@ class ArchiviertePlanung(BaseModel):
     @classmethod
     def get_filtered(cls, filter_dict):
         """Holt gefilterte archivierte Planungen"""
+        query = cls._filtered_query(filter_dict)
+
+        # Pagination
+        limit = filter_dict.get('limit', 50)
+        offset = filter_dict.get('offset', 0)
+
+        total = query.count()
+        planungen = query.order_by(cls.archiviert_am.desc()).limit(limit).offset(offset).all()
+
+        return {
+            'planungen': [p.to_dict() for p in planungen],
+            'total': total,
+            'pages': (total + limit - 1) // limit  # Ceiling division
+        }
+
+    @classmethod
+    def iter_filtered(cls, filter_dict, yield_per=100):
+        """
+        Wie get_filtered(), aber die Planungen als Generator über einen
+        Server-Side-Cursor (für gestreamte Responses, planung_daten ist groß)
+
+        Returns:
+            (Dict mit total/pages/anzahl, Generator von Dicts)
+        """
+        query = cls._filtered_query(filter_dict)
+
+        limit = filter_dict.get('limit', 50)
+        offset = filter_dict.get('offset', 0)
+        total = query.count()
+
+        def planungen():
+            for planung in query.order_by(cls.archiviert_am.desc()).limit(limit).offset(offset).yield_per(yield_per):
+                yield planung.to_dict()
+
+        return {
+            'total': total,
+            'pages': (total + limit - 1) // limit,
+            'anzahl': max(0, min(limit, total - offset))
+        }, planungen()
+
+    @classmethod
+    def _filtered_query(cls, filter_dict):
         query = cls.query
 
         if filter_dict.get('planungphase_id'):
@@ -466,18 +632,7 @@ class ArchiviertePlanung(BaseModel):
         if filter_dict.get('bis_datum'):
             query = query.filter(cls.archiviert_am <= filter_dict['bis_datum'])
 
-        # Pagination
-        limit = filter_dict.get('limit', 50)
-        offset = filter_dict.get('offset', 0)
-
-        total = query.count()
-        planungen = query.order_by(cls.archiviert_am.desc()).limit(limit).offset(offset).all()
-
-        return {
-            'planungen': [p.to_dict() for p in planungen],
-            'total': total,
-            'pages': (total + limit - 1) // limit  # Ceiling division
-        }
+        return query
 
     def to_dict(self):
         """Konvertiert zu Dictionary"""
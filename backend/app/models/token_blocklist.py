@@ -0,0 +1,24 @@
+"""
+Token Blocklist Model
+=====================
+Widerrufene JWTs (Logout), gemeinsam für alle Gunicorn-Worker.
+
+Gelesen wird inkrementell über die id (neue Einträge seit dem letzten
+Abgleich), siehe app/utils/token_blocklist.py.
+"""
+
+from datetime import datetime
+from .base import db
+
+
+class GesperrterToken(db.Model):
+    """Widerrufener Token (jti) bis zu seinem Ablauf"""
+    __tablename__ = 'token_blocklist'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), nullable=False, unique=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Ablauf des Tokens (UTC)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<GesperrterToken {self.jti[:8]}...>'
@@ -34,6 +34,21 @@ from app.services.deputat_service import DeputatService
 # Import Template Service (Feature 5)
 from app.services.template_service import TemplateService
 
+# Import Modulhandbuch Service (materialisierte Übersicht)
+from app.services.modulhandbuch_service import ModulhandbuchService
+
+# Import Modulhandbuch Import Service (PDF-Import)
+from app.services.modulhandbuch_import_service import ModulhandbuchImportService
+
+# Import Modulhandbuch PDF Service (Seiten-Auszüge)
+from app.services.modulhandbuch_pdf_service import ModulhandbuchPdfService
+
+# Import Modul Suche Service (Volltextsuche)
+from app.services.modul_suche_service import ModulSucheService
+
+# Import Deputat PDF Service (asynchrone PDF-Jobs)
+from app.services.deputat_pdf_service import DeputatPdfService
+
 # =========================================================================
 # SINGLETON INSTANCES
 # =========================================================================
@@ -50,6 +65,11 @@ sws_calculator = SWSCalculator()
 auftrag_service = AuftragService()
 deputat_service = DeputatService()
 template_service = TemplateService()
+modulhandbuch_service = ModulhandbuchService()
+modulhandbuch_import_service = ModulhandbuchImportService()
+modulhandbuch_pdf_service = ModulhandbuchPdfService()
+deputat_pdf_service = DeputatPdfService()
+modul_suche_service = ModulSucheService()
 
 
 # =========================================================================
@@ -72,6 +92,11 @@ __all__ = [
     'AuftragService',
     'DeputatService',
     'TemplateService',
+    'ModulhandbuchService',
+    'ModulhandbuchImportService',
+    'ModulhandbuchPdfService',
+    'DeputatPdfService',
+    'ModulSucheService',
 
     # Singleton Instances (HAUPTSÄCHLICH DIESE VERWENDEN!)
     'user_service',
@@ -85,4 +110,9 @@ __all__ = [
     'auftrag_service',
     'deputat_service',
     'template_service',
+    'modulhandbuch_service',
+    'modulhandbuch_import_service',
+    'modulhandbuch_pdf_service',
+    'deputat_pdf_service',
+    'modul_suche_service',
 ]
\ No newline at end of file
@@ -0,0 +1,730 @@
+"""
+Deputat PDF Service
+===================
+Asynchrone PDF-Erzeugung für Deputatsabrechnungen.
+
+Das Rendering mit reportlab blockiert einen Sync-Worker für die gesamte
+Dauer. Dieser Service verlagert es in einen lokalen Prozess-Pool:
+
+- Submit/Status über Jobs (Status im geteilten Cache, für alle Worker sichtbar;
+  ohne geteilten Cache - SimpleCache/NullCache - wird synchron gerendert)
+- Ergebnis auf Disk: deputat_<abrechnung_id>_<content_hash>.pdf
+- Wiederverwendung, solange sich die Abrechnung (inkl. Summen) nicht ändert
+- Pool-Prozesse laufen mit niedrigerer Priorität (nice), damit Rendering
+  nicht mit interaktivem API-Traffic konkurriert. Sie laden nur Config,
+  DB-Engine (eine Connection) und Cache, keine vollständige App
+- Den Job-Status (gestartet, fertig, fehler) schreibt der Render-Prozess
+  selbst; der Worker trägt nur Abstürze des Render-Prozesses nach. Stirbt
+  der Worker mitsamt Pool (max_requests, Timeout), gilt ein wartender Job
+  nach PDF_JOB_TIMEOUT ohne Lebenszeichen als fehlgeschlagen und kann neu
+  eingereicht werden
+- ZIP-Export aller PDFs einer Planungsphase als Job im selben Prozess-Pool:
+  ein Render-Prozess bestimmt Hashes und fehlende PDFs, diese werden über
+  alle Render-Prozesse verteilt gerendert, anschließend entsteht der ZIP aus
+  den abgelegten Dateien (Status/Download über die Job-Endpunkte)
+
+Config:
+    PDF_STORAGE_DIR = 'instance/pdf'
+    PDF_JOB_WORKERS = 1         # Render-Prozesse pro Gunicorn-Worker (verteilt auch ZIP-Exporte)
+    PDF_JOB_MP_CONTEXT = 'spawn'
+    PDF_JOB_NICE = 10           # Priorität der Render-Prozesse
+    PDF_JOB_TTL = 3600          # Aufbewahrung der Job-Status und ZIP-Dateien (Sekunden)
+    PDF_JOB_TIMEOUT = 600       # Wartender Job ohne Lebenszeichen gilt danach als fehlgeschlagen
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app
+
+from cachelib import NullCache, SimpleCache
+
+from app.extensions import cache
+
+
+JOB_KEY_PREFIX = 'pdfjobs/'
+
+# Job-Arten
+ART_PDF = 'pdf'
+ART_ZIP = 'zip'
+
+# Job-Status
+STATUS_WARTEND = 'wartend'
+STATUS_FERTIG = 'fertig'
+STATUS_FEHLER = 'fehler'
+
+
+class DeputatPdfService:
+    """
+    Deputat PDF Service
+
+    Verwaltet PDF-Jobs und die PDF-Ablage auf Disk.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._sync_gewarnt = False
+
+    # =========================================================================
+    # CONTENT HASH & ABLAGE
+    # =========================================================================
+
+    def content_hash(self, abrechnung) -> str:
+        """
+        Berechnet den Inhalts-Hash einer Abrechnung.
+
+        Umfasst alle Daten, die im PDF erscheinen (Stammdaten, Positionen,
+        Summen mit aktuellen Einstellungen).
+
+        Args:
+            abrechnung: Deputatsabrechnung
+
+        Returns:
+            SHA-256 Hex-Digest
+        """
+        from app.services import deputat_service
+
+        data = abrechnung.to_dict(include_details=True)
+        data['summen'] = abrechnung.berechne_summen(deputat_service.get_einstellungen())
+        payload = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _storage_dir(self) -> Path:
+        path = Path(current_app.config['PDF_STORAGE_DIR'])
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def result_path(self, abrechnung_id: int, content_hash: str) -> Path:
+        """Pfad des gespeicherten PDFs für einen Inhalts-Stand"""
+        return self._storage_dir() / f'deputat_{abrechnung_id}_{content_hash[:32]}.pdf'
+
+    def get_stored_pdf(self, abrechnung_id: int, content_hash: str) -> Optional[Path]:
+        """Liefert das gespeicherte PDF, falls für diesen Stand vorhanden"""
+        path = self.result_path(abrechnung_id, content_hash)
+        return path if path.exists() else None
+
+    def store_pdf(self, abrechnung_id: int, content_hash: str, pdf_bytes: bytes) -> Path:
+        """
+        Speichert ein PDF atomar und entfernt ältere Stände derselben Abrechnung.
+
+        Returns:
+            Pfad des gespeicherten PDFs
+        """
+        path = self.result_path(abrechnung_id, content_hash)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_bytes(pdf_bytes)
+        os.replace(tmp_path, path)
+
+        for old in path.parent.glob(f'deputat_{abrechnung_id}_*.pdf'):
+            if old != path:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+        return path
+
+    @staticmethod
+    def dateiname(abrechnung) -> str:
+        """Dateiname für den PDF-Export einer Abrechnung"""
+        benutzer_name = abrechnung.benutzer.username if abrechnung.benutzer else 'unbekannt'
+        phase_name = abrechnung.planungsphase.name if abrechnung.planungsphase else 'unbekannt'
+        safe_name = f"Deputatsabrechnung_{benutzer_name}_{phase_name}".replace(' ', '_').replace('/', '-')
+        return f"{safe_name}.pdf"
+
+    def render_and_store(self, abrechnung_id: int) -> Tuple[str, Path]:
+        """
+        Rendert das PDF einer Abrechnung und legt es unter ihrem aktuellen
+        Inhalts-Hash ab.
+
+        Returns:
+            (content_hash, Pfad des gespeicherten PDFs)
+        """
+        from app.services import deputat_service
+
+        abrechnung = deputat_service.get_by_id(abrechnung_id)
+        if not abrechnung:
+            raise ValueError('Abrechnung nicht gefunden')
+
+        content_hash = self.content_hash(abrechnung)
+        pdf_bytes = deputat_service.generate_pdf(abrechnung_id)
+        return content_hash, self.store_pdf(abrechnung_id, content_hash, pdf_bytes)
+
+    def get_or_generate_pdf(self, abrechnung) -> bytes:
+        """
+        Synchroner Export: gespeichertes PDF wiederverwenden oder erzeugen.
+
+        Args:
+            abrechnung: Deputatsabrechnung
+
+        Returns:
+            PDF als Bytes
+        """
+        from app.services import deputat_service
+
+        content_hash = self.content_hash(abrechnung)
+        stored = self.get_stored_pdf(abrechnung.id, content_hash)
+        if stored:
+            return stored.read_bytes()
+
+        pdf_bytes = deputat_service.generate_pdf(abrechnung.id)
+        self.store_pdf(abrechnung.id, content_hash, pdf_bytes)
+        return pdf_bytes
+
+    # =========================================================================
+    # JOBS
+    # =========================================================================
+
+    @staticmethod
+    def job_id_for(abrechnung_id: int, content_hash: str) -> str:
+        return f'{abrechnung_id}-{content_hash[:16]}'
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Holt den Status eines Jobs.
+
+        Fehlt der Eintrag im Cache (abgelaufen, nicht geteilter Cache), gilt
+        ein Job als fertig, wenn seine Datei (PDF bzw. ZIP) auf Disk liegt.
+        Ein wartender Job ohne Lebenszeichen seit PDF_JOB_TIMEOUT wird als
+        fehlgeschlagen markiert (Render-Prozess mit dem Worker beendet).
+        """
+        job = cache.get(JOB_KEY_PREFIX + job_id)
+        if job is None:
+            return self._job_von_datei(job_id)
+
+        if job['status'] == STATUS_WARTEND and self._ist_verwaist(job):
+            job.update(status=STATUS_FEHLER, fehler='Abgebrochen (Render-Prozess beendet)',
+                       fertig_am=datetime.utcnow().isoformat())
+            self._save_job(job)
+            current_app.logger.warning(f'[DeputatPDF] Job {job_id} stale, marked as failed')
+        return job
+
+    @staticmethod
+    def _ist_verwaist(job: Dict[str, Any]) -> bool:
+        """Kein Lebenszeichen (Submit, Start, Fortschritt) seit PDF_JOB_TIMEOUT"""
+        zuletzt = job.get('lebenszeichen_am') or job.get('eingereicht_am')
+        if not zuletzt:
+            return False
+        alter = datetime.utcnow() - datetime.fromisoformat(zuletzt)
+        return alter.total_seconds() > current_app.config.get('PDF_JOB_TIMEOUT', 600)
+
+    def _job_von_datei(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if job_id.startswith(f'{ART_ZIP}-'):
+            planungsphase_id, _, token = job_id[len(ART_ZIP) + 1:].partition('-')
+            if not planungsphase_id.isdigit() or len(token) != 16 or not token.isalnum():
+                return None
+            path = self.zip_path(job_id)
+            if not path.exists():
+                return None
+            fertig_am = datetime.utcfromtimestamp(path.stat().st_mtime).isoformat()
+            return {
+                'job_id': job_id,
+                'art': ART_ZIP,
+                'planungsphase_id': int(planungsphase_id),
+                'status': STATUS_FERTIG,
+                'eingereicht_am': fertig_am,
+                'fertig_am': fertig_am,
+                'fehler': None,
+            }
+
+        abrechnung_id, _, hash_prefix = job_id.partition('-')
+        if not abrechnung_id.isdigit() or len(hash_prefix) != 16 or not hash_prefix.isalnum():
+            return None
+        for path in self._storage_dir().glob(f'deputat_{abrechnung_id}_{hash_prefix}*.pdf'):
+            fertig_am = datetime.utcfromtimestamp(path.stat().st_mtime).isoformat()
+            return {
+                'job_id': job_id,
+                'art': ART_PDF,
+                'abrechnung_id': int(abrechnung_id),
+                'content_hash': path.stem.rsplit('_', 1)[-1],
+                'status': STATUS_FERTIG,
+                'eingereicht_am': fertig_am,
+                'fertig_am': fertig_am,
+                'fehler': None,
+            }
+        return None
+
+    def jobs_asynchron(self) -> bool:
+        """
+        Jobs im Prozess-Pool nur mit Render-Prozessen und einem Cache, den
+        alle Worker sehen. SimpleCache/NullCache halten den Job-Status pro
+        Prozess: Status-Abfragen auf einem anderen Worker fänden den Job nie.
+        """
+        if current_app.config.get('PDF_JOB_WORKERS', 1) < 1:
+            return False
+        if isinstance(cache.cache, (SimpleCache, NullCache)):
+            if not self._sync_gewarnt:
+                self._sync_gewarnt = True
+                current_app.logger.warning(
+                    f'[DeputatPDF] Cache backend {type(cache.cache).__name__} is not shared between '
+                    f'processes, PDF jobs are rendered synchronously'
+                )
+            return False
+        return True
+
+    def _save_job(self, job: Dict[str, Any]) -> None:
+        cache.set(JOB_KEY_PREFIX + job['job_id'], job, timeout=current_app.config.get('PDF_JOB_TTL', 3600))
+
+    def _update_job(self, job_id: str, **changes) -> Optional[Dict[str, Any]]:
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        job.update(changes)
+        self._save_job(job)
+        return job
+
+    def submit(self, abrechnung) -> Dict[str, Any]:
+        """
+        Reicht einen PDF-Job ein.
+
+        Existiert das PDF für den aktuellen Stand bereits, ist der Job sofort
+        fertig. Ein laufender Job für denselben Stand wird wiederverwendet,
+        ein fehlgeschlagener oder verwaister (get_job) neu eingereicht.
+        Ohne geteilten Cache (jobs_asynchron) wird im Request gerendert.
+
+        Args:
+            abrechnung: Deputatsabrechnung
+
+        Returns:
+            Job-Dict (job_id, abrechnung_id, status, ...)
+        """
+        content_hash = self.content_hash(abrechnung)
+        job_id = self.job_id_for(abrechnung.id, content_hash)
+        now = datetime.utcnow().isoformat()
+
+        if not self.get_stored_pdf(abrechnung.id, content_hash) and not self.jobs_asynchron():
+            content_hash, _ = self.render_and_store(abrechnung.id)
+            job_id = self.job_id_for(abrechnung.id, content_hash)
+
+        if self.get_stored_pdf(abrechnung.id, content_hash):
+            job = {
+                'job_id': job_id,
+                'art': ART_PDF,
+                'abrechnung_id': abrechnung.id,
+                'content_hash': content_hash,
+                'status': STATUS_FERTIG,
+                'eingereicht_am': now,
+                'fertig_am': now,
+                'fehler': None,
+            }
+            self._save_job(job)
+            return job
+
+        existing = self.get_job(job_id)
+        if existing and existing['status'] == STATUS_WARTEND:
+            return existing
+
+        job = {
+            'job_id': job_id,
+            'art': ART_PDF,
+            'abrechnung_id': abrechnung.id,
+            'content_hash': content_hash,
+            'status': STATUS_WARTEND,
+            'eingereicht_am': now,
+            'fertig_am': None,
+            'fehler': None,
+        }
+        self._save_job(job)
+
+        app = current_app._get_current_object()
+        future = self._get_executor(app).submit(_render_pdf_job, job_id, abrechnung.id)
+        future.add_done_callback(lambda f: self._on_job_done(app, job_id, f))
+
+        current_app.logger.info(f'[DeputatPDF] Job {job_id} submitted')
+        return job
+
+    def get_job_datei(self, job: Dict[str, Any]) -> Optional[Path]:
+        """Ergebnis-Datei eines fertigen Jobs (PDF bzw. ZIP)"""
+        if job.get('status') != STATUS_FERTIG:
+            return None
+        if job.get('art') == ART_ZIP:
+            path = self.zip_path(job['job_id'])
+            return path if path.exists() else None
+        return self.get_stored_pdf(job['abrechnung_id'], job['content_hash'])
+
+    def _abschliessen(self, job_id: str, felder: Optional[Dict[str, Any]] = None,
+                      exc: Optional[BaseException] = None) -> None:
+        """
+        Schreibt den Endstatus eines Jobs (im Render-Prozess).
+
+        Die Felder kommen aus dem Job (PDF: der zum Render-Zeitpunkt
+        berechnete Hash; Änderungen seit dem Submit landen unter dem
+        passenden Stand).
+        """
+        fertig_am = datetime.utcnow().isoformat()
+        if exc is None:
+            self._update_job(job_id, status=STATUS_FERTIG, fertig_am=fertig_am, **(felder or {}))
+        else:
+            self._update_job(job_id, status=STATUS_FEHLER, fehler=str(exc) or type(exc).__name__,
+                             fertig_am=fertig_am)
+
+    def lebenszeichen(self, job_id: str) -> None:
+        """Markiert einen Job als aktiv (Start, Fortschritt), siehe _ist_verwaist"""
+        self._update_job(job_id, lebenszeichen_am=datetime.utcnow().isoformat())
+
+    def _on_job_done(self, app, job_id: str, future) -> None:
+        """
+        Callback im Worker: trägt Abstürze des Render-Prozesses nach
+        (BrokenProcessPool), die dieser nicht mehr selbst schreiben konnte.
+        """
+        exc = future.exception()
+        if exc is None:
+            return
+        with app.app_context():
+            job = self.get_job(job_id)
+            if job is not None and job['status'] == STATUS_WARTEND:
+                self._abschliessen(job_id, exc=exc)
+            app.logger.error(f'[DeputatPDF] Job {job_id} failed: {exc}')
+
+    # =========================================================================
+    # ZIP-EXPORT PLANUNGSPHASE
+    # =========================================================================
+
+    def _zip_dir(self) -> Path:
+        path = self._storage_dir() / 'zip'
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def zip_path(self, job_id: str) -> Path:
+        """Pfad der ZIP-Datei eines ZIP-Jobs"""
+        return self._zip_dir() / f'{job_id}.zip'
+
+    def submit_phase_zip(self, planungsphase_id: int, status: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Reicht einen ZIP-Export aller PDFs einer Planungsphase ein.
+
+        Der Request macht nur Buchhaltung: Inhalts-Hashes, fehlende PDFs und
+        der ZIP entstehen im Prozess-Pool (_verteile_phase_zip). Ein wartender
+        Job für dieselbe Phase und denselben Status-Filter wird
+        wiederverwendet. Ohne geteilten Cache (jobs_asynchron) wird der ZIP
+        im Request gebaut.
+
+        Args:
+            planungsphase_id: Planungsphase
+            status: Optional - nur Abrechnungen mit diesem Status
+
+        Returns:
+            Job-Dict (job_id, art='zip', planungsphase_id, status, ...)
+        """
+        aktiv_key = f'{JOB_KEY_PREFIX}{ART_ZIP}-aktiv/{planungsphase_id}/{status or ""}'
+        existing_id = cache.get(aktiv_key)
+        existing = self.get_job(existing_id) if existing_id else None
+        if existing and existing['status'] == STATUS_WARTEND:
+            return existing
+
+        now = datetime.utcnow().isoformat()
+        job = {
+            'job_id': f'{ART_ZIP}-{planungsphase_id}-{uuid.uuid4().hex[:16]}',
+            'art': ART_ZIP,
+            'planungsphase_id': planungsphase_id,
+            'filter_status': status,
+            'status': STATUS_WARTEND,
+            'eingereicht_am': now,
+            'fertig_am': None,
+            'fehler': None,
+        }
+
+        if not self.jobs_asynchron():
+            self.build_phase_zip(job['job_id'], planungsphase_id, status)
+            job.update(status=STATUS_FERTIG, fertig_am=datetime.utcnow().isoformat())
+            self._save_job(job)
+            return job
+
+        self._save_job(job)
+        cache.set(aktiv_key, job['job_id'], timeout=current_app.config.get('PDF_JOB_TTL', 3600))
+
+        app = current_app._get_current_object()
+        threading.Thread(
+            target=self._verteile_phase_zip,
+            args=(app, job['job_id'], planungsphase_id, status),
+            name=f"pdf-{job['job_id']}",
+            daemon=True,
+        ).start()
+
+        current_app.logger.info(f"[DeputatPDF] ZIP job {job['job_id']} submitted")
+        return job
+
+    def _verteile_phase_zip(self, app, job_id: str, planungsphase_id: int,
+                            status: Optional[str]) -> None:
+        """
+        Steuert einen ZIP-Job (Thread im Worker, wartet nur auf den Pool).
+
+        Ein Render-Prozess plant den Export (plane_phase_zip), die fehlenden
+        PDFs werden als einzelne Aufgaben über alle Render-Prozesse verteilt,
+        zum Schluss packt ein Render-Prozess den ZIP aus den abgelegten
+        Dateien. Fehler einzelner PDFs landen in FEHLER.txt; scheitert
+        Planung, Packen oder der Pool, wird der Job als fehlgeschlagen
+        markiert. Stirbt der Worker, greift der Timeout (_ist_verwaist).
+        """
+        executor = self._get_executor(app)
+        try:
+            eintraege = executor.submit(_plane_phase_zip, job_id, planungsphase_id, status).result()
+
+            auftraege = {
+                executor.submit(_render_zip_pdf, job_id, eintrag['abrechnung_id']): eintrag
+                for eintrag in eintraege if not eintrag['vorhanden']
+            }
+            fehler = []
+            for future in as_completed(auftraege):
+                eintrag = auftraege[future]
+                try:
+                    eintrag['content_hash'] = future.result()
+                except Exception as e:
+                    app.logger.error(
+                        f"[DeputatPDF] ZIP export: abrechnung {eintrag['abrechnung_id']} failed: {e}"
+                    )
+                    eintrag['content_hash'] = None
+                    fehler.append(f"{eintrag['dateiname']}: {e}")
+
+            executor.submit(_pack_phase_zip, job_id, eintraege, fehler).result()
+            app.logger.info(
+                f'[DeputatPDF] ZIP export {job_id}: {len(eintraege)} abrechnungen, '
+                f'{len(auftraege)} rendered in pool, {len(fehler)} failed'
+            )
+        except Exception as exc:
+            with app.app_context():
+                job = self.get_job(job_id)
+                if job is not None and job['status'] == STATUS_WARTEND:
+                    self._abschliessen(job_id, exc=exc)
+            app.logger.error(f'[DeputatPDF] ZIP job {job_id} failed: {exc}')
+
+    def plane_phase_zip(self, job_id: str, planungsphase_id: int,
+                        status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Bestimmt die Einträge eines ZIP-Exports: Dateiname und aktueller
+        Inhalts-Hash je Abrechnung, und ob das PDF dazu schon abgelegt ist.
+
+        Returns:
+            Liste von Dicts (abrechnung_id, dateiname, content_hash, vorhanden)
+        """
+        from app.services import deputat_service
+
+        abrechnungen = deputat_service.get_abrechnungen_fuer_planungsphase(
+            planungsphase_id=planungsphase_id,
+            status=status
+        )
+        eintraege = []
+        for abrechnung in abrechnungen:
+            self.lebenszeichen(job_id)
+            content_hash = self.content_hash(abrechnung)
+            eintraege.append({
+                'abrechnung_id': abrechnung.id,
+                'dateiname': self.dateiname(abrechnung),
+                'content_hash': content_hash,
+                'vorhanden': self.get_stored_pdf(abrechnung.id, content_hash) is not None,
+            })
+        return eintraege
+
+    def pack_phase_zip(self, job_id: str, eintraege: List[Dict[str, Any]],
+                       fehler: Optional[List[str]] = None) -> Path:
+        """
+        Packt den ZIP aus den abgelegten PDFs (siehe plane_phase_zip).
+
+        Die PDFs werden von Disk in den ZIP kopiert, der Speicherbedarf
+        bleibt unabhängig von der Anzahl der Abrechnungen konstant.
+        Fehlgeschlagene Abrechnungen brechen den Export nicht ab, sondern
+        werden in FEHLER.txt im ZIP aufgeführt.
+
+        Returns:
+            Pfad der ZIP-Datei
+        """
+        fehler = list(fehler or [])
+        path = self.zip_path(job_id)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+
+        with zipfile.ZipFile(tmp_path, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for eintrag in eintraege:
+                if not eintrag['content_hash']:
+                    continue
+                pdf_path = self.get_stored_pdf(eintrag['abrechnung_id'], eintrag['content_hash'])
+                if pdf_path is None:
+                    fehler.append(f"{eintrag['dateiname']}: PDF nicht mehr vorhanden")
+                    continue
+                zf.write(pdf_path, arcname=eintrag['dateiname'])
+
+            if fehler:
+                zf.writestr('FEHLER.txt', '\n'.join(fehler) + '\n')
+
+        os.replace(tmp_path, path)
+        self._aufraeumen_zip(path)
+        return path
+
+    def build_phase_zip(self, job_id: str, planungsphase_id: int, status: Optional[str] = None) -> Path:
+        """
+        Baut den ZIP einer Planungsphase in einem Durchlauf (ohne Pool):
+        planen, fehlende PDFs nacheinander rendern, packen.
+
+        Returns:
+            Pfad der ZIP-Datei
+        """
+        eintraege = self.plane_phase_zip(job_id, planungsphase_id, status)
+        fehler = []
+        gerendert = 0
+
+        for eintrag in eintraege:
+            if eintrag['vorhanden']:
+                continue
+            self.lebenszeichen(job_id)
+            try:
+                eintrag['content_hash'], _ = self.render_and_store(eintrag['abrechnung_id'])
+                gerendert += 1
+            except Exception as e:
+                current_app.logger.error(
+                    f"[DeputatPDF] ZIP export: abrechnung {eintrag['abrechnung_id']} failed: {e}"
+                )
+                eintrag['content_hash'] = None
+                fehler.append(f"{eintrag['dateiname']}: {e}")
+
+        path = self.pack_phase_zip(job_id, eintraege, fehler)
+        current_app.logger.info(
+            f'[DeputatPDF] ZIP export {job_id}: {len(eintraege)} abrechnungen, '
+            f'{gerendert} rendered, {len(fehler)} failed'
+        )
+        return path
+
+    def _aufraeumen_zip(self, aktuell: Path) -> None:
+        """Entfernt ZIP-Dateien, deren Job-Status abgelaufen ist"""
+        grenze = time.time() - current_app.config.get('PDF_JOB_TTL', 3600)
+        for old in aktuell.parent.glob(f'{ART_ZIP}-*'):
+            if old == aktuell:
+                continue
+            try:
+                if old.stat().st_mtime < grenze:
+                    old.unlink()
+            except OSError:
+                pass
+
+    # =========================================================================
+    # PROZESS-POOL
+    # =========================================================================
+
+    @staticmethod
+    def _create_executor(app, max_workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_context(app.config.get('PDF_JOB_MP_CONTEXT', 'spawn')),
+            initializer=_init_pdf_worker,
+            initargs=(app.config.get('CONFIG_NAME'), app.config.get('PDF_JOB_NICE', 10)),
+        )
+
+    def _get_executor(self, app) -> ProcessPoolExecutor:
+        """Lazy Pool pro Prozess (nach fork() neu anlegen)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = self._create_executor(app, app.config.get('PDF_JOB_WORKERS', 1))
+                self._executor_pid = os.getpid()
+            return self._executor
+
+
+# =========================================================================
+# POOL-PROZESS
+# =========================================================================
+
+_worker_app = None
+
+
+def _init_pdf_worker(config_name: Optional[str], nice: int) -> None:
+    """
+    Initialisiert einen Render-Prozess: niedrige Priorität, Config,
+    DB-Engine mit einer Connection und Cache (nur lesend: Versions-Zähler
+    der Deputats-Einstellungen).
+
+    Keine vollständige App (create_app): Metriken, Rate Limiter, Listener,
+    Blueprints und CLI braucht das Rendering nicht, jeder Render-Prozess
+    hätte sonst einen eigenen Pool in Worker-Größe.
+    """
+    global _worker_app
+    if nice:
+        try:
+            os.nice(nice)
+        except OSError:
+            pass
+
+    from flask import Flask
+    from app.config import config
+    from app.extensions import db
+    from app.utils.cache_utils import CACHE_TAG_RULES
+    from app.utils.db_pool import render_engine_optionen
+
+    config_name = config_name or os.getenv('FLASK_ENV', 'development')
+    app = Flask('app')
+    app.config.from_object(config[config_name])
+    app.config['CONFIG_NAME'] = config_name
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = render_engine_optionen(app.config)
+    db.init_app(app)
+    cache.init_app(app, config={
+        'CACHE_TYPE': app.config.get('CACHE_TYPE', 'SimpleCache'),
+        'CACHE_DEFAULT_TIMEOUT': app.config.get('CACHE_DEFAULT_TIMEOUT', 300),
+        'CACHE_SHARED_PATH': app.config.get('CACHE_SHARED_PATH'),
+        'CACHE_TAG_RULES': CACHE_TAG_RULES,
+    })
+    _worker_app = app
+
+
+def _job_ausfuehren(job_id: str, fn, *args, abschliessen: bool = True):
+    """
+    Führt einen Job (oder einen Teilschritt davon) im Pool-Prozess aus.
+
+    Mit abschliessen schreibt der Render-Prozess den Status selbst:
+    gestartet (Lebenszeichen), fertig mit den Feldern von fn oder Fehler.
+    Teilschritte eines ZIP-Jobs setzen nur das Lebenszeichen und liefern
+    das Ergebnis von fn, Fehler wertet _verteile_phase_zip aus.
+    """
+    from app.services import deputat_pdf_service
+
+    with _worker_app.app_context():
+        deputat_pdf_service.lebenszeichen(job_id)
+        if not abschliessen:
+            return fn(deputat_pdf_service, *args)
+        try:
+            felder = fn(deputat_pdf_service, *args) or {}
+        except Exception as exc:
+            deputat_pdf_service._abschliessen(job_id, exc=exc)
+            raise
+        deputat_pdf_service._abschliessen(job_id, felder)
+        return felder
+
+
+def _render_pdf_job(job_id: str, abrechnung_id: int) -> Dict[str, Any]:
+    """Rendert ein PDF im Pool-Prozess, liefert die Job-Felder"""
+    def rendern(service, abrechnung_id):
+        content_hash, _ = service.render_and_store(abrechnung_id)
+        return {'content_hash': content_hash}
+
+    return _job_ausfuehren(job_id, rendern, abrechnung_id)
+
+
+def _plane_phase_zip(job_id: str, planungsphase_id: int, status: Optional[str]) -> List[Dict[str, Any]]:
+    """ZIP-Job, Schritt 1: Einträge und fehlende PDFs bestimmen"""
+    def planen(service, planungsphase_id, status):
+        return service.plane_phase_zip(job_id, planungsphase_id, status)
+
+    return _job_ausfuehren(job_id, planen, planungsphase_id, status, abschliessen=False)
+
+
+def _render_zip_pdf(job_id: str, abrechnung_id: int) -> str:
+    """ZIP-Job, Schritt 2: ein fehlendes PDF rendern, liefert dessen Inhalts-Hash"""
+    def rendern(service, abrechnung_id):
+        content_hash, _ = service.render_and_store(abrechnung_id)
+        return content_hash
+
+    return _job_ausfuehren(job_id, rendern, abrechnung_id, abschliessen=False)
+
+
+def _pack_phase_zip(job_id: str, eintraege: List[Dict[str, Any]], fehler: List[str]) -> Dict[str, Any]:
+    """ZIP-Job, Schritt 3: ZIP aus den abgelegten PDFs packen, schließt den Job ab"""
+    def packen(service, eintraege, fehler):
+        service.pack_phase_zip(job_id, eintraege, fehler)
+
+    return _job_ausfuehren(job_id, packen, eintraege, fehler)
@@ -218,7 +218,8 @@ class DeputatService(BaseService):
         """
         query = Deputatsabrechnung.query.options(
             joinedload(Deputatsabrechnung.benutzer),
-            joinedload(Deputatsabrechnung.planungsphase).joinedload(Planungsphase.semester)
+            joinedload(Deputatsabrechnung.planungsphase).joinedload(Planungsphase.semester),
+            joinedload(Deputatsabrechnung.genehmiger)
         ).filter_by(planungsphase_id=planungsphase_id)
 
         if status:
@@ -226,6 +227,27 @@ class DeputatService(BaseService):
 
         return query.all()
 
+    def get_alle_abrechnungen(self, status: str = None) -> List[Deputatsabrechnung]:
+        """
+        Holt alle Abrechnungen (Dekan-Übersicht), neueste zuerst
+
+        Args:
+            status: Optional - Filter nach Status
+
+        Returns:
+            Liste von Deputatsabrechnungen
+        """
+        query = Deputatsabrechnung.query.options(
+            joinedload(Deputatsabrechnung.benutzer),
+            joinedload(Deputatsabrechnung.planungsphase).joinedload(Planungsphase.semester),
+            joinedload(Deputatsabrechnung.genehmiger)
+        )
+
+        if status:
+            query = query.filter_by(status=status)
+
+        return query.order_by(Deputatsabrechnung.updated_at.desc()).all()
+
     def get_eingereichte_abrechnungen(
         self,
         planungsphase_id: int = None
@@ -1233,6 +1255,22 @@ class DeputatService(BaseService):
         einstellungen = self.get_einstellungen()
         return abrechnung.berechne_summen(einstellungen)
 
+    def berechne_summen_batch(
+        self,
+        abrechnungen: List[Deputatsabrechnung]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Berechnet die Summen vieler Abrechnungen mit GROUP BY Queries
+        (ohne die Positionen der einzelnen Abrechnungen zu laden)
+
+        Args:
+            abrechnungen: Liste von Deputatsabrechnungen
+
+        Returns:
+            Dict {abrechnung_id: summen}
+        """
+        return Deputatsabrechnung.berechne_summen_batch(abrechnungen, self.get_einstellungen())
+
     # =========================================================================
     # STATISTIKEN (Dekan)
     # =========================================================================
@@ -11,7 +11,10 @@ Funktionen:
 
 from typing import Optional, List, Dict, Any
 from app.services.base_service import BaseService
-from app.models import Dozent, DozentPosition, ModulDozent, Benutzer
+from app.models import (
+    Dozent, DozentPosition, ModulDozent, Benutzer, Modul,
+    Semesterplanung, GeplantesModul
+)
 from app.extensions import db
 
 
@@ -404,6 +407,107 @@ class DozentService(BaseService):
             'ohne_benutzer_account': len(self.get_dozenten_ohne_account()),
         }
     
+    def get_planungsfortschritt(
+        self,
+        planungsphase_id: Optional[int],
+        turnus: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Planungsfortschritt pro Modulverantwortlichem
+
+        Zählt zu planende (verantwortete, im Turnus angebotene) und in der
+        Phase bereits geplante Module in einer GROUP BY Abfrage, inkl.
+        Status. Eine zweite Abfrage liefert nur die offenen Module.
+        Module mit mehreren PO-Zuordnungen zählen einmal.
+
+        Args:
+            planungsphase_id: Planungsphase (None = nichts geplant)
+            turnus: Optional - Nur Module mit diesem Turnus
+
+        Returns:
+            Liste von Dicts pro Dozent (ohne Dozenten ohne Module)
+        """
+        zuordnung = db.select(ModulDozent.dozent_id, ModulDozent.modul_id).join(
+            Modul, ModulDozent.modul_id == Modul.id
+        ).where(
+            ModulDozent.rolle_ist(ModulDozent.ROLLE_VERANTWORTLICHER),
+            ModulDozent.dozent_id.isnot(None)
+        )
+        if turnus:
+            zuordnung = zuordnung.where(Modul.turnus.in_(turnus))
+        zuordnung = zuordnung.distinct().subquery()
+
+        geplant = db.select(GeplantesModul.modul_id).join(
+            Semesterplanung, GeplantesModul.semesterplanung_id == Semesterplanung.id
+        )
+        if planungsphase_id:
+            geplant = geplant.where(Semesterplanung.planungsphase_id == planungsphase_id)
+        else:
+            geplant = geplant.where(db.false())
+        geplant = geplant.distinct().subquery()
+
+        anzahl_zu_planen = db.func.count(zuordnung.c.modul_id)
+        anzahl_geplant = db.func.count(geplant.c.modul_id)
+
+        zeilen = db.session.execute(
+            db.select(
+                Dozent.id,
+                Dozent.titel,
+                Dozent.vorname,
+                Dozent.nachname,
+                Dozent.email,
+                anzahl_zu_planen.label('anzahl_zu_planen'),
+                anzahl_geplant.label('anzahl_geplant'),
+                db.case(
+                    (anzahl_geplant == anzahl_zu_planen, 'vollständig'),
+                    (anzahl_geplant > 0, 'teilweise'),
+                    else_='offen'
+                ).label('status')
+            ).join(
+                zuordnung, zuordnung.c.dozent_id == Dozent.id
+            ).outerjoin(
+                geplant, geplant.c.modul_id == zuordnung.c.modul_id
+            ).where(
+                Dozent.aktiv == True
+            ).group_by(
+                Dozent.id, Dozent.titel, Dozent.vorname, Dozent.nachname, Dozent.email
+            )
+        ).all()
+
+        offene_module = {}
+        for dozent_id, modul_id, kuerzel, bezeichnung in db.session.execute(
+            db.select(
+                zuordnung.c.dozent_id, Modul.id, Modul.kuerzel, Modul.bezeichnung_de
+            ).join(
+                Modul, Modul.id == zuordnung.c.modul_id
+            ).outerjoin(
+                geplant, geplant.c.modul_id == zuordnung.c.modul_id
+            ).where(
+                geplant.c.modul_id.is_(None)
+            ).order_by(Modul.id)
+        ):
+            offene_module.setdefault(dozent_id, []).append({
+                'id': modul_id,
+                'kuerzel': kuerzel,
+                'bezeichnung': bezeichnung
+            })
+
+        result = []
+        for z in zeilen:
+            name_komplett = ' '.join(t for t in (z.titel, z.vorname, z.nachname) if t)
+            result.append({
+                'dozent_id': z.id,
+                'name': name_komplett,
+                'email': z.email,
+                'anzahl_zu_planen': z.anzahl_zu_planen,
+                'anzahl_geplant': z.anzahl_geplant,
+                'anzahl_offen': z.anzahl_zu_planen - z.anzahl_geplant,
+                'prozent_geplant': round(z.anzahl_geplant / z.anzahl_zu_planen * 100, 1),
+                'status': z.status,
+                'nicht_geplante_module': offene_module.get(z.id, [])
+            })
+        return result
+
     def get_dozent_details(
         self,
         dozent_id: int
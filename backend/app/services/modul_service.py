@@ -8,13 +8,119 @@ Funktionen:
 - Modul-Details holen
 - Dozenten-Zuordnung
 - Lehrformen-Verwaltung
+- Listen-Projektionen (Row-Tupel statt ORM-Objekte)
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload
 from app.services.base_service import BaseService
-from app.models import Modul, ModulDozent, ModulLehrform, Pruefungsordnung
+from app.models import Modul, ModulDozent, ModulLehrform, Pruefungsordnung, Dozent, Lehrform
 from app.extensions import db
+from app.utils.serializers import Projektion
+
+
+# =========================================================================
+# PROJEKTIONEN
+# =========================================================================
+
+def _name_kurz(daten: Dict[str, Any]) -> Optional[str]:
+    """Wie Dozent.name_kurz, aber auf Projektions-Dict"""
+    if daten['vorname'] and daten['nachname']:
+        return f"{daten['vorname'][0]}. {daten['nachname']}"
+    return daten['nachname']
+
+
+MODUL_LEHRFORM_PROJEKTION = Projektion('lehrform', {
+    'id': ModulLehrform.id,
+    'lehrform_id': ModulLehrform.lehrform_id,
+    'bezeichnung': Lehrform.bezeichnung,
+    'kuerzel': Lehrform.kuerzel,
+    'sws': (ModulLehrform.sws, lambda sws: float(sws) if sws else 0.0),
+})
+
+MODUL_DOZENT_PROJEKTION = Projektion('dozent', {
+    'id': ModulDozent.id,
+    'dozent_id': ModulDozent.dozent_id,
+    'name_komplett': Dozent.name_komplett,
+    'vorname': Dozent.vorname,
+    'nachname': Dozent.nachname,
+    'rolle': ModulDozent.rolle,
+}, abgeleitet={
+    'name': lambda d: d['name_komplett'],
+    'name_kurz': _name_kurz,
+})
+
+
+def _lade_lehrformen(modul_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Lehrformen aller Module in einer Query, gruppiert nach Modul"""
+    rows = db.session.execute(
+        MODUL_LEHRFORM_PROJEKTION.select(ModulLehrform.modul_id)
+        .join(Lehrform, Lehrform.id == ModulLehrform.lehrform_id)
+        .where(ModulLehrform.modul_id.in_(modul_ids))
+        .order_by(ModulLehrform.modul_id, ModulLehrform.id)
+    ).all()
+    return MODUL_LEHRFORM_PROJEKTION.gruppieren(rows)
+
+
+def _lade_dozenten(modul_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Dozenten-Zuordnungen aller Module in einer Query (ohne Platzhalter)"""
+    rows = db.session.execute(
+        MODUL_DOZENT_PROJEKTION.select(ModulDozent.modul_id)
+        .join(Dozent, Dozent.id == ModulDozent.dozent_id)
+        .where(ModulDozent.modul_id.in_(modul_ids))
+        .order_by(ModulDozent.modul_id, ModulDozent.id)
+    ).all()
+    return MODUL_DOZENT_PROJEKTION.gruppieren(rows)
+
+
+# Gesamt-SWS als korrelierte Subquery (kein Laden der Lehrformen nötig)
+_SWS_GESAMT = (
+    select(func.coalesce(func.sum(ModulLehrform.sws), 0))
+    .where(ModulLehrform.modul_id == Modul.id)
+    .correlate(Modul)
+    .scalar_subquery(),
+    float
+)
+
+MODUL_PROJEKTIONEN = {
+    # Dropdowns / Type-Ahead
+    'option': Projektion('option', {
+        'id': Modul.id,
+        'kuerzel': Modul.kuerzel,
+        'po_id': Modul.po_id,
+        'bezeichnung_de': Modul.bezeichnung_de,
+    }),
+    # Modul-Listen (GET /api/module/, /search)
+    'list': Projektion('list', {
+        'id': Modul.id,
+        'kuerzel': Modul.kuerzel,
+        'po_id': (Modul.po_id, lambda po_id: po_id or 1),
+        'bezeichnung_de': Modul.bezeichnung_de,
+        'bezeichnung_en': Modul.bezeichnung_en,
+        'leistungspunkte': (Modul.leistungspunkte, lambda lp: lp or 0),
+        'turnus': (Modul.turnus, lambda turnus: turnus or 'Nicht festgelegt'),
+        'sws_gesamt': _SWS_GESAMT,
+    }, anhaenge={
+        'dozenten': (_lade_dozenten, list),
+        'lehrformen': (_lade_lehrformen, list),
+    }),
+    # Basisdaten der Detailansicht (GET /api/module/<id>)
+    'detail': Projektion('detail', {
+        'id': Modul.id,
+        'kuerzel': Modul.kuerzel,
+        'po_id': Modul.po_id,
+        'bezeichnung_de': Modul.bezeichnung_de,
+        'bezeichnung_en': Modul.bezeichnung_en,
+        'untertitel': Modul.untertitel,
+        'leistungspunkte': Modul.leistungspunkte,
+        'turnus': Modul.turnus,
+        'gruppengroesse': Modul.gruppengroesse,
+        'teilnehmerzahl': Modul.teilnehmerzahl,
+        'anmeldemodalitaeten': Modul.anmeldemodalitaeten,
+        'sws_gesamt': _SWS_GESAMT,
+    }),
+}
 
 
 class ModulService(BaseService):
@@ -55,10 +161,11 @@ class ModulService(BaseService):
         po_id: Optional[int] = None
     ) -> List[Modul]:
         """
-        Sucht Module anhand Bezeichnung oder Kürzel
+        Sucht Module über den Volltext-Index (Kürzel, Titel,
+        Lernergebnisse, Literatur), sortiert nach Relevanz
         
         Args:
-            suchbegriff: Suchtext
+            suchbegriff: Suchtext (Wörter werden als Präfix gesucht)
             po_id: Optional - Filter nach PO
             
         Returns:
@@ -67,19 +174,21 @@ class ModulService(BaseService):
         Example:
             >>> module = modul_service.search('Programmieren')
         """
-        pattern = f"%{suchbegriff}%"
-        query = Modul.query.filter(
-            db.or_(
-                Modul.kuerzel.ilike(pattern),
-                Modul.bezeichnung_de.ilike(pattern),
-                Modul.bezeichnung_en.ilike(pattern)
-            )
+        from app.services import modul_suche_service
+
+        return self.get_by_ids_sortiert(
+            modul_suche_service.search_ids(suchbegriff, po_id=po_id, limit=None)
         )
-        
-        if po_id:
-            query = query.filter_by(po_id=po_id)
-        
-        return query.all()
+
+    def get_by_ids_sortiert(self, modul_ids: List[int]) -> List[Modul]:
+        """
+        Holt Module in der Reihenfolge der übergebenen IDs
+        (z.B. Suchergebnis nach Relevanz)
+        """
+        if not modul_ids:
+            return []
+        module = {m.id: m for m in Modul.query.filter(Modul.id.in_(modul_ids)).all()}
+        return [module[modul_id] for modul_id in modul_ids if modul_id in module]
     
     def get_by_po(
         self,
@@ -115,6 +224,97 @@ class ModulService(BaseService):
             return self.get_all(turnus=turnus, po_id=po_id)
         return self.get_all(turnus=turnus)
     
+    # =========================================================================
+    # PROJEKTIONEN
+    # =========================================================================
+
+    def get_projektion(
+        self,
+        projektion: str = 'list',
+        bedingungen: Iterable = (),
+        order_by: Iterable = (),
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Serialisiert Module über eine benannte Projektion (MODUL_PROJEKTIONEN)
+
+        Liest nur die Spalten der Projektion als Row-Tupel, Anhänge
+        (Dozenten, Lehrformen) mit je einer Query für alle Module.
+
+        Args:
+            projektion: 'list', 'option' oder 'detail'
+            bedingungen: WHERE-Bedingungen auf Modul
+            order_by: Sortierung (Default: Modul.id)
+            limit: Optional - Max. Anzahl
+            offset: Optional - Offset
+
+        Returns:
+            Liste JSON-fähiger Dicts
+
+        Raises:
+            ValueError: Unbekannte Projektion
+        """
+        proj, stmt = self._projektion_stmt(projektion, bedingungen, order_by, limit, offset)
+        return proj.serialize(db.session.execute(stmt).all())
+
+    def iter_projektion(
+        self,
+        projektion: str = 'list',
+        bedingungen: Iterable = (),
+        order_by: Iterable = (),
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        yield_per: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Wie get_projektion(), aber lazy über einen Server-Side-Cursor
+
+        Rows werden in Partitionen zu `yield_per` gelesen (PostgreSQL:
+        benannter Cursor), Anhänge pro Partition geladen. Für gestreamte
+        Responses (app.utils.json_stream).
+
+        Yields:
+            JSON-fähige Dicts
+        """
+        proj, stmt = self._projektion_stmt(projektion, bedingungen, order_by, limit, offset)
+        result = db.session.execute(stmt.execution_options(yield_per=yield_per))
+        try:
+            yield from proj.serialize_iter(result.partitions())
+        finally:
+            result.close()
+
+    @staticmethod
+    def _projektion_stmt(projektion, bedingungen, order_by, limit, offset):
+        if projektion not in MODUL_PROJEKTIONEN:
+            raise ValueError(f"Unbekannte Projektion: {projektion}")
+        proj = MODUL_PROJEKTIONEN[projektion]
+
+        stmt = proj.select().where(*bedingungen).order_by(*(order_by or (Modul.id,)))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+        return proj, stmt
+
+    def count_module(self, bedingungen: Iterable = ()) -> int:
+        """Anzahl Module für die WHERE-Bedingungen (z.B. für Pagination)"""
+        return db.session.scalar(select(func.count(Modul.id)).where(*bedingungen))
+
+    def get_projektion_sortiert(
+        self,
+        modul_ids: List[int],
+        projektion: str = 'list'
+    ) -> List[Dict[str, Any]]:
+        """Projektion für Module in der Reihenfolge der IDs (z.B. Suchtreffer)"""
+        if not modul_ids:
+            return []
+        items = {
+            item['id']: item
+            for item in self.get_projektion(projektion, bedingungen=[Modul.id.in_(modul_ids)])
+        }
+        return [items[modul_id] for modul_id in modul_ids if modul_id in items]
+
     # =========================================================================
     # MODUL DETAILS
     # =========================================================================
@@ -400,12 +600,9 @@ class ModulService(BaseService):
             query = query.filter(Modul.leistungspunkte <= max_leistungspunkte)
         
         if suchbegriff:
-            pattern = f"%{suchbegriff}%"
+            from app.services import modul_suche_service
             query = query.filter(
-                db.or_(
-                    Modul.kuerzel.ilike(pattern),
-                    Modul.bezeichnung_de.ilike(pattern)
-                )
+                Modul.id.in_(modul_suche_service.search_ids(suchbegriff, po_id=po_id, limit=None))
             )
         
         return query.all()
@@ -0,0 +1,564 @@
+"""
+Modul Suche Service
+===================
+Volltextsuche über Module: Kürzel, Titel, Lernergebnisse und Literatur.
+
+Backends:
+- PostgreSQL: gewichteter tsvector (Tabelle modul_suchindex, GIN-Index),
+  deutsches Stemming, Präfix-Suche über to_tsquery(':*'), Ranking mit
+  ts_rank_cd.
+- SQLite/andere: prozesslokaler invertierter Index mit Snowball-Stemming
+  (nltk, optional), Präfix-Suche über sortierte Termliste, TF-IDF Ranking.
+
+Findet die Präfix-Suche nichts (z.B. "bank" in "Datenbanken"), sucht
+search() die Wörter als Teilstring (ILIKE) in Kürzel und Bezeichnungen.
+
+Die Tabelle modul_suchindex legt `flask ensure-tables` an, befüllt wird sie
+per `flask rebuild-search-index` (beides im Deployment). Requests bauen den
+Index nicht auf; ist er leer, greift die Teilstring-Suche.
+
+Inkrementelle Pflege:
+    Session-Events sammeln geänderte Modul-IDs (Modul, ModulLernergebnisse,
+    ModulLiteratur). Nach dem Commit werden in PostgreSQL die betroffenen
+    Dokumente neu geschrieben. Für den prozesslokalen Index wird ein
+    Versions-Counter im geteilten Cache erhöht und die geänderten IDs pro
+    Version abgelegt - jeder Worker arbeitet sie bei der nächsten Suche nach.
+
+Usage:
+    from app.services import modul_suche_service
+
+    treffer = modul_suche_service.search('datenb', po_id=1, limit=20)
+    # [(modul_id, rank), ...] absteigend nach Relevanz
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.extensions import db, cache
+from app.models import Modul, ModulLernergebnisse, ModulLiteratur, ModulSuchindex
+
+try:
+    from nltk.stem.snowball import GermanStemmer
+    _stemmer = GermanStemmer()
+except ImportError:
+    _stemmer = None
+
+
+VERSION_KEY = 'version/modul_suche'
+CHANGES_KEY_PREFIX = 'modul_suche/changes/'
+
+# Aufbewahrung der Änderungs-IDs pro Version (danach: kompletter Neuaufbau)
+CHANGES_TTL = 3600
+
+# Max. Versionen, die inkrementell nachgearbeitet werden
+MAX_CATCH_UP_VERSIONS = 200
+
+# Max. IDs pro IN-Liste beim Laden der Dokumente
+LOAD_CHUNK_SIZE = 500
+
+# Feldgewichte (entsprechen den PostgreSQL-Defaults für A/B/C/D)
+FELD_GEWICHTE = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+# Gewicht von Präfix-Treffern gegenüber vollständigen Wörtern
+PREFIX_FAKTOR = 0.5
+
+_TOKEN = re.compile(r'[^\W_]+')
+_UMLAUTE = str.maketrans({'ä': 'a', 'ö': 'o', 'ü': 'u', 'ß': 'ss'})
+
+
+def tokenize(text_value: Optional[str]) -> List[str]:
+    """Zerlegt Text in kleingeschriebene Wort-Tokens"""
+    if not text_value:
+        return []
+    return _TOKEN.findall(text_value.lower())
+
+
+def stem(token: str) -> str:
+    """Deutscher Wortstamm (Snowball), ohne nltk nur Umlaut-Faltung"""
+    if _stemmer is not None:
+        return _stemmer.stem(token)
+    return token.translate(_UMLAUTE)
+
+
+class InvertedIndex:
+    """
+    Prozesslokaler invertierter Index.
+
+    Pro Dokument werden Original-Token und Wortstamm indexiert: Stämme
+    finden Flexionen ("Datenbanken" -> "datenbank"), Original-Token
+    erlauben Präfix-Suche auf unvollständigen Eingaben.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []  # sortiert, für Präfix-Suche
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._po: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, modul_id: int, po_id: int, felder: Iterable[Tuple[Optional[str], float]]) -> None:
+        """Fügt ein Dokument hinzu (ersetzt eine vorhandene Version)"""
+        self.remove(modul_id)
+
+        gewichte = defaultdict(float)
+        for feld_text, gewicht in felder:
+            for token in tokenize(feld_text):
+                gewichte[token] += gewicht
+                token_stem = stem(token)
+                if token_stem != token:
+                    gewichte[token_stem] += gewicht
+
+        for term, gewicht in gewichte.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[modul_id] = gewicht
+
+        self._doc_terms[modul_id] = set(gewichte)
+        self._po[modul_id] = po_id
+
+    def remove(self, modul_id: int) -> None:
+        """Entfernt ein Dokument"""
+        for term in self._doc_terms.pop(modul_id, ()):
+            postings = self._postings[term]
+            postings.pop(modul_id, None)
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+        self._po.pop(modul_id, None)
+
+    def _prefix_terms(self, prefix: str) -> Iterable[str]:
+        i = bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            yield self._terms[i]
+            i += 1
+
+    def search(self, query: str, po_id: Optional[int] = None, limit: Optional[int] = 50) -> List[Tuple[int, float]]:
+        """
+        Sucht Dokumente, die alle Suchwörter (als Präfix) enthalten.
+
+        Returns:
+            [(modul_id, score), ...] absteigend nach Score
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        anzahl_docs = max(len(self._doc_terms), 1)
+        scores: Optional[Dict[int, float]] = None
+
+        for token in tokens:
+            token_stem = stem(token)
+            token_scores = defaultdict(float)
+
+            for prefix in {token, token_stem}:
+                for term in self._prefix_terms(prefix):
+                    postings = self._postings[term]
+                    idf = math.log(1 + anzahl_docs / len(postings))
+                    faktor = 1.0 if term in (token, token_stem) else PREFIX_FAKTOR
+                    for modul_id, gewicht in postings.items():
+                        score = gewicht * idf * faktor
+                        if score > token_scores[modul_id]:
+                            token_scores[modul_id] = score
+
+            if scores is None:
+                scores = dict(token_scores)
+            else:
+                scores = {m: s + token_scores[m] for m, s in scores.items() if m in token_scores}
+            if not scores:
+                return []
+
+        if po_id is not None:
+            scores = {m: s for m, s in scores.items() if self._po.get(m) == po_id}
+
+        ergebnis = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ergebnis[:limit] if limit else ergebnis
+
+
+class ModulSucheService:
+    """
+    Modul Suche Service
+
+    Wählt das Backend anhand des DB-Dialekts und pflegt den Index
+    inkrementell bei Modul-Änderungen.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._index: Optional[InvertedIndex] = None
+        self._index_version = None
+
+    # =========================================================================
+    # SUCHE
+    # =========================================================================
+
+    def search(
+        self,
+        suchbegriff: str,
+        po_id: Optional[int] = None,
+        limit: Optional[int] = 50
+    ) -> List[Tuple[int, float]]:
+        """
+        Volltextsuche mit Ranking und Präfix-Suche (Type-Ahead).
+
+        Alle Suchwörter müssen vorkommen; das letzte darf unvollständig sein
+        (tatsächlich werden alle Wörter als Präfix behandelt). Ohne Treffer
+        folgt die Teilstring-Suche (_infix_search).
+
+        Args:
+            suchbegriff: Suchtext
+            po_id: Optional - Filter nach PO
+            limit: Max. Anzahl Treffer (None = alle)
+
+        Returns:
+            [(modul_id, rank), ...] absteigend nach Relevanz
+        """
+        if not tokenize(suchbegriff):
+            return []
+
+        if self._use_postgres():
+            treffer = self._pg_search(suchbegriff, po_id, limit)
+        else:
+            with self._lock:
+                treffer = self._get_local_index().search(suchbegriff, po_id=po_id, limit=limit)
+
+        return treffer or self._infix_search(suchbegriff, po_id, limit)
+
+    @staticmethod
+    def _infix_search(suchbegriff: str, po_id: Optional[int], limit: Optional[int]) -> List[Tuple[int, float]]:
+        """
+        Teilstring-Suche (ILIKE) wie vor dem Volltext-Index
+
+        Jedes Suchwort muss in Kürzel, deutscher oder englischer Bezeichnung
+        vorkommen. Ohne Ranking (rank 0), sortiert nach Kürzel.
+        """
+        query = db.select(Modul.id)
+        for token in dict.fromkeys(tokenize(suchbegriff)):
+            pattern = f'%{token}%'
+            query = query.where(db.or_(
+                Modul.kuerzel.ilike(pattern),
+                Modul.bezeichnung_de.ilike(pattern),
+                Modul.bezeichnung_en.ilike(pattern)
+            ))
+        if po_id is not None:
+            query = query.where(Modul.po_id == po_id)
+        query = query.order_by(Modul.kuerzel, Modul.id)
+        if limit:
+            query = query.limit(limit)
+
+        return [(modul_id, 0.0) for modul_id in db.session.execute(query).scalars()]
+
+    def search_ids(self, suchbegriff: str, po_id: Optional[int] = None, limit: Optional[int] = 50) -> List[int]:
+        """Wie search(), liefert nur die Modul-IDs (nach Relevanz sortiert)"""
+        return [modul_id for modul_id, _ in self.search(suchbegriff, po_id=po_id, limit=limit)]
+
+    # =========================================================================
+    # PFLEGE
+    # =========================================================================
+
+    def apply_changes(self, modul_ids: Set[int]) -> None:
+        """
+        Übernimmt geänderte Module in den Index (nach dem Commit).
+
+        Läuft außerhalb der Request-Transaktion mit eigener Session.
+        """
+        if not modul_ids:
+            return
+
+        if self._use_postgres():
+            with Session(db.engine) as session:
+                self._pg_reindex(session, modul_ids)
+                session.commit()
+            return
+
+        version = cache.cache.inc(VERSION_KEY)
+        if version is not None:
+            cache.set(f'{CHANGES_KEY_PREFIX}{version}', sorted(modul_ids), timeout=CHANGES_TTL)
+
+    def rebuild(self) -> int:
+        """
+        Baut den Index komplett neu auf (flask rebuild-search-index).
+
+        Returns:
+            Anzahl indexierter Module
+        """
+        if self._use_postgres():
+            # Eine Transaktion: Suchen sehen bis zum Commit den alten Index
+            with Session(db.engine) as session:
+                dokumente = self._lade_dokumente(session)
+                session.execute(text('DELETE FROM modul_suchindex'))
+                self._pg_write(session, dokumente)
+                session.commit()
+            current_app.logger.info(f'[ModulSuche] Index rebuilt: {len(dokumente)} modules')
+            return len(dokumente)
+
+        with self._lock:
+            version = cache.get(VERSION_KEY)
+            index = self._build_local_index(self._lade_dokumente(db.session))
+            self._index, self._index_version = index, version
+            current_app.logger.info(f'[ModulSuche] Local index rebuilt: {len(index)} modules')
+            return len(index)
+
+    # =========================================================================
+    # DOKUMENTE
+    # =========================================================================
+
+    @staticmethod
+    def _lade_dokumente(session, modul_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Lädt die Suchtexte der Module, gruppiert nach Gewicht (A-D).
+
+        Returns:
+            Dict {modul_id: {'po_id', 'kuerzel', 'A', 'B', 'C', 'D'}}
+        """
+        if modul_ids is None:
+            chunks = [None]
+        else:
+            ids = sorted(set(modul_ids))
+            chunks = [ids[i:i + LOAD_CHUNK_SIZE] for i in range(0, len(ids), LOAD_CHUNK_SIZE)]
+
+        dokumente = {}
+        for chunk in chunks:
+            modul_query = db.select(
+                Modul.id, Modul.po_id, Modul.kuerzel,
+                Modul.bezeichnung_de, Modul.bezeichnung_en, Modul.untertitel
+            )
+            lern_query = db.select(
+                ModulLernergebnisse.modul_id, ModulLernergebnisse.lernziele,
+                ModulLernergebnisse.kompetenzen, ModulLernergebnisse.inhalt
+            )
+            literatur_query = db.select(
+                ModulLiteratur.modul_id, ModulLiteratur.titel, ModulLiteratur.autoren
+            )
+            if chunk is not None:
+                modul_query = modul_query.where(Modul.id.in_(chunk))
+                lern_query = lern_query.where(ModulLernergebnisse.modul_id.in_(chunk))
+                literatur_query = literatur_query.where(ModulLiteratur.modul_id.in_(chunk))
+
+            for modul_id, po_id, kuerzel, bez_de, bez_en, untertitel in session.execute(modul_query):
+                dokumente[modul_id] = {
+                    'po_id': po_id,
+                    'kuerzel': kuerzel or '',
+                    'A': [bez_de],
+                    'B': [bez_en, untertitel],
+                    'C': [],
+                    'D': [],
+                }
+
+            for modul_id, lernziele, kompetenzen, inhalt in session.execute(lern_query):
+                if modul_id in dokumente:
+                    dokumente[modul_id]['C'].extend((lernziele, kompetenzen, inhalt))
+
+            for modul_id, titel, autoren in session.execute(literatur_query):
+                if modul_id in dokumente:
+                    dokumente[modul_id]['D'].extend((titel, autoren))
+
+        for dokument in dokumente.values():
+            for gewicht in FELD_GEWICHTE:
+                dokument[gewicht] = ' '.join(t for t in dokument[gewicht] if t)
+
+        return dokumente
+
+    # =========================================================================
+    # BACKEND: POSTGRESQL
+    # =========================================================================
+
+    @staticmethod
+    def _use_postgres() -> bool:
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def _tsquery(suchbegriff: str) -> str:
+        """Präfix-Query: alle Wörter müssen (als Präfix) vorkommen"""
+        return ' & '.join(f'{token}:*' for token in dict.fromkeys(tokenize(suchbegriff)))
+
+    def _pg_search(self, suchbegriff: str, po_id: Optional[int], limit: Optional[int]) -> List[Tuple[int, float]]:
+        sql = """
+            WITH q AS (
+                SELECT to_tsquery('german', :tsquery) || to_tsquery('simple', :tsquery) AS query
+            )
+            SELECT s.modul_id, ts_rank_cd(s.dokument, q.query) AS rank
+            FROM modul_suchindex s, q
+            WHERE s.dokument @@ q.query
+        """
+        params = {'tsquery': self._tsquery(suchbegriff)}
+        if po_id is not None:
+            sql += ' AND s.po_id = :po_id'
+            params['po_id'] = po_id
+        sql += ' ORDER BY rank DESC, s.modul_id'
+        if limit:
+            sql += ' LIMIT :limit'
+            params['limit'] = limit
+
+        return [(row.modul_id, float(row.rank)) for row in db.session.execute(text(sql), params)]
+
+    def _pg_reindex(self, session, modul_ids: Set[int]) -> None:
+        dokumente = self._lade_dokumente(session, modul_ids)
+        entfernt = [modul_id for modul_id in modul_ids if modul_id not in dokumente]
+        if entfernt:
+            session.execute(
+                db.delete(ModulSuchindex).where(ModulSuchindex.modul_id.in_(entfernt))
+            )
+        self._pg_write(session, dokumente)
+
+    @staticmethod
+    def _pg_write(session, dokumente: Dict[int, Dict[str, Any]]) -> None:
+        if not dokumente:
+            return
+        session.execute(
+            text("""
+                INSERT INTO modul_suchindex (modul_id, po_id, dokument, updated_at)
+                VALUES (
+                    :modul_id, :po_id,
+                    setweight(to_tsvector('simple', :kuerzel), 'A')
+                    || setweight(to_tsvector('german', :a), 'A')
+                    || setweight(to_tsvector('german', :b), 'B')
+                    || setweight(to_tsvector('german', :c), 'C')
+                    || setweight(to_tsvector('german', :d), 'D'),
+                    now()
+                )
+                ON CONFLICT (modul_id) DO UPDATE SET
+                    po_id = EXCLUDED.po_id,
+                    dokument = EXCLUDED.dokument,
+                    updated_at = EXCLUDED.updated_at
+            """),
+            [
+                {
+                    'modul_id': modul_id,
+                    'po_id': dokument['po_id'],
+                    'kuerzel': dokument['kuerzel'],
+                    'a': dokument['A'],
+                    'b': dokument['B'],
+                    'c': dokument['C'],
+                    'd': dokument['D'],
+                }
+                for modul_id, dokument in dokumente.items()
+            ]
+        )
+
+    # =========================================================================
+    # BACKEND: PROZESSLOKALER INDEX
+    # =========================================================================
+
+    @staticmethod
+    def _felder(dokument: Dict[str, Any]) -> List[Tuple[str, float]]:
+        felder = [(dokument['kuerzel'], FELD_GEWICHTE['A'])]
+        felder.extend((dokument[gewicht], faktor) for gewicht, faktor in FELD_GEWICHTE.items())
+        return felder
+
+    def _build_local_index(self, dokumente: Dict[int, Dict[str, Any]]) -> InvertedIndex:
+        index = InvertedIndex()
+        for modul_id, dokument in dokumente.items():
+            index.add(modul_id, dokument['po_id'], self._felder(dokument))
+        return index
+
+    def _get_local_index(self) -> InvertedIndex:
+        """
+        Liefert den lokalen Index auf dem Stand des Versions-Counters.
+
+        Fehlende Versionen werden inkrementell nachgearbeitet; sind deren
+        Änderungs-IDs nicht mehr verfügbar, wird neu aufgebaut.
+        """
+        version = cache.get(VERSION_KEY)
+        if self._index is not None and self._index_version == version:
+            return self._index
+
+        geaendert = self._geaenderte_ids(self._index_version, version) if self._index is not None else None
+
+        # Eigene Session auf dem Primary: der Index gilt danach als Stand
+        # von version, eine nachlaufende Replica (GET-Request) lieferte ältere Daten
+        with Session(db.engine) as session:
+            if geaendert is None:
+                dokumente = self._lade_dokumente(session)
+            else:
+                dokumente = self._lade_dokumente(session, geaendert)
+
+        if geaendert is None:
+            self._index = self._build_local_index(dokumente)
+        else:
+            for modul_id in geaendert:
+                dokument = dokumente.get(modul_id)
+                if dokument is None:
+                    self._index.remove(modul_id)
+                else:
+                    self._index.add(modul_id, dokument['po_id'], self._felder(dokument))
+
+        self._index_version = version
+        return self._index
+
+    @staticmethod
+    def _geaenderte_ids(von_version, bis_version) -> Optional[Set[int]]:
+        """Geänderte Modul-IDs zwischen zwei Versionen (None = unbekannt)"""
+        if not isinstance(von_version, int) or not isinstance(bis_version, int):
+            return None
+        if not 0 < bis_version - von_version <= MAX_CATCH_UP_VERSIONS:
+            return None
+
+        geaendert = set()
+        for version in range(von_version + 1, bis_version + 1):
+            ids = cache.get(f'{CHANGES_KEY_PREFIX}{version}')
+            if ids is None:
+                return None
+            geaendert.update(ids)
+        return geaendert
+
+
+# =========================================================================
+# SESSION EVENTS
+# =========================================================================
+
+def _collect_modul_suche_changes(session, flush_context):
+    """after_flush: Geänderte Modul-IDs in session.info sammeln"""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Modul):
+            modul_id = obj.id
+        elif isinstance(obj, (ModulLernergebnisse, ModulLiteratur)):
+            modul_id = obj.modul_id
+        else:
+            continue
+        if modul_id is not None:
+            session.info.setdefault('modul_suche_ids', set()).add(modul_id)
+
+
+def _apply_modul_suche_changes(session):
+    """after_commit: Gesammelte Module im Suchindex aktualisieren"""
+    modul_ids = session.info.pop('modul_suche_ids', None)
+    if not modul_ids or not has_app_context():
+        return
+    from app.services import modul_suche_service
+    try:
+        modul_suche_service.apply_changes(modul_ids)
+    except Exception as e:
+        current_app.logger.error(f'[ModulSuche] Incremental update failed: {e}')
+
+
+def _discard_modul_suche_changes(session, previous_transaction):
+    """after_soft_rollback: Gesammelte Änderungen verwerfen"""
+    session.info.pop('modul_suche_ids', None)
+
+
+_SESSION_LISTENERS = (
+    ('after_flush', _collect_modul_suche_changes),
+    ('after_commit', _apply_modul_suche_changes),
+    ('after_soft_rollback', _discard_modul_suche_changes),
+)
+
+
+def register_modul_suche_listeners(app):
+    """Registriert Session-Events für die inkrementelle Index-Pflege"""
+    for identifier, listener in _SESSION_LISTENERS:
+        if not event.contains(db.session, identifier, listener):
+            event.listen(db.session, identifier, listener)
+
+    app.logger.info('[OK] Module search index maintenance registered')
@@ -134,7 +134,7 @@ class ModulVerwaltungService(BaseService):
             modul_id: ID des Moduls
             po_id: ID der Prüfungsordnung
             dozent_id: ID des Dozenten
-            rolle: Rolle ('verantwortlich', 'mitwirkend', etc.)
+            rolle: Rolle ('verantwortlicher', 'lehrperson', ...; wird normalisiert)
             geaendert_von_id: ID des Benutzers (Dekan)
             bemerkung: Optionale Bemerkung
 
@@ -354,7 +354,7 @@ class ModulVerwaltungService(BaseService):
         zu_dozent_id: int,
         po_id: int,
         geaendert_von_id: int,
-        rolle: str = 'verantwortlich',
+        rolle: str = 'verantwortlicher',
         bemerkung: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -366,7 +366,7 @@ class ModulVerwaltungService(BaseService):
             zu_dozent_id: Neuer Dozent
             po_id: Prüfungsordnung
             geaendert_von_id: Dekan
-            rolle: Rolle (default: 'verantwortlich')
+            rolle: Rolle (default: 'verantwortlicher')
             bemerkung: Optionale Bemerkung
 
         Returns:
@@ -374,6 +374,7 @@ class ModulVerwaltungService(BaseService):
         """
         erfolgreich = []
         fehlgeschlagen = []
+        rolle = ModulDozent.normalisiere_rolle(rolle)
 
         for modul_id in modul_ids:
             try:
@@ -381,9 +382,8 @@ class ModulVerwaltungService(BaseService):
                 zuordnung = ModulDozent.query.filter_by(
                     modul_id=modul_id,
                     po_id=po_id,
-                    dozent_id=von_dozent_id,
-                    rolle=rolle
-                ).first()
+                    dozent_id=von_dozent_id
+                ).filter(ModulDozent.rolle_ist(rolle)).first()
 
                 if not zuordnung:
                     fehlgeschlagen.append({
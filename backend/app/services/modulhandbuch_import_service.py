@@ -0,0 +1,494 @@
+"""
+Modulhandbuch Import Service
+============================
+Importiert die PDF-Modulhandbücher (Modulhandbuecher/MHB_<jahr>_<sg>_<BA|MA>.pdf)
+nach Modulhandbuch, ModulSeiten und Modul (flask import-modulhandbuecher).
+
+Ablauf:
+- SHA-256 pro Datei: unveränderte Handbücher (gleicher Hash wie in der
+  Tabelle modulhandbuch) werden übersprungen, ohne das PDF zu parsen
+- Parsen im Prozess-Pool: ein Task pro PDF, große PDFs werden in
+  Seitenbereiche (MODULHANDBUCH_IMPORT_SEITEN_PRO_TASK) aufgeteilt
+- Jede Seite wird für sich klassifiziert (Modul-Beginn, Kapitel-Trenner,
+  Fortsetzung), die Modul-Grenzen ergeben sich erst beim Zusammenführen.
+  Dadurch sind Seitenbereiche unabhängig voneinander parsebar.
+- Modul-Stammdaten werden gebündelt abgeglichen (Insert/Update in Batches,
+  nur geänderte Felder), ModulSeiten pro Handbuch komplett ersetzt
+
+Seitenzahlen sind 1-basiert (Seite im PDF, entspricht der gedruckten Seite).
+
+Config:
+    MODULHANDBUCH_DIR = 'Modulhandbuecher'
+    MODULHANDBUCH_IMPORT_WORKERS = 4          # Parse-Prozesse (max. CPU-Anzahl)
+    MODULHANDBUCH_IMPORT_MP_CONTEXT = 'fork'  # Parse-Prozesse brauchen keine App
+    MODULHANDBUCH_IMPORT_SEITEN_PRO_TASK = 32 # Seiten pro Task bei großen PDFs
+    MODULHANDBUCH_IMPORT_BATCH_SIZE = 200     # Module pro INSERT/UPDATE
+"""
+
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import insert, select, update
+
+from app.extensions import db
+from app.models import Modul, Modulhandbuch, ModulSeiten, Pruefungsordnung, Studiengang
+
+
+# MHB_2023_IN_BA.pdf -> (2023, 'IN', 'BA')
+DATEINAME_MUSTER = re.compile(r'^MHB_(\d{4})_([A-Z]+)_(BA|MA)\.pdf$', re.IGNORECASE)
+
+ABSCHLUESSE = {'BA': 'Bachelor', 'MA': 'Master'}
+
+# Seitenkopf: "MODULHANDBUCH  - 7 -", der Inhalt folgt danach
+SEITENKOPF_MUSTER = re.compile(r'^MODULHANDBUCH\s*-\s*\d+\s*-$')
+
+# Ein Modul beginnt mit Titel + "Kürzel:" in den ersten Zeilen der Seite
+KUERZEL_LABEL = 'Kürzel:'
+KUERZEL_SUCHBEREICH = 6
+
+# Steckbrief-Felder -> Modul-Spalten (Spaltenlänge für Kürzung)
+MERKMALE = {
+    'Untertitel:': ('untertitel', 200),
+    'Leistungspunkte:': ('leistungspunkte', None),
+    'Turnus:': ('turnus', 50),
+    'Gruppengröße:': ('gruppengroesse', 50),
+    'Teilnehmerzahl:': ('teilnehmerzahl', 50),
+    'Anmeldungsmodalitäten:': ('anmeldemodalitaeten', None),
+}
+
+# Umbrochene Labels ("Voraussetzungen nach" / "Prüfungsordnung:")
+LABEL_ANFAENGE = ('Voraussetzungen nach', 'Empfohlene Voraussetzungen')
+
+SEITE_MODUL = 'modul'
+SEITE_KAPITEL = 'kapitel'
+SEITE_FORTSETZUNG = 'fortsetzung'
+
+
+class ModulhandbuchImportService:
+    """
+    Modulhandbuch Import Service
+
+    Parst PDF-Modulhandbücher parallel und gleicht nur geänderte
+    Handbücher mit der Datenbank ab.
+    """
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def importiere(
+        self,
+        verzeichnis: Optional[str] = None,
+        workers: Optional[int] = None,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Importiert alle Modulhandbücher eines Verzeichnisses.
+
+        Args:
+            verzeichnis: PDF-Verzeichnis (Default: MODULHANDBUCH_DIR)
+            workers: Parse-Prozesse (Default: MODULHANDBUCH_IMPORT_WORKERS)
+            force: Auch unveränderte Handbücher neu importieren
+
+        Returns:
+            Statistik: dateien, uebersprungen, importiert, module_neu,
+            module_aktualisiert, seiten, fehler, dauer
+        """
+        start = time.perf_counter()
+        config = current_app.config
+        verzeichnis = Path(verzeichnis or config['MODULHANDBUCH_DIR'])
+        workers = workers or config.get('MODULHANDBUCH_IMPORT_WORKERS', 4)
+
+        stats = {
+            'dateien': 0, 'uebersprungen': 0, 'importiert': 0,
+            'module_neu': 0, 'module_aktualisiert': 0, 'seiten': 0, 'fehler': [],
+        }
+
+        dateien = sorted(verzeichnis.glob('*.pdf'))
+        stats['dateien'] = len(dateien)
+
+        bestand = {
+            row.dateiname: row
+            for row in db.session.execute(
+                select(Modulhandbuch.id, Modulhandbuch.dateiname, Modulhandbuch.hash)
+            )
+        }
+
+        zu_parsen = []
+        for pfad in dateien:
+            datei_hash = self.datei_hash(pfad)
+            vorhanden = bestand.get(pfad.name)
+            if not force and vorhanden is not None and vorhanden.hash == datei_hash:
+                stats['uebersprungen'] += 1
+                continue
+            zu_parsen.append((pfad, datei_hash))
+
+        if zu_parsen:
+            ergebnisse = self._parse_parallel([pfad for pfad, _ in zu_parsen], workers, stats['fehler'])
+            geaenderte_module = set()
+
+            for pfad, datei_hash in zu_parsen:
+                if pfad.name not in ergebnisse:
+                    continue
+                try:
+                    geaenderte_module |= self._speichere_handbuch(pfad.name, datei_hash, ergebnisse[pfad.name], stats)
+                    db.session.commit()
+                    stats['importiert'] += 1
+                except Exception as e:
+                    db.session.rollback()
+                    current_app.logger.error(f'[ModulhandbuchImport] {pfad.name} failed: {e}')
+                    stats['fehler'].append(f'{pfad.name}: {e}')
+
+            if stats['importiert']:
+                self._invalidiere(geaenderte_module)
+
+        stats['dauer'] = round(time.perf_counter() - start, 2)
+        current_app.logger.info(
+            f"[ModulhandbuchImport] {stats['importiert']} imported, {stats['uebersprungen']} unchanged, "
+            f"{len(stats['fehler'])} errors ({stats['dauer']}s)"
+        )
+        return stats
+
+    @staticmethod
+    def datei_hash(pfad: Path) -> str:
+        """SHA-256 des Dateiinhalts (blockweise gelesen)"""
+        sha = hashlib.sha256()
+        with open(pfad, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    # =========================================================================
+    # PARSEN
+    # =========================================================================
+
+    def _parse_parallel(self, pfade: List[Path], workers: int, fehler: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Parst PDFs im Prozess-Pool.
+
+        Returns:
+            Dict {dateiname: {'anzahl_seiten': n, 'seiten': [Seiten-Info, ...]}}
+        """
+        import fitz
+
+        seiten_pro_task = current_app.config.get('MODULHANDBUCH_IMPORT_SEITEN_PRO_TASK', 32)
+
+        tasks = []
+        anzahl_seiten = {}
+        for pfad in pfade:
+            try:
+                with fitz.open(pfad) as doc:
+                    anzahl_seiten[pfad.name] = doc.page_count
+            except Exception as e:
+                current_app.logger.error(f'[ModulhandbuchImport] {pfad.name} unreadable: {e}')
+                fehler.append(f'{pfad.name}: {e}')
+                continue
+            for von in range(0, anzahl_seiten[pfad.name], seiten_pro_task):
+                tasks.append((str(pfad), von, min(von + seiten_pro_task, anzahl_seiten[pfad.name])))
+
+        teile: Dict[str, List[Dict[str, Any]]] = {name: [] for name in anzahl_seiten}
+        fehlgeschlagen = set()
+
+        workers = min(workers, len(tasks), os.cpu_count() or 1)
+        if workers <= 1:
+            for task in tasks:
+                name = Path(task[0]).name
+                try:
+                    teile[name].extend(_parse_seiten(*task))
+                except Exception as e:
+                    fehlgeschlagen.add(name)
+                    fehler.append(f'{name}: {e}')
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context(current_app.config.get('MODULHANDBUCH_IMPORT_MP_CONTEXT', 'fork')),
+            )
+            try:
+                futures = {executor.submit(_parse_seiten, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    name = Path(futures[future][0]).name
+                    try:
+                        teile[name].extend(future.result())
+                    except Exception as e:
+                        current_app.logger.error(f'[ModulhandbuchImport] {name} pages {futures[future][1:]} failed: {e}')
+                        fehlgeschlagen.add(name)
+                        fehler.append(f'{name}: {e}')
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return {
+            name: {'anzahl_seiten': anzahl_seiten[name], 'seiten': sorted(seiten, key=lambda s: s['seite'])}
+            for name, seiten in teile.items()
+            if name not in fehlgeschlagen
+        }
+
+    @staticmethod
+    def modul_bereiche(seiten: List[Dict[str, Any]], anzahl_seiten: int) -> List[Dict[str, Any]]:
+        """
+        Leitet Module mit Seitenbereich aus den klassifizierten Seiten ab.
+
+        Ein Modul reicht bis vor den nächsten Modul-Beginn oder
+        Kapitel-Trenner (bzw. bis zur letzten Seite).
+
+        Returns:
+            Liste {kuerzel, seite_von, seite_bis, **merkmale} in PDF-Reihenfolge
+        """
+        module = []
+        aktuell = None
+        for seite in seiten:
+            if seite['typ'] == SEITE_FORTSETZUNG:
+                continue
+            if aktuell is not None:
+                aktuell['seite_bis'] = seite['seite'] - 1
+                aktuell = None
+            if seite['typ'] == SEITE_MODUL:
+                aktuell = dict(seite['modul'], seite_von=seite['seite'], seite_bis=anzahl_seiten)
+                module.append(aktuell)
+        return module
+
+    # =========================================================================
+    # SPEICHERN
+    # =========================================================================
+
+    def _speichere_handbuch(self, dateiname: str, datei_hash: str, ergebnis: Dict[str, Any], stats: Dict[str, Any]) -> set:
+        """
+        Schreibt ein geparstes Handbuch (ohne Commit).
+
+        Returns:
+            IDs der neu angelegten oder geänderten Module
+        """
+        po_id, studiengang_id = self._zuordnung(dateiname)
+        module = self.modul_bereiche(ergebnis['seiten'], ergebnis['anzahl_seiten'])
+
+        # Doppelte Kürzel (z.B. Modul in zwei Katalogen): erster Eintrag zählt
+        eindeutig: Dict[str, Dict[str, Any]] = {}
+        for modul in module:
+            eindeutig.setdefault(modul['kuerzel'], modul)
+
+        modul_ids, geaendert = self._upsert_module(po_id, list(eindeutig.values()), stats)
+
+        handbuch = db.session.execute(
+            select(Modulhandbuch).where(
+                (Modulhandbuch.dateiname == dateiname) | (Modulhandbuch.hash == datei_hash)
+            )
+        ).scalars().first()
+        if handbuch is None:
+            handbuch = Modulhandbuch(dateiname=dateiname, po_id=po_id)
+            db.session.add(handbuch)
+
+        handbuch.dateiname = dateiname
+        handbuch.po_id = po_id
+        handbuch.studiengang_id = studiengang_id
+        handbuch.hash = datei_hash
+        handbuch.anzahl_seiten = ergebnis['anzahl_seiten']
+        handbuch.anzahl_module = len(eindeutig)
+        handbuch.import_datum = datetime.utcnow()
+        db.session.flush()
+
+        db.session.query(ModulSeiten).filter_by(modulhandbuch_id=handbuch.id).delete(synchronize_session=False)
+        seiten = [
+            {
+                'modul_id': modul_ids[kuerzel],
+                'po_id': po_id,
+                'modulhandbuch_id': handbuch.id,
+                'seite_von': modul['seite_von'],
+                'seite_bis': modul['seite_bis'],
+            }
+            for kuerzel, modul in eindeutig.items()
+        ]
+        if seiten:
+            db.session.execute(insert(ModulSeiten), seiten)
+        stats['seiten'] += len(seiten)
+
+        current_app.logger.info(
+            f'[ModulhandbuchImport] {dateiname}: {len(eindeutig)} modules, {ergebnis["anzahl_seiten"]} pages'
+        )
+        return geaendert
+
+    def _upsert_module(self, po_id: int, module: List[Dict[str, Any]], stats: Dict[str, Any]) -> Tuple[Dict[str, int], set]:
+        """
+        Gleicht Modul-Stammdaten gebündelt ab (Kürzel + PO als Schlüssel).
+
+        Vorhandene Module werden nur aktualisiert, wenn sich ein Feld
+        ändert (leere Werte aus dem PDF überschreiben nichts).
+
+        Returns:
+            ({kuerzel: modul_id}, IDs neuer/geänderter Module)
+        """
+        batch_size = current_app.config.get('MODULHANDBUCH_IMPORT_BATCH_SIZE', 200)
+        spalten = ['bezeichnung_de'] + [spalte for spalte, _ in MERKMALE.values()]
+
+        vorhanden: Dict[str, Any] = {}
+        for kuerzel_batch in _batches([m['kuerzel'] for m in module], batch_size):
+            rows = db.session.execute(
+                select(Modul.id, Modul.kuerzel, *[getattr(Modul, spalte) for spalte in spalten])
+                .where(Modul.po_id == po_id, Modul.kuerzel.in_(kuerzel_batch))
+                .order_by(Modul.id)
+            )
+            for row in rows:
+                vorhanden.setdefault(row.kuerzel, row)
+
+        jetzt = datetime.utcnow()
+        neu, aenderungen = [], []
+        for modul in module:
+            werte = {spalte: modul[spalte] for spalte in spalten if modul.get(spalte) not in (None, '')}
+            row = vorhanden.get(modul['kuerzel'])
+            if row is None:
+                neu.append(dict(werte, kuerzel=modul['kuerzel'], po_id=po_id, created_at=jetzt, updated_at=jetzt))
+                continue
+            diff = {spalte: wert for spalte, wert in werte.items() if getattr(row, spalte) != wert}
+            if diff:
+                aenderungen.append(dict(diff, id=row.id, updated_at=jetzt))
+
+        modul_ids = {kuerzel: row.id for kuerzel, row in vorhanden.items()}
+        geaendert = {aenderung['id'] for aenderung in aenderungen}
+
+        for batch in _batches(neu, batch_size):
+            ids = db.session.execute(insert(Modul).returning(Modul.id, Modul.kuerzel), batch).all()
+            for modul_id, kuerzel in ids:
+                modul_ids[kuerzel] = modul_id
+                geaendert.add(modul_id)
+
+        # Bulk-UPDATE nach Primary Key; gleiche Spaltenmenge pro executemany
+        nach_spalten: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for aenderung in aenderungen:
+            nach_spalten.setdefault(tuple(sorted(aenderung)), []).append(aenderung)
+        for gruppe in nach_spalten.values():
+            for batch in _batches(gruppe, batch_size):
+                db.session.execute(update(Modul), batch)
+
+        stats['module_neu'] += len(neu)
+        stats['module_aktualisiert'] += len(aenderungen)
+        return modul_ids, geaendert
+
+    @staticmethod
+    def _zuordnung(dateiname: str) -> Tuple[int, Optional[int]]:
+        """
+        Ermittelt PO und Studiengang aus dem Dateinamen.
+
+        MHB_2023_IN_MA.pdf -> PO2023, Studiengang 'IN_MA' (sonst 'IN' mit Abschluss Master)
+
+        Raises:
+            ValueError: Unbekanntes Namensschema oder unbekannte PO
+        """
+        treffer = DATEINAME_MUSTER.match(dateiname)
+        if not treffer:
+            raise ValueError('Dateiname entspricht nicht MHB_<Jahr>_<Studiengang>_<BA|MA>.pdf')
+
+        jahr, kuerzel, abschluss = treffer.group(1), treffer.group(2).upper(), treffer.group(3).upper()
+
+        po_id = db.session.execute(
+            select(Pruefungsordnung.id)
+            .where(Pruefungsordnung.po_jahr.in_([f'PO{jahr}', jahr]))
+            .order_by(Pruefungsordnung.id)
+        ).scalars().first()
+        if po_id is None:
+            raise ValueError(f'Prüfungsordnung PO{jahr} nicht gefunden')
+
+        kandidaten = db.session.execute(
+            select(Studiengang.id, Studiengang.kuerzel, Studiengang.abschluss)
+            .where(Studiengang.kuerzel.in_([f'{kuerzel}_{abschluss}', kuerzel]))
+        ).all()
+        studiengang_id = next(
+            (sg.id for sg in kandidaten if sg.kuerzel == f'{kuerzel}_{abschluss}'),
+            next((sg.id for sg in kandidaten if sg.abschluss == ABSCHLUESSE[abschluss]), None)
+        )
+        return po_id, studiengang_id
+
+    @staticmethod
+    def _invalidiere(modul_ids: set) -> None:
+        """Core-INSERT/UPDATE lösen keine ORM-Events aus: Caches explizit invalidieren"""
+        from app.services import modul_suche_service, modulhandbuch_service
+        from app.utils.cache_utils import invalidate_cache_tags
+
+        invalidate_cache_tags('modul', 'modulhandbuch')
+        modulhandbuch_service.invalidate()
+        try:
+            modul_suche_service.apply_changes(modul_ids)
+        except Exception as e:
+            current_app.logger.error(f'[ModulhandbuchImport] Search index update failed: {e}')
+
+
+# =============================================================================
+# PARSE-PROZESSE (ohne App-Kontext, nur PyMuPDF)
+# =============================================================================
+
+def _parse_seiten(pfad: str, von: int, bis: int) -> List[Dict[str, Any]]:
+    """
+    Klassifiziert die Seiten [von, bis) eines PDFs (0-basiert).
+
+    Returns:
+        Liste {seite (1-basiert), typ, modul (nur bei Modul-Beginn)}
+    """
+    import fitz
+
+    seiten = []
+    with fitz.open(pfad) as doc:
+        for index in range(von, bis):
+            zeilen = _inhalt(doc[index].get_text())
+            seite = {'seite': index + 1, 'typ': _seitentyp(zeilen)}
+            if seite['typ'] == SEITE_MODUL:
+                seite['modul'] = _steckbrief(zeilen)
+            seiten.append(seite)
+    return seiten
+
+
+def _inhalt(text: str) -> Optional[List[str]]:
+    """Nicht-leere Zeilen nach dem Seitenkopf (None = Seite ohne Kopf, z.B. Deckblatt)"""
+    zeilen = [zeile.strip() for zeile in text.splitlines()]
+    for i, zeile in enumerate(zeilen):
+        if SEITENKOPF_MUSTER.match(zeile):
+            return [z for z in zeilen[i + 1:] if z]
+    return None
+
+
+def _seitentyp(zeilen: Optional[List[str]]) -> str:
+    if not zeilen:
+        return SEITE_KAPITEL
+    if KUERZEL_LABEL in zeilen[:KUERZEL_SUCHBEREICH] and zeilen.index(KUERZEL_LABEL) > 0:
+        return SEITE_MODUL
+    if len(zeilen) == 1:
+        # Trennseite "Modulkatalog", "Wahlpflichtkatalog ..."
+        return SEITE_KAPITEL
+    return SEITE_FORTSETZUNG
+
+
+def _steckbrief(zeilen: List[str]) -> Dict[str, Any]:
+    """Titel, Kürzel und Stammdaten-Felder von der ersten Modulseite"""
+    k = zeilen.index(KUERZEL_LABEL)
+    modul = {
+        'bezeichnung_de': ' '.join(zeilen[:k])[:200],
+        'kuerzel': zeilen[k + 1][:20] if k + 1 < len(zeilen) else '',
+    }
+
+    label, werte = None, []
+    for zeile in zeilen[k + 2:] + ['']:
+        if zeile.endswith(':') or zeile.startswith(LABEL_ANFAENGE) or not zeile:
+            if label in MERKMALE:
+                modul[MERKMALE[label][0]] = _merkmal(label, werte)
+            label, werte = zeile, []
+        else:
+            werte.append(zeile)
+    return modul
+
+
+def _merkmal(label: str, werte: List[str]) -> Any:
+    spalte, laenge = MERKMALE[label]
+    wert = ' '.join(werte).strip()
+    if spalte == 'leistungspunkte':
+        zahl = re.search(r'\d+', wert)
+        return int(zahl.group()) if zahl else None
+    return wert[:laenge] if laenge else wert
+
+
+def _batches(items: List[Any], groesse: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), groesse):
+        yield items[i:i + groesse]
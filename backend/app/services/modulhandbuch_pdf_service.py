@@ -0,0 +1,166 @@
+"""
+Modulhandbuch PDF Service
+=========================
+Liefert die Seiten eines Moduls als eigenes PDF (Auszug aus dem Modulhandbuch).
+
+- Seitenbereich aus ModulSeiten, Quelle Modulhandbuch.dateiname
+- Auszüge werden auf Disk gecacht, Key = (Handbuch-Hash, Seitenbereich):
+  ein neu importiertes Handbuch (neuer Hash) erzeugt automatisch neue
+  Auszüge, Module mit gleichem Bereich teilen sich eine Datei
+- LRU: Zugriff setzt die atime (mtime bleibt, sie steckt in ETag und
+  Last-Modified), beim Schreiben werden die am längsten nicht genutzten
+  Auszüge gelöscht, bis der Cache unter MODULHANDBUCH_AUSZUG_CACHE_MB liegt
+- Erzeugen per PyMuPDF insert_pdf(): MuPDF öffnet die Quelle per Datei
+  (lazy, mit Seek) und liest nur Xref und die Objekte der kopierten Seiten
+- Ausgeliefert wird die Datei per send_file (Gunicorn: sendfile())
+
+Config:
+    MODULHANDBUCH_DIR = 'Modulhandbuecher'
+    MODULHANDBUCH_AUSZUG_DIR = 'instance/modulhandbuch_auszuege'
+    MODULHANDBUCH_AUSZUG_CACHE_MB = 200
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Modul, Modulhandbuch, ModulSeiten
+
+
+class ModulhandbuchPdfService:
+    """
+    Modulhandbuch PDF Service
+
+    Erzeugt und cacht Seiten-Auszüge aus den PDF-Modulhandbüchern.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def get_auszug(self, modul_id: int, modulhandbuch_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Liefert den PDF-Auszug eines Moduls.
+
+        Args:
+            modul_id: Modul
+            modulhandbuch_id: Optional - Handbuch, falls das Modul in
+                              mehreren Handbüchern steht (Default: erstes)
+
+        Returns:
+            Dict mit path, download_name, seite_von, seite_bis
+            oder None, wenn keine Seiten hinterlegt sind
+
+        Raises:
+            FileNotFoundError: Handbuch-PDF fehlt auf Disk
+        """
+        stmt = (
+            select(
+                ModulSeiten.seite_von, ModulSeiten.seite_bis,
+                Modulhandbuch.dateiname, Modulhandbuch.hash, Modul.kuerzel
+            )
+            .join(Modulhandbuch, Modulhandbuch.id == ModulSeiten.modulhandbuch_id)
+            .join(Modul, Modul.id == ModulSeiten.modul_id)
+            .where(ModulSeiten.modul_id == modul_id)
+            .order_by(ModulSeiten.modulhandbuch_id)
+        )
+        if modulhandbuch_id is not None:
+            stmt = stmt.where(ModulSeiten.modulhandbuch_id == modulhandbuch_id)
+
+        row = db.session.execute(stmt).first()
+        if row is None:
+            return None
+
+        seite_von = row.seite_von
+        seite_bis = max(row.seite_bis or seite_von, seite_von)
+
+        return {
+            'path': self._hole_oder_erzeuge(row.dateiname, row.hash, seite_von, seite_bis),
+            'download_name': f'{Path(row.dateiname).stem}_{row.kuerzel}_S{seite_von}-{seite_bis}.pdf',
+            'seite_von': seite_von,
+            'seite_bis': seite_bis,
+        }
+
+    # =========================================================================
+    # DISK-CACHE
+    # =========================================================================
+
+    def _cache_dir(self) -> Path:
+        path = Path(current_app.config['MODULHANDBUCH_AUSZUG_DIR'])
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def auszug_path(self, handbuch_hash: str, seite_von: int, seite_bis: int) -> Path:
+        """Cache-Pfad eines Auszugs"""
+        return self._cache_dir() / f'{handbuch_hash[:32]}_{seite_von}-{seite_bis}.pdf'
+
+    def _hole_oder_erzeuge(self, dateiname: str, handbuch_hash: Optional[str], seite_von: int, seite_bis: int) -> Path:
+        # Handbücher ohne Hash (manuell angelegt): Dateiname als Key
+        path = self.auszug_path(handbuch_hash or dateiname, seite_von, seite_bis)
+        try:
+            # LRU: Zugriff vermerken (explizites utime wirkt auch bei noatime)
+            os.utime(path, (time.time(), path.stat().st_mtime))
+            return path
+        except FileNotFoundError:
+            pass
+
+        quelle = Path(current_app.config['MODULHANDBUCH_DIR']) / dateiname
+        if not quelle.is_file():
+            raise FileNotFoundError(f'Modulhandbuch {dateiname} nicht gefunden')
+
+        self._erzeuge(quelle, path, seite_von, seite_bis)
+        current_app.logger.debug(f'[ModulhandbuchPDF] Excerpt created: {path.name}')
+        self._raeume_auf(path)
+        return path
+
+    @staticmethod
+    def _erzeuge(quelle: Path, ziel: Path, seite_von: int, seite_bis: int) -> None:
+        """Kopiert die Seiten [seite_von, seite_bis] (1-basiert) in ein neues PDF (atomar)"""
+        import fitz
+
+        tmp_path = ziel.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with fitz.open(quelle) as src, fitz.open() as auszug:
+            letzte = min(seite_bis, src.page_count) - 1
+            auszug.insert_pdf(src, from_page=seite_von - 1, to_page=letzte)
+            auszug.save(tmp_path, garbage=3, deflate=True)
+        os.replace(tmp_path, ziel)
+
+    def _raeume_auf(self, behalten: Path) -> None:
+        """Löscht die am längsten nicht genutzten Auszüge über dem Limit"""
+        limit = current_app.config.get('MODULHANDBUCH_AUSZUG_CACHE_MB', 200) * 1024 * 1024
+
+        with self._lock:
+            dateien = []
+            gesamt = 0
+            for eintrag in os.scandir(behalten.parent):
+                if not eintrag.name.endswith('.pdf'):
+                    continue
+                try:
+                    stat = eintrag.stat()
+                except FileNotFoundError:
+                    continue
+                dateien.append((stat.st_atime, stat.st_size, eintrag.path))
+                gesamt += stat.st_size
+
+            if gesamt <= limit:
+                return
+
+            for _, groesse, pfad in sorted(dateien):
+                if gesamt <= limit:
+                    break
+                if pfad == str(behalten):
+                    continue
+                try:
+                    os.unlink(pfad)
+                    gesamt -= groesse
+                except FileNotFoundError:
+                    pass
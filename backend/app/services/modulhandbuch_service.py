@@ -0,0 +1,412 @@
+"""
+Modulhandbuch Service
+=====================
+Materialisierte Modulhandbücher-Übersicht (GET /api/dashboard/modulhandbuecher).
+
+Statt die Übersicht bei jedem Cache-Miss komplett neu zu aggregieren, wird
+ein Snapshot im (geteilten) Cache gehalten:
+
+- module:         modul_id -> Basisdaten + Studiengang-Zuordnungen
+- studiengaenge:  aktive Studiengänge (sortiert nach Kürzel)
+- uebersicht:     fertig aufgebaute Response-Daten
+
+Änderungen an Modul, ModulStudiengang, ModulDozent, ModulLehrform, Dozent
+und Studiengang werden nach dem Commit inkrementell eingearbeitet: nur die
+betroffenen Module werden neu geladen, danach wird die Übersicht aus dem
+Snapshot (ohne DB-Zugriff) neu zusammengesetzt.
+
+Konsistenz über Worker hinweg:
+    Jeder relevante Commit erhöht einen Generations-Zähler. Ein Snapshot
+    ist nur gültig, wenn seine Generation dem Zähler entspricht. Kann ein
+    Commit nicht lückenlos eingearbeitet werden (paralleler Commit in
+    einem anderen Worker), bleibt der Snapshot veraltet und wird beim
+    nächsten Zugriff komplett neu aufgebaut.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.extensions import cache, db
+from app.models import Dozent, Modul, ModulDozent, ModulLehrform, ModulStudiengang, Studiengang
+
+
+SNAPSHOT_KEY = 'materialized/modulhandbuecher'
+GENERATION_KEY = 'materialized/modulhandbuecher:generation'
+# Spätestens dann Neuaufbau, auch wenn eine Änderung nicht ankam
+SNAPSHOT_TIMEOUT = 6 * 3600
+
+
+class ModulhandbuchService:
+    """
+    Modulhandbuch Service
+
+    Liefert die Modulhandbücher-Übersicht aus einem inkrementell
+    gepflegten Snapshot.
+    """
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def get_uebersicht(self) -> Dict[str, Any]:
+        """
+        Holt die Modulhandbücher-Übersicht.
+
+        Returns:
+            Dict mit studiengaenge, nicht_zugeordnet, gesamt_statistik
+        """
+        snapshot = cache.get(SNAPSHOT_KEY)
+        if snapshot is None or snapshot.get('generation') != self._get_generation():
+            snapshot = self.rebuild()
+        return snapshot['uebersicht']
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Baut den Snapshot komplett neu auf (3 Queries).
+
+        Returns:
+            Neuer Snapshot
+        """
+        # Generation VOR dem Laden lesen: spätere Commits machen den
+        # Snapshot ungültig statt verloren zu gehen
+        generation = self._get_generation()
+
+        # Eigene Session auf dem Primary: der Snapshot wird unter der
+        # aktuellen Generation gespeichert, eine nachlaufende Replica
+        # (GET-Request) lieferte einen veralteten Stand
+        with Session(db.engine) as session:
+            snapshot = {
+                'generation': generation,
+                'studiengaenge': self._load_studiengaenge(session),
+                'module': self._load_module(session),
+            }
+        snapshot['uebersicht'] = self._build_uebersicht(snapshot)
+
+        cache.set(SNAPSHOT_KEY, snapshot, timeout=SNAPSHOT_TIMEOUT)
+        current_app.logger.info(
+            f"[Modulhandbuch] Snapshot rebuilt ({len(snapshot['module'])} Module, generation {generation})"
+        )
+        return snapshot
+
+    def apply_changes(
+        self,
+        modul_ids: Iterable[int] = (),
+        dozent_ids: Iterable[int] = (),
+        studiengaenge_geaendert: bool = False
+    ) -> bool:
+        """
+        Arbeitet Änderungen inkrementell in den Snapshot ein.
+
+        Args:
+            modul_ids: Geänderte Module
+            dozent_ids: Geänderte Dozenten (betroffene Module werden ermittelt)
+            studiengaenge_geaendert: Studiengang-Stammdaten geändert
+
+        Returns:
+            True wenn eingearbeitet, False wenn der Snapshot beim nächsten
+            Zugriff neu aufgebaut wird
+        """
+        generation = self._next_generation()
+
+        snapshot = cache.get(SNAPSHOT_KEY)
+        # Nur lückenlos anwenden: Snapshot muss den Stand direkt vor
+        # diesem Commit enthalten
+        if snapshot is None or snapshot.get('generation') != generation - 1:
+            return False
+
+        modul_ids = set(modul_ids)
+        dozent_ids = set(dozent_ids)
+
+        # Eigene Session: in after_commit darf die Request-Session kein SQL absetzen
+        with Session(db.engine) as session:
+            if dozent_ids:
+                modul_ids.update(session.scalars(
+                    select(ModulDozent.modul_id).where(ModulDozent.dozent_id.in_(dozent_ids))
+                ))
+
+            if studiengaenge_geaendert:
+                snapshot['studiengaenge'] = self._load_studiengaenge(session)
+
+            if modul_ids:
+                geladen = self._load_module(session, modul_ids)
+                for modul_id in modul_ids:
+                    if modul_id in geladen:
+                        snapshot['module'][modul_id] = geladen[modul_id]
+                    else:
+                        snapshot['module'].pop(modul_id, None)
+
+        snapshot['generation'] = generation
+        snapshot['uebersicht'] = self._build_uebersicht(snapshot)
+        cache.set(SNAPSHOT_KEY, snapshot, timeout=SNAPSHOT_TIMEOUT)
+        return True
+
+    def invalidate(self) -> None:
+        """Markiert den Snapshot als veraltet (Neuaufbau beim nächsten Zugriff)"""
+        self._next_generation()
+
+    # =========================================================================
+    # LADEN
+    # =========================================================================
+
+    def _load_studiengaenge(self, session) -> List[Dict[str, Any]]:
+        """Lädt alle aktiven Studiengänge (sortiert nach Kürzel)"""
+        studiengaenge = session.scalars(
+            select(Studiengang).where(Studiengang.aktiv == True).order_by(Studiengang.kuerzel)
+        ).all()
+        return [
+            {
+                'id': sg.id,
+                'kuerzel': sg.kuerzel,
+                'bezeichnung': sg.bezeichnung,
+                'abschluss': sg.abschluss,
+                'fachbereich': sg.fachbereich,
+                'regelstudienzeit': sg.regelstudienzeit,
+                'ects_gesamt': sg.ects_gesamt,
+            }
+            for sg in studiengaenge
+        ]
+
+    def _load_module(self, session, modul_ids: Optional[Set[int]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Lädt Module inkl. Lehrformen, Dozenten und Studiengang-Zuordnungen.
+
+        Args:
+            session: SQLAlchemy Session
+            modul_ids: Optional - nur diese Module laden
+
+        Returns:
+            Dict modul_id -> Snapshot-Eintrag
+        """
+        stmt = select(Modul).options(
+            selectinload(Modul.lehrformen),
+            selectinload(Modul.studiengang_zuordnungen),
+            selectinload(Modul.dozent_zuordnungen).joinedload(ModulDozent.dozent),
+        )
+        if modul_ids is not None:
+            stmt = stmt.where(Modul.id.in_(modul_ids))
+
+        module = {}
+        for modul in session.scalars(stmt).unique():
+            verantwortlicher = None
+            lehrpersonen = []
+            for dz in modul.dozent_zuordnungen:
+                rolle = ModulDozent.normalisiere_rolle(dz.rolle)
+                if rolle == ModulDozent.ROLLE_VERANTWORTLICHER and dz.dozent:
+                    verantwortlicher = dz.dozent.name_komplett
+                elif rolle == ModulDozent.ROLLE_LEHRPERSON and dz.dozent:
+                    lehrpersonen.append(dz.dozent.name_komplett)
+
+            module[modul.id] = {
+                'basis': {
+                    'id': modul.id,
+                    'kuerzel': modul.kuerzel,
+                    'bezeichnung_de': modul.bezeichnung_de,
+                    'bezeichnung_en': modul.bezeichnung_en,
+                    'leistungspunkte': modul.leistungspunkte,
+                    'turnus': modul.turnus,
+                    'sws_gesamt': modul.get_sws_gesamt(),
+                    'verantwortlicher': verantwortlicher,
+                    'lehrpersonen': lehrpersonen,
+                },
+                'zuordnungen': [
+                    {
+                        'id': mz.id,
+                        'studiengang_id': mz.studiengang_id,
+                        'semester': mz.semester,
+                        'pflicht': mz.pflicht,
+                        'wahlpflicht': mz.wahlpflicht,
+                    }
+                    for mz in modul.studiengang_zuordnungen
+                ],
+            }
+        return module
+
+    # =========================================================================
+    # AGGREGATION (ohne DB-Zugriff)
+    # =========================================================================
+
+    @staticmethod
+    def _normalize_turnus(turnus: Optional[str]) -> str:
+        """Normalisiert den Turnus für Frontend-Kompatibilität"""
+        turnus_raw = (turnus or '').lower()
+        if 'wintersemester' in turnus_raw and 'sommersemester' in turnus_raw:
+            return 'jedes_semester'
+        if 'jedes semester' in turnus_raw:
+            return 'jedes_semester'
+        if 'wintersemester' in turnus_raw or 'winter' in turnus_raw:
+            return 'wintersemester'
+        if 'sommersemester' in turnus_raw or 'sommer' in turnus_raw:
+            return 'sommersemester'
+        if turnus_raw:
+            return 'sonstige'
+        return 'unbekannt'
+
+    def _build_uebersicht(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Setzt die Response-Daten aus dem Snapshot zusammen"""
+        module = snapshot['module']
+
+        # Zuordnungen nach Studiengang gruppieren (Reihenfolge wie in der DB)
+        zuordnungen_je_sg: Dict[int, List] = {}
+        for eintrag in module.values():
+            for mz in eintrag['zuordnungen']:
+                zuordnungen_je_sg.setdefault(mz['studiengang_id'], []).append((mz['id'], eintrag['basis'], mz))
+
+        zugeordnete_modul_ids = set()
+        studiengaenge_data = []
+
+        for sg in snapshot['studiengaenge']:
+            module_data = []
+            kategorien = {}
+            ects_summe = 0
+            turnus_verteilung = {}
+            semester_verteilung = {}
+
+            for _, basis, mz in sorted(zuordnungen_je_sg.get(sg['id'], []), key=lambda z: z[0]):
+                zugeordnete_modul_ids.add(basis['id'])
+
+                # Kategorie aus pflicht/wahlpflicht ableiten
+                if mz['pflicht']:
+                    kategorie = 'pflicht'
+                elif mz['wahlpflicht']:
+                    kategorie = 'wahlpflicht'
+                else:
+                    kategorie = 'unbekannt'
+
+                module_data.append({
+                    **basis,
+                    'semester': mz['semester'],
+                    'kategorie': kategorie,
+                    'pflicht': mz['pflicht'],
+                    'wahlpflicht': mz['wahlpflicht'],
+                })
+
+                if basis['leistungspunkte']:
+                    ects_summe += basis['leistungspunkte']
+
+                kategorien[kategorie] = kategorien.get(kategorie, 0) + 1
+
+                turnus_key = self._normalize_turnus(basis['turnus'])
+                turnus_verteilung[turnus_key] = turnus_verteilung.get(turnus_key, 0) + 1
+
+                if mz['semester']:
+                    sem_key = str(mz['semester'])
+                    semester_verteilung[sem_key] = semester_verteilung.get(sem_key, 0) + 1
+
+            # Sortiere Module nach Semester und Kürzel
+            module_data.sort(key=lambda x: (x['semester'] or 99, x['kuerzel']))
+
+            studiengaenge_data.append({
+                **sg,
+                'module': module_data,
+                'statistik': {
+                    'anzahl_module': len(module_data),
+                    'kategorien': kategorien,
+                    'ects_summe': ects_summe,
+                    'turnus_verteilung': turnus_verteilung,
+                    'semester_verteilung': semester_verteilung
+                }
+            })
+
+        # Nicht zugeordnete Module (keinem aktiven Studiengang zugeordnet)
+        nicht_zugeordnet_data = [
+            {
+                **eintrag['basis'],
+                'semester': None,
+                'kategorie': 'unbekannt',
+            }
+            for modul_id, eintrag in module.items()
+            if modul_id not in zugeordnete_modul_ids
+        ]
+        nicht_zugeordnet_data.sort(key=lambda x: x['kuerzel'])
+
+        return {
+            'studiengaenge': studiengaenge_data,
+            'nicht_zugeordnet': {
+                'module': nicht_zugeordnet_data,
+                'anzahl': len(nicht_zugeordnet_data)
+            },
+            'gesamt_statistik': {
+                'alle_module': len(module),
+                'zugeordnet': len(zugeordnete_modul_ids),
+                'nicht_zugeordnet': len(nicht_zugeordnet_data),
+                'studiengaenge': len(snapshot['studiengaenge'])
+            }
+        }
+
+    # =========================================================================
+    # GENERATION
+    # =========================================================================
+
+    @staticmethod
+    def _get_generation() -> int:
+        return cache.get(GENERATION_KEY) or 0
+
+    @staticmethod
+    def _next_generation() -> int:
+        return cache.cache.inc(GENERATION_KEY) or 0
+
+
+# =========================================================================
+# SESSION EVENTS
+# =========================================================================
+
+def _collect_modulhandbuch_changes(session, flush_context):
+    """after_flush: Betroffene Module/Dozenten/Studiengänge in session.info sammeln"""
+    changes = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Modul):
+            key, value = 'modul_ids', obj.id
+        elif isinstance(obj, (ModulStudiengang, ModulDozent, ModulLehrform)):
+            key, value = 'modul_ids', obj.modul_id
+        elif isinstance(obj, Dozent):
+            key, value = 'dozent_ids', obj.id
+        elif isinstance(obj, Studiengang):
+            key, value = 'studiengaenge_geaendert', True
+        else:
+            continue
+
+        if changes is None:
+            changes = session.info.setdefault(
+                'modulhandbuch_changes',
+                {'modul_ids': set(), 'dozent_ids': set(), 'studiengaenge_geaendert': False}
+            )
+        if key == 'studiengaenge_geaendert':
+            changes[key] = True
+        elif value is not None:
+            changes[key].add(value)
+
+
+def _apply_modulhandbuch_changes(session):
+    """after_commit: Gesammelte Änderungen in den Snapshot einarbeiten"""
+    changes = session.info.pop('modulhandbuch_changes', None)
+    if not changes or not has_app_context():
+        return
+    from app.services import modulhandbuch_service
+    try:
+        modulhandbuch_service.apply_changes(**changes)
+    except Exception as e:
+        current_app.logger.error(f'[Modulhandbuch] Incremental update failed: {e}')
+
+
+def _discard_modulhandbuch_changes(session, previous_transaction):
+    """after_soft_rollback: Gesammelte Änderungen verwerfen"""
+    session.info.pop('modulhandbuch_changes', None)
+
+
+_SESSION_LISTENERS = (
+    ('after_flush', _collect_modulhandbuch_changes),
+    ('after_commit', _apply_modulhandbuch_changes),
+    ('after_soft_rollback', _discard_modulhandbuch_changes),
+)
+
+
+def register_modulhandbuch_listeners(app):
+    """Registriert Session-Events für die inkrementelle Snapshot-Pflege"""
+    for identifier, listener in _SESSION_LISTENERS:
+        if not event.contains(db.session, identifier, listener):
+            event.listen(db.session, identifier, listener)
+
+    app.logger.info('[OK] Modulhandbuch snapshot maintenance registered')
@@ -7,13 +7,30 @@ Funktionen:
 - Benachrichtigungen erstellen
 - Benachrichtigungen als gelesen markieren
 - Ungelesene Benachrichtigungen holen
+- Aufräumen alter Benachrichtigungen (Retention, auch per CLI)
+- Ungelesen-Zähler pro Benutzer im Shared Cache (ohne COUNT pro Request)
+
+Ungelesen-Zähler:
+    'notifications/ungelesen/<id>' -> (seq, anzahl)
+
+    Jede Änderung erhöht nach dem Commit die globale Sequenz
+    'notifications/seq' und schreibt die neu gezählten Werte der betroffenen
+    Benutzer per Compare-and-Set auf die seq: ein langsamer Schreiber mit
+    kleinerer seq überschreibt keinen neueren Zähler. Clients pollen den
+    Zähler kurz mit ETag (seq) und bekommen meist ein 304.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta
+from flask import current_app
 from app.services.base_service import BaseService
-from app.models import Benachrichtigung, Benutzer
-from app.extensions import db
+from app.models import Benachrichtigung, Benutzer, Rolle
+from app.extensions import cache, db
+from app.utils.db_routing import replica_router
+
+
+SEQ_KEY = 'notifications/seq'
+UNGELESEN_KEY = 'notifications/ungelesen/{}'
 
 
 class NotificationService(BaseService):
@@ -24,6 +41,9 @@ class NotificationService(BaseService):
     """
     
     model = Benachrichtigung
+
+    # Zeilen pro Multi-Row INSERT beim Fan-out
+    BULK_CHUNK_SIZE = 1000
     
     # Notification Types
     TYPES = {
@@ -79,6 +99,8 @@ class NotificationService(BaseService):
             nachricht=nachricht,
             gelesen=False
         )
+
+        self._aktualisiere_zaehler([empfaenger_id])
         
         return notification
     
@@ -88,10 +110,13 @@ class NotificationService(BaseService):
         typ: str,
         titel: str,
         nachricht: str = None
-    ) -> List[Benachrichtigung]:
+    ) -> int:
         """
         Erstellt Benachrichtigungen für mehrere Empfänger
-        
+
+        Schreibt per Multi-Row INSERT (BULK_CHUNK_SIZE Zeilen pro Statement)
+        ohne ORM-Objekte und committet einmal am Ende.
+
         Args:
             empfaenger_ids: Liste von Benutzer IDs
             typ: Typ der Benachrichtigung
@@ -99,27 +124,61 @@ class NotificationService(BaseService):
             nachricht: Optional - Nachricht
             
         Returns:
-            Liste von Benachrichtigungen
+            int: Anzahl erstellter Benachrichtigungen
             
         Example:
-            >>> notifications = notification_service.create_bulk(
+            >>> anzahl = notification_service.create_bulk(
                     empfaenger_ids=[1, 2, 3],
                     typ='planungsphase_geoeffnet',
                     titel='Planungsphase ist geöffnet',
                     nachricht='Sie können jetzt Ihre Semesterplanung erstellen.'
                 )
         """
-        notifications = []
-        for empfaenger_id in empfaenger_ids:
-            notification = self.create_notification(
-                empfaenger_id=empfaenger_id,
-                typ=typ,
-                titel=titel,
-                nachricht=nachricht
-            )
-            notifications.append(notification)
-        
-        return notifications
+        if typ not in self.TYPES:
+            raise ValueError(f"Ungültiger Notification-Typ: {typ}")
+
+        # Reihenfolge beibehalten, doppelte Empfänger nur einmal
+        empfaenger_ids = list(dict.fromkeys(empfaenger_ids))
+        if not empfaenger_ids:
+            return 0
+
+        jetzt = datetime.utcnow()
+        rows = [
+            {
+                'empfaenger_id': empfaenger_id,
+                'typ': typ,
+                'titel': titel,
+                'nachricht': nachricht,
+                'gelesen': False,
+                'erstellt_am': jetzt,
+            }
+            for empfaenger_id in empfaenger_ids
+        ]
+
+        try:
+            for start in range(0, len(rows), self.BULK_CHUNK_SIZE):
+                db.session.execute(
+                    db.insert(Benachrichtigung),
+                    rows[start:start + self.BULK_CHUNK_SIZE]
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self._aktualisiere_zaehler(empfaenger_ids)
+
+        return len(rows)
+
+    def _empfaenger_ids_fuer_rollen(self, rollen: List[str]) -> List[int]:
+        """Holt nur die IDs aller Benutzer mit einer der Rollen (ohne ORM-Objekte)"""
+        return [
+            row[0] for row in db.session.query(Benutzer.id)
+            .join(Rolle, Benutzer.rolle_id == Rolle.id)
+            .filter(Rolle.name.in_(rollen))
+            .order_by(Benutzer.id)
+            .all()
+        ]
     
     # =========================================================================
     # SPECIFIC NOTIFICATIONS
@@ -201,7 +260,7 @@ class NotificationService(BaseService):
         self,
         semester_kuerzel: str,
         alle_dozenten: bool = True
-    ) -> List[Benachrichtigung]:
+    ) -> int:
         """
         Benachrichtigt über geöffnete Planungsphase
         
@@ -210,13 +269,11 @@ class NotificationService(BaseService):
             alle_dozenten: Alle Dozenten benachrichtigen?
             
         Returns:
-            Liste von Benachrichtigungen
+            int: Anzahl erstellter Benachrichtigungen
         """
         if alle_dozenten:
-            # Hole alle Dozenten (Professoren + Lehrbeauftragte)
-            from app.services.user_service import user_service
-            dozenten = user_service.get_dozenten()
-            empfaenger_ids = [d.id for d in dozenten]
+            # Alle Dozenten (Professoren + Lehrbeauftragte)
+            empfaenger_ids = self._empfaenger_ids_fuer_rollen(['professor', 'lehrbeauftragter'])
         else:
             empfaenger_ids = []
         
@@ -231,7 +288,7 @@ class NotificationService(BaseService):
         self,
         dozent_name: str,
         semester_kuerzel: str
-    ) -> List[Benachrichtigung]:
+    ) -> int:
         """
         Benachrichtigt Dekane über neue eingereichte Planung
         
@@ -240,11 +297,9 @@ class NotificationService(BaseService):
             semester_kuerzel: Semester-Kürzel
             
         Returns:
-            Liste von Benachrichtigungen
+            int: Anzahl erstellter Benachrichtigungen
         """
-        from app.services.user_service import user_service
-        dekane = user_service.get_dekane()
-        empfaenger_ids = [d.id for d in dekane]
+        empfaenger_ids = self._empfaenger_ids_fuer_rollen(['dekan'])
         
         return self.create_bulk(
             empfaenger_ids=empfaenger_ids,
@@ -275,6 +330,7 @@ class NotificationService(BaseService):
             return False
         
         notification.markiere_gelesen()
+        self._aktualisiere_zaehler([notification.empfaenger_id])
         return True
     
     def markiere_alle_gelesen(
@@ -290,12 +346,23 @@ class NotificationService(BaseService):
         Returns:
             int: Anzahl markierter Benachrichtigungen
         """
-        ungelesen = self.get_ungelesene(benutzer_id)
-        
-        for notification in ungelesen:
-            notification.markiere_gelesen()
-        
-        return len(ungelesen)
+        try:
+            count = db.session.execute(
+                db.update(Benachrichtigung)
+                .where(
+                    Benachrichtigung.empfaenger_id == benutzer_id,
+                    Benachrichtigung.gelesen == False
+                )
+                .values(gelesen=True, gelesen_am=datetime.utcnow()),
+                execution_options={'synchronize_session': False}
+            ).rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self._aktualisiere_zaehler([benutzer_id])
+        return count
     
     def delete_notification(
         self,
@@ -310,7 +377,15 @@ class NotificationService(BaseService):
         Returns:
             bool: True wenn erfolgreich
         """
-        return self.delete(notification_id)
+        notification = self.get_by_id(notification_id)
+        if not notification:
+            return False
+
+        empfaenger_id = notification.empfaenger_id
+        geloescht = self.delete(notification_id)
+        if geloescht:
+            self._aktualisiere_zaehler([empfaenger_id])
+        return geloescht
     
     # =========================================================================
     # QUERIES
@@ -412,7 +487,7 @@ class NotificationService(BaseService):
         benutzer_id: int
     ) -> int:
         """
-        Zählt ungelesene Benachrichtigungen
+        Zählt ungelesene Benachrichtigungen (aus dem Ungelesen-Zähler)
         
         Args:
             benutzer_id: Benutzer ID
@@ -420,10 +495,86 @@ class NotificationService(BaseService):
         Returns:
             int: Anzahl ungelesener Benachrichtigungen
         """
-        return Benachrichtigung.query.filter_by(
-            empfaenger_id=benutzer_id,
-            gelesen=False
-        ).count()
+        return self.get_ungelesen_stand(benutzer_id)[1]
+
+    def get_ungelesen_stand(
+        self,
+        benutzer_id: int
+    ) -> Tuple[int, int]:
+        """
+        Holt den Ungelesen-Zähler eines Benutzers
+
+        Nur wenn der Zähler im Cache fehlt (erster Zugriff, TTL abgelaufen)
+        wird gezählt.
+
+        Args:
+            benutzer_id: Benutzer ID
+
+        Returns:
+            tuple: (seq, anzahl) - seq ändert sich bei jeder Änderung
+        """
+        stand = cache.get(UNGELESEN_KEY.format(benutzer_id))
+        if stand is not None:
+            return stand
+
+        seq = cache.get(SEQ_KEY) or 0
+        # Primary: der Zähler bleibt bis zur nächsten Änderung bzw. TTL stehen
+        with replica_router.primary():
+            anzahl = Benachrichtigung.query.filter_by(
+                empfaenger_id=benutzer_id,
+                gelesen=False
+            ).count()
+        stand = (seq, anzahl)
+        # add() statt set(): hat eine parallele Änderung den Zähler
+        # inzwischen geschrieben, bleibt deren (neuerer) Stand erhalten
+        cache.add(
+            UNGELESEN_KEY.format(benutzer_id), stand,
+            timeout=current_app.config.get('NOTIFICATION_COUNTER_TTL', 3600)
+        )
+        return stand
+
+    def _aktualisiere_zaehler(self, benutzer_ids: Iterable[int]) -> None:
+        """
+        Schreibt die Ungelesen-Zähler der Benutzer nach einer Änderung neu
+
+        Eine GROUP BY Abfrage pro BULK_CHUNK_SIZE Benutzer (Primary) und ein
+        Compare-and-Set in den Shared Cache. Muss nach dem Commit laufen:
+        dann enthält jede Zählung alle Änderungen mit kleinerer seq. Fehler
+        werden nur geloggt - der Zähler läuft dann spätestens per TTL wieder
+        ein.
+        """
+        benutzer_ids = list(dict.fromkeys(benutzer_ids))
+        if not benutzer_ids:
+            return
+
+        try:
+            seq = cache.cache.inc(SEQ_KEY) or 0
+            anzahl = dict.fromkeys(benutzer_ids, 0)
+            with replica_router.primary():
+                for start in range(0, len(benutzer_ids), self.BULK_CHUNK_SIZE):
+                    chunk = benutzer_ids[start:start + self.BULK_CHUNK_SIZE]
+                    anzahl.update(
+                        db.session.query(
+                            Benachrichtigung.empfaenger_id,
+                            db.func.count(Benachrichtigung.id)
+                        ).filter(
+                            Benachrichtigung.empfaenger_id.in_(chunk),
+                            Benachrichtigung.gelesen == False
+                        ).group_by(Benachrichtigung.empfaenger_id).all()
+                    )
+
+            staende = {UNGELESEN_KEY.format(uid): (seq, n) for uid, n in anzahl.items()}
+            timeout = current_app.config.get('NOTIFICATION_COUNTER_TTL', 3600)
+            if hasattr(cache.cache, 'set_many_if_newer'):
+                cache.cache.set_many_if_newer(staende, timeout=timeout)
+            else:
+                # Prozesslokaler Cache: Vergleich ohne Lock genügt
+                for key, stand in staende.items():
+                    alt = cache.get(key)
+                    if alt is None or alt[0] < stand[0]:
+                        cache.set(key, stand, timeout=timeout)
+        except Exception as e:
+            current_app.logger.warning(f'[Notifications] Ungelesen-Zähler nicht aktualisiert: {e}')
     
     def get_statistik(
         self,
@@ -455,31 +606,52 @@ class NotificationService(BaseService):
     
     def delete_alte_benachrichtigungen(
         self,
-        tage: int = 30
+        tage: int = 30,
+        chunk_size: Optional[int] = None
     ) -> int:
         """
         Löscht alte gelesene Benachrichtigungen
+
+        Set-basiertes DELETE ohne Laden der Zeilen. Mit chunk_size wird in
+        Blöcken gelöscht und nach jedem Block committet, damit Sperren auf
+        der Tabelle nur kurz gehalten werden.
         
         Args:
             tage: Löscht Benachrichtigungen älter als X Tage
+            chunk_size: Optional - Maximale Zeilen pro DELETE/Commit
             
         Returns:
             int: Anzahl gelöschter Benachrichtigungen
         """
         grenze = datetime.utcnow() - timedelta(days=tage)
-        
-        alte = Benachrichtigung.query.filter(
+        bedingung = db.and_(
             Benachrichtigung.gelesen == True,
             Benachrichtigung.gelesen_am < grenze
-        ).all()
-        
-        count = len(alte)
-        for notification in alte:
-            db.session.delete(notification)
-        
-        db.session.commit()
-        
-        return count
+        )
+
+        try:
+            if not chunk_size:
+                count = db.session.execute(
+                    db.delete(Benachrichtigung).where(bedingung),
+                    execution_options={'synchronize_session': False}
+                ).rowcount
+                db.session.commit()
+                return count
+
+            count = 0
+            while True:
+                ids = db.select(Benachrichtigung.id).where(bedingung).limit(chunk_size).scalar_subquery()
+                geloescht = db.session.execute(
+                    db.delete(Benachrichtigung).where(Benachrichtigung.id.in_(ids)),
+                    execution_options={'synchronize_session': False}
+                ).rowcount
+                db.session.commit()
+                count += geloescht
+                if geloescht < chunk_size:
+                    return count
+        except Exception:
+            db.session.rollback()
+            raise
 
 
 # Singleton Instance
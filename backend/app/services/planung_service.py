@@ -20,15 +20,23 @@ Funktionen:
 - SWS-Berechnung
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 from datetime import datetime
+from sqlalchemy.orm import joinedload, noload, selectinload
 from app.services.base_service import BaseService
 from app.services.sws_calculator import sws_calculator
 from app.models import (
     Semesterplanung, GeplantesModul, WunschFreierTag,
     Semester, Benutzer, Modul
 )
-from app.extensions import db
+from app.extensions import cache, db
+from app.utils.db_routing import replica_router
+from app.utils.cache_utils import get_tag_versionen
+
+
+# Set geplanter Modul-IDs pro Phase; Tag 'geplante_module' (cache_utils)
+# invalidiert nach jedem Commit, der geplante Module/Planungen ändert
+GEPLANTE_MODULE_KEY = 'planung/geplante_module/{}'
 
 
 class PlanungService(BaseService):
@@ -702,6 +710,139 @@ class PlanungService(BaseService):
             return self.get_all(semester_id=semester_id, status='freigegeben')
         return self.get_all(status='freigegeben')
     
+    def get_seite_fuer_phase(
+        self,
+        planungsphase_id: int,
+        status: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: int = 20,
+        details: bool = False
+    ) -> Tuple[List[Semesterplanung], Dict[int, int], Optional[int]]:
+        """
+        Holt eine Seite von Planungen einer Planungsphase (Keyset Pagination)
+
+        Phasen- und Status-Filter laufen in SQL, sortiert wird stabil nach ID.
+        Statt OFFSET wird ab der letzten ID der Vorseite gelesen, damit
+        spätere Seiten nicht teurer werden als die erste.
+
+        Ohne details werden geplante Module und Wunsch-freie Tage nicht
+        geladen; die Modulanzahl kommt aus einer GROUP BY Abfrage.
+
+        Args:
+            planungsphase_id: Planungsphase ID
+            status: Optional - Filter nach Status
+            after_id: Optional - Letzte ID der vorherigen Seite (Cursor)
+            limit: Maximale Anzahl Planungen pro Seite
+            details: Module und Wunsch-freie Tage mitladen?
+
+        Returns:
+            tuple: (Planungen, {planung_id: anzahl_module}, next_cursor)
+        """
+        query = Semesterplanung.query.options(
+            joinedload(Semesterplanung.semester),
+            joinedload(Semesterplanung.benutzer),
+            joinedload(Semesterplanung.planungsphase),
+        ).filter(Semesterplanung.planungsphase_id == planungsphase_id)
+
+        if details:
+            query = query.options(
+                selectinload(Semesterplanung.geplante_module),
+                selectinload(Semesterplanung.wunsch_freie_tage),
+            )
+        else:
+            query = query.options(
+                noload(Semesterplanung.geplante_module),
+                noload(Semesterplanung.wunsch_freie_tage),
+            )
+
+        if status:
+            query = query.filter(Semesterplanung.status == status)
+        if after_id:
+            query = query.filter(Semesterplanung.id > after_id)
+
+        # Eine Zeile mehr lesen: zeigt an, ob es eine nächste Seite gibt
+        planungen = query.order_by(Semesterplanung.id).limit(limit + 1).all()
+        next_cursor = None
+        if len(planungen) > limit:
+            planungen = planungen[:limit]
+            next_cursor = planungen[-1].id
+
+        if details:
+            anzahl_module = {p.id: len(p.geplante_module) for p in planungen}
+        else:
+            anzahl_module = dict.fromkeys((p.id for p in planungen), 0)
+            if planungen:
+                rows = db.session.query(
+                    GeplantesModul.semesterplanung_id,
+                    db.func.count(GeplantesModul.id)
+                ).filter(
+                    GeplantesModul.semesterplanung_id.in_(anzahl_module.keys())
+                ).group_by(GeplantesModul.semesterplanung_id).all()
+                anzahl_module.update(rows)
+
+        return planungen, anzahl_module, next_cursor
+
+    def get_geplante_modul_ids(
+        self,
+        planungsphase_id: Optional[int] = None
+    ) -> FrozenSet[int]:
+        """
+        Set aller geplanten Modul-IDs einer Planungsphase (gecacht)
+
+        Wird bei Änderungen an geplanten Modulen (add_modul, remove_modul,
+        Templates, Löschen von Planungen) per Cache-Tag invalidiert und beim
+        nächsten Zugriff mit einer DISTINCT Abfrage neu aufgebaut.
+
+        Der Eintrag trägt die Tag-Version von vor der Abfrage: schreibt ein
+        langsamer Leser nach einer Invalidierung seinen alten Stand zurück,
+        passt die Version nicht mehr und der Eintrag wird ignoriert.
+
+        Args:
+            planungsphase_id: Planungsphase ID (None = über alle Phasen)
+
+        Returns:
+            frozenset von Modul-IDs
+        """
+        key = GEPLANTE_MODULE_KEY.format(planungsphase_id or 'alle')
+        version = get_tag_versionen(['geplante_module'])['geplante_module']
+        eintrag = cache.get(key)
+        if eintrag is not None and eintrag[0] == version:
+            return eintrag[1]
+
+        query = db.session.query(GeplantesModul.modul_id)
+        if planungsphase_id:
+            query = query.join(
+                Semesterplanung,
+                GeplantesModul.semesterplanung_id == Semesterplanung.id
+            ).filter(Semesterplanung.planungsphase_id == planungsphase_id)
+
+        # Primary: der Eintrag gilt bis zur nächsten Invalidierung
+        with replica_router.primary():
+            modul_ids = frozenset(row[0] for row in query.distinct())
+        cache.set(key, (version, modul_ids))
+        return modul_ids
+
+    @staticmethod
+    def nicht_geplant_filter(planungsphase_id: Optional[int] = None):
+        """
+        Anti-Join (NOT EXISTS): Modul ist in der Phase nicht geplant
+
+        Nutzt den Index (modul_id, semesterplanung_id) auf geplante_module.
+
+        Args:
+            planungsphase_id: Planungsphase ID (None = in keiner Phase geplant)
+
+        Returns:
+            SQLAlchemy Bedingung für Queries auf Modul
+        """
+        geplant = db.select(GeplantesModul.id).where(GeplantesModul.modul_id == Modul.id)
+        if planungsphase_id:
+            geplant = geplant.join(
+                Semesterplanung,
+                GeplantesModul.semesterplanung_id == Semesterplanung.id
+            ).where(Semesterplanung.planungsphase_id == planungsphase_id)
+        return ~geplant.exists()
+
     # =========================================================================
     # STATISTICS
     # =========================================================================
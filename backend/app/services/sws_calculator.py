@@ -9,9 +9,11 @@ Der Calculator nutzt die bestehende modul_lehrform Tabelle um:
 - Gesamt-SWS zu berechnen
 """
 
-from typing import Dict, List, Optional, Any
-from sqlalchemy.orm import joinedload
-from app.models import Modul, ModulLehrform, GeplantesModul, Lehrform
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from flask import g, has_app_context
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload, lazyload
+from app.models import Modul, ModulLehrform, GeplantesModul, Lehrform, Semesterplanung
 from app.extensions import db
 
 
@@ -55,6 +57,11 @@ class SWSCalculator:
             >>> calculator.get_modul_basis_sws(1, 1)
             {'V': 2.0, 'Ü': 2.0, 'P': 2.0}
         """
+        # Bereits per Batch geladen (Request-Lookup)?
+        lookup = self._get_request_lookup()
+        if lookup is not None and (modul_id, po_id) in lookup:
+            return dict(lookup[(modul_id, po_id)])
+
         # Hole alle Lehrformen für dieses Modul (mit Eager Loading)
         lehrformen = ModulLehrform.query.options(
             joinedload(ModulLehrform.lehrform)
@@ -246,6 +253,9 @@ class SWSCalculator:
         """
         Updated SWS für alle geplanten Module einer Planung
 
+        Nutzt die Batch-Engine: Basis-SWS aller Module werden mit einer
+        Query geladen, statt einer Query pro Modul.
+
         Args:
             semesterplanung_id: Semesterplanung ID
 
@@ -253,23 +263,303 @@ class SWSCalculator:
             Liste von aktualisierten GeplantesModul Objekten
         """
         # Optimiert: Lade alle geplanten Module mit einer Query
-        geplante_module = GeplantesModul.query.filter_by(
+        # (ohne Eager Loading der Relationen - nur Spalten werden benötigt)
+        geplante_module = GeplantesModul.query.options(lazyload('*')).filter_by(
             semesterplanung_id=semesterplanung_id
         ).all()
 
         if not geplante_module:
             return []
 
-        updated = []
-        for geplantes_modul in geplante_module:
-            self.update_geplantes_modul_sws(geplantes_modul)
-            updated.append(geplantes_modul)
+        self.update_geplante_module_batch(geplante_module, commit=False)
 
-        # Update Planung Gesamt-SWS
+        # Update Planung Gesamt-SWS (committed auch die Modul-Updates)
         self.update_planung_gesamt_sws(semesterplanung_id)
 
-        return updated
-    
+        return geplante_module
+
+    def update_planungen_sws(
+        self,
+        semesterplanung_ids: Iterable[int]
+    ) -> int:
+        """
+        Updated SWS für alle geplanten Module mehrerer Planungen
+
+        Query-Anzahl unabhängig von der Anzahl Planungen/Module:
+        geplante Module, Basis-SWS, Gesamt-SWS je Planung.
+
+        Args:
+            semesterplanung_ids: Semesterplanung IDs
+
+        Returns:
+            int: Anzahl aktualisierter geplanter Module
+        """
+        semesterplanung_ids = list(set(semesterplanung_ids))
+        if not semesterplanung_ids:
+            return 0
+
+        geplante_module = GeplantesModul.query.options(lazyload('*')).filter(
+            GeplantesModul.semesterplanung_id.in_(semesterplanung_ids)
+        ).all()
+
+        self.update_geplante_module_batch(geplante_module, commit=False)
+        db.session.flush()
+
+        summen = dict(db.session.query(
+            GeplantesModul.semesterplanung_id,
+            func.coalesce(func.sum(GeplantesModul.sws_gesamt), 0.0)
+        ).filter(
+            GeplantesModul.semesterplanung_id.in_(semesterplanung_ids)
+        ).group_by(GeplantesModul.semesterplanung_id).all())
+
+        planungen = Semesterplanung.query.options(lazyload('*')).filter(
+            Semesterplanung.id.in_(semesterplanung_ids)
+        ).all()
+        for planung in planungen:
+            planung.gesamt_sws = float(summen.get(planung.id, 0.0))
+
+        db.session.commit()
+
+        return len(geplante_module)
+
+    # =========================================================================
+    # BATCH ENGINE
+    # =========================================================================
+
+    def lade_basis_sws(
+        self,
+        paare: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """
+        Lädt Basis-SWS für viele Module mit einer Query
+
+        Das Ergebnis wird zusätzlich in einer Request-Lookup-Tabelle
+        abgelegt, sodass get_modul_basis_sws() im selben Request keine
+        weiteren Queries absetzt.
+
+        Args:
+            paare: (modul_id, po_id) Paare
+
+        Returns:
+            Dict: {(modul_id, po_id): {lehrform_kuerzel: sws}}
+
+        Example:
+            >>> calculator.lade_basis_sws([(1, 1), (2, 1)])
+            {(1, 1): {'V': 2.0, 'Ü': 2.0}, (2, 1): {'V': 4.0}}
+        """
+        paare = set(paare)
+        if not paare:
+            return {}
+
+        # Alle Paare haben einen Eintrag (auch Module ohne Lehrformen)
+        basis = {paar: {} for paar in paare}
+
+        rows = db.session.query(
+            ModulLehrform.modul_id,
+            ModulLehrform.po_id,
+            Lehrform.kuerzel,
+            ModulLehrform.sws
+        ).join(
+            Lehrform, Lehrform.id == ModulLehrform.lehrform_id
+        ).filter(
+            ModulLehrform.modul_id.in_({modul_id for modul_id, _ in paare}),
+            ModulLehrform.po_id.in_({po_id for _, po_id in paare})
+        ).order_by(ModulLehrform.id).all()
+
+        for modul_id, po_id, kuerzel, sws in rows:
+            sws_dict = basis.get((modul_id, po_id))
+            if sws_dict is not None:
+                sws_dict[kuerzel] = sws
+
+        lookup = self._get_request_lookup(create=True)
+        if lookup is not None:
+            lookup.update(basis)
+
+        return basis
+
+    def berechne_sws_batch(
+        self,
+        geplante_module: List[GeplantesModul]
+    ) -> List[Dict[str, float]]:
+        """
+        Berechnet SWS für viele geplante Module (eine Query für alle)
+
+        Args:
+            geplante_module: Liste von GeplantesModul Objekten
+
+        Returns:
+            Liste von SWS-Dicts (gleiche Reihenfolge wie Eingabe),
+            Format wie berechne_geplantes_modul_sws()
+        """
+        basis = self.lade_basis_sws(
+            (gm.modul_id, gm.po_id) for gm in geplante_module
+        )
+
+        ergebnisse = []
+        for gm in geplante_module:
+            basis_sws = basis[(gm.modul_id, gm.po_id)]
+            sws_vorlesung = gm.anzahl_vorlesungen * basis_sws.get('V', 0.0)
+            sws_uebung = gm.anzahl_uebungen * basis_sws.get('Ü', 0.0)
+            sws_praktikum = gm.anzahl_praktika * basis_sws.get('P', 0.0)
+            sws_seminar = gm.anzahl_seminare * basis_sws.get('S', 0.0)
+            ergebnisse.append({
+                'sws_vorlesung': sws_vorlesung,
+                'sws_uebung': sws_uebung,
+                'sws_praktikum': sws_praktikum,
+                'sws_seminar': sws_seminar,
+                'sws_gesamt': sws_vorlesung + sws_uebung + sws_praktikum + sws_seminar
+            })
+
+        return ergebnisse
+
+    def update_geplante_module_batch(
+        self,
+        geplante_module: List[GeplantesModul],
+        commit: bool = True
+    ) -> List[GeplantesModul]:
+        """
+        Berechnet und setzt SWS für viele geplante Module
+
+        Args:
+            geplante_module: Liste von GeplantesModul Objekten
+            commit: Direkt committen (sonst übernimmt der Aufrufer)
+
+        Returns:
+            Liste der aktualisierten GeplantesModul Objekte
+        """
+        for gm, sws in zip(geplante_module, self.berechne_sws_batch(geplante_module)):
+            gm.sws_vorlesung = sws['sws_vorlesung']
+            gm.sws_uebung = sws['sws_uebung']
+            gm.sws_praktikum = sws['sws_praktikum']
+            gm.sws_seminar = sws['sws_seminar']
+            gm.sws_gesamt = sws['sws_gesamt']
+
+        if commit:
+            db.session.commit()
+
+        return geplante_module
+
+    def update_phase_sws(
+        self,
+        planungsphase_id: int,
+        modul_ids: Optional[Iterable[int]] = None,
+        commit: bool = True
+    ) -> int:
+        """
+        Berechnet SWS aller Entwurfs-Planungen einer Phase neu (set-based)
+
+        Für Neuberechnungen nach Lehrform-Änderungen: Die SWS werden per
+        UPDATE mit korrelierten Subqueries direkt in der DB berechnet,
+        ohne geplante Module zu laden. Eingereichte/freigegebene Planungen
+        behalten die Werte der finalen Berechnung beim Einreichen.
+
+        Args:
+            planungsphase_id: Planungsphase ID
+            modul_ids: Optional - nur geplante Module dieser Module
+            commit: Direkt committen (sonst übernimmt der Aufrufer)
+
+        Returns:
+            int: Anzahl aktualisierter geplanter Module
+        """
+        planung_ids = select(Semesterplanung.id).where(
+            Semesterplanung.planungsphase_id == planungsphase_id,
+            Semesterplanung.status == 'entwurf'
+        )
+
+        def basis_sws(kuerzel: str):
+            return select(
+                func.coalesce(func.sum(ModulLehrform.sws), 0.0)
+            ).join(
+                Lehrform, Lehrform.id == ModulLehrform.lehrform_id
+            ).where(
+                ModulLehrform.modul_id == GeplantesModul.modul_id,
+                ModulLehrform.po_id == GeplantesModul.po_id,
+                Lehrform.kuerzel == kuerzel
+            ).scalar_subquery()
+
+        sws_vorlesung = GeplantesModul.anzahl_vorlesungen * basis_sws('V')
+        sws_uebung = GeplantesModul.anzahl_uebungen * basis_sws('Ü')
+        sws_praktikum = GeplantesModul.anzahl_praktika * basis_sws('P')
+        sws_seminar = GeplantesModul.anzahl_seminare * basis_sws('S')
+
+        stmt = update(GeplantesModul).where(
+            GeplantesModul.semesterplanung_id.in_(planung_ids)
+        )
+        if modul_ids is not None:
+            stmt = stmt.where(GeplantesModul.modul_id.in_(list(modul_ids)))
+
+        result = db.session.execute(
+            stmt.values(
+                sws_vorlesung=sws_vorlesung,
+                sws_uebung=sws_uebung,
+                sws_praktikum=sws_praktikum,
+                sws_seminar=sws_seminar,
+                sws_gesamt=sws_vorlesung + sws_uebung + sws_praktikum + sws_seminar
+            ).execution_options(synchronize_session=False)
+        )
+
+        # Gesamt-SWS der Planungen nachziehen
+        summe = select(
+            func.coalesce(func.sum(GeplantesModul.sws_gesamt), 0.0)
+        ).where(
+            GeplantesModul.semesterplanung_id == Semesterplanung.id
+        ).scalar_subquery()
+
+        db.session.execute(
+            update(Semesterplanung).where(
+                Semesterplanung.planungsphase_id == planungsphase_id,
+                Semesterplanung.status == 'entwurf'
+            ).values(gesamt_sws=summe).execution_options(synchronize_session=False)
+        )
+
+        # Request-Lookup ist nach Lehrform-Änderungen veraltet
+        self.clear_request_lookup()
+
+        if commit:
+            db.session.commit()
+
+        return result.rowcount
+
+    def update_aktive_phase_nach_lehrform_aenderung(self, modul_id: int) -> int:
+        """
+        Zieht SWS der aktiven Planungsphase nach einer Lehrform-Änderung nach
+
+        Committet nicht - läuft in der Transaktion der Lehrform-Änderung.
+
+        Args:
+            modul_id: Geändertes Modul
+
+        Returns:
+            int: Anzahl aktualisierter geplanter Module
+        """
+        from app.models.planungsphase import Planungsphase
+
+        active_phase = Planungsphase.get_active_phase()
+        if not active_phase:
+            return 0
+
+        return self.update_phase_sws(active_phase.id, modul_ids=[modul_id], commit=False)
+
+    # =========================================================================
+    # REQUEST LOOKUP
+    # =========================================================================
+
+    @staticmethod
+    def _get_request_lookup(create: bool = False) -> Optional[Dict[Tuple[int, int], Dict[str, float]]]:
+        """Request-lokale Lookup-Tabelle (modul_id, po_id) -> Basis-SWS"""
+        if not has_app_context():
+            return None
+        lookup = g.get('sws_basis_lookup')
+        if lookup is None and create:
+            lookup = g.sws_basis_lookup = {}
+        return lookup
+
+    @staticmethod
+    def clear_request_lookup() -> None:
+        """Verwirft die Request-Lookup-Tabelle"""
+        if has_app_context():
+            g.pop('sws_basis_lookup', None)
+
     # =========================================================================
     # VALIDATION & HELPERS
     # =========================================================================
@@ -457,6 +457,11 @@ class TemplateService(BaseService):
         planung.berechne_gesamt_sws()
         db.session.commit()
 
+        if clear_existing:
+            # Bulk-DELETE oben löst keine ORM-Events aus
+            from app.utils.cache_utils import invalidate_geplante_module_caches
+            invalidate_geplante_module_caches()
+
         return {
             'planung': planung,
             'hinzugefuegt': hinzugefuegt,
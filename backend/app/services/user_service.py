@@ -15,6 +15,7 @@ from app.services.base_service import BaseService
 from app.models import Benutzer, Rolle, Dozent
 from app.auth.utils import validate_password_with_config, validate_email
 from app.extensions import db
+from app.utils.principal_cache import principal_cache
 from flask import current_app
 
 
@@ -163,7 +164,9 @@ class UserService(BaseService):
             if existing and existing.id != user_id:
                 raise ValueError(f"Username '{data['username']}' ist bereits vergeben")
         
-        return self.update(user_id, **data)
+        user = self.update(user_id, **data)
+        principal_cache.invalidate(user_id)
+        return user
     
     # =========================================================================
     # PASSWORD MANAGEMENT
@@ -257,6 +260,7 @@ class UserService(BaseService):
             return False
         
         user.aktivieren()
+        principal_cache.invalidate(user_id)
         return True
     
     def deaktiviere_user(self, user_id: int) -> bool:
@@ -274,6 +278,7 @@ class UserService(BaseService):
             return False
         
         user.deaktivieren()
+        principal_cache.invalidate(user_id)
         return True
     
     # =========================================================================
@@ -305,6 +310,7 @@ class UserService(BaseService):
         
         user.rolle_id = rolle.id
         db.session.commit()
+        principal_cache.invalidate(user_id)
         
         return user
     
@@ -427,7 +433,9 @@ class UserService(BaseService):
             if not kann:
                 raise ValueError(f"Benutzer kann nicht gelöscht werden: {grund}")
         
-        return self.delete(user_id)
+        geloescht = self.delete(user_id)
+        principal_cache.invalidate(user_id)
+        return geloescht
 
 
 # Singleton Instance
@@ -2,12 +2,238 @@
 Cache Utilities
 ===============
 Helper-Funktionen für Cache-Invalidierung bei Datenänderungen.
+
+Invalidierung erfolgt über Tags: Jeder Cache-Key wird anhand seines
+Präfixes (CACHE_TAG_RULES) einem oder mehreren Tags zugeordnet. Mit dem
+SharedCache Backend wirkt ein invalidate_cache_tags() in allen Workern.
+
+Zusätzlich invalidiert register_cache_invalidation() automatisch nach
+jedem Commit, der Modelle aus MODEL_CACHE_TAGS verändert hat.
+
+Jede Invalidierung erhöht außerdem den Versions-Zähler des Tags
+(get_tag_versionen). Daraus werden ETag/Last-Modified für Conditional
+GETs gebildet (siehe conditional_get in app/api/base.py).
 """
 
-from app.extensions import cache
-from flask import current_app
+import time
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import event
+from flask import current_app, has_app_context
+
+from app.extensions import cache, db
+
+
+# =========================================================================
+# TAG-REGELN
+# =========================================================================
+
+# Tag -> Key-Präfixe
+# Flask-Caching Key-Formate:
+#   @cache.cached()                   -> 'view/<request.path>'
+#   @cache.cached(query_string=True)  -> '<request.path><hash>'
+#   @cache.memoize()                  -> '<modul>.<funktion>...'
+CACHE_TAG_RULES = {
+    'modul': [
+        'view//api/module',
+        '/api/module',
+        '/api/dashboard/statistik',
+        'app.api.dashboard._get_cached_statistiken',
+    ],
+    'semester': [
+        'view//api/semester',
+        '/api/semester',
+        '/api/dashboard/statistik',
+        'app.api.dashboard._get_cached_semester_liste',
+    ],
+    'dozent': [
+        'view//api/module/options/dozenten',
+        '/api/module',
+        '/api/dashboard/statistik',
+        'app.api.dashboard._get_cached_statistiken',
+    ],
+    'studiengang': [
+        'view//api/module/options/studiengaenge',
+    ],
+    'lehrform': [
+        'view//api/module/options/lehrformen',
+        '/api/module',
+    ],
+    'geplante_module': [
+        'planung/geplante_module/',
+    ],
+    # Antworten mit Planungs-Statistik (Semester.to_dict, Dashboard-Statistik)
+    'semesterplanung': [
+        'view//api/semester',
+        '/api/semester',
+        '/api/dashboard/statistik',
+        'app.api.dashboard._get_cached_semester_liste',
+    ],
+    # Nur Versions-Zähler (ETag), keine Cache-Keys
+    'planungsphase': [],
+    'modulhandbuch': [],
+}
+
+# Model-Klasse -> Tags, die bei Änderungen invalidiert werden
+MODEL_CACHE_TAGS = {
+    'Modul': ('modul',),
+    'ModulLehrform': ('modul', 'lehrform'),
+    'ModulDozent': ('modul', 'dozent'),
+    'ModulStudiengang': ('modul', 'studiengang'),
+    'Dozent': ('dozent',),
+    'Studiengang': ('studiengang',),
+    'Lehrform': ('lehrform',),
+    'ModulLiteratur': ('modul',),
+    'ModulPruefung': ('modul',),
+    'ModulLernergebnisse': ('modul',),
+    'ModulVoraussetzungen': ('modul',),
+    'ModulArbeitsaufwand': ('modul',),
+    'ModulSprache': ('modul',),
+    'ModulAbhaengigkeit': ('modul',),
+    'ModulSeiten': ('modul',),
+    'Pruefungsordnung': ('studiengang',),
+    'Modulhandbuch': ('modulhandbuch',),
+    'Semester': ('semester',),
+    'Planungsphase': ('semester', 'planungsphase'),
+    'PhaseSubmission': ('planungsphase',),
+    'ArchiviertePlanung': ('planungsphase',),
+    'Semesterplanung': ('geplante_module', 'semesterplanung'),
+    'GeplantesModul': ('geplante_module',),
+}
+
+
+def invalidate_cache_tags(*tags: str) -> int:
+    """
+    Invalidiert alle Cache-Einträge der angegebenen Tags.
+
+    Mit SharedCache in allen Workern, mit SimpleCache (Development/Testing)
+    nur im aktuellen Prozess.
+
+    Args:
+        *tags: Tag-Namen aus CACHE_TAG_RULES
+
+    Returns:
+        Anzahl gelöschter Einträge
+    """
+    backend = cache.cache
+    _bump_tag_versionen(tags)
+
+    if hasattr(backend, 'invalidate_tags'):
+        return backend.invalidate_tags(*tags)
+
+    # Fallback für SimpleCache: lokale Keys per Präfix löschen
+    prefixes = tuple(p for tag in tags for p in CACHE_TAG_RULES.get(tag, []))
+    local_store = getattr(backend, '_cache', None)
+    if not prefixes or local_store is None:
+        return 0
+
+    keys = [key for key in list(local_store.keys()) if key.startswith(prefixes)]
+    for key in keys:
+        backend.delete(key)
+    return len(keys)
+
+
+# =========================================================================
+# VERSIONS-ZÄHLER (ETag / Last-Modified)
+# =========================================================================
+
+TAG_VERSION_KEY = 'cache/version/{}'
+
+
+def _jetzt_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def get_tag_versionen(tags: Iterable[str]) -> Dict[str, int]:
+    """
+    Liefert den Versions-Zähler pro Tag (nur Cache-Reads, keine DB-Query).
+
+    Zähler starten beim aktuellen Zeitstempel in Millisekunden und
+    wachsen mindestens bis zum Zeitpunkt der letzten Änderung. Dadurch
+    liefert ein geleerter Cache nie eine alte Version erneut, und der
+    Zähler taugt direkt als Last-Modified.
+
+    Args:
+        tags: Tag-Namen aus CACHE_TAG_RULES
+
+    Returns:
+        Dict {tag: version}
+    """
+    tags = list(tags)
+    werte = cache.get_many(*[TAG_VERSION_KEY.format(tag) for tag in tags])
+
+    versionen = {}
+    for tag, wert in zip(tags, werte):
+        if wert is None:
+            key = TAG_VERSION_KEY.format(tag)
+            cache.add(key, _jetzt_ms(), timeout=0)
+            wert = cache.get(key)
+        versionen[tag] = int(wert or 0)
+    return versionen
+
+
+def _bump_tag_versionen(tags: Iterable[str]) -> None:
+    """Erhöht die Versions-Zähler (atomar, mindestens auf jetzt)"""
+    for tag, version in get_tag_versionen(tags).items():
+        cache.cache.inc(TAG_VERSION_KEY.format(tag), max(1, _jetzt_ms() - version))
 
 
+def _tags_for_objects(objects: Iterable) -> Set[str]:
+    tags = set()
+    for obj in objects:
+        tags.update(MODEL_CACHE_TAGS.get(type(obj).__name__, ()))
+    return tags
+
+
+def _collect_cache_tags(session, flush_context):
+    """after_flush: Tags geänderter Objekte in session.info sammeln"""
+    tags = _tags_for_objects(list(session.new) + list(session.dirty) + list(session.deleted))
+    if tags:
+        session.info.setdefault('cache_tags', set()).update(tags)
+
+
+def _invalidate_after_commit(session):
+    """after_commit: Gesammelte Tags invalidieren"""
+    tags = session.info.pop('cache_tags', None)
+    if not tags or not has_app_context():
+        return
+    try:
+        removed = invalidate_cache_tags(*sorted(tags))
+        current_app.logger.debug(f'[Cache] Tags invalidated after commit: {sorted(tags)} ({removed} entries)')
+    except Exception as e:
+        current_app.logger.error(f'[Cache] Error invalidating tags {sorted(tags)}: {e}')
+
+
+def _discard_cache_tags(session, previous_transaction):
+    """after_soft_rollback: Gesammelte Tags verwerfen"""
+    session.info.pop('cache_tags', None)
+
+
+_SESSION_LISTENERS = (
+    ('after_flush', _collect_cache_tags),
+    ('after_commit', _invalidate_after_commit),
+    ('after_soft_rollback', _discard_cache_tags),
+)
+
+
+def register_cache_invalidation(app):
+    """
+    Registriert Session-Events für automatische Cache-Invalidierung.
+
+    after_flush sammelt die Tags geänderter Objekte, after_commit
+    invalidiert sie. Bei Rollback werden die gesammelten Tags verworfen.
+    """
+    for identifier, listener in _SESSION_LISTENERS:
+        if not event.contains(db.session, identifier, listener):
+            event.listen(db.session, identifier, listener)
+
+    app.logger.info('[OK] Cache invalidation on commit registered')
+
+
+# =========================================================================
+# EXPLIZITE INVALIDIERUNG
+# =========================================================================
+
 def invalidate_module_caches():
     """
     Invalidiert alle Modul-bezogenen Caches.
@@ -18,10 +244,7 @@ def invalidate_module_caches():
     - Lehrformen hinzugefügt/geändert werden
     """
     try:
-        # Lösche alle gecachten /api/module/options/* Endpoints
-        cache.delete_memoized('get_lehrformen_options')
-        cache.delete_memoized('get_dozenten_options')
-        cache.delete_memoized('get_studiengaenge_options')
+        invalidate_cache_tags('modul', 'lehrform')
         current_app.logger.info('[Cache] Module-related caches invalidated')
     except Exception as e:
         current_app.logger.error(f'[Cache] Error invalidating module caches: {e}')
@@ -37,8 +260,7 @@ def invalidate_semester_caches():
     - Planungsphase geändert wird
     """
     try:
-        # Lösche alle gecachten Semester-Listen
-        cache.delete('view//api/semester/')  # Flask-Caching Key Format
+        invalidate_cache_tags('semester', 'planungsphase')
         current_app.logger.info('[Cache] Semester caches invalidated')
     except Exception as e:
         current_app.logger.error(f'[Cache] Error invalidating semester caches: {e}')
@@ -52,7 +274,7 @@ def invalidate_dozent_caches():
     - Ein Dozent erstellt/aktualisiert/gelöscht wird
     """
     try:
-        cache.delete_memoized('get_dozenten_options')
+        invalidate_cache_tags('dozent')
         current_app.logger.info('[Cache] Dozent caches invalidated')
     except Exception as e:
         current_app.logger.error(f'[Cache] Error invalidating dozent caches: {e}')
@@ -66,12 +288,40 @@ def invalidate_studiengang_caches():
     - Ein Studiengang erstellt/aktualisiert/gelöscht wird
     """
     try:
-        cache.delete_memoized('get_studiengaenge_options')
+        invalidate_cache_tags('studiengang')
         current_app.logger.info('[Cache] Studiengang caches invalidated')
     except Exception as e:
         current_app.logger.error(f'[Cache] Error invalidating studiengang caches: {e}')
 
 
+def invalidate_geplante_module_caches():
+    """
+    Invalidiert die Sets geplanter Module pro Planungsphase.
+
+    Rufe diese Funktion auf, wenn geplante Module per Bulk-DELETE
+    (Query.delete, ohne ORM-Events) entfernt wurden.
+    """
+    try:
+        invalidate_cache_tags('geplante_module')
+        current_app.logger.info('[Cache] Geplante-Module caches invalidated')
+    except Exception as e:
+        current_app.logger.error(f'[Cache] Error invalidating geplante module caches: {e}')
+
+
+def invalidate_semesterplanung_caches():
+    """
+    Invalidiert die Caches geplanter Module und der Planungs-Statistik.
+
+    Rufe diese Funktion auf, wenn Semesterplanungen per Bulk-DELETE
+    (Query.delete, ohne ORM-Events) entfernt wurden.
+    """
+    try:
+        invalidate_cache_tags('geplante_module', 'semesterplanung')
+        current_app.logger.info('[Cache] Semesterplanung caches invalidated')
+    except Exception as e:
+        current_app.logger.error(f'[Cache] Error invalidating semesterplanung caches: {e}')
+
+
 def clear_all_caches():
     """
     Löscht alle Caches komplett.
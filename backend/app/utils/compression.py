@@ -0,0 +1,170 @@
+"""
+Response Compression
+====================
+Komprimiert Responses nach Accept-Encoding (brotli bevorzugt, sonst gzip).
+
+- Gepufferte Responses erst ab COMPRESS_MIN_SIZE Bytes (kleine Bodies
+  werden durch Header-Overhead nicht kleiner)
+- Gestreamte Responses (siehe json_stream) werden chunkweise komprimiert
+  und nach jedem Chunk geflusht, damit der Client sofort Daten erhält
+- send_file/Passthrough, bereits kodierte Bodies und nicht komprimierbare
+  MIME-Types (PDF, ZIP, Bilder) bleiben unverändert
+
+brotli ist optional: ohne das Paket wird nur gzip angeboten.
+
+Usage (app/__init__.py):
+    from app.utils.compression import compressor
+    compressor.init_app(app)
+"""
+
+import gzip
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/csv',
+    'text/plain',
+    'text/xml',
+    'image/svg+xml',
+)
+
+
+class ResponseCompressor:
+    """
+    after_request-Hook für gzip/brotli Content-Encoding
+
+    Config:
+        COMPRESS_ENABLED: An/Aus (z.B. aus, wenn der Reverse Proxy komprimiert)
+        COMPRESS_MIN_SIZE: Schwelle in Bytes für gepufferte Responses
+        COMPRESS_GZIP_LEVEL: gzip Level (1-9)
+        COMPRESS_BROTLI_QUALITY: brotli Quality (0-11)
+        COMPRESS_MIMETYPES: Komprimierbare MIME-Types
+    """
+
+    def __init__(self):
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+        self.mimetypes = frozenset(DEFAULT_MIMETYPES)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Registriert den Hook.
+
+        Muss VOR allen anderen after_request-Hooks registriert werden:
+        Flask ruft sie in umgekehrter Reihenfolge auf, so sieht die
+        Kompression den fertigen Body.
+        """
+        if not app.config.get('COMPRESS_ENABLED', True):
+            return
+
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        self.mimetypes = frozenset(app.config.get('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES))
+
+        app.after_request(self.compress_response)
+
+        app.logger.info('[OK] Response compression initialized')
+        app.logger.info(
+            f"   Encodings: {', '.join(self.encodings)}, min size: {self.min_size} bytes"
+        )
+
+    @property
+    def encodings(self):
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    # =========================================================================
+    # HOOK
+    # =========================================================================
+
+    def compress_response(self, response: Response) -> Response:
+        """Komprimiert die Response, falls Client und Inhalt es zulassen"""
+        encoding = self._encoding_fuer(response)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._komprimiere_stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self._komprimiere(data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        self._schwaeche_etag(response)
+        return response
+
+    def _encoding_fuer(self, response: Response) -> Optional[str]:
+        """Ausgehandeltes Encoding oder None (nicht komprimieren)"""
+        if (
+            request.method == 'HEAD'
+            or response.direct_passthrough
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return None
+
+        return request.accept_encodings.best_match(self.encodings)
+
+    @staticmethod
+    def _schwaeche_etag(response: Response) -> None:
+        """Starke ETags gelten nur byte-genau - nach Kompression als weak markieren"""
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+    # =========================================================================
+    # KOMPRESSION
+    # =========================================================================
+
+    def _komprimiere(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def _komprimiere_stream(self, chunks: Iterable, encoding: str) -> Iterator[bytes]:
+        """Komprimiert chunkweise, Flush nach jedem Chunk (Time-to-first-byte)"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            flush = compressor.flush
+            finish = compressor.finish
+            compress = compressor.process
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # 31 = gzip-Header
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            finish = compressor.flush
+            compress = compressor.compress
+
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if chunk:
+                    yield compress(chunk) + flush()
+            yield finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+
+
+# Singleton
+compressor = ResponseCompressor()
@@ -0,0 +1,354 @@
+"""
+DB Pool Sizing
+==============
+Leitet die Pool-Größe pro Prozess aus einem globalen Connection-Budget ab.
+
+Ohne Budget öffnet jeder Gunicorn-Worker bis zu pool_size + max_overflow
+Connections. Ein Sync-Worker bearbeitet aber nur einen Request gleichzeitig
+und braucht höchstens zwei Connections (Request-Session + eigene Session in
+after_commit-Hooks, siehe modul_suche_service/modulhandbuch_service).
+
+Modi (DB_POOL_MODE):
+- budget:    Pool pro Worker = Bedarf des Worker-Modells, gedeckelt durch
+             (Budget - DB_CONNECTION_RESERVE - Render-Connections) / Worker.
+             Budget ist DB_CONNECTION_BUDGET oder, wenn nicht gesetzt,
+             max_connections - superuser_reserved_connections des Servers
+             (Fallback DEFAULT_CONNECTION_BUDGET). Reicht es nicht für zwei
+             Connections pro Worker, startet die App bei explizit gesetztem
+             Budget nicht (ValueError), sonst nur mit Warnung.
+- pgbouncer: DATABASE_URL zeigt auf einen Transaction-Pooler (extern oder
+             pgbouncer.ini.example). Der App-Pool hält nur Client-
+             Connections zum Pooler; das Budget gilt für dessen Server-Pool.
+             Serverseitige Prepared Statements werden abgeschaltet (psycopg 3,
+             asyncpg), weil Statements zwischen Transaktionen auf einer
+             anderen Server-Connection landen können.
+- static:    SQLALCHEMY_ENGINE_OPTIONS unverändert
+
+PDF-Render-Prozesse (PDF_JOB_WORKERS pro Worker, deputat_pdf_service)
+halten je genau eine Connection (render_engine_optionen).
+
+Mindest-Budget im Modus budget (Replica: Worker x 2 + Reserve):
+    Worker x (2 + PDF_JOB_WORKERS) + DB_CONNECTION_RESERVE
+z.B. 33 Worker (16 Kerne) mit einem Render-Prozess: 33 x 3 + 5 = 104.
+Liegt das über dem, was PostgreSQL hergibt (max_connections), ist
+DB_POOL_MODE=pgbouncer Pflicht (oder weniger Worker/Render-Prozesse).
+Teilen sich mehrere Anwendungen den Server, DB_CONNECTION_BUDGET setzen.
+
+Read-Replicas (DB_REPLICA_URLS, siehe app/utils/db_routing.py) werden als
+SQLALCHEMY_BINDS replica_1..n angelegt. Jeder Replica-Server hat ein
+eigenes Budget (DB_REPLICA_CONNECTION_BUDGET); lesende Requests brauchen
+dort nur eine Connection (Hook-Sessions schreiben auf den Primary), dazu
+kommt eine für die Lag-Prüfung.
+
+Worker-Modell: gunicorn.conf.py setzt vor dem Fork GUNICORN_WORKERS,
+GUNICORN_WORKER_CLASS, GUNICORN_THREADS und GUNICORN_WORKER_CONNECTIONS.
+Ohne diese Variablen (flask run, CLI) gilt ein Prozess mit Parallelität 1.
+
+Usage (app/extensions.py, vor db.init_app):
+    from app.utils.db_pool import init_db_pool
+    init_db_pool(app)
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+
+POOL_MODES = ('budget', 'pgbouncer', 'static')
+
+# Connections pro gleichzeitigem Request (Request-Session + Hook-Session)
+CONNECTIONS_PRO_REQUEST = 2
+
+# Connections pro PDF-Render-Prozess (render_engine_optionen)
+CONNECTIONS_PRO_RENDER_PROZESS = 1
+
+# Budget, wenn weder konfiguriert noch vom Server lesbar
+DEFAULT_CONNECTION_BUDGET = 60
+
+# Worker-Klassen mit Greenlets: Parallelität = worker_connections
+ASYNC_WORKER_CLASSES = ('gevent', 'eventlet')
+
+
+def worker_modell(environ=os.environ) -> Dict[str, Any]:
+    """
+    Worker-Modell aus den von gunicorn.conf.py gesetzten Variablen.
+
+    Returns:
+        Dict mit worker_class, workers, parallelitaet (gleichzeitige
+        Requests pro Worker)
+    """
+    worker_class = environ.get('GUNICORN_WORKER_CLASS', 'sync').rsplit('.', 1)[-1].lower()
+    workers = int(environ.get('GUNICORN_WORKERS', 1))
+    threads = int(environ.get('GUNICORN_THREADS', 1))
+
+    if any(name in worker_class for name in ASYNC_WORKER_CLASSES):
+        parallelitaet = int(environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+    elif 'gthread' in worker_class or threads > 1:
+        parallelitaet = threads
+    else:
+        parallelitaet = 1
+
+    return {'worker_class': worker_class, 'workers': max(1, workers), 'parallelitaet': max(1, parallelitaet)}
+
+
+def server_budget(url: str, timeout: int = 2) -> Optional[int]:
+    """
+    Connections, die der PostgreSQL-Server Anwendungen erlaubt
+    (max_connections - superuser_reserved_connections).
+
+    Eine kurze Connection ohne Pool beim Start jedes Prozesses.
+
+    Returns:
+        Anzahl oder None (Server nicht erreichbar)
+    """
+    connect_args = {'connect_timeout': timeout} if make_url(url).get_driver_name().startswith('psycopg') else {}
+    engine = create_engine(url, poolclass=NullPool, connect_args=connect_args)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(
+                "SELECT current_setting('max_connections')::int"
+                " - current_setting('superuser_reserved_connections')::int"
+            )).scalar()
+    except Exception:
+        return None
+    finally:
+        engine.dispose()
+
+
+def _budget(konfiguriert: Optional[int], url: str, modus: str) -> Dict[str, Any]:
+    """Budget und Herkunft (konfiguriert, Server oder Default)"""
+    if konfiguriert:
+        return {'budget': konfiguriert, 'explizit': True}
+    # pgbouncer: Budget gilt für den Server-Pool des Poolers, nicht für die App
+    gelesen = server_budget(url) if modus == 'budget' else None
+    return {'budget': gelesen or DEFAULT_CONNECTION_BUDGET, 'explizit': False, 'vom_server': gelesen is not None}
+
+
+def berechne_pool(budget: Optional[int], reserve: int, prozesse: int, parallelitaet: int,
+                  pro_request: int = CONNECTIONS_PRO_REQUEST,
+                  minimum: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Pool-Größe pro Prozess.
+
+    Bedarf: pro_request Connections pro gleichzeitigem Request, davon
+    parallelitaet + 1 dauerhaft offen (der Rest als Overflow). Der Anteil
+    am Budget deckelt den Bedarf, mindestens bleiben aber minimum
+    (Primary: pro_request, sonst blockieren after_commit-Hooks). Reicht der
+    Anteil dafür nicht, ist das Ergebnis ueberbucht (init_db_pool bricht bei
+    explizitem Budget ab, sonst Warnung).
+
+    Args:
+        budget: Max. Connections aller Prozesse (None = nicht deckeln)
+        pro_request: Connections pro Request (Replica: 1)
+        minimum: Mindestgröße pro Prozess (Default: pro_request)
+
+    Returns:
+        Dict mit pool_size, max_overflow, limit (pro Prozess),
+        gesamt (alle Prozesse) und ueberbucht
+    """
+    limit = pro_request * parallelitaet
+    if budget is not None:
+        anteil = max(0, budget - reserve) // max(1, prozesse)
+        limit = max(minimum or pro_request, min(limit, anteil))
+    pool_size = min(limit, parallelitaet + 1)
+
+    return {
+        'pool_size': pool_size,
+        'max_overflow': limit - pool_size,
+        'limit': limit,
+        'gesamt': limit * prozesse,
+        'ueberbucht': budget is not None and limit * prozesse + reserve > budget,
+    }
+
+
+def pool_optionen(config, environ=os.environ) -> Optional[Dict[str, Any]]:
+    """
+    Engine-Optionen für den konfigurierten Pool-Modus.
+
+    Returns:
+        Dict {engine_options, info} oder None (static bzw. kein QueuePool)
+    """
+    modus = config.get('DB_POOL_MODE', 'budget')
+    if modus not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE '{modus}' unbekannt (erlaubt: {', '.join(POOL_MODES)})")
+
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if modus == 'static' or not uri or make_url(uri).get_backend_name() == 'sqlite':
+        return None
+
+    modell = worker_modell(environ)
+    prozesse = modell['workers']
+    # PDF-Render-Prozesse (deputat_pdf_service) halten je eine Connection
+    render = prozesse * config.get('PDF_JOB_WORKERS', 0) * CONNECTIONS_PRO_RENDER_PROZESS
+    herkunft = _budget(config.get('DB_CONNECTION_BUDGET'), uri, modus)
+    budget = herkunft['budget']
+    reserve = config.get('DB_CONNECTION_RESERVE', 5)
+
+    # pgbouncer: Client-Connections zum Pooler sind billig, das Budget
+    # begrenzt dort den Server-Pool (default_pool_size)
+    pool = berechne_pool(
+        budget if modus == 'budget' else None, reserve + render, prozesse, modell['parallelitaet']
+    )
+
+    optionen = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    optionen.update(
+        pool_size=pool['pool_size'],
+        max_overflow=pool['max_overflow'],
+        pool_timeout=config.get('DB_POOL_TIMEOUT', 10),
+    )
+
+    if modus == 'pgbouncer':
+        optionen['connect_args'] = dict(
+            optionen.get('connect_args') or {},
+            **_statement_cache_aus(make_url(uri).get_driver_name())
+        )
+
+    return {
+        'engine_options': optionen,
+        'info': dict(pool, modus=modus, prozesse=prozesse, render=render, reserve=reserve, **herkunft, **modell),
+    }
+
+
+def replica_binds(config, environ=os.environ) -> Dict[str, Any]:
+    """
+    SQLALCHEMY_BINDS-Einträge für die Read-Replicas (DB_REPLICA_URLS).
+
+    Returns:
+        Dict {binds: {replica_1: {url, ...}}, info} - binds leer ohne Replicas
+    """
+    urls = [url for url in config.get('DB_REPLICA_URLS') or [] if url]
+    modus = config.get('DB_POOL_MODE', 'budget')
+    binds: Dict[str, Dict[str, Any]] = {}
+    info: Optional[Dict[str, Any]] = None
+
+    for nummer, url in enumerate(urls, start=1):
+        optionen: Dict[str, Any] = {'url': url}
+        if make_url(url).get_backend_name() == 'sqlite':
+            binds[f'replica_{nummer}'] = optionen
+            continue
+
+        optionen.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        # Nicht erreichbare Replica: schnell auf den Primary ausweichen
+        optionen['connect_args'] = dict(
+            optionen.get('connect_args') or {},
+            connect_timeout=config.get('DB_REPLICA_CONNECT_TIMEOUT', 2),
+        )
+
+        if modus != 'static':
+            modell = worker_modell(environ)
+            # Render-Prozesse lesen vom Primary (kein Replica-Routing)
+            prozesse = modell['workers']
+            herkunft = _budget(
+                config.get('DB_REPLICA_CONNECTION_BUDGET') or config.get('DB_CONNECTION_BUDGET'), url, modus
+            )
+            budget = herkunft['budget']
+            reserve = config.get('DB_CONNECTION_RESERVE', 5)
+            # Eine Connection pro Request, dazu eine für die Lag-Prüfung
+            # (db_routing, läuft auch während eine Request-Transaktion offen ist)
+            pool = berechne_pool(
+                budget if modus == 'budget' else None, reserve, prozesse, modell['parallelitaet'] + 1,
+                pro_request=1, minimum=2,
+            )
+            optionen.update(
+                pool_size=pool['pool_size'],
+                max_overflow=pool['max_overflow'],
+                pool_timeout=config.get('DB_POOL_TIMEOUT', 10),
+            )
+            if modus == 'pgbouncer':
+                optionen['connect_args'].update(_statement_cache_aus(make_url(url).get_driver_name()))
+            info = dict(pool, modus=modus, prozesse=prozesse, reserve=reserve, **herkunft)
+
+        binds[f'replica_{nummer}'] = optionen
+
+    return {'binds': binds, 'info': info}
+
+
+def render_engine_optionen(config) -> Dict[str, Any]:
+    """
+    Engine-Optionen für PDF-Render-Prozesse (deputat_pdf_service).
+
+    Ein Render-Prozess bearbeitet einen Job nach dem anderen und liest nur:
+    eine Connection ohne Overflow genügt, in jedem Pool-Modus.
+    """
+    optionen = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri or make_url(uri).get_backend_name() == 'sqlite':
+        return optionen
+
+    optionen.update(pool_size=1, max_overflow=0, pool_timeout=config.get('DB_POOL_TIMEOUT', 10))
+    if config.get('DB_POOL_MODE', 'budget') == 'pgbouncer':
+        optionen['connect_args'] = dict(
+            optionen.get('connect_args') or {},
+            **_statement_cache_aus(make_url(uri).get_driver_name())
+        )
+    return optionen
+
+
+def _statement_cache_aus(driver: str) -> Dict[str, Any]:
+    """connect_args ohne serverseitige Prepared Statements (Transaction-Pooling)"""
+    if driver == 'psycopg':
+        return {'prepare_threshold': None}
+    if driver == 'asyncpg':
+        return {'statement_cache_size': 0, 'prepared_statement_cache_size': 0}
+    # psycopg2 bereitet nicht serverseitig vor
+    return {}
+
+
+def init_db_pool(app: Flask) -> None:
+    """Setzt SQLALCHEMY_ENGINE_OPTIONS nach DB_POOL_MODE und die Replica-Binds (vor db.init_app)"""
+    replicas = replica_binds(app.config)
+    if replicas['binds']:
+        app.config['SQLALCHEMY_BINDS'] = dict(app.config.get('SQLALCHEMY_BINDS') or {}, **replicas['binds'])
+        info = replicas['info']
+        app.logger.info(f"[DBPool] {len(replicas['binds'])} read replica(s) configured")
+        if info:
+            app.logger.info(
+                f"[DBPool] Replica pool: pool_size={info['pool_size']}, max_overflow={info['max_overflow']} "
+                f"per process (max {info['gesamt']} connections per replica, budget {info['budget']})"
+            )
+        if info and info['ueberbucht']:
+            _ueberbucht(
+                app, info,
+                f"[DBPool] Replica connection budget too small: {info['prozesse']} workers x "
+                f"{info['limit']} + reserve {info['reserve']} > {info['budget']}. Reduce workers, raise "
+                f"DB_REPLICA_CONNECTION_BUDGET or use DB_POOL_MODE=pgbouncer"
+            )
+
+    ergebnis = pool_optionen(app.config)
+    if ergebnis is None:
+        return
+
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = ergebnis['engine_options']
+    info = ergebnis['info']
+
+    app.logger.info(
+        f"[DBPool] Mode {info['modus']}: pool_size={info['pool_size']}, max_overflow={info['max_overflow']} "
+        f"per worker ({info['prozesse']} workers, {info['worker_class']} x{info['parallelitaet']}, "
+        f"max {info['gesamt']} connections + {info['render']} render, budget {info['budget']})"
+    )
+    if info['ueberbucht']:
+        _ueberbucht(
+            app, info,
+            f"[DBPool] Connection budget too small: {info['prozesse']} workers x {info['limit']} "
+            f"+ {info['render']} render + reserve {info['reserve']} > {info['budget']}. Reduce workers "
+            f"or PDF_JOB_WORKERS, raise DB_CONNECTION_BUDGET or use DB_POOL_MODE=pgbouncer"
+        )
+
+
+def _ueberbucht(app: Flask, info: Dict[str, Any], meldung: str) -> None:
+    """
+    Überbuchtes Budget: Abbruch nur, wenn es konfiguriert wurde
+
+    Ein vom Server gelesenes oder Default-Budget bricht den Start nicht ab
+    (z.B. Host mit vielen Kernen ohne gesetztes DB_CONNECTION_BUDGET); die
+    Pools bleiben auf dem Minimum, PostgreSQL weist überzählige Connections
+    unter Last ab.
+    """
+    if info['explizit']:
+        raise ValueError(meldung)
+    herkunft = 'max_connections' if info.get('vom_server') else 'default'
+    app.logger.warning(f"{meldung} (budget from {herkunft}, starting anyway)")
@@ -0,0 +1,405 @@
+"""
+DB Routing (Read-Replicas)
+==========================
+Verteilt lesende Requests auf Read-Replicas, alles andere läuft über den
+Primary (SQLALCHEMY_DATABASE_URI).
+
+db.session ist eine RoutingSession (app/extensions.py). Deren get_bind()
+wählt pro Statement:
+
+- Primary: schreibende Requests (POST/PUT/PATCH/DELETE), Flush,
+  INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, Code ohne Request-Kontext
+  (CLI, PDF-Jobs) sowie alles innerhalb von replica_router.primary()
+- Cache-Füllpfade: was in einen Cache geschrieben wird, liest vom Primary
+  (RoutingCache für @cache.cached/@cache.memoize, auf_primary bzw.
+  Session(db.engine) in Services). Von einer nachlaufenden Replica
+  gelesen, bliebe der Eintrag nach der Invalidierung bis zum Timeout alt
+- Responses mit versionsbasiertem ETag (conditional_get) lesen vom
+  Primary, sonst bekäme ein alter Stand den neuen ETag
+- Replica: GET/HEAD/OPTIONS-Requests und Service-Aufrufe innerhalb von
+  replica_router.replica(), solange eine Replica erreichbar ist und ihr
+  Lag unter DB_REPLICA_MAX_LAG liegt
+
+Read-your-writes:
+- Nach dem ersten Schreibzugriff liest die Session bis zum Ende des
+  Requests vom Primary
+- Danach bleibt derselbe Benutzer DB_REPLICA_STICKY_SECONDS lang auf dem
+  Primary: Cookie db_primary_bis (Browser, auch über mehrere App-Server)
+  und Cache-Key pro Benutzer-ID (andere Clients desselben Benutzers)
+
+Lag-Prüfung: pro Worker höchstens alle DB_REPLICA_CHECK_INTERVAL Sekunden
+(nach einem Fehler erst nach DB_REPLICA_RETRY_INTERVAL), nicht blockierend
+für parallele Requests. PostgreSQL: Abstand zum zuletzt eingespielten
+Commit (0, wenn alles empfangene WAL eingespielt ist). SQLite
+(lokale Tests mit zwei Dateien): nur Erreichbarkeit.
+
+Config:
+    DB_REPLICA_URLS = ['postgresql://...replica1/digidekan', ...]
+    DB_REPLICA_MAX_LAG = 5.0
+    DB_REPLICA_STICKY_SECONDS = 10      # > DB_REPLICA_MAX_LAG
+    DB_REPLICA_CHECK_INTERVAL = 2.0
+    DB_REPLICA_RETRY_INTERVAL = 30.0
+
+Usage:
+    # Service-Aufruf außerhalb eines GET-Requests auf einer Replica
+    with replica_router.replica():
+        statistiken = dashboard_service.get_statistiken()
+
+    # Lesen, das den aktuellen Stand braucht (z.B. Sicherheitsprüfungen)
+    with replica_router.primary():
+        gesperrt = db.session.execute(stmt).scalar()
+
+    # Funktion, deren Ergebnis gecacht wird
+    @auf_primary
+    def lade_geplante_module(): ...
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+from flask import Flask, current_app, g, has_request_context, request
+from flask_caching import Cache
+from flask_sqlalchemy.session import Session
+
+from app.utils.metrics import metrics
+
+
+REPLICA_BIND_PREFIX = 'replica_'
+LESENDE_METHODEN = ('GET', 'HEAD', 'OPTIONS')
+STICKY_COOKIE = 'db_primary_bis'
+STICKY_CACHE_PREFIX = 'db_primary:'
+
+PRIMARY = 'primary'
+REPLICA = 'replica'
+
+# Replay-Lag in Sekunden; 0 wenn alles empfangene WAL eingespielt ist
+# (sonst wüchse der Wert auf einem ruhenden Primary ständig)
+LAG_SQL_POSTGRESQL = sa.text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+_erzwungen: ContextVar[Optional[str]] = ContextVar('db_routing_erzwungen', default=None)
+
+
+def _ist_schreibend(clause) -> bool:
+    """INSERT/UPDATE/DELETE oder SELECT ... FOR UPDATE"""
+    if clause is None:
+        return False
+    if isinstance(clause, sa.UpdateBase):
+        return True
+    return getattr(clause, '_for_update_arg', None) is not None
+
+
+class RoutingSession(Session):
+    """
+    Flask-SQLAlchemy Session mit Replica-Routing.
+
+    Models mit eigenem bind_key und explizite Binds werden nicht umgeleitet.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or not replica_router.replicas:
+            return engine
+
+        engines = self._db.engines
+        if engine is not engines.get(None):
+            return engine
+
+        if self._flushing or _ist_schreibend(clause):
+            self.info['db_primary'] = True
+            if has_request_context():
+                g.db_geschrieben = True
+            return engine
+        if self.info.get('db_primary'):
+            return engine
+
+        key = replica_router.ziel()
+        return engines[key] if key else engine
+
+
+class ReplicaRouter:
+    """
+    Wählt pro Request Primary oder eine Replica.
+
+    Usage:
+        replica_router.init_app(app)   # nach db.init_app
+        replica_router.ziel()          # Bind-Key der Replica oder None
+        replica_router.get_status()
+    """
+
+    def __init__(self):
+        self.replicas: List[str] = []
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._max_lag = 5.0
+        self._sticky_seconds = 10
+        self._check_interval = 2.0
+        self._retry_interval = 30.0
+
+    # =========================================================================
+    # SETUP
+    # =========================================================================
+
+    def init_app(self, app: Flask) -> None:
+        """Liest die Replica-Binds (siehe db_pool.replica_binds) und registriert die Request-Hooks"""
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.replicas = sorted(key for key in binds if key.startswith(REPLICA_BIND_PREFIX))
+        if not self.replicas:
+            return
+
+        self._max_lag = app.config.get('DB_REPLICA_MAX_LAG', 5.0)
+        self._sticky_seconds = app.config.get('DB_REPLICA_STICKY_SECONDS', 10)
+        self._check_interval = app.config.get('DB_REPLICA_CHECK_INTERVAL', 2.0)
+        self._retry_interval = app.config.get('DB_REPLICA_RETRY_INTERVAL', 30.0)
+        # Replicas haben keine eigenen Models: ohne MetaData übergehen
+        # create_all()/drop_all() sie (Schema kommt per Replikation)
+        from app.extensions import db
+        for key in self.replicas:
+            db.metadatas.pop(key, None)
+
+        self._status = {
+            key: {'ok': False, 'lag': None, 'naechste_pruefung': 0.0, 'lock': threading.Lock()}
+            for key in self.replicas
+        }
+
+        app.after_request(self._merke_schreibzugriff)
+        app.teardown_request(self._zaehle_routing)
+
+        app.logger.info(f"[DBRouting] Read replicas: {', '.join(self.replicas)}")
+        app.logger.info(
+            f"   Max lag: {self._max_lag}s, sticky primary after write: {self._sticky_seconds}s"
+        )
+
+    # =========================================================================
+    # ROUTING
+    # =========================================================================
+
+    @contextmanager
+    def primary(self):
+        """Alle Statements im Block auf dem Primary"""
+        token = _erzwungen.set(PRIMARY)
+        try:
+            yield
+        finally:
+            _erzwungen.reset(token)
+
+    @contextmanager
+    def replica(self):
+        """Lesende Statements im Block auf einer Replica (auch ohne GET-Request)"""
+        token = _erzwungen.set(REPLICA)
+        try:
+            yield
+        finally:
+            _erzwungen.reset(token)
+
+    def request_auf_primary(self, grund: str) -> None:
+        """
+        Restlichen Request (inkl. gestreamter Responses) auf dem Primary
+        ausführen, z.B. wenn die Antwort einen versionsbasierten ETag bekommt
+        """
+        g.db_routing = (None, grund)
+
+    def ziel(self) -> Optional[str]:
+        """
+        Bind-Key der Replica für das nächste lesende Statement.
+
+        Returns:
+            Bind-Key oder None (Primary)
+        """
+        erzwungen = _erzwungen.get()
+        if erzwungen == PRIMARY:
+            return None
+        if not has_request_context():
+            return self._waehle_replica()[0] if erzwungen == REPLICA else None
+
+        entscheidung = g.get('db_routing')
+        if entscheidung is None:
+            entscheidung = self._entscheide(erzwungen == REPLICA)
+        return entscheidung[0]
+
+    def _entscheide(self, replica_erlaubt: bool) -> Tuple[Optional[str], str]:
+        """Routing des Requests als (Bind-Key oder None, Grund), wird in g gemerkt"""
+        if request.method not in LESENDE_METHODEN and not replica_erlaubt:
+            g.db_routing = (None, 'schreibend')
+            return g.db_routing
+
+        if self._sticky_cookie_gueltig():
+            g.db_routing = (None, 'sticky')
+            return g.db_routing
+
+        # Benutzer erst nach der Token-Prüfung bekannt: der User-Lookup selbst
+        # liest von der Replica, die Entscheidung fällt beim nächsten Statement
+        jwt_daten = g.get('_jwt_extended_jwt')
+        if jwt_daten is None and self._hat_token():
+            if 'db_replica' not in g:
+                g.db_replica = self._waehle_replica()
+            return g.db_replica
+
+        if jwt_daten is not None and self._benutzer_sticky(jwt_daten.get('sub')):
+            g.db_routing = (None, 'sticky')
+            return g.db_routing
+
+        if 'db_replica' not in g:
+            g.db_replica = self._waehle_replica()
+        g.db_routing = g.db_replica
+        return g.db_routing
+
+    @staticmethod
+    def _hat_token() -> bool:
+        config = current_app.config
+        return bool(
+            request.cookies.get(config.get('JWT_ACCESS_COOKIE_NAME', 'access_token_cookie'))
+            or request.headers.get(config.get('JWT_HEADER_NAME', 'Authorization'))
+        )
+
+    def _sticky_cookie_gueltig(self) -> bool:
+        try:
+            return int(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _benutzer_sticky(self, user_id) -> bool:
+        if user_id is None:
+            return False
+        from app.extensions import cache
+        try:
+            bis = cache.get(f'{STICKY_CACHE_PREFIX}{user_id}')
+        except Exception as e:
+            current_app.logger.error(f'[DBRouting] Sticky lookup failed: {e}')
+            return True
+        return bis is not None and bis > time.time()
+
+    def _waehle_replica(self) -> Tuple[Optional[str], str]:
+        """Zufällige Replica mit Lag unter DB_REPLICA_MAX_LAG"""
+        kandidaten = []
+        erreichbar = False
+        for key in self.replicas:
+            self._pruefe(key)
+            status = self._status[key]
+            if status['ok']:
+                erreichbar = True
+                if status['lag'] <= self._max_lag:
+                    kandidaten.append(key)
+
+        if kandidaten:
+            return random.choice(kandidaten), 'lesend'
+        return None, 'lag' if erreichbar else 'nicht_erreichbar'
+
+    # =========================================================================
+    # LAG-PRÜFUNG
+    # =========================================================================
+
+    def _pruefe(self, key: str) -> None:
+        """Misst den Lag einer Replica, falls fällig (parallele Requests nutzen den alten Stand)"""
+        status = self._status[key]
+        if time.monotonic() < status['naechste_pruefung'] or not status['lock'].acquire(blocking=False):
+            return
+
+        from app.extensions import db
+        war_ok = status['ok']
+        war_zu_weit = war_ok and status['lag'] > self._max_lag
+        try:
+            engine = db.engines[key]
+            sql = LAG_SQL_POSTGRESQL if engine.dialect.name == 'postgresql' else sa.text('SELECT 0')
+            with engine.connect() as conn:
+                lag = float(conn.execute(sql).scalar() or 0)
+            status.update(ok=True, lag=lag)
+            metrics.observe('db_replica_lag_seconds', (key,), lag)
+            if not war_ok and status['naechste_pruefung']:
+                current_app.logger.info(f'[DBRouting] Replica {key} available again (lag {lag:.1f}s)')
+            elif lag > self._max_lag and not war_zu_weit:
+                current_app.logger.warning(
+                    f'[DBRouting] Replica {key} lag {lag:.1f}s > {self._max_lag}s, reading from primary'
+                )
+        except Exception as e:
+            status.update(ok=False, lag=None)
+            metrics.inc('db_replica_check_errors_total', (key,))
+            if war_ok or not status['naechste_pruefung']:
+                current_app.logger.warning(f'[DBRouting] Replica {key} not reachable, reading from primary: {e}')
+        finally:
+            intervall = self._check_interval if status['ok'] else self._retry_interval
+            status['naechste_pruefung'] = time.monotonic() + intervall
+            status['lock'].release()
+
+    # =========================================================================
+    # REQUEST-HOOKS
+    # =========================================================================
+
+    def _merke_schreibzugriff(self, response):
+        """after_request: Benutzer nach einem Schreibzugriff auf den Primary festlegen"""
+        if not g.get('db_geschrieben'):
+            return response
+
+        bis = int(time.time()) + self._sticky_seconds
+        response.set_cookie(
+            STICKY_COOKIE, str(bis),
+            max_age=self._sticky_seconds,
+            httponly=True,
+            secure=current_app.config.get('JWT_COOKIE_SECURE', False),
+            samesite=current_app.config.get('JWT_COOKIE_SAMESITE', 'Lax'),
+        )
+
+        user_id = (g.get('_jwt_extended_jwt') or {}).get('sub')
+        if user_id is not None:
+            from app.extensions import cache
+            try:
+                cache.set(f'{STICKY_CACHE_PREFIX}{user_id}', bis, timeout=self._sticky_seconds)
+            except Exception as e:
+                current_app.logger.error(f'[DBRouting] Sticky write failed: {e}')
+        return response
+
+    def _zaehle_routing(self, exc):
+        entscheidung = g.pop('db_routing', None) or g.pop('db_replica', None)
+        if entscheidung is not None:
+            metrics.inc('db_routing_total', (entscheidung[0] or PRIMARY, entscheidung[1]))
+
+    # =========================================================================
+    # STATUS
+    # =========================================================================
+
+    def get_status(self) -> Dict[str, Any]:
+        """Replica-Status dieses Workers (für /metrics?format=json)"""
+        return {
+            key: {'available': status['ok'], 'lag_seconds': status['lag']}
+            for key, status in self._status.items()
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+def auf_primary(f):
+    """Decorator: f liest vom Primary (Cache-Füllpfade)"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        with replica_router.primary():
+            return f(*args, **kwargs)
+    return wrapper
+
+
+class RoutingCache(Cache):
+    """
+    Flask-Caching, dessen Füllpfade vom Primary lesen.
+
+    Bei einem Miss in @cache.cached/@cache.memoize läuft die View bzw.
+    Funktion innerhalb von replica_router.primary(); Treffer brauchen
+    keine DB.
+    """
+
+    def cached(self, *args, **kwargs):
+        decorator = super().cached(*args, **kwargs)
+        return lambda f: decorator(auf_primary(f))
+
+    def memoize(self, *args, **kwargs):
+        decorator = super().memoize(*args, **kwargs)
+        return lambda f: decorator(auf_primary(f))
@@ -0,0 +1,95 @@
+"""
+JSON Streaming
+==============
+Schreibt große Listen-Responses als gestreamtes JSON.
+
+jsonify() baut die komplette Struktur und den kompletten String im
+Speicher, bevor das erste Byte rausgeht. stream_json() gibt zuerst die
+Kopf-Felder aus und serialisiert die Liste Element für Element, während
+die Items (z.B. aus einem Server-Side-Cursor, yield_per) nachgeladen
+werden. Speicherbedarf und Time-to-first-byte hängen so nicht mehr von
+der Ergebnisgröße ab.
+
+Einschränkung: Nach dem ersten Byte steht der Status-Code fest. Fehler
+während des Streamens werden geloggt, die Antwort bricht ab (der Client
+erhält ungültiges JSON statt einer Fehlermeldung).
+
+Usage:
+    return stream_json(
+        {'success': True, 'total': total},
+        'data',
+        (p.to_dict() for p in query.yield_per(100))
+    )
+"""
+
+from typing import Any, Dict, Iterable, Iterator
+
+from flask import Response, current_app, stream_with_context
+
+
+# Items pro Chunk (ein Chunk = ein write() an den Client)
+DEFAULT_CHUNK_ITEMS = 100
+
+
+def _iter_json(kopf: Dict[str, Any], list_key: str, items: Iterable, chunk_items: int) -> Iterator[str]:
+    dumps = current_app.json.dumps
+
+    prefix = dumps(kopf)[:-1]  # ohne schließende Klammer
+    prefix += ', ' if kopf else ''
+    yield f'{prefix}{dumps(list_key)}: ['
+
+    puffer = []
+    erstes = True
+    try:
+        for item in items:
+            puffer.append(dumps(item) if erstes else ',' + dumps(item))
+            erstes = False
+            if len(puffer) >= chunk_items:
+                yield ''.join(puffer)
+                puffer = []
+    except Exception as e:
+        current_app.logger.exception(f'[JsonStream] Abbruch nach Start der Response: {e}')
+        raise
+
+    puffer.append(']}')
+    yield ''.join(puffer)
+
+
+def stream_json(
+    kopf: Dict[str, Any],
+    list_key: str,
+    items: Iterable,
+    status_code: int = 200,
+    chunk_items: int = None
+) -> Response:
+    """
+    Gestreamte JSON-Response: {**kopf, list_key: [items...]}
+
+    Args:
+        kopf: Felder vor der Liste (müssen vorab bekannt sein, z.B. total)
+        list_key: Key der gestreamten Liste (z.B. 'data')
+        items: Iterable JSON-fähiger Objekte (wird lazy konsumiert)
+        status_code: HTTP Status Code
+        chunk_items: Items pro Chunk (Default: JSON_STREAM_CHUNK_ITEMS)
+
+    Returns:
+        Flask Response (application/json, gestreamt)
+    """
+    if chunk_items is None:
+        chunk_items = current_app.config.get('JSON_STREAM_CHUNK_ITEMS', DEFAULT_CHUNK_ITEMS)
+
+    return Response(
+        stream_with_context(_iter_json(kopf, list_key, items, chunk_items)),
+        status=status_code,
+        mimetype='application/json'
+    )
+
+
+def nicht_gestreamt(rv) -> bool:
+    """response_filter für @cache.cached: gestreamte Responses nicht cachen"""
+    return not (isinstance(rv, Response) and rv.is_streamed)
+
+
+def soll_streamen(anzahl: int) -> bool:
+    """True, wenn eine Liste mit `anzahl` Items gestreamt werden sollte"""
+    return anzahl >= current_app.config.get('JSON_STREAM_MIN_ITEMS', 200)
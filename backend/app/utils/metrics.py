@@ -0,0 +1,560 @@
+"""
+Metrics Registry
+================
+Prometheus-kompatible Metriken (Text Exposition Format) für GET /metrics.
+
+Metriken:
+- HTTP Requests pro Blueprint/Endpoint (Counter, Latenz-Histogramm)
+- In-Flight Requests pro Blueprint (Gauge)
+- DB Queries/DB-Zeit pro Request (Histogramme, gespeist vom Query Profiler)
+- Cache Hits/Misses (app.extensions.cache)
+- DB Pool: Checkout-Latenz, davon Warten auf eine freie Connection und
+  Verbindungsaufbau (Histogramme), Timeouts, Pool-Auslastung und Limit
+  pro Worker (Gauges, Summe = max. Connections aller Worker)
+  für Primary und Read-Replicas (engine="default" bzw. "replica_n")
+- DB Routing: Requests pro Ziel (Primary/Replica), Replica-Lag, Fehler
+  der Lag-Prüfung (siehe app.utils.db_routing)
+- Prozess: CPU-Sekunden, Resident Memory (ohne blockierendes Sampling)
+
+Multiprocess-Modus (Gunicorn):
+    Jeder Worker schreibt seinen Stand periodisch (METRICS_FLUSH_INTERVAL)
+    als JSON-Datei nach METRICS_MULTIPROC_DIR. Beim Scrape werden alle
+    Dateien aggregiert: Counter und Histogramme werden summiert (auch von
+    beendeten Workern), Gauges nur von laufenden Workern.
+
+    In-Flight Gauges werden bei jeder Änderung in eine kleine eigene
+    Datei geschrieben, damit lange laufende Requests sofort sichtbar sind.
+
+    Das Verzeichnis wird beim Start des Gunicorn-Masters geleert
+    (siehe gunicorn.conf.py: on_starting). Beendet sich ein Worker, führt
+    der Master dessen Counter und Histogramme in eine gemeinsame Datei
+    zusammen und löscht seine Dateien (child_exit), damit das Verzeichnis
+    bei Worker-Recycling nicht mit jeder PID wächst. Ohne METRICS_MULTIPROC_DIR
+    liefert /metrics nur die Werte des antwortenden Prozesses.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, g, request
+
+
+PREFIX = 'dekanet_'
+
+# Summierte Counter/Histogramme beendeter Worker (siehe mark_process_dead)
+MULTIPROC_ARCHIV = 'metrics_archiv.json'
+
+# Latenz-Grenzen in Sekunden
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+REPLICA_LAG_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# name -> (typ, hilfe, labels, buckets)
+METRIC_DEFINITIONS = {
+    'http_requests_total': (
+        'counter', 'Anzahl HTTP Requests', ('blueprint', 'endpoint', 'method', 'status'), None),
+    'http_request_duration_seconds': (
+        'histogram', 'Request-Dauer in Sekunden', ('blueprint', 'endpoint'), LATENCY_BUCKETS),
+    'http_requests_in_flight': (
+        'gauge', 'Aktuell laufende Requests', ('blueprint',), None),
+    'db_queries_per_request': (
+        'histogram', 'SQL-Statements pro Request', ('endpoint',), QUERY_COUNT_BUCKETS),
+    'db_time_seconds': (
+        'histogram', 'DB-Zeit pro Request in Sekunden', ('endpoint',), LATENCY_BUCKETS),
+    'db_n_plus_one_requests_total': (
+        'counter', 'Requests mit N+1 Verdacht', ('endpoint',), None),
+    'cache_requests_total': (
+        'counter', 'Cache-Zugriffe nach Ergebnis', ('group', 'result'), None),
+    'db_pool_checkout_seconds': (
+        'histogram', 'Checkout-Latenz (Warten + Verbindungsaufbau + Pre-Ping)', ('engine',), POOL_WAIT_BUCKETS),
+    'db_pool_wait_seconds': (
+        'histogram', 'Wartezeit auf eine freie Connection (Pool ausgeschöpft)', ('engine',), POOL_WAIT_BUCKETS),
+    'db_connect_seconds': (
+        'histogram', 'Aufbau neuer DB-Connections', ('engine',), POOL_WAIT_BUCKETS),
+    'db_pool_timeouts_total': (
+        'counter', 'Checkouts mit Pool-Timeout', ('engine',), None),
+    'db_pool_size': (
+        'gauge', 'Konfigurierte Pool-Größe', ('engine',), None),
+    'db_pool_limit': (
+        'gauge', 'Max. Connections (pool_size + max_overflow)', ('engine',), None),
+    'db_pool_checked_out': (
+        'gauge', 'Ausgeliehene Connections', ('engine',), None),
+    'db_pool_overflow': (
+        'gauge', 'Overflow-Connections', ('engine',), None),
+    'db_routing_total': (
+        'counter', 'Requests nach DB-Ziel (primary/Replica) und Grund', ('ziel', 'grund'), None),
+    'db_replica_lag_seconds': (
+        'histogram', 'Gemessener Replikations-Lag', ('engine',), REPLICA_LAG_BUCKETS),
+    'db_replica_check_errors_total': (
+        'counter', 'Fehlgeschlagene Lag-Prüfungen (Replica nicht erreichbar)', ('engine',), None),
+    'process_cpu_seconds_total': (
+        'counter', 'CPU-Zeit (User + System) der Worker', (), None),
+    'process_resident_memory_bytes': (
+        'gauge', 'Resident Memory der Worker', (), None),
+    'workers': (
+        'gauge', 'Laufende Worker-Prozesse', (), None),
+}
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    parts = [f'{n}="{_escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _resident_memory_bytes() -> Optional[int]:
+    """RSS aus /proc (Linux) - ohne psutil"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_CACHE_KEY_GROUP = re.compile(r'^(?:view/)?(/api/[^/?]+)')
+
+
+def cache_key_group(key: str) -> str:
+    """
+    Ordnet einen Cache-Key einer Gruppe mit begrenzter Kardinalität zu.
+
+    '/api/module/<hash>' -> '/api/module', 'view//api/semester' -> '/api/semester',
+    'app.api.dashboard._get_cached_statistiken...' -> 'memoize', sonst Präfix bis '/' bzw. ':'.
+    """
+    match = _CACHE_KEY_GROUP.match(key or '')
+    if match:
+        return match.group(1)
+    if key.startswith('app.'):
+        return 'memoize'
+    return re.split(r'[/:]', key, maxsplit=1)[0] or 'other'
+
+
+class MetricsRegistry:
+    """
+    Prozesslokale Metriken mit Aggregation über Worker.
+
+    Usage:
+        metrics.init_app(app)
+        metrics.inc('cache_requests_total', ('/api/module', 'hit'))
+        metrics.observe('db_time_seconds', ('module.get_alle_module',), 0.012)
+        metrics.render()   # Text Exposition Format
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._multiproc_dir: Optional[str] = None
+        self._flush_interval = 1.0
+        self._last_flush = 0.0
+        self._engines = {}
+
+    # =========================================================================
+    # SETUP
+    # =========================================================================
+
+    def init_app(self, app: Flask) -> None:
+        """Registriert Request-Hooks, Cache- und Pool-Instrumentierung"""
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+
+        self._multiproc_dir = app.config.get('METRICS_MULTIPROC_DIR')
+        self._flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 1.0)
+        if self._multiproc_dir:
+            os.makedirs(self._multiproc_dir, exist_ok=True)
+
+        @app.before_request
+        def start_request_metrics():
+            g.metrics_start = time.perf_counter()
+            g.metrics_blueprint = request.blueprint or 'app'
+            self.gauge_add('http_requests_in_flight', (g.metrics_blueprint,), 1)
+            self._write_in_flight()
+
+        @app.after_request
+        def record_request_metrics(response):
+            start = g.get('metrics_start')
+            if start is not None:
+                blueprint = g.metrics_blueprint
+                endpoint = request.endpoint or 'unknown'
+                self.inc('http_requests_total', (blueprint, endpoint, request.method, str(response.status_code)))
+                self.observe('http_request_duration_seconds', (blueprint, endpoint), time.perf_counter() - start)
+            return response
+
+        @app.teardown_request
+        def finish_request_metrics(exc):
+            blueprint = g.pop('metrics_blueprint', None)
+            if blueprint is not None:
+                self.gauge_add('http_requests_in_flight', (blueprint,), -1)
+                self._write_in_flight()
+            self.flush()
+
+        from app.extensions import cache, db
+        with app.app_context():
+            self.instrument_cache(cache.cache)
+            for bind, engine in db.engines.items():
+                self.instrument_pool(engine, 'default' if bind is None else bind)
+
+        app.logger.info('[OK] Metrics registry initialized')
+        app.logger.info(f"   Multiprocess dir: {self._multiproc_dir or 'disabled'}")
+
+    def instrument_cache(self, backend) -> None:
+        """Zählt Hits/Misses von backend.get() nach Key-Gruppe"""
+        if getattr(backend, '_metrics_instrumented', False):
+            return
+        original_get = backend.get
+
+        def get(key):
+            value = original_get(key)
+            self.inc('cache_requests_total', (cache_key_group(key), 'miss' if value is None else 'hit'))
+            return value
+
+        backend.get = get
+        backend._metrics_instrumented = True
+
+    def instrument_pool(self, engine, name: str) -> None:
+        """
+        Misst Checkouts: Gesamtlatenz von pool.connect() (inkl. Pre-Ping),
+        davon Warten auf eine freie Connection (_do_get ohne
+        Verbindungsaufbau) und Verbindungsaufbau (_create_connection)
+        """
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+        pool = engine.pool
+        if getattr(pool, '_metrics_instrumented', False):
+            return
+        original_connect = pool.connect
+        original_do_get = pool._do_get
+        original_create = pool._create_connection
+        lokal = threading.local()
+
+        def connect():
+            start = time.perf_counter()
+            try:
+                return original_connect()
+            finally:
+                self.observe('db_pool_checkout_seconds', (name,), time.perf_counter() - start)
+
+        def do_get():
+            # QueuePool._do_get ruft sich bei Races selbst auf: nur äußersten Aufruf messen
+            if getattr(lokal, 'aktiv', False):
+                return original_do_get()
+            lokal.aktiv, lokal.connect_zeit = True, 0.0
+            start = time.perf_counter()
+            try:
+                return original_do_get()
+            except PoolTimeoutError:
+                self.inc('db_pool_timeouts_total', (name,))
+                raise
+            finally:
+                lokal.aktiv = False
+                warten = time.perf_counter() - start - lokal.connect_zeit
+                self.observe('db_pool_wait_seconds', (name,), max(0.0, warten))
+
+        def create_connection():
+            start = time.perf_counter()
+            try:
+                return original_create()
+            finally:
+                dauer = time.perf_counter() - start
+                lokal.connect_zeit = getattr(lokal, 'connect_zeit', 0.0) + dauer
+                self.observe('db_connect_seconds', (name,), dauer)
+
+        pool.connect = connect
+        pool._do_get = do_get
+        pool._create_connection = create_connection
+        pool._metrics_instrumented = True
+        self._engines[name] = engine
+
+    # =========================================================================
+    # RECORDING
+    # =========================================================================
+
+    def inc(self, name: str, labels: LabelKey = (), value: float = 1) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + value
+
+    def gauge_add(self, name: str, labels: LabelKey = (), value: float = 1) -> None:
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + value
+
+    def gauge_set(self, name: str, labels: LabelKey = (), value: float = 0) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[labels] = value
+
+    def observe(self, name: str, labels: LabelKey, value: float) -> None:
+        buckets = METRIC_DEFINITIONS[name][3]
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(labels)
+            if hist is None:
+                # [bucket_1 .. bucket_n, +Inf, sum] (nicht kumulativ)
+                hist = series[labels] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    hist[i] += 1
+                    break
+            else:
+                hist[len(buckets)] += 1
+            hist[-1] += value
+
+    # =========================================================================
+    # SNAPSHOT & MULTIPROCESS
+    # =========================================================================
+
+    def _update_process_metrics(self) -> None:
+        times = os.times()
+        with self._lock:
+            self._counters['process_cpu_seconds_total'] = {(): times.user + times.system}
+        rss = _resident_memory_bytes()
+        if rss is not None:
+            self.gauge_set('process_resident_memory_bytes', (), rss)
+        self.gauge_set('workers', (), 1)
+
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            for metric, getter in (('db_pool_size', 'size'),
+                                   ('db_pool_checked_out', 'checkedout'),
+                                   ('db_pool_overflow', 'overflow')):
+                if hasattr(pool, getter):
+                    self.gauge_set(metric, (name,), getattr(pool, getter)())
+            if hasattr(pool, '_max_overflow'):
+                self.gauge_set('db_pool_limit', (name,), pool.size() + max(0, pool._max_overflow))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serialisierbarer Stand dieses Prozesses"""
+        self._update_process_metrics()
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[n, list(l), v] for n, s in self._counters.items() for l, v in s.items()],
+                'gauges': [[n, list(l), v] for n, s in self._gauges.items() for l, v in s.items()],
+                'histograms': [[n, list(l), list(h)] for n, s in self._histograms.items() for l, h in s.items()],
+            }
+
+    def flush(self, force: bool = False) -> None:
+        """Schreibt den Stand dieses Workers (höchstens alle METRICS_FLUSH_INTERVAL Sekunden)"""
+        if not self._multiproc_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self._flush_interval:
+            return
+        self._last_flush = now
+
+        path = os.path.join(self._multiproc_dir, f'metrics_{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _write_in_flight(self) -> None:
+        """Schreibt die In-Flight Gauges dieses Workers (bei jeder Änderung)"""
+        if not self._multiproc_dir:
+            return
+        with self._lock:
+            in_flight = [[list(l), v] for l, v in self._gauges.get('http_requests_in_flight', {}).items()]
+
+        path = os.path.join(self._multiproc_dir, f'inflight_{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(in_flight, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _load_in_flight(self) -> Dict[LabelKey, float]:
+        """Summiert die In-Flight Dateien laufender Worker"""
+        result: Dict[LabelKey, float] = {}
+        for filename in os.listdir(self._multiproc_dir):
+            if not (filename.startswith('inflight_') and filename.endswith('.json')):
+                continue
+            try:
+                pid = int(filename[len('inflight_'):-len('.json')])
+                if not _pid_alive(pid):
+                    continue
+                with open(os.path.join(self._multiproc_dir, filename)) as f:
+                    for labels, value in json.load(f):
+                        result[tuple(labels)] = result.get(tuple(labels), 0) + value
+            except (OSError, ValueError):
+                continue
+        return result
+
+    def _load_snapshots(self) -> List[Dict[str, Any]]:
+        if not self._multiproc_dir:
+            return [self.snapshot()]
+
+        self.flush(force=True)
+        snapshots = []
+        for filename in os.listdir(self._multiproc_dir):
+            if not (filename.startswith('metrics_') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self._multiproc_dir, filename)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self) -> Dict[str, Dict[LabelKey, Any]]:
+        """
+        Aggregiert alle Worker.
+
+        Counter/Histogramme: Summe über alle (auch beendete) Worker.
+        Gauges: Summe über laufende Worker.
+        """
+        result: Dict[str, Dict[LabelKey, Any]] = {}
+        for snap in self._load_snapshots():
+            alive = _pid_alive(snap.get('pid', 0))
+            for name, labels, value in snap.get('counters', []):
+                series = result.setdefault(name, {})
+                series[tuple(labels)] = series.get(tuple(labels), 0) + value
+            if alive:
+                for name, labels, value in snap.get('gauges', []):
+                    series = result.setdefault(name, {})
+                    series[tuple(labels)] = series.get(tuple(labels), 0) + value
+            for name, labels, hist in snap.get('histograms', []):
+                series = result.setdefault(name, {})
+                current = series.get(tuple(labels))
+                series[tuple(labels)] = hist if current is None else [a + b for a, b in zip(current, hist)]
+
+        if self._multiproc_dir:
+            result['http_requests_in_flight'] = self._load_in_flight()
+        return result
+
+    # =========================================================================
+    # EXPOSITION
+    # =========================================================================
+
+    def render(self) -> str:
+        """Text Exposition Format (Prometheus 0.0.4)"""
+        collected = self.collect()
+        lines = []
+
+        for name, (kind, help_text, label_names, buckets) in METRIC_DEFINITIONS.items():
+            series = collected.get(name)
+            if not series:
+                continue
+            full_name = PREFIX + name
+            lines.append(f'# HELP {full_name} {help_text}')
+            lines.append(f'# TYPE {full_name} {kind}')
+
+            for labels, value in sorted(series.items()):
+                if kind != 'histogram':
+                    lines.append(f'{full_name}{_format_labels(label_names, labels)} {_format_value(value)}')
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(buckets + ('+Inf',), value[:-1]):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f'{full_name}_bucket{_format_labels(label_names, labels, le)} {cumulative}')
+                lines.append(f'{full_name}_sum{_format_labels(label_names, labels)} {_format_value(value[-1])}')
+                lines.append(f'{full_name}_count{_format_labels(label_names, labels)} {cumulative}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def clear_multiproc_dir(path: Optional[str]) -> None:
+    """Löscht Worker-Dateien (beim Start des Gunicorn-Masters)"""
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for filename in os.listdir(path):
+        if filename.startswith(('metrics_', 'inflight_')):
+            try:
+                os.remove(os.path.join(path, filename))
+            except OSError:
+                pass
+
+
+def mark_process_dead(path: Optional[str], pid: int) -> None:
+    """
+    Räumt die Dateien eines beendeten Workers auf (im Gunicorn-Master).
+
+    Counter und Histogramme werden in MULTIPROC_ARCHIV summiert, damit sie
+    beim Scrape erhalten bleiben; Gauges und In-Flight-Datei des Workers
+    werden verworfen. Läuft nur im Master (child_exit), Schreibzugriffe
+    auf das Archiv sind damit serialisiert.
+    """
+    if not path:
+        return
+    worker_path = os.path.join(path, f'metrics_{pid}.json')
+    try:
+        with open(worker_path) as f:
+            snap = json.load(f)
+    except (OSError, ValueError):
+        snap = None
+
+    if snap is not None:
+        archiv_path = os.path.join(path, MULTIPROC_ARCHIV)
+        try:
+            with open(archiv_path) as f:
+                archiv = json.load(f)
+        except (OSError, ValueError):
+            archiv = {}
+
+        counters = {(n, tuple(l)): v for n, l, v in archiv.get('counters', [])}
+        for name, labels, value in snap.get('counters', []):
+            key = (name, tuple(labels))
+            counters[key] = counters.get(key, 0) + value
+        histograms = {(n, tuple(l)): h for n, l, h in archiv.get('histograms', [])}
+        for name, labels, hist in snap.get('histograms', []):
+            key = (name, tuple(labels))
+            current = histograms.get(key)
+            histograms[key] = hist if current is None else [a + b for a, b in zip(current, hist)]
+
+        tmp_path = f'{archiv_path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'counters': [[n, list(l), v] for (n, l), v in counters.items()],
+                    'histograms': [[n, list(l), h] for (n, l), h in histograms.items()],
+                }, f)
+            os.replace(tmp_path, archiv_path)
+        except OSError:
+            return
+
+    for filename in (f'metrics_{pid}.json', f'inflight_{pid}.json'):
+        try:
+            os.remove(os.path.join(path, filename))
+        except OSError:
+            pass
+
+
+metrics = MetricsRegistry()
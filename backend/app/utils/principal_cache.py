@@ -0,0 +1,221 @@
+"""
+Principal Cache - JWT User Lookup ohne DB-Zugriff
+=================================================
+
+user_lookup_callback (app/extensions.py) läuft bei jedem authentifizierten
+Request. Statt des Benutzers samt Rolle (1-2 Queries) liefert er einen
+BenutzerPrincipal mit den Feldern, die Autorisierungsprüfungen brauchen:
+id, username, aktiv, Rollenname, dozent_id.
+
+Pro Worker liegen die Principals in einem LRU-Cache mit TTL. Gültig ist ein
+Eintrag nur, solange der Versions-Zähler des Benutzers im gemeinsamen
+Cache (SharedCache, alle Worker) unverändert ist. UserService erhöht den
+Zähler nach update_user, change_rolle, (de)aktiviere_user und delete_user;
+eine Deaktivierung wirkt damit ab dem nächsten Request in allen Workern.
+Pro Request bleibt ein Cache-Lesezugriff (Versions-Zähler), keine Query.
+
+Alles, was der Principal nicht selbst hält (to_dict(), dozent,
+Relationships, check_password(), ...), lädt er beim ersten Zugriff als
+Benutzer aus der Session nach.
+
+Usage:
+    from app.utils.principal_cache import principal_cache
+
+    # user_lookup_callback
+    principal = principal_cache.get_or_load(user_id, lade_benutzer)
+
+    # Nach Änderungen am Benutzer (nach dem Commit!)
+    principal_cache.invalidate(user_id)
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from flask import current_app
+
+
+VERSION_KEY_PREFIX = 'benutzer_version:'
+
+
+class _Rolle(NamedTuple):
+    """Ersatz für Rolle: current_user.rolle.name ohne Query"""
+    name: str
+
+
+class BenutzerPrincipal:
+    """
+    Leichtgewichtiger, authentifizierter Benutzer (current_user bei JWT).
+
+    Kompatibel mit den Rollen-Helfern von Benutzer (rolle.name, ist_dekan(),
+    get_rolle_name(), ...). Andere Attribute werden vom Benutzer-Objekt
+    gelesen, das einmal pro Principal aus der Session geladen wird.
+    """
+
+    __slots__ = ('id', 'username', 'aktiv', 'rolle_name', 'dozent_id', '_benutzer')
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, daten: Tuple, benutzer=None):
+        self.id, self.username, self.aktiv, self.rolle_name, self.dozent_id = daten
+        self._benutzer = benutzer
+
+    @staticmethod
+    def daten_von(benutzer) -> Tuple:
+        """Cachebare Felder eines Benutzers (id, username, aktiv, Rollenname, dozent_id)"""
+        rolle_name = benutzer.rolle.name if benutzer.rolle else None
+        return (benutzer.id, benutzer.username, benutzer.aktiv, rolle_name, benutzer.dozent_id)
+
+    @property
+    def is_active(self) -> bool:
+        return self.aktiv
+
+    def get_id(self) -> str:
+        return str(self.id)
+
+    @property
+    def rolle(self) -> Optional[_Rolle]:
+        return _Rolle(self.rolle_name) if self.rolle_name else None
+
+    def hat_rolle(self, rolle_name: str) -> bool:
+        return self.rolle_name == rolle_name
+
+    def ist_dekan(self) -> bool:
+        return self.hat_rolle('dekan')
+
+    def ist_professor(self) -> bool:
+        return self.hat_rolle('professor')
+
+    def ist_lehrbeauftragter(self) -> bool:
+        return self.hat_rolle('lehrbeauftragter')
+
+    def ist_dozent(self) -> bool:
+        return self.ist_professor() or self.ist_lehrbeauftragter()
+
+    def get_rolle_name(self) -> str:
+        return self.rolle_name or 'unknown'
+
+    @property
+    def benutzer(self):
+        """Vollständiger Benutzer (lazy, aus der Identity Map der Session)"""
+        if self._benutzer is None:
+            from app.extensions import db
+            from app.models.user import Benutzer
+            self._benutzer = db.session.get(Benutzer, self.id)
+        return self._benutzer
+
+    def __getattr__(self, name):
+        # Nur für Attribute, die der Principal nicht selbst hat
+        return getattr(self.benutzer, name)
+
+    def __repr__(self):
+        return f'<BenutzerPrincipal {self.username} ({self.rolle_name})>'
+
+
+class PrincipalCache:
+    """
+    LRU-Cache (pro Worker) für BenutzerPrincipal-Daten mit TTL und
+    Versions-Zähler im gemeinsamen Cache.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._eintraege: 'OrderedDict[int, Tuple[Tuple, object, float]]' = OrderedDict()
+        self._max_size = 4096
+        self._ttl = 60.0
+
+    def init_app(self, app) -> None:
+        """Liest die Konfiguration (AUTH_PRINCIPAL_CACHE_*)"""
+        self._max_size = app.config.get('AUTH_PRINCIPAL_CACHE_SIZE', self._max_size)
+        self._ttl = app.config.get('AUTH_PRINCIPAL_CACHE_TTL', self._ttl)
+        self.clear()
+
+    # =========================================================================
+    # API
+    # =========================================================================
+
+    def get_or_load(self, user_id: int, laden: Callable) -> Optional[BenutzerPrincipal]:
+        """
+        Principal aus dem Cache oder per laden(user_id) aus der DB.
+
+        Args:
+            user_id: Benutzer ID
+            laden: Liefert den aktiven Benutzer oder None
+                   (None wird nicht gecacht)
+
+        Returns:
+            BenutzerPrincipal oder None
+        """
+        # Version vor dem Laden lesen: eine Änderung währenddessen
+        # macht den neuen Eintrag beim nächsten Request ungültig
+        version = self._version(user_id)
+        jetzt = time.monotonic()
+
+        if self._max_size > 0:
+            with self._lock:
+                eintrag = self._eintraege.get(user_id)
+                if eintrag is not None and eintrag[1] == version and eintrag[2] > jetzt:
+                    self._eintraege.move_to_end(user_id)
+                    return BenutzerPrincipal(eintrag[0])
+
+        benutzer = laden(user_id)
+        if benutzer is None:
+            return None
+
+        daten = BenutzerPrincipal.daten_von(benutzer)
+        if self._max_size > 0:
+            with self._lock:
+                self._eintraege[user_id] = (daten, version, jetzt + self._ttl)
+                self._eintraege.move_to_end(user_id)
+                while len(self._eintraege) > self._max_size:
+                    self._eintraege.popitem(last=False)
+
+        return BenutzerPrincipal(daten, benutzer)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Erhöht den Versions-Zähler des Benutzers (alle Worker).
+
+        Nach dem Commit aufrufen, sonst kann ein anderer Worker den alten
+        Stand erneut cachen.
+        """
+        from app.extensions import cache
+
+        with self._lock:
+            self._eintraege.pop(user_id, None)
+        try:
+            if cache.cache.inc(f'{VERSION_KEY_PREFIX}{user_id}') is None:
+                cache.set(f'{VERSION_KEY_PREFIX}{user_id}', time.time_ns(), timeout=0)
+        except Exception as e:
+            current_app.logger.error(f'[PrincipalCache] Invalidation failed for user {user_id}: {e}')
+
+    def clear(self) -> None:
+        """Leert den Cache dieses Workers."""
+        with self._lock:
+            self._eintraege.clear()
+
+    @property
+    def size(self) -> int:
+        """Anzahl der Principals im Cache dieses Workers."""
+        with self._lock:
+            return len(self._eintraege)
+
+    # =========================================================================
+    # INTERN
+    # =========================================================================
+
+    @staticmethod
+    def _version(user_id: int):
+        from app.extensions import cache
+        try:
+            return cache.get(f'{VERSION_KEY_PREFIX}{user_id}')
+        except Exception as e:
+            current_app.logger.error(f'[PrincipalCache] Version lookup failed: {e}')
+            # Ohne Version kein Cache-Treffer
+            return object()
+
+
+# Singleton Instance
+principal_cache = PrincipalCache()
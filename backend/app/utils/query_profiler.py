@@ -0,0 +1,278 @@
+"""
+Query Profiler
+==============
+Wertet die von Flask-SQLAlchemy aufgezeichneten Queries
+(SQLALCHEMY_RECORD_QUERIES) pro Request aus.
+
+Pro Request:
+- Anzahl SQL-Statements und gesamte DB-Zeit
+- Wiederholte Statement-Formen (N+1 Signaturen)
+- Langsamste Statements
+- Server-Timing Response-Header (db, app), nur mit QUERY_PROFILER_SERVER_TIMING
+
+Pro Endpoint werden Histogramme für Dauer und Query-Anzahl aggregiert:
+als Prometheus-Metriken (über alle Worker, siehe app.utils.metrics) und
+inkl. N+1 Signaturen unter GET /metrics?format=json (pro Worker).
+
+Config:
+    QUERY_PROFILER_ENABLED = True
+    QUERY_PROFILER_SERVER_TIMING = False       # True nur in Development (Header legt DB-Interna offen)
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = 5    # ab N gleichen Statements
+    QUERY_PROFILER_SLOW_QUERY_MS = 100         # Logging langsamer Queries
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, g, request
+from flask_sqlalchemy.record_queries import get_recorded_queries
+
+from app.utils.metrics import metrics
+
+
+# Histogramm-Grenzen
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# Anzahl N+1 Signaturen pro Endpoint, die im Report gehalten werden
+MAX_SIGNATURES_PER_ENDPOINT = 10
+
+_WHITESPACE = re.compile(r'\s+')
+_PARAM_LIST = re.compile(r'\(\s*(?:\?|%\([^)]+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\([^)]+\)s|%s|:\w+))*\s*\)')
+_POSTCOMPILE = re.compile(r'\(__\[POSTCOMPILE_\w+\]\)')
+
+
+def normalize_statement(statement: Optional[str]) -> str:
+    """
+    Normalisiert ein Statement zu seiner "Form" (Signatur).
+
+    Expandierte IN-Listen werden zu einem Platzhalter zusammengefasst,
+    damit z.B. IN (?, ?) und IN (?, ?, ?) dieselbe Signatur ergeben.
+    """
+    if not statement:
+        return ''
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _POSTCOMPILE.sub('(?)', shape)
+    return _PARAM_LIST.sub('(?)', shape)
+
+
+def analyze_queries(queries: List[Any], n_plus_one_threshold: int = 5, top_slowest: int = 3) -> Dict[str, Any]:
+    """
+    Analysiert die Queries eines Requests.
+
+    Args:
+        queries: Liste von Flask-SQLAlchemy _QueryInfo Objekten
+        n_plus_one_threshold: Ab wie vielen gleichen Statements N+1 gemeldet wird
+        top_slowest: Anzahl der langsamsten Statements im Ergebnis
+
+    Returns:
+        Dict mit count, db_time_ms, n_plus_one, slowest
+    """
+    shapes = Counter()
+    locations = {}
+    for query in queries:
+        shape = normalize_statement(query.statement)
+        shapes[shape] += 1
+        locations.setdefault(shape, query.location)
+
+    n_plus_one = [
+        {'statement': shape, 'count': count, 'location': locations.get(shape)}
+        for shape, count in shapes.most_common()
+        if count >= n_plus_one_threshold
+    ]
+
+    slowest = sorted(queries, key=lambda q: q.duration, reverse=True)[:top_slowest]
+
+    return {
+        'count': len(queries),
+        'db_time_ms': sum(q.duration for q in queries) * 1000,
+        'n_plus_one': n_plus_one,
+        'slowest': [
+            {
+                'statement': normalize_statement(q.statement),
+                'duration_ms': round(q.duration * 1000, 2),
+                'location': q.location
+            }
+            for q in slowest
+        ]
+    }
+
+
+class Histogram:
+    """Kumulatives Histogramm mit festen Grenzen (Prometheus-Semantik)"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # letzter Bucket: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {'buckets': buckets, 'sum': round(self.sum, 2), 'count': self.count}
+
+
+class EndpointStats:
+    """Aggregierte Query-Statistiken eines Endpoints"""
+
+    def __init__(self):
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.db_time_ms = Histogram(DURATION_BUCKETS_MS)
+        self.query_count = Histogram(QUERY_COUNT_BUCKETS)
+        self.n_plus_one_requests = 0
+        self.signatures = Counter()
+        self.signature_locations = {}
+
+    def observe(self, duration_ms: float, report: Dict[str, Any]) -> None:
+        self.duration_ms.observe(duration_ms)
+        self.db_time_ms.observe(report['db_time_ms'])
+        self.query_count.observe(report['count'])
+
+        if report['n_plus_one']:
+            self.n_plus_one_requests += 1
+            for signature in report['n_plus_one']:
+                self.signatures[signature['statement']] += signature['count']
+                self.signature_locations.setdefault(signature['statement'], signature['location'])
+
+            # Nur die häufigsten Signaturen behalten (Speicher begrenzen)
+            if len(self.signatures) > MAX_SIGNATURES_PER_ENDPOINT * 2:
+                self.signatures = Counter(dict(self.signatures.most_common(MAX_SIGNATURES_PER_ENDPOINT)))
+                self.signature_locations = {
+                    s: self.signature_locations.get(s) for s in self.signatures
+                }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.duration_ms.count,
+            'duration_ms': self.duration_ms.to_dict(),
+            'db_time_ms': self.db_time_ms.to_dict(),
+            'query_count': self.query_count.to_dict(),
+            'n_plus_one_requests': self.n_plus_one_requests,
+            'n_plus_one_signatures': [
+                {
+                    'statement': statement,
+                    'queries': count,
+                    'location': self.signature_locations.get(statement)
+                }
+                for statement, count in self.signatures.most_common(MAX_SIGNATURES_PER_ENDPOINT)
+            ]
+        }
+
+
+class QueryProfiler:
+    """
+    Sammelt Query-Statistiken pro Endpoint (prozesslokal).
+
+    Usage:
+        query_profiler.init_app(app)
+        query_profiler.get_report()   # für /metrics
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointStats] = {}
+
+    def init_app(self, app: Flask) -> None:
+        """Registriert before/after_request Hooks"""
+        if not app.config.get('QUERY_PROFILER_ENABLED', True):
+            return
+
+        if not app.config.get('SQLALCHEMY_RECORD_QUERIES'):
+            app.logger.warning('[QueryProfiler] SQLALCHEMY_RECORD_QUERIES is disabled - profiler inactive')
+            return
+
+        threshold = app.config.get('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', 5)
+        slow_query_ms = app.config.get('QUERY_PROFILER_SLOW_QUERY_MS', 100)
+        server_timing = app.config.get('QUERY_PROFILER_SERVER_TIMING', False)
+
+        @app.before_request
+        def start_query_profiling():
+            g.profiler_start = time.perf_counter()
+
+        @app.after_request
+        def finish_query_profiling(response):
+            start = g.pop('profiler_start', None)
+            if start is None:
+                return response
+
+            duration_ms = (time.perf_counter() - start) * 1000
+            report = analyze_queries(get_recorded_queries(), n_plus_one_threshold=threshold)
+            endpoint = request.endpoint or 'unknown'
+
+            self.observe(endpoint, duration_ms, report)
+
+            if server_timing:
+                response.headers.add('Server-Timing', self.format_server_timing(duration_ms, report))
+
+            for signature in report['n_plus_one']:
+                app.logger.warning(
+                    f"[QueryProfiler] N+1 suspected in {endpoint}: "
+                    f"{signature['count']}x {signature['statement'][:200]} ({signature['location']})"
+                )
+            for query in report['slowest']:
+                if query['duration_ms'] >= slow_query_ms:
+                    app.logger.warning(
+                        f"[QueryProfiler] Slow query in {endpoint}: "
+                        f"{query['duration_ms']}ms {query['statement'][:200]} ({query['location']})"
+                    )
+
+            return response
+
+        app.logger.info('[OK] Query profiler initialized')
+        app.logger.info(
+            f"   N+1 threshold: {threshold}, slow query: {slow_query_ms}ms, "
+            f"Server-Timing: {'on' if server_timing else 'off'}"
+        )
+
+    @staticmethod
+    def format_server_timing(duration_ms: float, report: Dict[str, Any]) -> str:
+        """Formatiert den Server-Timing Header (db, app, n+1)"""
+        parts = [
+            f'db;dur={report["db_time_ms"]:.1f};desc="{report["count"]} queries"',
+            f'app;dur={max(duration_ms - report["db_time_ms"], 0):.1f}',
+        ]
+        if report['n_plus_one']:
+            repeated = sum(s['count'] for s in report['n_plus_one'])
+            parts.append(f'nplusone;desc="{repeated} repeated queries"')
+        return ', '.join(parts)
+
+    def observe(self, endpoint: str, duration_ms: float, report: Dict[str, Any]) -> None:
+        metrics.observe('db_queries_per_request', (endpoint,), report['count'])
+        metrics.observe('db_time_seconds', (endpoint,), report['db_time_ms'] / 1000)
+        if report['n_plus_one']:
+            metrics.inc('db_n_plus_one_requests_total', (endpoint,))
+
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.observe(duration_ms, report)
+
+    def get_report(self) -> Dict[str, Any]:
+        """Aggregierte Statistiken pro Endpoint (dieses Workers)"""
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in sorted(self._endpoints.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+query_profiler = QueryProfiler()
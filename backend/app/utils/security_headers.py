@@ -71,8 +71,12 @@ def add_security_headers(app: Flask):
         )
 
         # Cache-Control für sensitive Daten
-        # API-Responses sollten nicht gecacht werden
-        if request.endpoint and 'api' in request.endpoint:
+        # API-Responses sollten nicht gecacht werden - außer sie tragen
+        # einen ETag (conditional_get): dann privat speichern, aber bei
+        # jedem Zugriff revalidieren (If-None-Match -> 304)
+        if response.headers.get('ETag'):
+            response.headers['Cache-Control'] = 'private, no-cache'
+        elif request.endpoint and 'api' in request.endpoint:
             response.headers['Cache-Control'] = (
                 'no-store, no-cache, must-revalidate, private, max-age=0'
             )
@@ -0,0 +1,128 @@
+"""
+Serializer
+==========
+Projektionen für Listen-Endpoints.
+
+Statt ORM-Objekte zu hydrieren und pro Objekt ein to_dict() mit
+Lazy-Loads aufzurufen, wählt eine Projektion nur die benötigten Spalten
+und baut aus den Row-Tupeln in einem Durchlauf JSON-fähige Dicts.
+
+Eine Projektion besteht aus:
+- felder:     Key -> Spalte oder (Spalte, Umwandlung)
+- abgeleitet: Key -> Funktion(dict), berechnet aus bereits gelesenen Feldern
+- anhaenge:   Key -> (Loader, Leerwert), Loader(ids) liefert {id: Wert}
+              (eine Query für alle Zeilen statt einer pro Zeile)
+
+Usage:
+    LEHRFORM_OPTION = Projektion('option', {
+        'id': Lehrform.id,
+        'bezeichnung': Lehrform.bezeichnung,
+    })
+    rows = db.session.execute(LEHRFORM_OPTION.select()).all()
+    data = LEHRFORM_OPTION.serialize(rows)
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+
+class Projektion:
+    """
+    Benannte Spaltenauswahl mit vorkompiliertem Row -> Dict Mapping
+
+    Args:
+        name: Name der Projektion (z.B. 'list', 'option', 'detail')
+        felder: Dict {key: Spalte | (Spalte, Umwandlung)}
+        abgeleitet: Dict {key: Funktion(dict) -> Wert}
+        anhaenge: Dict {key: (Loader(ids) -> {id: Wert}, Leerwert-Factory)}
+        id_key: Feld, über das Anhänge zugeordnet werden
+    """
+
+    def __init__(
+        self,
+        name: str,
+        felder: Dict[str, Any],
+        abgeleitet: Optional[Dict[str, Callable[[Dict], Any]]] = None,
+        anhaenge: Optional[Dict[str, Tuple[Callable[[List[int]], Dict], Callable[[], Any]]]] = None,
+        id_key: str = 'id'
+    ):
+        self.name = name
+        self.keys = tuple(felder)
+        self.spalten = []
+        self.umwandlungen = []
+
+        for key, feld in felder.items():
+            if isinstance(feld, tuple):
+                spalte, umwandlung = feld
+                self.umwandlungen.append((key, umwandlung))
+            else:
+                spalte = feld
+            self.spalten.append(spalte.label(key) if hasattr(spalte, 'label') else spalte)
+
+        self.abgeleitet = tuple((abgeleitet or {}).items())
+        self.anhaenge = tuple((anhaenge or {}).items())
+        self.id_key = id_key
+
+    def __repr__(self):
+        return f'<Projektion {self.name} ({len(self.keys)} Felder)>'
+
+    def select(self, *vorab):
+        """
+        SELECT über die Spalten der Projektion
+
+        Args:
+            *vorab: Zusätzliche Spalten vor den Projektions-Spalten
+                    (z.B. Gruppierungs-Key für gruppieren())
+        """
+        return select(*vorab, *self.spalten)
+
+    def zeile(self, row: Iterable) -> Dict[str, Any]:
+        """Wandelt ein Row-Tupel in ein Dict (ohne Anhänge)"""
+        daten = dict(zip(self.keys, row))
+        for key, umwandlung in self.umwandlungen:
+            daten[key] = umwandlung(daten[key])
+        for key, funktion in self.abgeleitet:
+            daten[key] = funktion(daten)
+        return daten
+
+    def serialize(self, rows: Iterable) -> List[Dict[str, Any]]:
+        """
+        Wandelt Row-Tupel in Dicts und lädt Anhänge gebündelt
+
+        Returns:
+            Liste von Dicts in Reihenfolge der Rows
+        """
+        items = [self.zeile(row) for row in rows]
+        if items and self.anhaenge:
+            ids = [item[self.id_key] for item in items]
+            for key, (loader, leer) in self.anhaenge:
+                werte = loader(ids)
+                for item in items:
+                    item[key] = werte.get(item[self.id_key]) or leer()
+        return items
+
+    def serialize_iter(self, partitionen: Iterable[List]) -> Iterator[Dict[str, Any]]:
+        """
+        Wie serialize(), aber lazy über Row-Partitionen
+
+        Für Server-Side-Cursor (Result.partitions() mit yield_per):
+        Anhänge werden pro Partition mit einer Query geladen.
+
+        Yields:
+            Dicts in Reihenfolge der Rows
+        """
+        for rows in partitionen:
+            yield from self.serialize(rows)
+
+    def gruppieren(self, rows: Iterable) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Gruppiert Rows aus select(gruppen_spalte) nach der ersten Spalte
+
+        Returns:
+            Dict {gruppen_key: [dict, ...]}
+        """
+        gruppen: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in rows:
+            gruppen.setdefault(row[0], []).append(self.zeile(row[1:]))
+        return gruppen
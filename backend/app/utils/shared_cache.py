@@ -0,0 +1,356 @@
+"""
+Shared Cache Backend
+====================
+Prozessübergreifender Flask-Caching Backend auf Basis einer SQLite-Datei.
+
+SimpleCache hält pro Gunicorn-Worker eine eigene Kopie - Invalidierungen
+wirken nur im Worker, der den Schreibzugriff bearbeitet hat. Dieses Backend
+legt alle Einträge in einer gemeinsamen SQLite-Datei (WAL-Modus) ab, sodass
+alle Worker auf einer Maschine denselben Cache sehen.
+
+Features:
+- Tag-basierte Invalidierung (ein Tag löscht alle zugehörigen Keys)
+- Automatisches Tagging über Key-Präfix-Regeln (CACHE_TAG_RULES)
+- Atomare Zähler (inc/dec) für Versions-Counter
+- set_many in einer Transaktion (Fan-out auf viele Keys)
+- set_many_if_newer: Compare-and-Set auf eine Version im Wert
+- Lazy Connection pro Prozess + Thread (fork-sicher)
+
+Usage (config.py):
+    CACHE_TYPE = 'app.utils.shared_cache.SharedCache'
+    CACHE_SHARED_PATH = '/var/lib/digidekan/shared_cache.sqlite3'
+
+    # Alle Modul-Einträge in allen Workern löschen
+    cache.cache.invalidate_tags('modul')
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from flask_caching.backends.base import BaseCache
+
+
+# Aufräumen abgelaufener Einträge nach jeweils N Schreibzugriffen
+PRUNE_INTERVAL = 500
+
+
+class SharedCache(BaseCache):
+    """
+    SQLite-basierter Cache, der von allen Workern geteilt wird.
+
+    Tabellen:
+        cache_entries: key -> (value, expires)
+        cache_tags:    (tag, key) Zuordnung für Invalidierung
+
+    Args:
+        path: Pfad zur SQLite-Datei
+        default_timeout: Default TTL in Sekunden (0 = kein Ablauf)
+        tag_rules: Dict {tag: [key_prefix, ...]} für automatisches Tagging
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_timeout: int = 300,
+        tag_rules: Optional[Dict[str, List[str]]] = None
+    ):
+        super().__init__(default_timeout=default_timeout)
+        self.path = str(path)
+        self.tag_rules = tag_rules or {}
+        self._local = threading.local()
+        self._write_count = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._transaction() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                '  key TEXT PRIMARY KEY,'
+                '  value BLOB NOT NULL,'
+                '  expires REAL NOT NULL'
+                ')'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_tags ('
+                '  tag TEXT NOT NULL,'
+                '  key TEXT NOT NULL,'
+                '  PRIMARY KEY (tag, key)'
+                ')'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags (key)')
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(dict(
+            path=config['CACHE_SHARED_PATH'],
+            tag_rules=config.get('CACHE_TAG_RULES'),
+        ))
+        return cls(*args, **kwargs)
+
+    # =========================================================================
+    # CONNECTION HANDLING
+    # =========================================================================
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Liefert die Connection des aktuellen Threads.
+
+        Nach einem fork() (Gunicorn pre-fork) wird eine neue Connection
+        geöffnet, da SQLite-Handles nicht prozessübergreifend nutzbar sind.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Schreib-Transaktion (BEGIN IMMEDIATE) über mehrere Statements"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def _expires_at(self, timeout: Optional[int]) -> float:
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    def tags_for_key(self, key: str) -> List[str]:
+        """Ermittelt die Tags eines Keys anhand der Präfix-Regeln"""
+        return [
+            tag for tag, prefixes in self.tag_rules.items()
+            if any(key.startswith(prefix) for prefix in prefixes)
+        ]
+
+    # =========================================================================
+    # CACHE API
+    # =========================================================================
+
+    def get(self, key: str):
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, expires = row
+        if expires and expires <= time.time():
+            return None
+
+        try:
+            return pickle.loads(value)
+        except (pickle.PickleError, EOFError, AttributeError, ImportError):
+            return None
+
+    def has(self, key: str) -> bool:
+        row = self._connection().execute(
+            'SELECT expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and (not row[0] or row[0] > time.time())
+
+    def set(self, key: str, value, timeout: Optional[int] = None, tags: Iterable[str] = ()) -> bool:
+        return self._store(key, value, timeout, tags, replace=True)
+
+    def add(self, key: str, value, timeout: Optional[int] = None, tags: Iterable[str] = ()) -> bool:
+        return self._store(key, value, timeout, tags, replace=False)
+
+    def _store(self, key, value, timeout, tags, replace: bool) -> bool:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires = self._expires_at(timeout)
+        all_tags = set(tags) | set(self.tags_for_key(key))
+
+        with self._transaction() as conn:
+            if replace:
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+                    (key, data, expires)
+                )
+            else:
+                # add() überschreibt nur abgelaufene Einträge
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE key = ? AND expires > 0 AND expires <= ?',
+                    (key, time.time())
+                )
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+                    (key, data, expires)
+                )
+                if cursor.rowcount == 0:
+                    return False
+
+            if all_tags:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)',
+                    [(tag, key) for tag in all_tags]
+                )
+
+        self._maybe_prune()
+        return True
+
+    def set_many(self, mapping, timeout: Optional[int] = None) -> List[str]:
+        """Schreibt mehrere Einträge in einer Transaktion (statt einer pro Key)"""
+        expires = self._expires_at(timeout)
+        rows = [
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires)
+            for key, value in mapping.items()
+        ]
+        tag_rows = [(tag, key) for key, _, _ in rows for tag in self.tags_for_key(key)]
+
+        with self._transaction() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+                rows
+            )
+            if tag_rows:
+                conn.executemany('INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)', tag_rows)
+
+        self._maybe_prune()
+        return [key for key, _, _ in rows]
+
+    def set_many_if_newer(self, mapping, timeout: Optional[int] = None) -> List[str]:
+        """
+        Wie set_many, überschreibt aber nur ältere Stände (Compare-and-Set)
+
+        Die Werte sind Tupel mit einer monoton steigenden Version an erster
+        Stelle, z.B. (seq, anzahl). Ein Eintrag wird nur geschrieben, wenn
+        der vorhandene fehlt, abgelaufen ist oder eine kleinere Version hat -
+        ein langsamer Schreiber kann so keinen neueren Stand überschreiben.
+
+        Returns:
+            Die tatsächlich geschriebenen Keys
+        """
+        expires = self._expires_at(timeout)
+        now = time.time()
+
+        # BEGIN IMMEDIATE: Vergleich und Schreiben unter demselben Lock
+        with self._transaction() as conn:
+            rows = []
+            for key, value in mapping.items():
+                row = conn.execute(
+                    'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and (not row[1] or row[1] > now):
+                    try:
+                        if pickle.loads(row[0])[0] >= value[0]:
+                            continue
+                    except (pickle.PickleError, TypeError, IndexError, EOFError):
+                        pass
+                rows.append((key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires))
+
+            conn.executemany(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+                rows
+            )
+            tag_rows = [(tag, key) for key, _, _ in rows for tag in self.tags_for_key(key)]
+            if tag_rows:
+                conn.executemany('INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)', tag_rows)
+
+        self._maybe_prune()
+        return [key for key, _, _ in rows]
+
+    def delete(self, key: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            conn.execute('DELETE FROM cache_tags WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def clear(self) -> bool:
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM cache_entries')
+            conn.execute('DELETE FROM cache_tags')
+        return True
+
+    def inc(self, key: str, delta: int = 1) -> Optional[int]:
+        """
+        Atomares Inkrement (für prozessübergreifende Versions-Counter).
+
+        Zähler werden als Integer ohne Ablauf gespeichert.
+        """
+        # BEGIN IMMEDIATE: Schreib-Lock vor dem Lesen -> kein Lost Update
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            current = 0
+            if row is not None and (not row[1] or row[1] > time.time()):
+                try:
+                    current = int(pickle.loads(row[0]))
+                except (pickle.PickleError, TypeError, ValueError, EOFError):
+                    current = 0
+            value = current + delta
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, 0)',
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            )
+        return value
+
+    def dec(self, key: str, delta: int = 1) -> Optional[int]:
+        return self.inc(key, -delta)
+
+    # =========================================================================
+    # TAGS
+    # =========================================================================
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Löscht alle Einträge, die einem der Tags zugeordnet sind.
+
+        Args:
+            *tags: Tag-Namen (z.B. 'modul', 'semester')
+
+        Returns:
+            Anzahl gelöschter Einträge
+        """
+        if not tags:
+            return 0
+
+        placeholders = ','.join('?' for _ in tags)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f'DELETE FROM cache_entries WHERE key IN '
+                f'(SELECT key FROM cache_tags WHERE tag IN ({placeholders}))',
+                tags
+            )
+            conn.execute(
+                f'DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries) '
+                f'OR tag IN ({placeholders})',
+                tags
+            )
+        return cursor.rowcount
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    def _maybe_prune(self) -> None:
+        """Entfernt abgelaufene Einträge (nur jeder N-te Schreibzugriff)"""
+        self._write_count += 1
+        if self._write_count % PRUNE_INTERVAL:
+            return
+        self.prune()
+
+    def prune(self) -> int:
+        """Entfernt alle abgelaufenen Einträge und verwaiste Tags"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'DELETE FROM cache_entries WHERE expires > 0 AND expires <= ?',
+                (time.time(),)
+            )
+            conn.execute('DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)')
+        return cursor.rowcount
@@ -4,8 +4,23 @@ Token Blocklist - Sichere Token-Invalidierung
 
 Ermöglicht das Invalidieren von JWTs bei Logout.
 
-In-Memory Implementation für Development.
-Für Production: Redis oder Datenbank verwenden.
+Persistente Blocklist in der Datenbank (Tabelle token_blocklist), damit
+ein Logout in allen Gunicorn-Workern und über Neustarts hinweg gilt.
+
+Davor liegt pro Worker ein Bloom-Filter über alle gesperrten jti:
+- "Nicht gesperrt" (der Normalfall) wird ohne I/O beantwortet
+- Nur bei einem Treffer im Filter wird in der DB nachgesehen
+- Der Filter wird alle TOKEN_BLOCKLIST_REFRESH_SECONDS inkrementell
+  nachgeladen (nur Einträge ab der zuletzt gesehenen id)
+- Abgelaufene Einträge verschwinden beim periodischen Neuaufbau
+
+Ein Logout in Worker A wirkt in Worker B also spätestens nach dem
+Refresh-Intervall (Default 2s), in Worker A sofort. Gelesen wird immer vom
+Primary (nie von einer Read-Replica mit Lag), in einer eigenen Session: ein
+fehlgeschlagenes SELECT bricht so nicht die Transaktion des Requests ab.
+
+Fail-closed: Ist die Blocklist nicht lesbar (DB weg, Tabelle fehlt), gilt
+der Token als gesperrt. Die Tabelle legt `flask ensure-tables` an.
 
 Usage:
     from app.utils.token_blocklist import token_blocklist
@@ -17,30 +32,90 @@ Usage:
     is_blocked = token_blocklist.is_blocked(jti)
 """
 
+import hashlib
+import os
 import time
 from threading import Lock
 from typing import Dict, Optional
 from datetime import datetime
 
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+# Beim Nachladen auch die letzten N ids erneut lesen: Sequenz-Werte
+# werden nicht zwingend in id-Reihenfolge committet
+NACHLADE_UEBERLAPPUNG = 50
+
+
+class BloomFilter:
+    """
+    Bloom-Filter mit fester Bitanzahl (Double Hashing über blake2b)
+
+    Falsch-positive Treffer sind möglich (-> DB-Check), falsch-negative nicht.
+    """
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+        self.count = 0
+
+    def _positionen(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positionen(key):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positionen(key))
+
 
 class TokenBlocklist:
     """
-    Thread-safe In-Memory Token Blocklist.
+    DB-gestützte Token Blocklist mit Bloom-Filter pro Worker.
 
     Features:
-    - Automatische Bereinigung abgelaufener Tokens
-    - Thread-safe durch Lock
-    - TTL-basierte Speicherung (Tokens werden nach Ablauf entfernt)
-
-    Hinweis: Für Production sollte Redis verwendet werden.
-    Diese Implementation verliert Daten bei Server-Neustart.
+    - Persistent und für alle Worker gültig (Tabelle token_blocklist)
+    - TTL: Einträge gelten bis zum Ablauf des Tokens, abgelaufene werden
+      beim Hinzufügen neuer Einträge gelöscht
+    - Bloom-Filter: kein I/O für nicht gesperrte Tokens
+    - Fork-sicher: Filter wird pro Prozess aufgebaut
     """
 
     def __init__(self):
-        self._blocklist: Dict[str, float] = {}  # jti -> expiry_timestamp
         self._lock = Lock()
-        self._last_cleanup = time.time()
-        self._cleanup_interval = 300  # 5 Minuten
+        self._refresh_interval = 2.0
+        self._rebuild_interval = 3600.0
+        self._bits = 1 << 20
+        self._hashes = 7
+        self._reset()
+
+    def init_app(self, app) -> None:
+        """Liest die Konfiguration (TOKEN_BLOCKLIST_*)"""
+        self._refresh_interval = app.config.get('TOKEN_BLOCKLIST_REFRESH_SECONDS', self._refresh_interval)
+        self._rebuild_interval = app.config.get('TOKEN_BLOCKLIST_REBUILD_SECONDS', self._rebuild_interval)
+        self._bits = app.config.get('TOKEN_BLOCKLIST_BLOOM_BITS', self._bits)
+        self._hashes = app.config.get('TOKEN_BLOCKLIST_BLOOM_HASHES', self._hashes)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._filter: Optional[BloomFilter] = None
+        self._gesperrt: Dict[str, float] = {}  # bestätigte Treffer: jti -> expiry_timestamp
+        self._letzte_id = 0
+        self._last_refresh = 0.0
+        self._last_rebuild = 0.0
+        self._pid = None
+
+    # =========================================================================
+    # API
+    # =========================================================================
 
     def add(self, jti: str, exp_timestamp: Optional[float] = None) -> None:
         """
@@ -51,13 +126,31 @@ class TokenBlocklist:
             exp_timestamp: Token-Ablaufzeit (Unix timestamp)
                           Falls nicht angegeben, wird Token für 24h geblockt
         """
+        from app.extensions import db
+        from app.models import GesperrterToken
+
         if exp_timestamp is None:
             # Default: 24 Stunden
             exp_timestamp = time.time() + 86400
 
+        if not db.session.query(GesperrterToken.id).filter_by(jti=jti).first():
+            db.session.add(GesperrterToken(jti=jti, expires_at=datetime.utcfromtimestamp(exp_timestamp)))
+
+        # TTL: abgelaufene Tokens sind ohnehin ungültig
+        db.session.query(GesperrterToken).filter(
+            GesperrterToken.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+        # Dieser Worker sofort, die anderen beim nächsten Refresh
         with self._lock:
-            self._blocklist[jti] = exp_timestamp
-            self._maybe_cleanup()
+            try:
+                self._sicherstellen()
+            except Exception as e:
+                current_app.logger.error(f'[TokenBlocklist] Refresh failed: {e}')
+            if self._filter is not None:
+                self._filter.add(jti)
+                self._gesperrt[jti] = exp_timestamp
 
     def is_blocked(self, jti: str) -> bool:
         """
@@ -67,73 +160,149 @@ class TokenBlocklist:
             jti: JWT ID
 
         Returns:
-            True wenn geblockt, False sonst
+            True wenn geblockt oder Blocklist nicht lesbar, False sonst
         """
         with self._lock:
-            if jti not in self._blocklist:
+            try:
+                self._sicherstellen()
+            except Exception as e:
+                # Fail-closed: ohne aktuellen Filter könnte ein widerrufener
+                # Token durchrutschen
+                current_app.logger.error(f'[TokenBlocklist] Refresh failed, rejecting token: {e}')
+                return True
+
+            if jti not in self._filter:
                 return False
 
-            # Prüfe ob Token abgelaufen ist
-            exp_timestamp = self._blocklist[jti]
-            if time.time() > exp_timestamp:
-                # Token ist abgelaufen - aus Blocklist entfernen
-                del self._blocklist[jti]
+            exp_timestamp = self._gesperrt.get(jti)
+            if exp_timestamp is not None:
+                if time.time() <= exp_timestamp:
+                    return True
+                del self._gesperrt[jti]
                 return False
 
+        # Filter-Treffer (gesperrt oder falsch-positiv): in der DB nachsehen
+        try:
+            return self._pruefe_db(jti)
+        except Exception as e:
+            current_app.logger.error(f'[TokenBlocklist] Lookup failed, rejecting token: {e}')
             return True
 
     def remove(self, jti: str) -> bool:
         """
         Entfernt Token aus Blocklist.
 
+        Im Bloom-Filter bleibt der jti bis zum nächsten Neuaufbau stehen,
+        is_blocked() prüft dann gegen die DB.
+
         Args:
             jti: JWT ID
 
         Returns:
             True wenn entfernt, False wenn nicht gefunden
         """
+        from app.extensions import db
+        from app.models import GesperrterToken
+
+        geloescht = db.session.query(GesperrterToken).filter_by(jti=jti).delete(synchronize_session=False)
+        db.session.commit()
         with self._lock:
-            if jti in self._blocklist:
-                del self._blocklist[jti]
-                return True
-            return False
+            self._gesperrt.pop(jti, None)
+        return geloescht > 0
 
     def clear(self) -> None:
         """Leert die gesamte Blocklist."""
+        from app.extensions import db
+        from app.models import GesperrterToken
+
+        db.session.query(GesperrterToken).delete(synchronize_session=False)
+        db.session.commit()
         with self._lock:
-            self._blocklist.clear()
+            self._reset()
 
-    def _maybe_cleanup(self) -> None:
+    # =========================================================================
+    # BLOOM-FILTER REFRESH
+    # =========================================================================
+
+    def _sicherstellen(self) -> None:
         """
-        Bereinigt abgelaufene Tokens (wird automatisch aufgerufen).
-        Nicht thread-safe - muss innerhalb des Locks aufgerufen werden.
+        Baut den Filter auf bzw. lädt neue Einträge nach (fällig nach
+        Intervall). Muss innerhalb des Locks aufgerufen werden.
         """
+        if self._pid != os.getpid():
+            self._reset()
+            self._pid = os.getpid()
+
         now = time.time()
-        if now - self._last_cleanup < self._cleanup_interval:
-            return
+        if self._filter is None or now - self._last_rebuild >= self._rebuild_interval:
+            self._neu_aufbauen(now)
+        elif now - self._last_refresh >= self._refresh_interval:
+            self._nachladen(now)
+
+    def _neu_aufbauen(self, now: float) -> None:
+        """Kompletter Neuaufbau (verwirft abgelaufene Einträge)"""
+        alt = (self._filter, self._gesperrt, self._letzte_id)
+        self._filter = BloomFilter(self._bits, self._hashes)
+        self._gesperrt = {}
+        self._letzte_id = 0
+        try:
+            self._nachladen(now, nur_gueltige=True)
+        except Exception:
+            # Kein halb befüllter Filter (wäre falsch-negativ)
+            self._filter, self._gesperrt, self._letzte_id = alt
+            raise
+        self._last_rebuild = now
+
+    def _nachladen(self, now: float, nur_gueltige: bool = False) -> None:
+        """Lädt Einträge ab der zuletzt gesehenen id nach (Index-Scan auf PK)"""
+        from app.extensions import db
+        from app.models import GesperrterToken
+
+        stmt = select(GesperrterToken.id, GesperrterToken.jti).where(
+            GesperrterToken.id > self._letzte_id - NACHLADE_UEBERLAPPUNG
+        )
+        if nur_gueltige:
+            stmt = stmt.where(GesperrterToken.expires_at >= datetime.utcnow())
 
-        # Entferne abgelaufene Tokens
-        expired_jtis = [
-            jti for jti, exp in self._blocklist.items()
-            if now > exp
-        ]
-        for jti in expired_jtis:
-            del self._blocklist[jti]
+        # Eigene Session auf dem Primary: Fehler rollt nur diese zurück
+        with Session(db.engine) as session:
+            eintraege = session.execute(stmt.order_by(GesperrterToken.id)).all()
+        for eintrag_id, jti in eintraege:
+            self._filter.add(jti)
+            self._letzte_id = max(self._letzte_id, eintrag_id)
+        self._last_refresh = now
 
-        self._last_cleanup = now
+    def _pruefe_db(self, jti: str) -> bool:
+        """Exakte Prüfung nach Filter-Treffer, bestätigte Treffer merken"""
+        from app.extensions import db
+        from app.models import GesperrterToken
+
+        with Session(db.engine) as session:
+            expires_at = session.execute(
+                select(GesperrterToken.expires_at).where(GesperrterToken.jti == jti)
+            ).scalar()
+        if expires_at is None or expires_at < datetime.utcnow():
+            return False
+
+        with self._lock:
+            self._gesperrt[jti] = (expires_at - datetime(1970, 1, 1)).total_seconds()
+        return True
 
     @property
     def size(self) -> int:
-        """Anzahl der geblockten Tokens."""
+        """Anzahl der Tokens im Bloom-Filter dieses Workers."""
         with self._lock:
-            return len(self._blocklist)
+            return self._filter.count if self._filter else 0
 
     def get_stats(self) -> dict:
         """Statistiken für Debugging."""
         with self._lock:
             return {
-                'blocked_tokens': len(self._blocklist),
-                'last_cleanup': datetime.fromtimestamp(self._last_cleanup).isoformat(),
+                'blocked_tokens': self._filter.count if self._filter else 0,
+                'confirmed_cached': len(self._gesperrt),
+                'last_id': self._letzte_id,
+                'last_refresh': datetime.fromtimestamp(self._last_refresh).isoformat(),
+                'last_rebuild': datetime.fromtimestamp(self._last_rebuild).isoformat(),
             }
 
 
@@ -963,6 +963,18 @@ CREATE SEQUENCE public.modul_studiengang_id_seq
 ALTER SEQUENCE public.modul_studiengang_id_seq OWNED BY public.modul_studiengang.id;
 
 
+--
+-- Name: modul_suchindex; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.modul_suchindex (
+    modul_id integer NOT NULL,
+    po_id integer NOT NULL,
+    dokument tsvector NOT NULL,
+    updated_at timestamp without time zone NOT NULL
+);
+
+
 --
 -- Name: modul_voraussetzungen; Type: TABLE; Schema: public; Owner: -
 --
@@ -1444,6 +1456,38 @@ CREATE SEQUENCE public.template_module_id_seq
 ALTER SEQUENCE public.template_module_id_seq OWNED BY public.template_module.id;
 
 
+--
+-- Name: token_blocklist; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.token_blocklist (
+    id integer NOT NULL,
+    jti character varying(64) NOT NULL,
+    expires_at timestamp without time zone NOT NULL,
+    created_at timestamp without time zone NOT NULL
+);
+
+
+--
+-- Name: token_blocklist_id_seq; Type: SEQUENCE; Schema: public; Owner: -
+--
+
+CREATE SEQUENCE public.token_blocklist_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+--
+-- Name: token_blocklist_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: -
+--
+
+ALTER SEQUENCE public.token_blocklist_id_seq OWNED BY public.token_blocklist.id;
+
+
 --
 -- Name: wunsch_freie_tage; Type: TABLE; Schema: public; Owner: -
 --
@@ -1724,6 +1768,13 @@ ALTER TABLE ONLY public.studiengang ALTER COLUMN id SET DEFAULT nextval('public.
 ALTER TABLE ONLY public.template_module ALTER COLUMN id SET DEFAULT nextval('public.template_module_id_seq'::regclass);
 
 
+--
+-- Name: token_blocklist id; Type: DEFAULT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.token_blocklist ALTER COLUMN id SET DEFAULT nextval('public.token_blocklist_id_seq'::regclass);
+
+
 --
 -- Name: wunsch_freie_tage id; Type: DEFAULT; Schema: public; Owner: -
 --
@@ -9621,6 +9672,12 @@ INSERT INTO public.modul_studiengang (id, modul_id, po_id, studiengang_id, semes
 INSERT INTO public.modul_studiengang (id, modul_id, po_id, studiengang_id, semester, pflicht, wahlpflicht, modul_kategorie) VALUES (460, 159, 1, 3, NULL, false, true, NULL);
 
 
+--
+-- Data for Name: modul_suchindex; Type: TABLE DATA; Schema: public; Owner: -
+--
+
+
+
 --
 -- Data for Name: modul_voraussetzungen; Type: TABLE DATA; Schema: public; Owner: -
 --
@@ -9890,6 +9947,12 @@ INSERT INTO public.template_module (id, template_id, modul_id, po_id, anzahl_vor
 INSERT INTO public.template_module (id, template_id, modul_id, po_id, anzahl_vorlesungen, anzahl_uebungen, anzahl_praktika, anzahl_seminare, mitarbeiter_ids, anmerkungen, raumbedarf, raum_vorlesung, raum_uebung, raum_praktikum, raum_seminar, kapazitaet_vorlesung, kapazitaet_uebung, kapazitaet_praktikum, kapazitaet_seminar, created_at) VALUES (3, 2, 1, 1, 1, 1, 0, 0, '[27]', NULL, NULL, NULL, NULL, NULL, NULL, 30, 20, 15, 20, '2026-02-01 13:48:41.651452');
 
 
+--
+-- Data for Name: token_blocklist; Type: TABLE DATA; Schema: public; Owner: -
+--
+
+
+
 --
 -- Data for Name: wunsch_freie_tage; Type: TABLE DATA; Schema: public; Owner: -
 --
@@ -10141,6 +10204,13 @@ SELECT pg_catalog.setval('public.studiengang_id_seq', 7, true);
 SELECT pg_catalog.setval('public.template_module_id_seq', 3, true);
 
 
+--
+-- Name: token_blocklist_id_seq; Type: SEQUENCE SET; Schema: public; Owner: -
+--
+
+SELECT pg_catalog.setval('public.token_blocklist_id_seq', 1, false);
+
+
 --
 -- Name: wunsch_freie_tage_id_seq; Type: SEQUENCE SET; Schema: public; Owner: -
 --
@@ -10388,6 +10458,14 @@ ALTER TABLE ONLY public.modul_studiengang
     ADD CONSTRAINT modul_studiengang_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: modul_suchindex modul_suchindex_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.modul_suchindex
+    ADD CONSTRAINT modul_suchindex_pkey PRIMARY KEY (modul_id);
+
+
 --
 -- Name: modul_voraussetzungen modul_voraussetzungen_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -10540,6 +10618,22 @@ ALTER TABLE ONLY public.template_module
     ADD CONSTRAINT template_module_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: token_blocklist token_blocklist_jti_key; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.token_blocklist
+    ADD CONSTRAINT token_blocklist_jti_key UNIQUE (jti);
+
+
+--
+-- Name: token_blocklist token_blocklist_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.token_blocklist
+    ADD CONSTRAINT token_blocklist_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: phase_submissions unique_professor_phase_approved; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -11044,6 +11138,20 @@ CREATE INDEX ix_modul_studiengang_modul_id ON public.modul_studiengang USING btr
 CREATE INDEX ix_modul_studiengang_studiengang_id ON public.modul_studiengang USING btree (studiengang_id);
 
 
+--
+-- Name: ix_modul_suchindex_dokument; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX ix_modul_suchindex_dokument ON public.modul_suchindex USING gin (dokument);
+
+
+--
+-- Name: ix_modul_suchindex_po_id; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX ix_modul_suchindex_po_id ON public.modul_suchindex USING btree (po_id);
+
+
 --
 -- Name: ix_planungs_templates_benutzer_id; Type: INDEX; Schema: public; Owner: -
 --
@@ -11205,6 +11313,13 @@ CREATE INDEX ix_template_module_modul_id ON public.template_module USING btree (
 CREATE INDEX ix_template_module_template_id ON public.template_module USING btree (template_id);
 
 
+--
+-- Name: ix_token_blocklist_expires_at; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX ix_token_blocklist_expires_at ON public.token_blocklist USING btree (expires_at);
+
+
 --
 -- Name: ix_wunsch_freie_tage_semesterplanung_id; Type: INDEX; Schema: public; Owner: -
 --
@@ -11668,6 +11783,22 @@ ALTER TABLE ONLY public.modul_studiengang
     ADD CONSTRAINT modul_studiengang_studiengang_id_fkey FOREIGN KEY (studiengang_id) REFERENCES public.studiengang(id) ON DELETE CASCADE;
 
 
+--
+-- Name: modul_suchindex modul_suchindex_modul_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.modul_suchindex
+    ADD CONSTRAINT modul_suchindex_modul_id_fkey FOREIGN KEY (modul_id) REFERENCES public.modul(id) ON DELETE CASCADE;
+
+
+--
+-- Name: modul_suchindex modul_suchindex_po_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.modul_suchindex
+    ADD CONSTRAINT modul_suchindex_po_id_fkey FOREIGN KEY (po_id) REFERENCES public.pruefungsordnung(id) ON DELETE CASCADE;
+
+
 --
 -- Name: modul_voraussetzungen modul_voraussetzungen_modul_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
 --
@@ -223,6 +223,8 @@ EOF
     # Run migrations
     print_info "Running database migrations..."
     flask db upgrade
+    flask ensure-tables
+    flask rebuild-search-index
     print_success "Migrations completed"
 
     # Create systemd service
@@ -315,6 +317,9 @@ update_deployment() {
     print_info "Running migrations..."
     source "$APP_DIR/.env.production"
     flask db upgrade
+    flask ensure-tables
+    flask rebuild-search-index
+    flask normalize-modul-rollen
     print_success "Migrations completed"
 
     # Restart service
@@ -34,6 +34,10 @@ timeout = 30  # Request Timeout in Sekunden
 graceful_timeout = 30  # Zeit für graceful shutdown
 keepalive = 2  # Keep-Alive Connections
 
+# send_file() mit Dateipfad (z.B. Modulhandbuch-Auszüge) per sendfile():
+# Kernel kopiert direkt von der Datei in den Socket
+sendfile = True
+
 # ============================================================================
 # Logging
 # ============================================================================
@@ -90,6 +94,16 @@ limit_request_field_size = 8190  # Max Größe eines Header Fields
 # ca_certs = "/path/to/ca_certs.pem"
 # cert_reqs = 0  # SSL Certificate Requirements (0=CERT_NONE, 1=CERT_OPTIONAL, 2=CERT_REQUIRED)
 
+# ============================================================================
+# Metrics (Aggregation über Worker für /metrics)
+# ============================================================================
+# Worker schreiben ihre Metriken in dieses Verzeichnis (siehe app/utils/metrics.py).
+# Wird vor dem Fork gesetzt und damit an alle Worker vererbt.
+os.environ.setdefault(
+    'METRICS_MULTIPROC_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'metrics')
+)
+
 # ============================================================================
 # Hooks (Optional)
 # ============================================================================
@@ -100,6 +114,17 @@ def on_starting(server):
     """
     server.log.info("Starting Gunicorn server...")
 
+    # Worker-Modell für die Pool-Größe pro Worker (siehe app/utils/db_pool.py),
+    # aus der effektiven Config (inkl. Kommandozeile), vor dem Fork gesetzt
+    os.environ['GUNICORN_WORKERS'] = str(server.cfg.workers)
+    os.environ['GUNICORN_WORKER_CLASS'] = server.cfg.worker_class_str
+    os.environ['GUNICORN_THREADS'] = str(server.cfg.threads)
+    os.environ['GUNICORN_WORKER_CONNECTIONS'] = str(server.cfg.worker_connections)
+
+    # Metriken vorheriger Läufe verwerfen
+    from app.utils.metrics import clear_multiproc_dir
+    clear_multiproc_dir(os.environ['METRICS_MULTIPROC_DIR'])
+
 
 def on_reload(server):
     """
@@ -129,6 +154,15 @@ def post_fork(server, worker):
     server.log.info(f"Worker spawned (pid: {worker.pid})")
 
 
+def child_exit(server, worker):
+    """
+    Called just after a worker has been exited, in the master process.
+    """
+    # Counter des Workers ins Archiv übernehmen, Gauges/In-Flight verwerfen
+    from app.utils.metrics import mark_process_dead
+    mark_process_dead(os.environ.get('METRICS_MULTIPROC_DIR'), worker.pid)
+
+
 def pre_exec(server):
     """
     Called just before a new master process is forked.
@@ -0,0 +1,171 @@
+"""
+DB Routing Test (Read-Replicas)
+===============================
+Testet das Replica-Routing (app/utils/db_routing.py) mit zwei SQLite-Dateien:
+Primary und Replica unterscheiden sich in einer Markierungs-Zeile, die
+Test-Routen melden, aus welcher Datei sie gelesen haben.
+
+- GET liest von der Replica, POST und alles nach einem Flush vom Primary
+- Nach einem Schreibzugriff bleibt der Benutzer auf dem Primary
+  (Cookie db_primary_bis und Cache-Key db_primary:<uid>)
+- Ist die Replica nicht erreichbar, liest auch GET vom Primary
+"""
+
+import shutil
+import sqlite3
+import time
+
+import pytest
+from flask import jsonify
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+
+from app import create_app
+from app.config import TestingConfig, config
+from app.extensions import cache, db
+from app.models import Benutzer, GesperrterToken, Rolle
+from app.utils.db_routing import STICKY_CACHE_PREFIX, STICKY_COOKIE, replica_router
+
+
+MARKIERUNG = 'nur_replica'
+
+
+def _quelle() -> str:
+    """'replica', wenn die Markierungs-Zeile sichtbar ist, sonst 'primary'"""
+    name = db.session.execute(db.select(Rolle.name).where(Rolle.name == MARKIERUNG)).scalar()
+    return 'replica' if name else 'primary'
+
+
+def _registriere_testrouten(app):
+    def lesen():
+        verify_jwt_in_request()
+        return jsonify(quelle=_quelle())
+
+    def schreiben():
+        verify_jwt_in_request()
+        quelle = _quelle()
+        db.session.add(Rolle(name=f'neu_{time.time_ns()}'))
+        db.session.commit()
+        return jsonify(quelle=quelle)
+
+    def flush():
+        verify_jwt_in_request()
+        vorher = _quelle()
+        db.session.add(Rolle(name='flush'))
+        db.session.flush()
+        nachher = _quelle()
+        db.session.rollback()
+        return jsonify(vorher=vorher, nachher=nachher)
+
+    app.add_url_rule('/test/routing/lesen', 'routing_lesen', lesen, methods=['GET', 'POST'])
+    app.add_url_rule('/test/routing/schreiben', 'routing_schreiben', schreiben, methods=['POST'])
+    app.add_url_rule('/test/routing/flush', 'routing_flush', flush, methods=['GET'])
+
+
+def _erstelle_app(tmp_path, monkeypatch, replica_url=None):
+    primary = tmp_path / 'primary.sqlite'
+    replica = tmp_path / 'replica.sqlite'
+
+    class RoutingTestConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{primary}'
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        DB_REPLICA_URLS = [replica_url or f'sqlite:///{replica}']
+        DB_REPLICA_CHECK_INTERVAL = 0
+        RATELIMIT_ENABLED = False
+        JWT_TOKEN_LOCATION = ['headers']
+
+    monkeypatch.setitem(config, 'routing_test', RoutingTestConfig)
+    app = create_app('routing_test')
+    _registriere_testrouten(app)
+
+    with app.app_context():
+        # Nur die Tabellen für Login und Markierung (Schema ohne PostgreSQL-Typen)
+        db.metadata.create_all(db.engine, tables=[
+            Rolle.__table__, Benutzer.__table__, GesperrterToken.__table__,
+        ])
+        db.session.add(Rolle(name='dekan'))
+        db.session.flush()
+        for i in (1, 2):
+            benutzer = Benutzer(email=f'user{i}@test.de', username=f'user{i}', rolle_id=1)
+            benutzer.set_password('test')
+            db.session.add(benutzer)
+        db.session.commit()
+        for engine in db.engines.values():
+            engine.dispose()
+
+    # Replica = Kopie des Primary plus Markierung
+    shutil.copy(primary, replica)
+    with sqlite3.connect(replica) as conn:
+        conn.execute('INSERT INTO rolle (name) VALUES (?)', (MARKIERUNG,))
+    return app
+
+
+def _token(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+
+@pytest.fixture
+def routing_app(tmp_path, monkeypatch):
+    # Nicht 'app': pytest-flask hielte sonst einen Request-Kontext über den
+    # ganzen Test offen, alle Requests teilten sich eine Session
+    return _erstelle_app(tmp_path, monkeypatch)
+
+
+def test_get_liest_von_replica(routing_app):
+    response = routing_app.test_client().get('/test/routing/lesen', headers=_token(routing_app, 1))
+
+    assert response.status_code == 200
+    assert response.json['quelle'] == 'replica'
+
+
+def test_post_liest_vom_primary(routing_app):
+    response = routing_app.test_client().post('/test/routing/lesen', headers=_token(routing_app, 1))
+
+    assert response.status_code == 200
+    assert response.json['quelle'] == 'primary'
+
+
+def test_nach_flush_primary(routing_app):
+    response = routing_app.test_client().get('/test/routing/flush', headers=_token(routing_app, 1))
+
+    assert response.status_code == 200
+    assert response.json == {'vorher': 'replica', 'nachher': 'primary'}
+
+
+def test_sticky_nach_schreibzugriff(routing_app):
+    client = routing_app.test_client()
+    headers = _token(routing_app, 1)
+
+    response = client.post('/test/routing/schreiben', headers=headers)
+    assert response.status_code == 200
+    assert STICKY_COOKIE in response.headers.get('Set-Cookie', '')
+    with routing_app.app_context():
+        assert cache.get(f'{STICKY_CACHE_PREFIX}1') > time.time()
+
+    # Gleicher Browser (Cookie)
+    assert client.get('/test/routing/lesen', headers=headers).json['quelle'] == 'primary'
+    # Anderer Client desselben Benutzers (Cache-Key)
+    assert routing_app.test_client().get('/test/routing/lesen', headers=headers).json['quelle'] == 'primary'
+    # Anderer Benutzer
+    anderer = _token(routing_app, 2)
+    assert routing_app.test_client().get('/test/routing/lesen', headers=anderer).json['quelle'] == 'replica'
+
+
+def test_sticky_abgelaufen(routing_app):
+    headers = _token(routing_app, 2)
+    client = routing_app.test_client()
+    client.set_cookie(STICKY_COOKIE, str(int(time.time()) - 1))
+    with routing_app.app_context():
+        cache.set(f'{STICKY_CACHE_PREFIX}2', int(time.time()) - 1)
+
+    assert client.get('/test/routing/lesen', headers=headers).json['quelle'] == 'replica'
+
+
+def test_replica_nicht_erreichbar(tmp_path, monkeypatch):
+    app = _erstelle_app(tmp_path, monkeypatch, replica_url=f'sqlite:///{tmp_path}/fehlt/replica.sqlite')
+
+    response = app.test_client().get('/test/routing/lesen', headers=_token(app, 1))
+
+    assert response.status_code == 200
+    assert response.json['quelle'] == 'primary'
+    assert [s['available'] for s in replica_router.get_status().values()] == [False]
@@ -109,6 +109,9 @@ sleep 10
 if [ "$MIGRATE" = true ]; then
     echo -e "\n${YELLOW}[6/6] Running database migrations...${NC}"
     docker-compose -f docker-compose.production.yml exec -T backend flask db upgrade
+    docker-compose -f docker-compose.production.yml exec -T backend flask ensure-tables
+    docker-compose -f docker-compose.production.yml exec -T backend flask rebuild-search-index
+    docker-compose -f docker-compose.production.yml exec -T backend flask normalize-modul-rollen
 fi
 
 # Health check
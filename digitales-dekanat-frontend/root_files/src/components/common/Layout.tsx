@@ -36,6 +36,7 @@ import {
   MenuBook,
 } from '@mui/icons-material';
 import useAuthStore from '../../store/authStore';
+import NotificationBadge from '../dashboard/NotificationBadge';
 import { createContextLogger } from '../../utils/logger';
 
 const log = createContextLogger('Layout');
@@ -215,6 +216,8 @@ const Layout: React.FC = () => {
 
           {/* User Info & Logout */}
           <Box sx={{ display: 'flex', alignItems: 'center', gap: 2 }}>
+            <NotificationBadge />
+
             <Box sx={{ display: { xs: 'none', sm: 'block' } }}>
               <Typography variant="body2">
                 {user?.name_komplett || user?.username}
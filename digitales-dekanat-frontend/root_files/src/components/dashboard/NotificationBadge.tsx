@@ -0,0 +1,195 @@
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+import {
+  Badge,
+  Box,
+  Button,
+  CircularProgress,
+  Divider,
+  IconButton,
+  ListItemText,
+  Menu,
+  MenuItem,
+  Tooltip,
+  Typography,
+} from '@mui/material';
+import { Notifications as NotificationsIcon } from '@mui/icons-material';
+import dashboardService, { Notification } from '../../services/dashboardService';
+import { createContextLogger } from '../../utils/logger';
+
+const log = createContextLogger('NotificationBadge');
+
+/** Fallback, bis der Server sein Intervall (poll_sekunden) mitteilt */
+const DEFAULT_POLL_SEKUNDEN = 30;
+/** Obergrenze für das Backoff nach Fehlern (z.B. 429) */
+const MAX_POLL_SEKUNDEN = 300;
+
+/**
+ * NotificationBadge Component
+ * ===========================
+ * Glocke mit Ungelesen-Zähler in der AppBar.
+ *
+ * Features:
+ * - Kurzes Polling mit ETag: unverändert -> 304 ohne Body
+ * - Pausiert in Hintergrund-Tabs, fragt beim Zurückkehren sofort nach
+ * - Backoff bei Fehlern
+ * - Menü mit ungelesenen Benachrichtigungen, Markieren als gelesen
+ */
+const NotificationBadge: React.FC = () => {
+  const [ungelesen, setUngelesen] = useState(0);
+  const [anchorEl, setAnchorEl] = useState<null | HTMLElement>(null);
+  const [notifications, setNotifications] = useState<Notification[]>([]);
+  const [loading, setLoading] = useState(false);
+
+  const etagRef = useRef<string | null>(null);
+  const intervallRef = useRef(DEFAULT_POLL_SEKUNDEN);
+  const timerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const laeuftRef = useRef(false);
+  const aktivRef = useRef(true);
+
+  const poll = useCallback(async () => {
+    // Nur eine Abfrage gleichzeitig (Timer und Tab-Wechsel)
+    if (laeuftRef.current) {
+      return;
+    }
+    laeuftRef.current = true;
+    if (timerRef.current) {
+      clearTimeout(timerRef.current);
+      timerRef.current = null;
+    }
+
+    let naechsterVersuch = intervallRef.current;
+    if (!document.hidden) {
+      try {
+        const { stand, etag } = await dashboardService.getUngelesenStand(etagRef.current);
+        etagRef.current = etag;
+        if (stand) {
+          setUngelesen(stand.ungelesen);
+          intervallRef.current = stand.poll_sekunden || DEFAULT_POLL_SEKUNDEN;
+        }
+        naechsterVersuch = intervallRef.current;
+      } catch (error) {
+        log.warn('Ungelesen-Zähler nicht abrufbar', error);
+        naechsterVersuch = Math.min(naechsterVersuch * 2, MAX_POLL_SEKUNDEN);
+        intervallRef.current = naechsterVersuch;
+      }
+    }
+
+    laeuftRef.current = false;
+    if (aktivRef.current) {
+      timerRef.current = setTimeout(poll, naechsterVersuch * 1000);
+    }
+  }, []);
+
+  useEffect(() => {
+    aktivRef.current = true;
+    poll();
+
+    const handleVisibility = () => {
+      if (!document.hidden) {
+        poll();
+      }
+    };
+    document.addEventListener('visibilitychange', handleVisibility);
+
+    return () => {
+      aktivRef.current = false;
+      document.removeEventListener('visibilitychange', handleVisibility);
+      if (timerRef.current) {
+        clearTimeout(timerRef.current);
+      }
+    };
+  }, [poll]);
+
+  const handleOpen = async (event: React.MouseEvent<HTMLElement>) => {
+    setAnchorEl(event.currentTarget);
+    setLoading(true);
+    try {
+      const response = await dashboardService.getNotifications(true);
+      setNotifications(response.data?.notifications || []);
+    } catch (error) {
+      log.error('Benachrichtigungen nicht ladbar', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleClose = () => {
+    setAnchorEl(null);
+  };
+
+  const handleGelesen = async (notification: Notification) => {
+    try {
+      await dashboardService.markiereGelesen(notification.id);
+      setNotifications(prev => prev.filter(n => n.id !== notification.id));
+      // Neuer Stand kommt mit dem nächsten Poll (neue seq -> 200)
+      setUngelesen(prev => Math.max(0, prev - 1));
+    } catch (error) {
+      log.error('Markieren fehlgeschlagen', error);
+    }
+  };
+
+  const handleAlleGelesen = async () => {
+    try {
+      await dashboardService.markiereAlleGelesen();
+      setNotifications([]);
+      setUngelesen(0);
+    } catch (error) {
+      log.error('Markieren fehlgeschlagen', error);
+    }
+  };
+
+  return (
+    <>
+      <Tooltip title="Benachrichtigungen">
+        <IconButton color="inherit" onClick={handleOpen}>
+          <Badge badgeContent={ungelesen} color="error" max={99}>
+            <NotificationsIcon />
+          </Badge>
+        </IconButton>
+      </Tooltip>
+
+      <Menu
+        sx={{ mt: '45px' }}
+        anchorEl={anchorEl}
+        anchorOrigin={{ vertical: 'top', horizontal: 'right' }}
+        transformOrigin={{ vertical: 'top', horizontal: 'right' }}
+        open={Boolean(anchorEl)}
+        onClose={handleClose}
+        PaperProps={{ sx: { width: 360, maxHeight: 480 } }}
+      >
+        <Box sx={{ px: 2, py: 1, display: 'flex', alignItems: 'center', justifyContent: 'space-between' }}>
+          <Typography variant="subtitle1">Benachrichtigungen</Typography>
+          {notifications.length > 0 && (
+            <Button size="small" onClick={handleAlleGelesen}>
+              Alle gelesen
+            </Button>
+          )}
+        </Box>
+        <Divider />
+
+        {loading ? (
+          <Box sx={{ display: 'flex', justifyContent: 'center', py: 2 }}>
+            <CircularProgress size={24} />
+          </Box>
+        ) : notifications.length === 0 ? (
+          <MenuItem disabled>
+            <Typography variant="body2">Keine ungelesenen Benachrichtigungen</Typography>
+          </MenuItem>
+        ) : (
+          notifications.map(notification => (
+            <MenuItem key={notification.id} onClick={() => handleGelesen(notification)}>
+              <ListItemText
+                primary={notification.titel}
+                secondary={notification.nachricht}
+                primaryTypographyProps={{ noWrap: true }}
+                secondaryTypographyProps={{ noWrap: true }}
+              />
+            </MenuItem>
+          ))
+        )}
+      </Menu>
+    </>
+  );
+};
+
+export default NotificationBadge;
@@ -252,7 +252,7 @@ const AddDozentDialog: React.FC<AddDozentDialogProps> = ({
                 label="Rolle"
                 onChange={(e) => setRolle(e.target.value)}
               >
-                <MenuItem value="verantwortlich">Verantwortlich</MenuItem>
+                <MenuItem value="verantwortlicher">Verantwortlich</MenuItem>
                 <MenuItem value="mitwirkend">Mitwirkend</MenuItem>
                 <MenuItem value="vertreter">Vertreter</MenuItem>
                 <MenuItem value="pruefend">Prüfend</MenuItem>
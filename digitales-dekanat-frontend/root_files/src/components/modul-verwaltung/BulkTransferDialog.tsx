@@ -67,7 +67,7 @@ const BulkTransferDialog: React.FC<BulkTransferDialogProps> = ({
   const [vonDozent, setVonDozent] = useState<Dozent | null>(null);
   const [zuDozent, setZuDozent] = useState<Dozent | null>(null);
   const [poId, setPoId] = useState<number | null>(null);
-  const [rolle, setRolle] = useState<string>('verantwortlich');
+  const [rolle, setRolle] = useState<string>('verantwortlicher');
   const [selectedModuleIds, setSelectedModuleIds] = useState<number[]>([]);
   const [bemerkung, setBemerkung] = useState<string>('');
 
@@ -130,7 +130,7 @@ const BulkTransferDialog: React.FC<BulkTransferDialogProps> = ({
     setVonDozent(null);
     setZuDozent(null);
     setPoId(pruefungsordnungen.length > 0 ? pruefungsordnungen[0].id : null);
-    setRolle('verantwortlich');
+    setRolle('verantwortlicher');
     setSelectedModuleIds([]);
     setBemerkung('');
     setError(null);
@@ -342,7 +342,7 @@ const BulkTransferDialog: React.FC<BulkTransferDialogProps> = ({
                 label="Rolle"
                 onChange={(e) => setRolle(e.target.value)}
               >
-                <MenuItem value="verantwortlich">Verantwortlich</MenuItem>
+                <MenuItem value="verantwortlicher">Verantwortlich</MenuItem>
                 <MenuItem value="mitwirkend">Mitwirkend</MenuItem>
                 <MenuItem value="vertreter">Vertreter</MenuItem>
                 <MenuItem value="pruefend">Prüfend</MenuItem>
@@ -273,12 +273,13 @@ export interface ApiResponse<T = any> {
   errors?: string[];
   meta?: {
     pagination?: {
-      total: number;
-      page: number;
+      total?: number;
+      page?: number;
       per_page: number;
-      pages: number;
-      has_prev: boolean;
+      pages?: number;
+      has_prev?: boolean;
       has_next: boolean;
+      next_cursor?: number | null;
     };
   };
 }
@@ -212,6 +212,40 @@ export const getNotifications = async (
   return response.data;
 };
 
+export interface UngelesenStand {
+  ungelesen: number;
+  seq: number;
+  poll_sekunden: number;
+}
+
+export interface UngelesenPoll {
+  /** null = unverändert seit dem übergebenen ETag (304) */
+  stand: UngelesenStand | null;
+  etag: string | null;
+}
+
+/**
+ * Fragt den Ungelesen-Zähler ab (kurzes Polling)
+ *
+ * Mit dem ETag der letzten Antwort antwortet der Server mit 304, solange
+ * sich der Zähler nicht geändert hat - dann ist `stand` null.
+ *
+ * @param etag - Optional: ETag aus der letzten Antwort
+ */
+export const getUngelesenStand = async (
+  etag?: string | null
+): Promise<UngelesenPoll> => {
+  const response = await api.get('/dashboard/notifications/ungelesen', {
+    headers: etag ? { 'If-None-Match': etag } : undefined,
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+  });
+
+  return {
+    stand: response.status === 304 ? null : response.data.data,
+    etag: response.headers['etag'] ?? etag ?? null,
+  };
+};
+
 /**
  * Markiert eine Benachrichtigung als gelesen
  *
@@ -424,6 +458,7 @@ export default {
   getDekanDashboard,
   getDozentDashboard,
   getNotifications,
+  getUngelesenStand,
   markiereGelesen,
   markiereAlleGelesen,
   getNichtZugeordneteModule,
@@ -29,7 +29,7 @@ export interface ModulDozentZuordnung {
   id: number; // zuordnung_id
   name: string;
   name_kurz: string;
-  rolle: string; // 'verantwortlich', 'mitwirkend', etc.
+  rolle: string; // 'verantwortlicher', 'lehrperson', 'mitwirkend', etc.
   zuordnung_id: number;
   po_id: number;
   vertreter_id?: number;
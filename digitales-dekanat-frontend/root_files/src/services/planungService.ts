@@ -418,11 +418,26 @@ class PlanungService {
         queryParams.append('nur_aktive_phase', 'true');
       }
 
-      const url = `/planung/dekan${queryParams.toString() ? `?${queryParams}` : ''}`;
-      const response = await api.get<ApiResponse<Semesterplanung[]>>(url);
-
-      log.debug('[DEKAN] Planungen loaded:', response.data.data?.length || 0);
-      return response.data;
+      // Dekan-Ansicht braucht Module + Wunsch-freie Tage; Seiten per Cursor nachladen
+      queryParams.append('details', 'true');
+      queryParams.append('per_page', '200');
+
+      const planungen: Semesterplanung[] = [];
+      let cursor: number | null | undefined = null;
+      let page: ApiResponse<Semesterplanung[]>;
+      do {
+        const pageParams = new URLSearchParams(queryParams);
+        if (cursor) {
+          pageParams.append('cursor', cursor.toString());
+        }
+        const response = await api.get<ApiResponse<Semesterplanung[]>>(`/planung/dekan?${pageParams}`);
+        page = response.data;
+        planungen.push(...(page.data || []));
+        cursor = page.meta?.pagination?.next_cursor;
+      } while (page.success && cursor);
+
+      log.debug('[DEKAN] Planungen loaded:', planungen.length);
+      return { ...page, data: planungen };
     } catch (error) {
       log.error('[DEKAN] Error fetching planungen:', error);
       throw new Error(handleApiError(error));